@@ -40,7 +40,7 @@ if [[ "$file_path" =~ \.coditect/(agents|skills|commands)/.*\.md$ ]]; then
     fi
 
     # Run Python validation with the full JSON input
-    if python3 "$SCRIPT_DIR/validate_component.py" < <(echo "$json"); then
+    if python3 -S "$SCRIPT_DIR/hook_client.py" validate_component < <(echo "$json"); then
         # Validation passed
         exit 0
     else
@@ -21,7 +21,7 @@ json=$(cat)
 
 # Run Python sync in background (non-blocking PostToolUse hook)
 (
-    python3 "$SCRIPT_DIR/sync_documentation.py" < <(echo "$json") 2>/dev/null || true
+    python3 -S "$SCRIPT_DIR/hook_client.py" sync_documentation < <(echo "$json") 2>/dev/null || true
 ) &
 
 # Return immediately (non-blocking)
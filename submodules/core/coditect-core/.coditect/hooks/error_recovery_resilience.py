@@ -18,6 +18,8 @@ from pathlib import Path
 from typing import Dict, Optional, List
 from datetime import datetime, timedelta
 
+from hook_state import get_instance
+
 
 class ErrorRecoveryManager:
     """Manages error recovery and resilience"""
@@ -256,7 +258,7 @@ def main():
         repo_root = str(script_dir)
 
         # Initialize error recovery
-        recovery = ErrorRecoveryManager(repo_root)
+        recovery = get_instance(ErrorRecoveryManager, repo_root)
 
         # No error, record success
         if exit_code == 0:
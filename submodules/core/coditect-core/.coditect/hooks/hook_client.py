@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Hook Client Shim for CODITECT
+
+Tiny entry point used by the shell wrappers instead of launching a hook
+script directly. Forwards the hook input to the hook daemon over a Unix
+domain socket and relays its stdout, stderr and exit code. If the daemon is
+not running, it is started in the background and the hook runs in-process
+for this event, so hooks always work with or without the daemon.
+
+Only standard-library modules needed for the fast path are imported at
+startup; run with ``python3 -S`` to skip site initialization as well.
+
+Usage:
+    python3 -S .coditect/hooks/hook_client.py monitoring_observability < input.json
+
+Environment:
+    CODITECT_HOOK_DAEMON=0        Always run hooks in-process
+    CODITECT_HOOK_AUTOSTART=0     Don't start the daemon when it is absent
+    CODITECT_HOOK_SOCKET=<path>   Override the daemon socket path
+    CODITECT_HOOK_TIMEOUT=<secs>  Maximum time to wait for a hook (default 600)
+"""
+
+import json
+import os
+import sys
+
+# The C-level module: `socket` pulls in enum/selectors and costs ~20 ms of
+# startup, which is most of what the shim is meant to save.
+import _socket as socket
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CONNECT_TIMEOUT = 0.25
+DEFAULT_HOOK_TIMEOUT = 600.0
+
+# sockaddr_un.sun_path is 104-108 bytes depending on the platform
+MAX_SOCKET_PATH = 100
+
+
+def default_socket_path(hooks_dir: str = HOOKS_DIR) -> str:
+    """Socket path for the daemon serving `hooks_dir`"""
+    override = os.environ.get('CODITECT_HOOK_SOCKET')
+    if override:
+        return override
+
+    path = os.path.join(hooks_dir, '.hook-daemon.sock')
+    if len(path.encode()) <= MAX_SOCKET_PATH:
+        return path
+
+    # Deep checkouts: fall back to a per-directory name in the temp dir
+    import hashlib
+    import tempfile
+    digest = hashlib.sha1(hooks_dir.encode()).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f'coditect-hooks-{digest}.sock')
+
+
+def send_request(socket_path: str, header: dict, payload: bytes = b'', timeout: float = DEFAULT_HOOK_TIMEOUT):
+    """
+    Send one request to the daemon and return its decoded response.
+
+    Returns None if the daemon cannot be reached or the exchange fails.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(socket_path)
+
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(header).encode() + b'\n' + payload)
+        sock.shutdown(socket.SHUT_WR)
+
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+        return json.loads(b''.join(chunks))
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+
+def start_daemon(hooks_dir: str = HOOKS_DIR):
+    """Start the hook daemon in the background (does not wait for it)"""
+    import subprocess
+
+    log_path = os.path.join(hooks_dir, '.hook-daemon.log')
+    try:
+        with open(log_path, 'ab') as log:
+            subprocess.Popen(
+                [sys.executable, os.path.join(hooks_dir, 'hook_daemon.py'), 'serve'],
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=log,
+                start_new_session=True,
+                close_fds=True,
+            )
+    except OSError:
+        pass
+
+
+def run_in_process(hook_name: str, payload: bytes, hooks_dir: str = HOOKS_DIR) -> int:
+    """Run a hook script in this process, as if launched with python3"""
+    import io
+    import runpy
+
+    hook_path = os.path.join(hooks_dir, f'{hook_name}.py')
+    if hooks_dir not in sys.path:
+        sys.path.insert(0, hooks_dir)
+
+    sys.stdin = io.TextIOWrapper(io.BytesIO(payload), encoding='utf-8')
+    try:
+        runpy.run_path(hook_path, run_name='__main__')
+    except SystemExit as e:
+        return _exit_code(e.code)
+    finally:
+        sys.stdout.flush()
+    return 0
+
+
+def _exit_code(code) -> int:
+    """Translate a SystemExit code the way the interpreter does"""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    sys.stderr.write(f"{code}\n")
+    return 1
+
+
+def main(argv=None) -> int:
+    """Main client entry point"""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        sys.stderr.write("Usage: hook_client.py <hook_name>\n")
+        return 2
+
+    hook_name = argv[0]
+    if hook_name.endswith('.py'):
+        hook_name = hook_name[:-3]
+    if not hook_name.replace('_', '').isalnum():
+        sys.stderr.write(f"Invalid hook name: {hook_name}\n")
+        return 2
+
+    payload = sys.stdin.buffer.read()
+
+    if os.environ.get('CODITECT_HOOK_DAEMON', '1') != '0':
+        timeout = float(os.environ.get('CODITECT_HOOK_TIMEOUT', DEFAULT_HOOK_TIMEOUT))
+        response = send_request(
+            default_socket_path(),
+            {'op': 'run', 'hook': hook_name, 'cwd': os.getcwd()},
+            payload,
+            timeout,
+        )
+
+        if response is not None and 'exit_code' in response:
+            sys.stdout.write(response.get('stdout', ''))
+            sys.stderr.write(response.get('stderr', ''))
+            return response['exit_code']
+
+        if response is None and os.environ.get('CODITECT_HOOK_AUTOSTART', '1') != '0':
+            start_daemon()
+
+    return run_in_process(hook_name, payload)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Hook Daemon for CODITECT
+
+Long-lived server hosting every hook in .coditect/hooks. Hook scripts are
+imported once and their state objects stay in memory (see hook_state.py),
+so a tool event costs a socket round-trip instead of a Python startup,
+module imports and JSON state parsing.
+
+Each request runs the hook's existing main() with stdin/stdout/stderr
+redirected, exactly as if the script had been launched directly. Requests
+are handled one at a time. A hook file that changes on disk is re-imported
+on its next use; the daemon exits after a period without requests.
+
+Only one daemon serves a socket path: it holds an flock on the pidfile next
+to the socket for its whole lifetime, so a daemon that is merely busy is
+never mistaken for a stale one.
+
+Protocol (one request per connection):
+    client -> daemon: JSON header line, then the raw hook input
+                      {"op": "run", "hook": "monitoring_observability", "cwd": "..."}
+                      {"op": "ping"} | {"op": "stats"} | {"op": "stop"}
+    daemon -> client: one JSON object, then the connection is closed
+                      {"exit_code": 0, "stdout": "...", "stderr": "..."}
+
+Usage:
+    python3 .coditect/hooks/hook_daemon.py start     # start in background
+    python3 .coditect/hooks/hook_daemon.py serve     # run in foreground
+    python3 .coditect/hooks/hook_daemon.py status
+    python3 .coditect/hooks/hook_daemon.py stop
+"""
+
+import fcntl
+import importlib.util
+import io
+import json
+import os
+import re
+import runpy
+import socket
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+HOOKS_DIR = Path(__file__).resolve().parent
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
+
+import hook_state
+from hook_client import default_socket_path, send_request, start_daemon
+
+DEFAULT_IDLE_TIMEOUT = 30 * 60  # seconds
+HOOK_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_]+$')
+
+# Modules that are infrastructure, not hooks
+NON_HOOK_MODULES = {'hook_daemon', 'hook_client', 'hook_state'}
+
+
+class HookDaemon:
+    """Unix socket server running hook handlers in-process"""
+
+    def __init__(self, hooks_dir: Path = HOOKS_DIR, socket_path: Optional[str] = None,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.hooks_dir = Path(hooks_dir)
+        self.socket_path = socket_path or default_socket_path(str(self.hooks_dir))
+        self.idle_timeout = idle_timeout
+        self.modules: Dict[str, Tuple[float, object]] = {}
+        self.stats: Dict[str, Dict] = {}
+        self.started_at = time.time()
+        self.running = False
+        self.sock: Optional[socket.socket] = None
+        self.socket_inode: Optional[int] = None
+        self.pid_path = pidfile_path(self.socket_path)
+        self.pid_fd: Optional[int] = None
+
+    def bind(self) -> bool:
+        """Bind the listening socket; False if another daemon already serves it"""
+        if not self.acquire_pidfile():
+            return False
+
+        # Holding the lock, any socket left at the path belongs to a daemon
+        # that did not shut down cleanly
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o077)  # socket accessible by this user only
+        try:
+            self.sock.bind(self.socket_path)
+        except OSError:
+            self.sock.close()
+            self.sock = None
+            self.release_pidfile()
+            raise
+        finally:
+            os.umask(old_umask)
+        self.socket_inode = os.stat(self.socket_path).st_ino
+        self.sock.listen(16)
+        return True
+
+    def acquire_pidfile(self) -> bool:
+        """Take the exclusive lock on the pidfile; False if another daemon holds it"""
+        fd = os.open(self.pid_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+
+        os.ftruncate(fd, 0)
+        os.write(fd, f'{os.getpid()}\n'.encode())
+        self.pid_fd = fd
+        return True
+
+    def release_pidfile(self):
+        """Release the pidfile lock (the file itself is left in place)"""
+        if self.pid_fd is not None:
+            os.close(self.pid_fd)
+            self.pid_fd = None
+
+    def serve_forever(self):
+        """Accept and handle requests until stopped or idle too long"""
+        hook_state.PERSISTENT = True
+        self.running = True
+        self.sock.settimeout(self.idle_timeout)
+
+        try:
+            while self.running:
+                try:
+                    conn, _ = self.sock.accept()
+                except socket.timeout:
+                    break  # idle: exit, the next client restarts us
+
+                with conn:
+                    conn.settimeout(None)
+                    try:
+                        self.handle_connection(conn)
+                    except Exception:
+                        traceback.print_exc()
+        finally:
+            self.close()
+
+    def close(self):
+        """Close the listening socket and remove the socket file if it is still ours"""
+        self.running = False
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+            try:
+                if os.stat(self.socket_path).st_ino == self.socket_inode:
+                    os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+            self.socket_inode = None
+        self.release_pidfile()
+
+    def handle_connection(self, conn: socket.socket):
+        """Read one request, dispatch it and send the response"""
+        chunks = []
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+        header_line, _, payload = b''.join(chunks).partition(b'\n')
+        try:
+            header = json.loads(header_line)
+        except ValueError:
+            response = {'error': 'invalid request header'}
+        else:
+            response = self.dispatch(header, payload)
+
+        conn.sendall(json.dumps(response).encode())
+
+    def dispatch(self, header: Dict, payload: bytes) -> Dict:
+        """Handle a decoded request"""
+        op = header.get('op')
+
+        if op == 'run':
+            return self.run_hook(header.get('hook', ''), payload, header.get('cwd'))
+        if op == 'ping':
+            return {'ok': True, 'pid': os.getpid()}
+        if op == 'stats':
+            return {
+                'pid': os.getpid(),
+                'uptime_seconds': round(time.time() - self.started_at, 1),
+                'loaded_hooks': sorted(self.modules),
+                'hooks': self.stats,
+            }
+        if op == 'stop':
+            self.running = False
+            return {'ok': True}
+
+        return {'error': f'unknown op: {op}'}
+
+    def load_hook(self, hook_name: str):
+        """
+        Import a hook module, re-importing it if the file changed.
+
+        Returns None for scripts without a main() function; those are not
+        imported but executed as __main__ on every event.
+        """
+        path = self.hooks_dir / f'{hook_name}.py'
+        mtime = path.stat().st_mtime
+
+        cached = self.modules.get(hook_name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        if not re.search(r'^def main\(', path.read_text(encoding='utf-8'), re.MULTILINE):
+            self.modules[hook_name] = (mtime, None)
+            return None
+
+        spec = importlib.util.spec_from_file_location(f'coditect_hook_{hook_name}', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        self.modules[hook_name] = (mtime, module)
+        return module
+
+    def run_hook(self, hook_name: str, payload: bytes, cwd: Optional[str] = None) -> Dict:
+        """Run a hook's main() with redirected standard streams"""
+        if (not HOOK_NAME_PATTERN.match(hook_name) or hook_name in NON_HOOK_MODULES
+                or not (self.hooks_dir / f'{hook_name}.py').is_file()):
+            return {'exit_code': 1, 'stdout': '', 'stderr': f'Unknown hook: {hook_name}\n'}
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        saved = (sys.stdin, sys.stdout, sys.stderr)
+        saved_cwd = os.getcwd()
+        start = time.perf_counter()
+        exit_code = 0
+
+        try:
+            if cwd and os.path.isdir(cwd):
+                os.chdir(cwd)
+            sys.stdin = io.StringIO(payload.decode('utf-8', errors='replace'))
+            sys.stdout, sys.stderr = stdout, stderr
+
+            module = self.load_hook(hook_name)
+            if module is not None:
+                module.main()
+            else:
+                runpy.run_path(str(self.hooks_dir / f'{hook_name}.py'), run_name='__main__')
+        except SystemExit as e:
+            if e.code is None:
+                exit_code = 0
+            elif isinstance(e.code, int):
+                exit_code = e.code
+            else:
+                stderr.write(f'{e.code}\n')
+                exit_code = 1
+        except Exception:
+            stderr.write(traceback.format_exc())
+            exit_code = 1
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = saved
+            os.chdir(saved_cwd)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        stats = self.stats.setdefault(hook_name, {'count': 0, 'errors': 0, 'total_ms': 0.0})
+        stats['count'] += 1
+        stats['total_ms'] = round(stats['total_ms'] + elapsed_ms, 3)
+        if exit_code != 0:
+            stats['errors'] += 1
+
+        return {'exit_code': exit_code, 'stdout': stdout.getvalue(), 'stderr': stderr.getvalue()}
+
+
+def pidfile_path(socket_path: str) -> str:
+    """Pidfile guarding the daemon that serves `socket_path`"""
+    return os.path.splitext(socket_path)[0] + '.pid'
+
+
+def wait_for_daemon(socket_path: str, timeout: float = 5.0) -> bool:
+    """Wait until a daemon answers on socket_path"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if send_request(socket_path, {'op': 'ping'}, timeout=1.0) is not None:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def main():
+    """Main daemon entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='CODITECT hook daemon')
+    parser.add_argument('command', choices=['serve', 'start', 'stop', 'status'])
+    parser.add_argument('--socket', help='Socket path (default: per hooks directory)')
+    parser.add_argument('--idle-timeout', type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help='Exit after this many idle seconds')
+    args = parser.parse_args()
+
+    socket_path = args.socket or default_socket_path(str(HOOKS_DIR))
+
+    if args.command == 'serve':
+        daemon = HookDaemon(HOOKS_DIR, socket_path, args.idle_timeout)
+        if not daemon.bind():
+            print(f"Hook daemon already running on {socket_path}")
+            sys.exit(0)
+        print(f"Hook daemon listening on {socket_path} (pid {os.getpid()})", flush=True)
+        daemon.serve_forever()
+        sys.exit(0)
+
+    if args.command == 'start':
+        if send_request(socket_path, {'op': 'ping'}, timeout=1.0) is None:
+            start_daemon(str(HOOKS_DIR))
+            if not wait_for_daemon(socket_path):
+                print("Failed to start hook daemon (see .hook-daemon.log)", file=sys.stderr)
+                sys.exit(1)
+        print(f"Hook daemon running on {socket_path}")
+        sys.exit(0)
+
+    if args.command == 'stop':
+        response = send_request(socket_path, {'op': 'stop'}, timeout=5.0)
+        print("Hook daemon stopped" if response else "Hook daemon not running")
+        sys.exit(0)
+
+    response = send_request(socket_path, {'op': 'stats'}, timeout=5.0)
+    if response is None:
+        print("Hook daemon not running")
+        sys.exit(1)
+    print(json.dumps(response, indent=2))
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Hook State Cache for CODITECT
+
+Lets hooks keep their state objects (metrics, circuit breakers, session
+state, profiles) in memory when they run inside the hook daemon, instead of
+re-parsing their JSON state files on every tool event.
+
+Outside the daemon every call returns a fresh instance, so hooks run as
+standalone scripts behave exactly as before.
+
+Usage (inside a hook):
+    from hook_state import get_instance
+
+    monitor = get_instance(MonitoringObservability, repo_root)
+"""
+
+from typing import Any, Dict, Tuple, Type, TypeVar
+
+T = TypeVar('T')
+
+# Set to True by hook_daemon.py; instances are only reused in a long-lived process
+PERSISTENT = False
+
+_instances: Dict[Tuple[str, str, str], Any] = {}
+
+
+def get_instance(cls: Type[T], repo_root: str) -> T:
+    """Return a cached instance of `cls` for `repo_root` (fresh outside the daemon)"""
+    if not PERSISTENT:
+        return cls(repo_root)
+
+    key = (cls.__module__, cls.__qualname__, str(repo_root))
+    instance = _instances.get(key)
+
+    # A reloaded hook module defines a new class object; drop the old instance
+    if instance is None or type(instance) is not cls:
+        instance = cls(repo_root)
+        _instances[key] = instance
+
+    return instance
+
+
+def clear():
+    """Drop all cached instances (they are rebuilt from their state files)"""
+    _instances.clear()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Latency Sketches & Event Logs for CODITECT Hooks
+
+Shared building blocks that keep hook profiling cheap:
+
+- LatencySketch: mergeable, fixed-memory latency distribution using
+  log-spaced buckets (DDSketch-style). Quantiles are accurate to a fixed
+  relative error (1% by default) no matter how many samples are added, and
+  sketches from different sessions or machines merge exactly.
+- EventLog: append-only JSONL log. A hook appends one short line per event
+  and periodically writes a snapshot that records how far into the log it
+  covers; loading = snapshot + replay of the lines after that offset.
+- write_snapshot: atomic (temp + rename) compact JSON snapshot writer.
+"""
+
+import json
+import math
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Values at or below this (seconds) are counted in the zero bucket
+MIN_TRACKED_VALUE = 1e-6
+
+
+class LatencySketch:
+    """Mergeable latency sketch with bounded relative error"""
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, value: float, count: int = 1):
+        """Add `count` samples of `value` (seconds)"""
+        if value <= MIN_TRACKED_VALUE:
+            self.zero_count += count
+        else:
+            index = math.ceil(math.log(value) / self.log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + count
+            if len(self.buckets) > self.max_buckets:
+                self._collapse_lowest()
+
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: 'LatencySketch'):
+        """Merge another sketch (same relative accuracy) into this one"""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        while len(self.buckets) > self.max_buckets:
+            self._collapse_lowest()
+
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0 <= q <= 1); 0.0 for an empty sketch"""
+        if self.count == 0:
+            return 0.0
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return max(0.0, self.min)
+
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Midpoint of bucket (gamma^(i-1), gamma^i] in relative terms
+                value = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def _collapse_lowest(self):
+        """Fold the lowest bucket into its neighbour (keeps high quantiles exact)"""
+        lowest, second = sorted(self.buckets)[:2]
+        self.buckets[second] += self.buckets.pop(lowest)
+
+    def to_dict(self) -> Dict:
+        """Compact JSON-serializable form"""
+        return {
+            'alpha': self.relative_accuracy,
+            'buckets': {str(k): v for k, v in self.buckets.items()},
+            'zero': self.zero_count,
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min if self.count else 0.0,
+            'max': self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LatencySketch':
+        """Rebuild a sketch from to_dict() output"""
+        sketch = cls(relative_accuracy=data.get('alpha', 0.01))
+        sketch.buckets = {int(k): v for k, v in data.get('buckets', {}).items()}
+        sketch.zero_count = data.get('zero', 0)
+        sketch.count = data.get('count', 0)
+        sketch.sum = data.get('sum', 0.0)
+        sketch.min = data.get('min', 0.0) if sketch.count else math.inf
+        sketch.max = data.get('max', 0.0)
+        return sketch
+
+
+class EventLog:
+    """
+    Append-only JSONL event log with offset-tracked replay.
+
+    The position is (inode, offset): if the log is compacted (removed and
+    recreated) by another process, the inode changes and replay restarts at
+    the beginning of the new file.
+    """
+
+    def __init__(self, path: Path, max_bytes: Optional[int] = None):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.inode = 0
+        self.offset = 0
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        return self.inode, self.offset
+
+    def seek(self, inode: int, offset: int):
+        """Resume from a position recorded in a snapshot"""
+        self.inode, self.offset = inode, offset
+
+    def append(self, event: Dict) -> bool:
+        """Append one event (a single O_APPEND write); False if the write failed"""
+        line = (json.dumps(event, separators=(',', ':')) + '\n').encode('utf-8')
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                # Terminate a torn line left by an interrupted write
+                size = os.fstat(fd).st_size
+                if size and os.pread(fd, 1, size - 1) != b'\n':
+                    line = b'\n' + line
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+        except OSError:
+            return False
+        return True
+
+    def read_new(self) -> List[Dict]:
+        """Return complete events appended since the current position"""
+        try:
+            stat = self.path.stat()
+        except (FileNotFoundError, OSError):
+            self.inode, self.offset = 0, 0
+            return []
+
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            self.inode, self.offset = stat.st_ino, 0
+        if stat.st_size == self.offset:
+            return []
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(stat.st_size - self.offset)
+
+        # Leave a partially written trailing line for the next read
+        end = data.rfind(b'\n') + 1
+        self.offset += end
+
+        events = []
+        for line in data[:end].splitlines():
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+        return events
+
+    def should_compact(self) -> bool:
+        return self.max_bytes is not None and self.offset >= self.max_bytes
+
+    def compact(self):
+        """
+        Drop the log after its contents were captured in a snapshot.
+
+        Call only right after writing a snapshot at the current position.
+        The empty replacement is created before the old log is unlinked, so
+        it always gets a different inode and other readers notice the swap.
+        """
+        temp_path = self.path.parent / f".{self.path.name}.tmp.{os.getpid()}"
+        try:
+            temp_path.touch()
+            os.replace(temp_path, self.path)
+            self.inode, self.offset = self.path.stat().st_ino, 0
+        except OSError:
+            self.inode, self.offset = 0, 0
+
+
+def write_snapshot(path: Path, data: Dict):
+    """Atomically write a compact JSON snapshot"""
+    path = Path(path)
+    temp_path = path.parent / f".{path.name}.tmp.{os.getpid()}"
+    try:
+        with open(temp_path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(temp_path, path)
+    except Exception:
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
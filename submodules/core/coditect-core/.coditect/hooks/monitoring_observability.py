@@ -8,6 +8,11 @@ Collects metrics, logs traces, and enables debugging and optimization.
 Event: PostToolUse (all tools)
 Matcher: tool_name = "*" (all tools)
 Trigger: After every tool execution for complete observability
+
+Traces are the event log: each execution appends one line to
+.hook-traces.jsonl, and the metrics/health files are snapshots written
+periodically. On load, counters are rebuilt from the snapshot plus the
+traces appended after the offset it recorded.
 """
 
 import json
@@ -19,6 +24,13 @@ from typing import Dict, Optional
 from datetime import datetime
 import hashlib
 
+from hook_state import get_instance
+from latency_sketch import EventLog, LatencySketch, write_snapshot
+
+# Write the metrics and health snapshots after this many executions or seconds
+SNAPSHOT_EVERY = 100
+SNAPSHOT_INTERVAL = 60.0
+
 
 class MonitoringObservability:
     """Monitors hook execution and system observability"""
@@ -28,19 +40,88 @@ class MonitoringObservability:
         self.metrics_file = self.repo_root / '.coditect' / 'hooks' / '.hook-metrics.json'
         self.trace_file = self.repo_root / '.coditect' / 'hooks' / '.hook-traces.jsonl'
         self.health_file = self.repo_root / '.coditect' / 'hooks' / '.hook-health.json'
+        self.trace_log = EventLog(self.trace_file)
+        self.sketches: Dict[str, LatencySketch] = {}
+        self.pending_events = 0
+        self.last_snapshot = time.time()
         self.metrics = self.load_metrics()
         self.start_time = time.time()
 
     def load_metrics(self) -> Dict:
-        """Load existing metrics"""
+        """Load the metrics snapshot and replay traces recorded after it"""
+        metrics = None
         if self.metrics_file.exists():
             try:
                 with open(self.metrics_file, 'r') as f:
-                    import json as json_module
-                    return json_module.load(f)
+                    metrics = json.load(f)
             except Exception:
-                return self.init_metrics()
-        return self.init_metrics()
+                metrics = None
+
+        if metrics is None:
+            metrics = self.init_metrics()
+            # No snapshot: the trace log holds the full history
+            self.trace_log.seek(0, 0)
+        elif 'log_position' in metrics:
+            self.trace_log.seek(*metrics.pop('log_position'))
+        else:
+            # Snapshot written before traces were replayed: it already covers them
+            self.trace_log.seek(*self._current_log_position())
+
+        self.sketches = {
+            name: LatencySketch.from_dict(data)
+            for name, data in metrics.pop('latency', {}).items()
+        }
+        self.metrics = metrics
+        self.sync_traces()
+        return self.metrics
+
+    def _current_log_position(self):
+        try:
+            stat = self.trace_file.stat()
+            return stat.st_ino, stat.st_size
+        except OSError:
+            return 0, 0
+
+    def sync_traces(self) -> int:
+        """Apply traces appended since the last sync (by any process)"""
+        traces = self.trace_log.read_new()
+        for trace in traces:
+            self._apply_trace(trace)
+        self.pending_events += len(traces)
+        return len(traces)
+
+    def _apply_trace(self, trace: Dict):
+        """Fold one trace record into the counters"""
+        event = trace.get('event', 'Unknown')
+        tool = trace.get('tool', 'Unknown')
+        duration = trace.get('duration_ms', 0) / 1000
+        success = trace.get('status') == 'success'
+
+        self.metrics['total_executions'] += 1
+        self.metrics['total_time'] += duration
+        if success:
+            self.metrics['successes'] += 1
+        else:
+            self.metrics['errors'] += 1
+
+        for group, key in (('by_tool', tool), ('by_event', event)):
+            entry = self.metrics[group].setdefault(key, {'count': 0, 'total_time': 0})
+            entry['count'] += 1
+            entry['total_time'] += duration
+
+        hook_name = f"{event}_{tool}"
+        hook = self.metrics['hooks_executed'].setdefault(
+            hook_name, {'count': 0, 'total_time': 0, 'errors': 0}
+        )
+        hook['count'] += 1
+        hook['total_time'] += duration
+        if not success:
+            hook['errors'] += 1
+
+        sketch = self.sketches.get(hook_name)
+        if sketch is None:
+            sketch = self.sketches[hook_name] = LatencySketch()
+        sketch.add(duration)
 
     def init_metrics(self) -> Dict:
         """Initialize metrics structure"""
@@ -56,16 +137,23 @@ class MonitoringObservability:
         }
 
     def save_metrics(self):
-        """Save metrics to file"""
-        try:
-            with open(self.metrics_file, 'w') as f:
-                import json as json_module
-                json_module.dump(self.metrics, f, indent=2)
-        except Exception:
-            pass
-
-    def record_trace(self, event: str, tool_name: str, duration: float, status: str, details: Optional[Dict] = None):
-        """Record execution trace"""
+        """Write the metrics snapshot, including the trace log position it covers"""
+        self.sync_traces()
+        snapshot = dict(self.metrics)
+        snapshot['latency'] = {name: sketch.to_dict() for name, sketch in self.sketches.items()}
+        snapshot['log_position'] = list(self.trace_log.position)
+        write_snapshot(self.metrics_file, snapshot)
+
+        self.pending_events = 0
+        self.last_snapshot = time.time()
+
+    def snapshot_due(self) -> bool:
+        return (self.pending_events >= SNAPSHOT_EVERY
+                or time.time() - self.last_snapshot >= SNAPSHOT_INTERVAL)
+
+    def record_trace(self, event: str, tool_name: str, duration: float, status: str,
+                     details: Optional[Dict] = None) -> bool:
+        """Append an execution trace; False if it could not be written"""
         trace = {
             'timestamp': datetime.now().isoformat(),
             'event': event,
@@ -75,15 +163,10 @@ class MonitoringObservability:
             'details': details or {}
         }
 
-        try:
-            with open(self.trace_file, 'a') as f:
-                import json as json_module
-                f.write(json_module.dumps(trace) + '\n')
-        except Exception:
-            pass
-
-    def update_health_status(self):
-        """Update system health status"""
+        return self.trace_log.append(trace)
+
+    def update_health_status(self, write: bool = True):
+        """Compute system health status (and write the health file)"""
         health = {
             'status': 'healthy',
             'timestamp': datetime.now().isoformat(),
@@ -104,12 +187,12 @@ class MonitoringObservability:
         elif health['metrics']['error_rate'] > 0.05:
             health['status'] = 'warning'
 
-        try:
-            with open(self.health_file, 'w') as f:
-                import json as json_module
-                json_module.dump(health, f, indent=2)
-        except Exception:
-            pass
+        if write:
+            try:
+                with open(self.health_file, 'w') as f:
+                    json.dump(health, f, indent=2)
+            except Exception:
+                pass
 
         return health
 
@@ -141,12 +224,18 @@ class MonitoringObservability:
                     'name': name,
                     'total_time_ms': round(data['total_time'] * 1000, 2),
                     'execution_count': data['count'],
-                    'avg_time_ms': round((data['total_time'] / data['count']) * 1000, 2)
+                    'avg_time_ms': round((data['total_time'] / data['count']) * 1000, 2),
+                    'p95_time_ms': round(self._quantile(name, 0.95) * 1000, 2),
+                    'p99_time_ms': round(self._quantile(name, 0.99) * 1000, 2)
                 }
                 for name, data in slowest_hooks
             ]
         }
 
+    def _quantile(self, hook_name: str, q: float) -> float:
+        sketch = self.sketches.get(hook_name)
+        return sketch.quantile(q) if sketch else 0.0
+
     def monitor_execution(self, hook_input: Dict) -> Dict:
         """Monitor hook execution"""
 
@@ -166,59 +255,24 @@ class MonitoringObservability:
             'timestamp': datetime.now().isoformat()
         }
 
-        # Track by tool
-        if tool_name not in self.metrics['by_tool']:
-            self.metrics['by_tool'][tool_name] = {'count': 0, 'total_time': 0}
-
-        self.metrics['by_tool'][tool_name]['count'] += 1
-
-        # Track by event
-        if event not in self.metrics['by_event']:
-            self.metrics['by_event'][event] = {'count': 0, 'total_time': 0}
-
-        self.metrics['by_event'][event]['count'] += 1
-
+        # Counters are updated from the trace in record_completion()
         return monitoring_data
 
-    def record_completion(self, monitoring_data: Dict, status: str = 'success', error: Optional[str] = None):
-        """Record hook completion"""
+    def record_completion(self, monitoring_data: Dict, status: str = 'success',
+                          error: Optional[str] = None) -> bool:
+        """
+        Record hook completion.
 
+        Appends the trace and folds it (plus traces from other processes)
+        into the counters; snapshots are written every SNAPSHOT_EVERY
+        executions or SNAPSHOT_INTERVAL seconds. Returns True if a snapshot
+        was written.
+        """
         duration = time.time() - monitoring_data['start_time']
-
-        # Update metrics
-        self.metrics['total_executions'] += 1
-        self.metrics['total_time'] += duration
-
-        if status == 'success':
-            self.metrics['successes'] += 1
-        else:
-            self.metrics['errors'] += 1
-
-        # Track by tool
-        tool = monitoring_data['tool']
-        self.metrics['by_tool'][tool]['total_time'] += duration
-
-        # Track by event
         event = monitoring_data['event']
-        self.metrics['by_event'][event]['total_time'] += duration
-
-        # Track individual hook
-        hook_name = f"{event}_{tool}"
-        if hook_name not in self.metrics['hooks_executed']:
-            self.metrics['hooks_executed'][hook_name] = {
-                'count': 0,
-                'total_time': 0,
-                'errors': 0
-            }
-
-        self.metrics['hooks_executed'][hook_name]['count'] += 1
-        self.metrics['hooks_executed'][hook_name]['total_time'] += duration
-
-        if status != 'success':
-            self.metrics['hooks_executed'][hook_name]['errors'] += 1
+        tool = monitoring_data['tool']
 
-        # Record trace
-        self.record_trace(
+        written = self.record_trace(
             event,
             tool,
             duration,
@@ -229,11 +283,24 @@ class MonitoringObservability:
             }
         )
 
-        # Save metrics
-        self.save_metrics()
+        if written:
+            self.sync_traces()
+        else:
+            # Trace log unavailable: keep in-memory counters accurate anyway
+            self._apply_trace({
+                'event': event,
+                'tool': tool,
+                'duration_ms': round(duration * 1000, 2),
+                'status': status
+            })
+            self.pending_events += 1
+
+        if not self.snapshot_due():
+            return False
 
-        # Update health
+        self.save_metrics()
         self.update_health_status()
+        return True
 
 
 def main():
@@ -247,7 +314,7 @@ def main():
         repo_root = str(script_dir)
 
         # Initialize monitoring
-        monitor = MonitoringObservability(repo_root)
+        monitor = get_instance(MonitoringObservability, repo_root)
 
         # Start monitoring
         monitoring_data = monitor.monitor_execution(hook_input)
@@ -264,7 +331,7 @@ def main():
 
         # Include health status if there are existing metrics
         if monitor.metrics['total_executions'] > 0:
-            health = monitor.update_health_status()
+            health = monitor.update_health_status(write=False)
             if health['status'] != 'healthy':
                 result['warning'] = f"System health: {health['status']}"
 
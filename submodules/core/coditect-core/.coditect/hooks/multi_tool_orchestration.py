@@ -18,6 +18,8 @@ from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 import hashlib
 
+from hook_state import get_instance
+
 
 class ToolOrchestrator:
     """Orchestrates multi-tool workflows"""
@@ -226,7 +228,7 @@ def main():
         repo_root = str(script_dir)
 
         # Track tool execution
-        orchestrator = ToolOrchestrator(repo_root)
+        orchestrator = get_instance(ToolOrchestrator, repo_root)
         pattern, guidance = orchestrator.track_tool_execution(tool_name, tool_input, event)
 
         # Validate prerequisites
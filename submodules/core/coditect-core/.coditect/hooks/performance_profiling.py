@@ -5,6 +5,13 @@ Performance Profiling & Tuning Hook for CODITECT
 Profiles hook execution, identifies bottlenecks, and suggests optimizations.
 Provides detailed performance metrics and trend analysis.
 
+Latency percentiles come from mergeable fixed-memory sketches; executions
+are appended to an event log and snapshotted periodically, so profiling
+costs O(1) per event.
+
+Report (merged across sessions):
+    python3 .coditect/hooks/performance_profiling.py report [--last N] [--merge other.json]
+
 Event: PostToolUse (after tool execution)
 Matcher: tool_name = "*" (all tools)
 Trigger: After every tool execution for complete profiling coverage
@@ -14,88 +21,157 @@ import json
 import sys
 import time
 import os
+from collections import deque
 from pathlib import Path
 from typing import Dict, Optional, List
 from datetime import datetime, timedelta
 
+from hook_state import get_instance
+from latency_sketch import EventLog, LatencySketch, write_snapshot
+
+SNAPSHOT_FORMAT_VERSION = 2
+SNAPSHOT_EVERY = 100          # events between snapshots
+SNAPSHOT_INTERVAL = 60.0      # ...or seconds since the last snapshot
+EVENT_LOG_MAX_BYTES = 1024 * 1024
+RECENT_WINDOW = 20            # durations kept for trend detection
+MAX_SESSIONS = 20             # per-session sketches kept for cross-session reports
+
 
 class PerformanceProfiler:
-    """Profiles and optimizes hook performance"""
+    """Profiles and optimizes hook performance
+
+    Each execution appends one line to .performance-events.jsonl and updates
+    in-memory statistics and a latency sketch in O(1). The profile snapshot
+    (.performance-profile.json) is rewritten only every SNAPSHOT_EVERY events
+    or SNAPSHOT_INTERVAL seconds; on load, events after the snapshot are
+    replayed from the log.
+    """
 
     def __init__(self, repo_root: str):
         self.repo_root = Path(repo_root)
         self.profile_file = self.repo_root / '.coditect' / 'hooks' / '.performance-profile.json'
         self.bottleneck_file = self.repo_root / '.coditect' / 'hooks' / '.bottlenecks.json'
+        self.event_log = EventLog(
+            self.repo_root / '.coditect' / 'hooks' / '.performance-events.jsonl',
+            max_bytes=EVENT_LOG_MAX_BYTES
+        )
+        self.sessions: Dict[str, Dict] = {}
+        self.pending_events = 0
+        self.last_snapshot = time.monotonic()
         self.profiles = self.load_profiles()
 
     def load_profiles(self) -> Dict:
-        """Load existing performance profiles"""
+        """Load the profile snapshot and replay newer events"""
+        profiles = {}
         if self.profile_file.exists():
             try:
                 with open(self.profile_file, 'r') as f:
-                    import json as json_module
-                    return json_module.load(f)
+                    data = json.load(f)
+                if data.get('format_version') == SNAPSHOT_FORMAT_VERSION:
+                    profiles = {k: self._profile_from_dict(p) for k, p in data['profiles'].items()}
+                    self.sessions = {
+                        sid: {
+                            'updated': session['updated'],
+                            'sketches': {k: LatencySketch.from_dict(v) for k, v in session['sketches'].items()}
+                        }
+                        for sid, session in data.get('sessions', {}).items()
+                    }
+                    self.event_log.seek(*data.get('log_position', (0, 0)))
+                else:
+                    profiles = self._convert_legacy_profiles(data)
             except Exception:
-                return {}
-        return {}
+                profiles = {}
+
+        self.profiles = profiles
+        self.sync_events()
+        return self.profiles
+
+    def sync_events(self) -> int:
+        """Apply events appended to the log since the last sync (by any process)"""
+        events = self.event_log.read_new()
+        for event in events:
+            self._apply(event['k'], event['d'], event.get('s', 'default'), event.get('t'))
+        self.pending_events += len(events)
+        return len(events)
 
     def save_profiles(self):
-        """Save performance profiles"""
-        try:
-            with open(self.profile_file, 'w') as f:
-                import json as json_module
-                json_module.dump(self.profiles, f, indent=2)
-        except Exception:
-            pass
+        """Write the profile snapshot (compacting the event log when large)"""
+        self.sync_events()
+        self._write_snapshot()
+        if self.event_log.should_compact():
+            self.event_log.compact()
+            self._write_snapshot()
+        self.pending_events = 0
+        self.last_snapshot = time.monotonic()
+
+    def _write_snapshot(self):
+        for profile in self.profiles.values():
+            self._refresh_percentiles(profile)
+
+        write_snapshot(self.profile_file, {
+            'format_version': SNAPSHOT_FORMAT_VERSION,
+            'updated': datetime.now().isoformat(),
+            'log_position': list(self.event_log.position),
+            'profiles': {k: self._profile_to_dict(p) for k, p in self.profiles.items()},
+            'sessions': {
+                sid: {
+                    'updated': session['updated'],
+                    'sketches': {k: v.to_dict() for k, v in session['sketches'].items()}
+                }
+                for sid, session in self.sessions.items()
+            }
+        })
 
-    def record_execution(self, tool_name: str, event: str, duration: float, details: Optional[Dict] = None):
-        """Record execution metrics"""
+    def record_execution(self, tool_name: str, event: str, duration: float, details: Optional[Dict] = None,
+                         session_id: str = 'default') -> bool:
+        """Record execution metrics
 
+        Returns:
+            True if a snapshot was written during this call
+        """
         key = f"{event}_{tool_name}"
-
+        timestamp = datetime.now().isoformat()
+
+        record = {'t': timestamp, 'k': key, 'd': duration, 's': session_id}
+        if details:
+            record['x'] = details
+
+        # Applying through the log keeps events from concurrent processes
+        # (daemon and in-process fallback) in order and counted once
+        if self.event_log.append(record):
+            self.sync_events()
+        else:
+            self._apply(key, duration, session_id, timestamp)
+            self.pending_events += 1
+
+        if (self.pending_events >= SNAPSHOT_EVERY
+                or time.monotonic() - self.last_snapshot >= SNAPSHOT_INTERVAL):
+            self.save_profiles()
+            return True
+        return False
+
+    def _apply(self, key: str, duration: float, session_id: str, timestamp: Optional[str]):
+        """Fold one execution into the in-memory statistics (O(1))"""
         if key not in self.profiles:
-            self.profiles[key] = {
-                'executions': [],
-                'total_time': 0,
-                'count': 0,
-                'min_time': float('inf'),
-                'max_time': 0,
-                'avg_time': 0,
-                'p95_time': 0,
-                'p99_time': 0,
-                'recent_trend': 'stable'
-            }
+            self.profiles[key] = self._new_profile()
 
         profile = self.profiles[key]
 
-        # Add execution
-        profile['executions'].append({
-            'timestamp': datetime.now().isoformat(),
-            'duration': duration,
-            'details': details or {}
-        })
-
-        # Keep only last 100 executions
-        if len(profile['executions']) > 100:
-            profile['executions'] = profile['executions'][-100:]
-
         # Update statistics
         profile['total_time'] += duration
         profile['count'] += 1
         profile['min_time'] = min(profile['min_time'], duration)
         profile['max_time'] = max(profile['max_time'], duration)
         profile['avg_time'] = profile['total_time'] / profile['count']
-
-        # Calculate percentiles
-        if len(profile['executions']) >= 95:
-            sorted_times = sorted([e['duration'] for e in profile['executions']])
-            profile['p95_time'] = sorted_times[int(len(sorted_times) * 0.95)]
-            profile['p99_time'] = sorted_times[int(len(sorted_times) * 0.99)]
+        profile['sketch'].add(duration)
+        profile['recent'].append(duration)
 
         # Detect trend
-        if len(profile['executions']) > 10:
-            recent = [e['duration'] for e in profile['executions'][-10:]]
-            older = [e['duration'] for e in profile['executions'][-20:-10]]
+        recent_window = profile['recent']
+        if len(recent_window) > 10:
+            window = list(recent_window)
+            recent = window[-10:]
+            older = window[:-10]
 
             recent_avg = sum(recent) / len(recent)
             older_avg = sum(older) / len(older) if older else recent_avg
@@ -107,7 +183,67 @@ class PerformanceProfiler:
             else:
                 profile['recent_trend'] = 'stable'
 
-        self.save_profiles()
+        # Per-session sketch for cross-session reports
+        session = self.sessions.get(session_id)
+        if session is None:
+            if len(self.sessions) >= MAX_SESSIONS:
+                oldest = min(self.sessions, key=lambda sid: self.sessions[sid]['updated'])
+                del self.sessions[oldest]
+            session = self.sessions[session_id] = {'updated': '', 'sketches': {}}
+        session['updated'] = timestamp or datetime.now().isoformat()
+        if key not in session['sketches']:
+            session['sketches'][key] = LatencySketch()
+        session['sketches'][key].add(duration)
+
+    @staticmethod
+    def _new_profile() -> Dict:
+        return {
+            'total_time': 0,
+            'count': 0,
+            'min_time': float('inf'),
+            'max_time': 0,
+            'avg_time': 0,
+            'p95_time': 0,
+            'p99_time': 0,
+            'recent_trend': 'stable',
+            'recent': deque(maxlen=RECENT_WINDOW),
+            'sketch': LatencySketch()
+        }
+
+    @staticmethod
+    def _refresh_percentiles(profile: Dict):
+        """Update p95/p99 from the sketch (once enough samples exist)"""
+        if profile['count'] >= 20:
+            profile['p95_time'] = profile['sketch'].quantile(0.95)
+            profile['p99_time'] = profile['sketch'].quantile(0.99)
+
+    @staticmethod
+    def _profile_to_dict(profile: Dict) -> Dict:
+        data = {k: v for k, v in profile.items() if k not in ('recent', 'sketch')}
+        data['recent'] = list(profile['recent'])
+        data['sketch'] = profile['sketch'].to_dict()
+        return data
+
+    def _profile_from_dict(self, data: Dict) -> Dict:
+        profile = self._new_profile()
+        profile.update({k: v for k, v in data.items() if k not in ('recent', 'sketch')})
+        profile['recent'].extend(data.get('recent', []))
+        profile['sketch'] = LatencySketch.from_dict(data['sketch'])
+        return profile
+
+    def _convert_legacy_profiles(self, data: Dict) -> Dict:
+        """Convert the old per-execution list format into sketches"""
+        profiles = {}
+        for key, old in data.items():
+            profile = self._new_profile()
+            for execution in old.get('executions', []):
+                profile['sketch'].add(execution['duration'])
+                profile['recent'].append(execution['duration'])
+            for field in ('total_time', 'count', 'min_time', 'max_time', 'avg_time', 'recent_trend'):
+                if field in old:
+                    profile[field] = old[field]
+            profiles[key] = profile
+        return profiles
 
     def identify_bottlenecks(self) -> List[Dict]:
         """Identify performance bottlenecks"""
@@ -167,7 +303,7 @@ class PerformanceProfiler:
             suggestions.append("Consider async processing for blocking operations")
 
         # Based on variance
-        recent_times = [e['duration'] for e in profile['executions'][-10:]] if profile['executions'] else []
+        recent_times = list(profile['recent'])[-10:]
         if recent_times:
             recent_avg = sum(recent_times) / len(recent_times)
             if max(recent_times) > recent_avg * 2:
@@ -183,6 +319,9 @@ class PerformanceProfiler:
     def get_performance_report(self) -> Dict:
         """Generate performance report"""
 
+        for profile in self.profiles.values():
+            self._refresh_percentiles(profile)
+
         report = {
             'timestamp': datetime.now().isoformat(),
             'summary': {
@@ -219,6 +358,81 @@ class PerformanceProfiler:
         return report
 
 
+def merge_session_sketches(snapshots: List[Dict], session_ids: Optional[List[str]] = None,
+                           last: Optional[int] = None) -> Dict[str, LatencySketch]:
+    """Merge per-session sketches from one or more profile snapshots by hook key"""
+    sessions = []
+    for snapshot in snapshots:
+        for sid, session in snapshot.get('sessions', {}).items():
+            if session_ids and sid not in session_ids:
+                continue
+            sessions.append(session)
+
+    sessions.sort(key=lambda session: session['updated'], reverse=True)
+    if last:
+        sessions = sessions[:last]
+
+    merged: Dict[str, LatencySketch] = {}
+    for session in sessions:
+        for key, sketch_data in session['sketches'].items():
+            sketch = LatencySketch.from_dict(sketch_data)
+            if key in merged:
+                merged[key].merge(sketch)
+            else:
+                merged[key] = sketch
+    return merged
+
+
+def report_main(argv: List[str]) -> int:
+    """Print a latency report merged across sessions (and other snapshots)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='performance_profiling.py report',
+                                     description='Hook latency report merged across sessions')
+    parser.add_argument('--session', action='append', help='Only include this session (repeatable)')
+    parser.add_argument('--last', type=int, help='Only include the N most recent sessions')
+    parser.add_argument('--merge', action='append', default=[],
+                        help='Additional .performance-profile.json to merge (repeatable)')
+    parser.add_argument('--json', action='store_true', help='Output JSON')
+    args = parser.parse_args(argv)
+
+    repo_root = str(Path(__file__).parent.parent.parent)
+    profiler = PerformanceProfiler(repo_root)
+    profiler.save_profiles()  # fold pending events into the snapshot
+
+    snapshots = []
+    for path in [str(profiler.profile_file)] + args.merge:
+        try:
+            with open(path, 'r') as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"Skipping {path}: {e}", file=sys.stderr)
+
+    merged = merge_session_sketches(snapshots, args.session, args.last)
+    rows = [
+        {
+            'hook': key,
+            'count': sketch.count,
+            'avg_ms': round(sketch.mean * 1000, 2),
+            'p50_ms': round(sketch.quantile(0.50) * 1000, 2),
+            'p95_ms': round(sketch.quantile(0.95) * 1000, 2),
+            'p99_ms': round(sketch.quantile(0.99) * 1000, 2),
+            'max_ms': round(sketch.max * 1000, 2)
+        }
+        for key, sketch in sorted(merged.items(), key=lambda item: item[1].sum, reverse=True)
+    ]
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+
+    print(f"{'Hook':<40} {'Count':>8} {'Avg':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'Max':>9}")
+    for row in rows:
+        print(f"{row['hook']:<40} {row['count']:>8} {row['avg_ms']:>7.1f}ms {row['p50_ms']:>7.1f}ms "
+              f"{row['p95_ms']:>7.1f}ms {row['p99_ms']:>7.1f}ms {row['max_ms']:>7.1f}ms")
+    return 0
+
+
 def main():
     """Main hook entry point"""
     try:
@@ -230,19 +444,20 @@ def main():
         event = hook_input.get('event', 'PostToolUse')
         duration = hook_input.get('duration', 0)  # Duration in seconds
         details = hook_input.get('details', {})
+        session_id = hook_input.get('session_id', 'default')
 
         # Get repo root
         script_dir = Path(__file__).parent.parent.parent
         repo_root = str(script_dir)
 
         # Initialize profiler
-        profiler = PerformanceProfiler(repo_root)
+        profiler = get_instance(PerformanceProfiler, repo_root)
 
-        # Record execution
-        profiler.record_execution(tool_name, event, duration, details)
+        # Record execution (O(1); snapshots are written periodically)
+        snapshot_written = profiler.record_execution(tool_name, event, duration, details, session_id)
 
-        # Get performance report
-        report = profiler.get_performance_report()
+        # Refresh the bottleneck report together with the snapshot
+        report = profiler.get_performance_report() if snapshot_written else {'bottlenecks': []}
 
         # Log report if there are bottlenecks
         if report['bottlenecks']:
@@ -274,4 +489,6 @@ def main():
 
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'report':
+        sys.exit(report_main(sys.argv[2:]))
     main()
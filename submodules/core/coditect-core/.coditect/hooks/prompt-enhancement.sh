@@ -19,5 +19,5 @@ REPO_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
 json=$(cat)
 
 # Run Python enhancement
-python3 "$SCRIPT_DIR/enhance_prompt.py" < <(echo "$json")
+python3 -S "$SCRIPT_DIR/hook_client.py" enhance_prompt < <(echo "$json")
 exit $?
@@ -0,0 +1,24 @@
+#!/bin/bash
+#
+# Generic Hook Runner for CODITECT
+#
+# Runs any Python hook in this directory through the hook daemon
+# (hook_client.py), falling back to in-process execution when the
+# daemon is not running.
+#
+# Usage: bash .coditect/hooks/run-hook.sh <hook_name>
+# Example: bash .coditect/hooks/run-hook.sh monitoring_observability
+#
+
+set -euo pipefail
+
+# Get script directory
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+if [[ $# -ne 1 ]]; then
+    echo "Usage: $0 <hook_name>" >&2
+    exit 2
+fi
+
+# stdin (hook input JSON) is passed straight through to the client
+exec python3 -S "$SCRIPT_DIR/hook_client.py" "$1"
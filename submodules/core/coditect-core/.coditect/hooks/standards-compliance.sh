@@ -20,5 +20,5 @@ REPO_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
 json=$(cat)
 
 # Run Python compliance check
-python3 "$SCRIPT_DIR/standards_compliance.py" < <(echo "$json")
+python3 -S "$SCRIPT_DIR/hook_client.py" standards_compliance < <(echo "$json")
 exit $?
@@ -3,12 +3,31 @@ CODITECT REST API - Main Application
 
 FastAPI application for programmatic command execution.
 
+Commands are executed in the background: POST /api/v1/commands/execute
+queues the command and returns 202 with its id; a bounded pool of workers
+runs queued commands by priority. Poll /api/v1/commands/{id}/status for
+progress and fetch /api/v1/commands/{id} for the result.
+
+Environment:
+    CODITECT_API_WORKERS     Concurrent command executions (default: 4)
+    CODITECT_API_MAX_QUEUED  Maximum waiting commands (default: 1000)
+    CODITECT_API_JOB_DB      SQLite file for queued jobs, so they survive
+                             restarts (default: in-memory only)
+    CODITECT_API_RESULT_DB   SQLite file for command results; large outputs
+                             go to compressed files beside it
+                             (default: in-memory only, where results too
+                             large for memory are reported as not retained)
+    CODITECT_API_RESULT_CACHE  Results kept in memory (default: 1000)
+    CODITECT_API_RESULT_TTL    Seconds a result stays in memory (default: 3600)
+
 Run with:
     uvicorn api.main:app --reload --host 0.0.0.0 --port 8000
 """
 
 import asyncio
 import logging
+import os
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Optional, List
@@ -20,18 +39,23 @@ from fastapi import (
     Depends,
     status,
     Request,
+    Response,
     Query,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 
 from .models import (
     CommandRequest,
+    CommandAcceptedResponse,
     CommandResponse,
     CommandStatusResponse,
     CommandListResponse,
     CommandListItem,
+    CommandResultListResponse,
+    CommandResultSummary,
     ErrorResponse,
     HealthResponse,
 )
@@ -43,11 +67,28 @@ from orchestration import (
     CommandResult,
     CommandStatus,
 )
+from orchestration.job_queue import Job, JobQueue, JobState, JobStore, QueueFullError
+from orchestration.metrics import CONTENT_TYPE_LATEST, get_registry
+from orchestration.result_store import ResultStore
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Background execution settings
+JOB_WORKERS = int(os.environ.get("CODITECT_API_WORKERS", "4"))
+JOB_MAX_QUEUED = int(os.environ.get("CODITECT_API_MAX_QUEUED", "1000"))
+JOB_DB = os.environ.get("CODITECT_API_JOB_DB")
+
+# Result storage settings
+RESULT_DB = os.environ.get("CODITECT_API_RESULT_DB")
+RESULT_CACHE_ENTRIES = int(os.environ.get("CODITECT_API_RESULT_CACHE", "1000"))
+RESULT_TTL_SECONDS = float(os.environ.get("CODITECT_API_RESULT_TTL", "3600"))
+RESULT_NOT_RETAINED_MESSAGE = (
+    "Command completed but its result is no longer stored (output too large for "
+    "the in-memory result store, or expired); set CODITECT_API_RESULT_DB to keep results"
+)
+
 
 # Application state
 class AppState:
@@ -55,12 +96,37 @@ class AppState:
 
     def __init__(self):
         self.router: Optional[SlashCommandRouter] = None
-        self.active_commands: dict = {}  # command_id -> CommandResult
+        self.job_queue: Optional[JobQueue] = None
+        self.results: ResultStore = ResultStore(
+            max_entries=RESULT_CACHE_ENTRIES, ttl_seconds=RESULT_TTL_SECONDS
+        )
 
 
 app_state = AppState()
 
 
+async def run_command_job(job: Job) -> str:
+    """Job runner: execute a queued slash command through the router."""
+    command = job.payload["command"]
+    spec = app_state.router.get_command_spec(command.split(" ", 1)[0])
+    job.report(5.0, f"Executing {command} with {spec.agent_id}" if spec else f"Executing {command}")
+
+    result: CommandResult = await app_state.router.execute(
+        command_str=command,
+        args=job.payload.get("args"),
+        command_id=job.job_id,
+    )
+    app_state.results.put(job.job_id, result)
+    if job.job_id not in app_state.results:
+        logger.warning(
+            f"Result of {job.job_id} not retained: output too large for the in-memory "
+            "result store (set CODITECT_API_RESULT_DB to keep large results)"
+        )
+
+    logger.info(f"Command {job.job_id} completed with status: {result.status.value}")
+    return result.status.value
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
@@ -68,9 +134,102 @@ async def lifespan(app: FastAPI):
     logger.info("Starting CODITECT REST API...")
     app_state.router = get_command_router()
     logger.info("Command router initialized")
+    if RESULT_DB:
+        app_state.results = ResultStore(
+            max_entries=RESULT_CACHE_ENTRIES,
+            ttl_seconds=RESULT_TTL_SECONDS,
+            path=RESULT_DB,
+        )
+        logger.info(f"Result store persisted to {RESULT_DB}")
+    store = JobStore(JOB_DB) if JOB_DB else None
+    app_state.job_queue = JobQueue(
+        run_command_job,
+        workers=JOB_WORKERS,
+        max_queued=JOB_MAX_QUEUED,
+        store=store,
+    )
+    recovered = await app_state.job_queue.start()
+    logger.info(f"Job queue started ({JOB_WORKERS} workers, {recovered} recovered)")
     yield
     # Shutdown
     logger.info("Shutting down CODITECT REST API...")
+    await app_state.job_queue.stop()
+    if store:
+        store.close()
+    app_state.results.close()
+
+
+def _command_response(command_id: str, result: CommandResult) -> CommandResponse:
+    """Convert a CommandResult to its API response."""
+    return CommandResponse(
+        command_id=command_id,
+        command=result.command,
+        status=result.status.value,
+        output=result.output or "",
+        agent_used=result.agent_used,
+        llm_provider=result.llm_provider,
+        llm_model=result.llm_model,
+        started_at=result.started_at,
+        completed_at=result.completed_at,
+        execution_time_seconds=result.execution_time_seconds,
+        tokens_used=result.tokens_used,
+        estimated_cost=result.estimated_cost,
+        structured_data=result.structured_data or {},
+        error_message=result.error_message,
+        error_type=result.error_type,
+        metadata=result.metadata or {},
+    )
+
+
+def _job_response(job: Job) -> CommandResponse:
+    """Response for a command whose result is not (or never will be) available.
+
+    A completed command ends up here when its result was not retained (too
+    large for the in-memory store, or expired from it); it reports the
+    command's status with a ResultNotRetained error instead of its output.
+    """
+    status_value = {
+        JobState.CANCELLED: "cancelled",
+        JobState.FAILED: CommandStatus.FAILED.value,
+        JobState.COMPLETED: job.outcome or CommandStatus.SUCCESS.value,
+    }.get(job.state, CommandStatus.PENDING.value)
+    error_message = {
+        JobState.FAILED: job.error,
+        JobState.COMPLETED: RESULT_NOT_RETAINED_MESSAGE,
+    }.get(job.state)
+    return CommandResponse(
+        command_id=job.job_id,
+        command=job.kind,
+        status=status_value,
+        output="",
+        started_at=job.started_at,
+        completed_at=job.completed_at,
+        error_message=error_message,
+        error_type={
+            JobState.CANCELLED: "Cancelled",
+            JobState.FAILED: "ExecutionError",
+            JobState.COMPLETED: "ResultNotRetained",
+        }.get(job.state),
+        metadata={"job_status": job.state.value},
+    )
+
+
+def _status_response(job: Job) -> CommandStatusResponse:
+    """Build the status response for a queued, running or finished command."""
+    queue = app_state.job_queue
+    return CommandStatusResponse(
+        command_id=job.job_id,
+        status=job.state.value,
+        progress=queue.estimated_progress(job),
+        current_step=job.current_step,
+        queue_position=queue.position(job.job_id),
+        submitted_at=job.submitted_at,
+        started_at=job.started_at,
+        completed_at=job.completed_at,
+        estimated_completion=queue.estimated_completion(job),
+        result_status=job.outcome,
+        error_message=job.error,
+    )
 
 
 # Create FastAPI application
@@ -95,6 +254,36 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Request metrics (labeled by route template to keep cardinality bounded)
+    metrics = get_registry()
+    http_requests_total = metrics.counter(
+        "coditect_http_requests_total",
+        "HTTP requests by method, route and status code",
+        ["method", "route", "status"],
+    )
+    http_request_seconds = metrics.histogram(
+        "coditect_http_request_seconds",
+        "HTTP request latency in seconds",
+        ["method", "route"],
+    )
+
+    @app.middleware("http")
+    async def record_request_metrics(request: Request, call_next):
+        """Count requests and observe their latency."""
+        start = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            http_request_seconds.labels(request.method, route_path).observe(
+                time.perf_counter() - start
+            )
+            http_requests_total.labels(request.method, route_path, str(status_code)).inc()
+
     # Exception handlers
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -130,8 +319,14 @@ def create_app() -> FastAPI:
             "version": "1.0.0",
             "docs": "/docs",
             "health": "/health",
+            "metrics": "/metrics",
         }
 
+    @app.get("/metrics", response_class=PlainTextResponse, tags=["health"])
+    async def prometheus_metrics():
+        """Prometheus scrape endpoint."""
+        return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE_LATEST)
+
     @app.get("/health", response_model=HealthResponse, tags=["health"])
     async def health_check():
         """Health check endpoint."""
@@ -189,15 +384,23 @@ def create_app() -> FastAPI:
 
     @app.post(
         "/api/v1/commands/execute",
-        response_model=CommandResponse,
+        response_model=None,
         tags=["commands"],
         summary="Execute a slash command",
-        description="Execute a slash command and return structured results.",
-        status_code=status.HTTP_200_OK,
+        description=(
+            "Queue a slash command for background execution and return its id "
+            "(202). With wait=true, block until it finishes and return the "
+            "result (200)."
+        ),
+        status_code=status.HTTP_202_ACCEPTED,
+        responses={
+            202: {"model": CommandAcceptedResponse},
+            200: {"model": CommandResponse},
+        },
     )
-    async def execute_command(request: CommandRequest):
-        """Execute a slash command."""
-        if not app_state.router:
+    async def execute_command(request: CommandRequest, response: Response):
+        """Queue (and optionally await) a slash command."""
+        if not app_state.router or not app_state.job_queue:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Command router not initialized",
@@ -206,55 +409,77 @@ def create_app() -> FastAPI:
         # Generate command ID
         command_id = f"CMD-{request.command.lstrip('/')}-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid4().hex[:8]}"
 
-        logger.info(f"Executing command {command_id}: {request.command}")
-
         try:
-            # Execute command via router
-            result: CommandResult = await app_state.router.execute(
-                command_str=request.command,
-                args=request.args,
+            job = app_state.job_queue.submit(
+                kind=request.command,
+                payload={"command": request.command, "args": request.args},
+                priority=request.priority,
+                job_id=command_id,
+            )
+        except QueueFullError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail={"error": "QueueFull", "message": str(e)},
+                headers={"Retry-After": "5"},
             )
 
-            # Store result
-            app_state.active_commands[command_id] = result
+        logger.info(f"Queued command {command_id}: {request.command} (priority {request.priority})")
 
-            # Convert to response format
-            response = CommandResponse(
+        if not request.wait:
+            return CommandAcceptedResponse(
                 command_id=command_id,
-                command=result.command,
-                status=result.status.value,
-                output=result.output or "",
-                agent_used=result.agent_used,
-                llm_provider=result.llm_provider,
-                llm_model=result.llm_model,
-                started_at=result.started_at,
-                completed_at=result.completed_at,
-                execution_time_seconds=result.execution_time_seconds,
-                tokens_used=result.tokens_used,
-                estimated_cost=result.estimated_cost,
-                structured_data=result.structured_data or {},
-                error_message=result.error_message,
-                error_type=result.error_type,
-                metadata=result.metadata or {},
-            )
-
-            logger.info(
-                f"Command {command_id} completed with status: {result.status.value}"
+                command=request.command,
+                status=job.state.value,
+                priority=job.priority,
+                queue_position=app_state.job_queue.position(command_id),
+                status_url=f"/api/v1/commands/{command_id}/status",
+                result_url=f"/api/v1/commands/{command_id}",
             )
 
-            return response
-
-        except Exception as e:
-            logger.error(f"Error executing command {command_id}: {e}", exc_info=True)
+        await job.wait()
+        if job.state == JobState.FAILED:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail={
                     "error": "ExecutionError",
-                    "message": str(e),
+                    "message": job.error,
                     "command_id": command_id,
                 },
             )
 
+        response.status_code = status.HTTP_200_OK
+        result = app_state.results.get(command_id)
+        return _command_response(command_id, result) if result else _job_response(job)
+
+    @app.get(
+        "/api/v1/results",
+        response_model=CommandResultListResponse,
+        tags=["commands"],
+        summary="List command results",
+        description="List stored command results, newest first, without their outputs.",
+    )
+    async def list_results(
+        limit: int = Query(50, ge=1, le=500, description="Page size"),
+        cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+        result_status: Optional[str] = Query(
+            None, alias="status", description="Filter by status (success, failed, partial)"
+        ),
+    ):
+        """List stored command results."""
+        try:
+            page = app_state.results.list(limit=limit, cursor=cursor, status=result_status)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid cursor: {cursor}",
+            )
+
+        return CommandResultListResponse(
+            results=[CommandResultSummary(**vars(item)) for item in page.items],
+            count=len(page.items),
+            next_cursor=page.next_cursor,
+        )
+
     @app.get(
         "/api/v1/commands/{command_id}/status",
         response_model=CommandStatusResponse,
@@ -264,23 +489,39 @@ def create_app() -> FastAPI:
     )
     async def get_command_status(command_id: str):
         """Get command execution status."""
-        # Check if command exists in active commands
-        if command_id not in app_state.active_commands:
+        job = app_state.job_queue.get(command_id) if app_state.job_queue else None
+        if job is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Command {command_id} not found",
             )
 
-        result = app_state.active_commands[command_id]
+        return _status_response(job)
 
-        return CommandStatusResponse(
-            command_id=command_id,
-            status=result.status.value,
-            progress=100.0 if result.status == CommandStatus.SUCCESS else None,
-            current_step="Completed" if result.status == CommandStatus.SUCCESS else None,
-            started_at=result.started_at,
-            estimated_completion=result.completed_at,
-        )
+    @app.post(
+        "/api/v1/commands/{command_id}/cancel",
+        response_model=CommandStatusResponse,
+        tags=["commands"],
+        summary="Cancel a command",
+        description="Cancel a queued or running command.",
+    )
+    async def cancel_command(command_id: str):
+        """Cancel a queued or running command."""
+        job = app_state.job_queue.get(command_id) if app_state.job_queue else None
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Command {command_id} not found",
+            )
+
+        if not app_state.job_queue.cancel(command_id):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Command {command_id} already {job.state.value}",
+            )
+
+        logger.info(f"Cancelled command {command_id}")
+        return _status_response(job)
 
     @app.get(
         "/api/v1/commands/{command_id}",
@@ -291,32 +532,24 @@ def create_app() -> FastAPI:
     )
     async def get_command_result(command_id: str):
         """Get full command execution result."""
-        if command_id not in app_state.active_commands:
+        result = app_state.results.get(command_id)
+        if result is not None:
+            return _command_response(command_id, result)
+
+        job = app_state.job_queue.get(command_id) if app_state.job_queue else None
+        if job is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Command {command_id} not found",
             )
 
-        result = app_state.active_commands[command_id]
-
-        return CommandResponse(
-            command_id=command_id,
-            command=result.command,
-            status=result.status.value,
-            output=result.output or "",
-            agent_used=result.agent_used,
-            llm_provider=result.llm_provider,
-            llm_model=result.llm_model,
-            started_at=result.started_at,
-            completed_at=result.completed_at,
-            execution_time_seconds=result.execution_time_seconds,
-            tokens_used=result.tokens_used,
-            estimated_cost=result.estimated_cost,
-            structured_data=result.structured_data or {},
-            error_message=result.error_message,
-            error_type=result.error_type,
-            metadata=result.metadata or {},
-        )
+        if not job.done:
+            # Still queued or running: 202 with a pending placeholder
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content=jsonable_encoder(_job_response(job)),
+            )
+        return _job_response(job)
 
     return app
 
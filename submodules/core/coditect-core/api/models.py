@@ -26,6 +26,17 @@ class CommandRequest(BaseModel):
         default=False,
         description="Enable streaming results via WebSocket",
     )
+    priority: int = Field(
+        default=0,
+        ge=-10,
+        le=10,
+        description="Queue priority (higher runs first)",
+    )
+    wait: bool = Field(
+        default=False,
+        description="Wait for completion and return the result (200) instead of "
+        "returning the command id immediately (202)",
+    )
 
     @validator("command")
     def validate_command_format(cls, v):
@@ -40,6 +51,38 @@ class CommandRequest(BaseModel):
                 "command": "/analyze",
                 "args": {"target": "src/main.rs", "focus": "security"},
                 "stream": False,
+                "priority": 0,
+                "wait": False,
+            }
+        }
+
+
+class CommandAcceptedResponse(BaseModel):
+    """Response for a command queued for background execution."""
+
+    command_id: str = Field(..., example="CMD-analyze-20241123-153045-1a2b3c4d")
+    command: str = Field(..., example="/analyze")
+    status: str = Field(
+        ..., description="Job state: queued, running, completed, failed, cancelled",
+        example="queued",
+    )
+    priority: int = Field(0, example=0)
+    queue_position: Optional[int] = Field(
+        None, description="1-based position among waiting commands", example=3
+    )
+    status_url: str = Field(..., example="/api/v1/commands/CMD-analyze-20241123-153045-1a2b3c4d/status")
+    result_url: str = Field(..., example="/api/v1/commands/CMD-analyze-20241123-153045-1a2b3c4d")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "command_id": "CMD-analyze-20241123-153045-1a2b3c4d",
+                "command": "/analyze",
+                "status": "queued",
+                "priority": 0,
+                "queue_position": 3,
+                "status_url": "/api/v1/commands/CMD-analyze-20241123-153045-1a2b3c4d/status",
+                "result_url": "/api/v1/commands/CMD-analyze-20241123-153045-1a2b3c4d",
             }
         }
 
@@ -117,27 +160,80 @@ class CommandStatusResponse(BaseModel):
     """Response for command status check."""
 
     command_id: str
-    status: str
+    status: str = Field(
+        ..., description="Job state: queued, running, completed, failed, cancelled"
+    )
     progress: Optional[float] = Field(
         None, description="Progress percentage (0-100)", ge=0, le=100
     )
     current_step: Optional[str] = None
+    queue_position: Optional[int] = Field(
+        None, description="1-based position among waiting commands (queued only)"
+    )
+    submitted_at: Optional[datetime] = None
     started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
     estimated_completion: Optional[datetime] = None
+    result_status: Optional[str] = Field(
+        None, description="Command result status once completed (success, failed, partial)"
+    )
+    error_message: Optional[str] = None
 
     class Config:
         json_schema_extra = {
             "example": {
                 "command_id": "CMD-implement-20241123-153050",
-                "status": "pending",
+                "status": "running",
                 "progress": 35.5,
-                "current_step": "Generating code structure",
+                "current_step": "Executing /implement with rust-expert-developer",
+                "submitted_at": "2024-11-23T15:30:48",
                 "started_at": "2024-11-23T15:30:50",
                 "estimated_completion": "2024-11-23T15:32:30",
             }
         }
 
 
+class CommandResultSummary(BaseModel):
+    """Stored command result, without its output."""
+
+    command_id: str = Field(..., example="CMD-analyze-20241123-153045-1a2b3c4d")
+    command: str = Field(..., example="/analyze")
+    status: str = Field(..., example="success")
+    agent_used: Optional[str] = Field(None, example="code-reviewer")
+    completed_at: Optional[datetime] = None
+    execution_time_seconds: Optional[float] = Field(None, example=2.45)
+    output_size: int = Field(0, description="Output size in bytes", example=5120)
+
+
+class CommandResultListResponse(BaseModel):
+    """Page of stored command results, newest first."""
+
+    results: List[CommandResultSummary]
+    count: int = Field(..., description="Number of results in this page")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page (None on the last page)"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "results": [
+                    {
+                        "command_id": "CMD-analyze-20241123-153045-1a2b3c4d",
+                        "command": "/analyze",
+                        "status": "success",
+                        "agent_used": "code-reviewer",
+                        "completed_at": "2024-11-23T15:30:47",
+                        "execution_time_seconds": 2.45,
+                        "output_size": 5120,
+                    }
+                ],
+                "count": 1,
+                "next_cursor": "41",
+            }
+        }
+
+
 class CommandListItem(BaseModel):
     """Item in command list response."""
 
@@ -18,6 +18,7 @@ Example:
     >>> # Generate content
     >>> messages = [{"role": "user", "content": "Hello!"}]
     >>> response = await llm.generate_content_async(messages)
+    >>> response.usage.total_tokens, response.usage.latency_seconds
 
 Copyright © 2025 AZ1.AI INC. All rights reserved.
 Phase: Phase 1C - LLM Provider Implementation
@@ -25,6 +26,7 @@ Phase: Phase 1C - LLM Provider Implementation
 
 from .base_llm import BaseLlm
 from .llm_factory import LlmFactory
+from .usage import LlmResponse, LlmUsage
 
 # Agent-to-LLM configuration (Phase 2A)
 try:
@@ -93,6 +95,8 @@ except ImportError:
 __all__ = [
     "BaseLlm",
     "LlmFactory",
+    "LlmResponse",
+    "LlmUsage",
     # Agent-to-LLM configuration (Phase 2A)
     "AgentLlmConfig",
     "LlmConfig",
@@ -28,9 +28,11 @@ Phase: Phase 1C - LLM Provider Implementation
 """
 
 import os
+import time
 from typing import Any, Dict, List, Optional
 
 from .base_llm import BaseLlm
+from .usage import token_count
 
 
 class AnthropicLlm(BaseLlm):
@@ -51,6 +53,8 @@ class AnthropicLlm(BaseLlm):
         >>> response = await llm.generate_content_async(messages)
     """
 
+    PROVIDER = "anthropic-claude"
+
     # Supported Claude models
     SUPPORTED_MODELS = [
         "claude-3-5-sonnet-20241022",  # Sonnet 3.5 (latest, recommended)
@@ -124,7 +128,7 @@ class AnthropicLlm(BaseLlm):
                       - system: str (system prompt)
 
         Returns:
-            Generated text response
+            Generated text response (LlmResponse with token usage and latency)
 
         Raises:
             ValueError: If messages format is invalid
@@ -170,6 +174,7 @@ class AnthropicLlm(BaseLlm):
 
         try:
             # Call Anthropic API
+            started = time.perf_counter()
             response = await self.client.messages.create(
                 model=self.model,
                 messages=filtered_messages,
@@ -177,10 +182,22 @@ class AnthropicLlm(BaseLlm):
             )
 
             # Extract text from response
+            text = ""
             if response.content and len(response.content) > 0:
-                return response.content[0].text
-
-            return ""
+                text = response.content[0].text
+
+            # input_tokens excludes prompt-cache reads and writes
+            usage = getattr(response, "usage", None)
+            uncached = token_count(getattr(usage, "input_tokens", None))
+            cache_read = token_count(getattr(usage, "cache_read_input_tokens", None)) or 0
+            cache_write = token_count(getattr(usage, "cache_creation_input_tokens", None)) or 0
+            return self._response(
+                text,
+                started,
+                input_tokens=None if uncached is None else uncached + cache_read + cache_write,
+                output_tokens=token_count(getattr(usage, "output_tokens", None)),
+                cached_tokens=cache_read if uncached is not None else None,
+            )
 
         except Exception as e:
             raise RuntimeError(
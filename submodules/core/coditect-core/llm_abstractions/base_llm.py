@@ -1,5 +1,8 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from .usage import LlmResponse, LlmUsage, estimate_cost
 
 
 class BaseLlm(ABC):
@@ -7,6 +10,9 @@ class BaseLlm(ABC):
     Abstract base class for all LLM implementations.
     """
 
+    # Provider identifier used in usage records (matches LlmFactory keys)
+    PROVIDER = "custom"
+
     @abstractmethod
     async def generate_content_async(
         self, messages: List[Dict[str, str]], **kwargs: Any
@@ -19,6 +25,34 @@ class BaseLlm(ABC):
             **kwargs: Additional keyword arguments for the LLM.
 
         Returns:
-            The generated content as a string.
+            The generated content as a string. Built-in providers return an
+            LlmResponse (a str) whose usage attribute holds token counts
+            and timings.
         """
         pass
+
+    def _response(
+        self,
+        text: str,
+        started: float,
+        input_tokens: Optional[int] = None,
+        output_tokens: Optional[int] = None,
+        cached_tokens: Optional[int] = None,
+        time_to_first_token: Optional[float] = None,
+    ) -> LlmResponse:
+        """
+        Build an LlmResponse for a request that started at started
+        (a time.perf_counter() value).
+        """
+        model = getattr(self, "model", None)
+        usage = LlmUsage(
+            provider=self.PROVIDER,
+            model=model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cached_tokens=cached_tokens,
+            latency_seconds=time.perf_counter() - started,
+            time_to_first_token_seconds=time_to_first_token,
+        )
+        usage.estimated_cost = estimate_cost(self.PROVIDER, model, usage)
+        return LlmResponse(text, usage)
@@ -27,9 +27,11 @@ Phase: Phase 1C - LLM Provider Implementation
 
 import asyncio
 import os
+import time
 from typing import Any, Dict, List, Optional
 
 from .base_llm import BaseLlm
+from .usage import token_count
 
 
 class Gemini(BaseLlm):
@@ -50,6 +52,8 @@ class Gemini(BaseLlm):
         >>> response = await llm.generate_content_async(messages)
     """
 
+    PROVIDER = "google-gemini"
+
     # Supported Gemini models
     SUPPORTED_MODELS = [
         "gemini-2.0-flash",    # Gemini 2.0 Flash (latest, recommended)
@@ -121,7 +125,7 @@ class Gemini(BaseLlm):
                       - top_k: int
 
         Returns:
-            Generated text response
+            Generated text response (LlmResponse with token usage and latency)
 
         Raises:
             ValueError: If messages format is invalid
@@ -164,6 +168,7 @@ class Gemini(BaseLlm):
 
         try:
             # Call Gemini API (run in thread pool for async compatibility)
+            started = time.perf_counter()
             response = await asyncio.to_thread(
                 self.client.generate_content,
                 prompt,
@@ -171,10 +176,16 @@ class Gemini(BaseLlm):
             )
 
             # Extract text from response
-            if response.text:
-                return response.text
-
-            return ""
+            text = response.text or ""
+
+            usage = getattr(response, "usage_metadata", None)
+            return self._response(
+                text,
+                started,
+                input_tokens=token_count(getattr(usage, "prompt_token_count", None)),
+                output_tokens=token_count(getattr(usage, "candidates_token_count", None)),
+                cached_tokens=token_count(getattr(usage, "cached_content_token_count", None)),
+            )
 
         except Exception as e:
             raise RuntimeError(
@@ -30,9 +30,11 @@ Phase: Phase 1C - LLM Provider Implementation
 """
 
 import os
+import time
 from typing import Any, Dict, List, Optional
 
 from .base_llm import BaseLlm
+from .usage import chat_completion_usage
 
 
 class HuggingFaceLlm(BaseLlm):
@@ -53,6 +55,8 @@ class HuggingFaceLlm(BaseLlm):
         >>> response = await llm.generate_content_async(messages)
     """
 
+    PROVIDER = "huggingface"
+
     # Supported Hugging Face models (popular chat/instruct models)
     SUPPORTED_MODELS = [
         "meta-llama/Meta-Llama-3-70B-Instruct",     # Llama 3 70B (recommended)
@@ -133,7 +137,7 @@ class HuggingFaceLlm(BaseLlm):
                       - repetition_penalty: float
 
         Returns:
-            Generated text response
+            Generated text response (LlmResponse with token usage and latency)
 
         Raises:
             ValueError: If messages format is invalid
@@ -172,16 +176,18 @@ class HuggingFaceLlm(BaseLlm):
 
         try:
             # Call Hugging Face Inference API
+            started = time.perf_counter()
             response = await self.client.chat_completion(
                 messages=messages,
                 **params
             )
 
             # Extract text from response
+            text = ""
             if response.choices and len(response.choices) > 0:
-                return response.choices[0].message.content or ""
+                text = response.choices[0].message.content or ""
 
-            return ""
+            return self._response(text, started, **chat_completion_usage(response))
 
         except Exception as e:
             raise RuntimeError(
@@ -9,6 +9,8 @@ Features:
 - AgentType-based provider lookup
 - Configuration injection
 - Custom provider support
+- Request count/latency metrics and trace spans for every provider instance
+- Token usage metrics; every response carries LlmUsage (see usage.py)
 
 Example:
     >>> from llm_abstractions import LlmFactory
@@ -29,10 +31,13 @@ Copyright © 2025 AZ1.AI INC. All rights reserved.
 Phase: Phase 1C - LLM Provider Implementation
 """
 
+import functools
 import os
+import time
 from typing import Dict, Type, Any, Optional
 
 from .base_llm import BaseLlm
+from .usage import LlmResponse, LlmUsage
 
 
 class LlmFactory:
@@ -128,12 +133,102 @@ class LlmFactory:
 
         # Instantiate provider with configuration
         try:
-            return provider_class(model=model, api_key=api_key, **kwargs)
+            llm = provider_class(model=model, api_key=api_key, **kwargs)
         except Exception as e:
             raise RuntimeError(
                 f"Failed to instantiate {provider_class.__name__}: {e}"
             ) from e
 
+        return cls._instrument(llm, agent_type)
+
+    @classmethod
+    def _instrument(cls, llm: BaseLlm, agent_type: str) -> BaseLlm:
+        """
+        Record request count, latency, token usage and an "llm.generate"
+        trace span for llm.generate_content_async().
+
+        Metrics go to the orchestration metrics registry:
+        coditect_llm_requests_total{provider,model,status},
+        coditect_llm_request_seconds{provider,model} and
+        coditect_llm_tokens_total{provider,model,type}. Plain-string
+        responses from custom providers are wrapped in an LlmResponse with
+        the measured latency, so callers always find response.usage. The
+        instance is returned unchanged if orchestration is not importable.
+        """
+        # Import here to avoid circular dependencies (orchestration imports us)
+        try:
+            from orchestration.metrics import get_registry
+            from orchestration.tracing import SpanKind, get_tracer
+        except ImportError:
+            return llm
+
+        registry = get_registry()
+        requests_total = registry.counter(
+            "coditect_llm_requests_total",
+            "LLM requests by provider, model and outcome",
+            ["provider", "model", "status"],
+        )
+        request_seconds = registry.histogram(
+            "coditect_llm_request_seconds",
+            "LLM request latency in seconds",
+            ["provider", "model"],
+        )
+        tokens_total = registry.counter(
+            "coditect_llm_tokens_total",
+            "LLM tokens by provider, model and type (input, output, cached)",
+            ["provider", "model", "type"],
+        )
+
+        model = str(getattr(llm, "model", None) or "default")
+        latency = request_seconds.labels(agent_type, model)
+        succeeded = requests_total.labels(agent_type, model, "success")
+        failed = requests_total.labels(agent_type, model, "error")
+        token_counters = {
+            kind: tokens_total.labels(agent_type, model, kind)
+            for kind in ("input", "output", "cached")
+        }
+        generate = llm.generate_content_async
+
+        @functools.wraps(generate)
+        async def generate_content_async(*args: Any, **kw: Any) -> str:
+            with get_tracer().start_as_current_span(
+                "llm.generate",
+                {"provider": agent_type, "model": model},
+                kind=SpanKind.CLIENT,
+            ) as span:
+                start = time.perf_counter()
+                try:
+                    response = await generate(*args, **kw)
+                except BaseException:
+                    latency.observe(time.perf_counter() - start)
+                    failed.inc()
+                    raise
+                elapsed = time.perf_counter() - start
+                latency.observe(elapsed)
+                succeeded.inc()
+                if not isinstance(response, str):
+                    return response
+
+                if not isinstance(response, LlmResponse):
+                    response = LlmResponse(
+                        response,
+                        LlmUsage(provider=agent_type, model=model, latency_seconds=elapsed),
+                    )
+                usage = response.usage
+                span.set_attribute("response_chars", len(response))
+                for kind, count in (
+                    ("input", usage.input_tokens),
+                    ("output", usage.output_tokens),
+                    ("cached", usage.cached_tokens),
+                ):
+                    if count is not None:
+                        token_counters[kind].inc(count)
+                        span.set_attribute(f"{kind}_tokens", count)
+                return response
+
+        llm.generate_content_async = generate_content_async
+        return llm
+
     @classmethod
     def _register_default_providers(cls) -> None:
         """
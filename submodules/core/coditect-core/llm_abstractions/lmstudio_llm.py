@@ -29,9 +29,11 @@ Phase: Phase 1C - LLM Provider Implementation
 """
 
 import os
+import time
 from typing import Any, Dict, List, Optional
 
 from .base_llm import BaseLlm
+from .usage import chat_completion_usage
 
 
 class LMStudioLlm(BaseLlm):
@@ -53,6 +55,8 @@ class LMStudioLlm(BaseLlm):
         >>> response = await llm.generate_content_async(messages)
     """
 
+    PROVIDER = "lmstudio"
+
     # Popular GGUF models for LM Studio (examples)
     SUPPORTED_MODELS = [
         "llama-3.2-3b-instruct",
@@ -136,7 +140,7 @@ class LMStudioLlm(BaseLlm):
                       - stream: bool (default: False)
 
         Returns:
-            Generated text response
+            Generated text response (LlmResponse with token usage and latency)
 
         Raises:
             ValueError: If messages format is invalid
@@ -175,6 +179,7 @@ class LMStudioLlm(BaseLlm):
 
         try:
             # Call LM Studio API (OpenAI-compatible)
+            started = time.perf_counter()
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
@@ -182,10 +187,11 @@ class LMStudioLlm(BaseLlm):
             )
 
             # Extract text from response
+            text = ""
             if response.choices and len(response.choices) > 0:
-                return response.choices[0].message.content or ""
+                text = response.choices[0].message.content or ""
 
-            return ""
+            return self._response(text, started, **chat_completion_usage(response))
 
         except Exception as e:
             raise RuntimeError(
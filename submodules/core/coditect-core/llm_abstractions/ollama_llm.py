@@ -32,11 +32,13 @@ Phase: Phase 1C - LLM Provider Implementation
 """
 
 import os
+import time
 from typing import Any, Dict, List, Optional
 
 import aiohttp
 
 from .base_llm import BaseLlm
+from .usage import token_count
 
 
 class OllamaLlm(BaseLlm):
@@ -56,6 +58,8 @@ class OllamaLlm(BaseLlm):
         >>> response = await llm.generate_content_async(messages)
     """
 
+    PROVIDER = "ollama"
+
     # Supported Ollama models (popular ones)
     SUPPORTED_MODELS = [
         "llama3.2",      # Llama 3.2 (latest, recommended)
@@ -117,7 +121,7 @@ class OllamaLlm(BaseLlm):
                       - stream: bool (default: False)
 
         Returns:
-            Generated text response
+            Generated text response (LlmResponse with token usage and latency)
 
         Raises:
             ValueError: If messages format is invalid
@@ -160,6 +164,7 @@ class OllamaLlm(BaseLlm):
 
         try:
             # Call Ollama API
+            started = time.perf_counter()
             async with aiohttp.ClientSession() as session:
                 async with session.post(
                     f"{self.base_url}/api/chat",
@@ -175,10 +180,25 @@ class OllamaLlm(BaseLlm):
                     result = await response.json()
 
                     # Extract text from response
+                    text = ""
                     if "message" in result and "content" in result["message"]:
-                        return result["message"]["content"]
-
-                    return ""
+                        text = result["message"]["content"]
+
+                    # Server-side timings are in nanoseconds; the first token
+                    # follows model load and prompt evaluation
+                    load_ns = token_count(result.get("load_duration"))
+                    prompt_ns = token_count(result.get("prompt_eval_duration"))
+                    first_token = None
+                    if prompt_ns is not None:
+                        first_token = ((load_ns or 0) + prompt_ns) / 1e9
+
+                    return self._response(
+                        text,
+                        started,
+                        input_tokens=token_count(result.get("prompt_eval_count")),
+                        output_tokens=token_count(result.get("eval_count")),
+                        time_to_first_token=first_token,
+                    )
 
         except aiohttp.ClientError as e:
             raise RuntimeError(
@@ -28,9 +28,11 @@ Phase: Phase 1C - LLM Provider Implementation
 """
 
 import os
+import time
 from typing import Any, Dict, List, Optional
 
 from .base_llm import BaseLlm
+from .usage import chat_completion_usage
 
 
 class OpenAILlm(BaseLlm):
@@ -51,6 +53,8 @@ class OpenAILlm(BaseLlm):
         >>> response = await llm.generate_content_async(messages)
     """
 
+    PROVIDER = "openai-gpt"
+
     # Supported GPT models
     SUPPORTED_MODELS = [
         "gpt-4o",              # GPT-4 Optimized (latest, recommended)
@@ -129,7 +133,7 @@ class OpenAILlm(BaseLlm):
                       - response_format: dict (for JSON mode)
 
         Returns:
-            Generated text response
+            Generated text response (LlmResponse with token usage and latency)
 
         Raises:
             ValueError: If messages format is invalid
@@ -166,6 +170,7 @@ class OpenAILlm(BaseLlm):
 
         try:
             # Call OpenAI API
+            started = time.perf_counter()
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
@@ -173,10 +178,11 @@ class OpenAILlm(BaseLlm):
             )
 
             # Extract text from response
+            text = ""
             if response.choices and len(response.choices) > 0:
-                return response.choices[0].message.content or ""
+                text = response.choices[0].message.content or ""
 
-            return ""
+            return self._response(text, started, **chat_completion_usage(response))
 
         except Exception as e:
             raise RuntimeError(
@@ -0,0 +1,150 @@
+"""
+LLM Usage - Token and Latency Accounting
+========================================
+
+Structured responses returned by every provider.
+
+LlmResponse is a str subclass, so existing callers that treat the result
+of generate_content_async() as text keep working, while usage-aware
+callers read response.usage for token counts, latency and cost.
+
+Token semantics are normalised across providers:
+- input_tokens: all prompt tokens, including those served from cache
+- cached_tokens: the part of input_tokens read from a prompt cache
+- output_tokens: generated tokens
+
+Example:
+    >>> response = await llm.generate_content_async(messages)
+    >>> print(response)                       # the text, as before
+    >>> response.usage.total_tokens
+    1250
+    >>> response.usage.estimated_cost
+    0.0032
+
+Copyright © 2025 AZ1.AI INC. All rights reserved.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple
+
+
+# USD per million tokens: (input, output, cached input)
+MODEL_PRICING: Dict[str, Tuple[float, float, float]] = {
+    "claude-3-5-sonnet-20241022": (3.00, 15.00, 0.30),
+    "claude-3-5-haiku-20241022": (0.80, 4.00, 0.08),
+    "claude-3-opus-20240229": (15.00, 75.00, 1.50),
+    "claude-3-sonnet-20240229": (3.00, 15.00, 0.30),
+    "claude-3-haiku-20240307": (0.25, 1.25, 0.03),
+    "gpt-4o": (2.50, 10.00, 1.25),
+    "gpt-4-turbo": (10.00, 30.00, 10.00),
+    "gpt-4": (30.00, 60.00, 30.00),
+    "gpt-3.5-turbo": (0.50, 1.50, 0.50),
+    "gemini-2.0-flash": (0.10, 0.40, 0.025),
+    "gemini-1.5-pro": (1.25, 5.00, 0.3125),
+    "gemini-1.5-flash": (0.075, 0.30, 0.01875),
+}
+
+# Providers running on local hardware have no per-token cost
+LOCAL_PROVIDERS = frozenset({"ollama", "lmstudio"})
+
+
+def token_count(value: Any) -> Optional[int]:
+    """Return value if it is a token count reported by an SDK, else None."""
+    if isinstance(value, bool) or not isinstance(value, int):
+        return None
+    return value
+
+
+def chat_completion_usage(response: Any) -> Dict[str, Optional[int]]:
+    """
+    Token counts from an OpenAI-style chat completion (OpenAI, LM Studio,
+    Hugging Face), as keyword arguments for BaseLlm._response().
+    """
+    usage = getattr(response, "usage", None)
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "input_tokens": token_count(getattr(usage, "prompt_tokens", None)),
+        "output_tokens": token_count(getattr(usage, "completion_tokens", None)),
+        "cached_tokens": token_count(getattr(details, "cached_tokens", None)),
+    }
+
+
+def estimate_cost(provider: str, model: Optional[str], usage: "LlmUsage") -> Optional[float]:
+    """
+    Estimate the USD cost of a request from MODEL_PRICING.
+
+    Returns None when token counts are missing or the model is not priced.
+    """
+    if usage.input_tokens is None or usage.output_tokens is None:
+        return None
+    if provider in LOCAL_PROVIDERS:
+        return 0.0
+    pricing = MODEL_PRICING.get(model or "")
+    if pricing is None:
+        return None
+
+    input_price, output_price, cached_price = pricing
+    cached = usage.cached_tokens or 0
+    cost = (
+        (usage.input_tokens - cached) * input_price
+        + cached * cached_price
+        + usage.output_tokens * output_price
+    ) / 1_000_000
+    return round(cost, 6)
+
+
+@dataclass
+class LlmUsage:
+    """
+    Token counts and timings for one LLM request.
+
+    Token fields are None when the provider did not report them;
+    time_to_first_token_seconds is only known for providers that report
+    prompt processing time (or streamed responses).
+    """
+
+    provider: str
+    model: Optional[str] = None
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    cached_tokens: Optional[int] = None
+    latency_seconds: Optional[float] = None
+    time_to_first_token_seconds: Optional[float] = None
+    estimated_cost: Optional[float] = None
+
+    @property
+    def total_tokens(self) -> Optional[int]:
+        """Input plus output tokens (None if either is unknown)."""
+        if self.input_tokens is None or self.output_tokens is None:
+            return None
+        return self.input_tokens + self.output_tokens
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        data = asdict(self)
+        data["total_tokens"] = self.total_tokens
+        return data
+
+
+class LlmResponse(str):
+    """
+    Generated text plus the usage of the request that produced it.
+
+    Behaves exactly like the text (comparison, slicing, JSON encoding);
+    usage is carried alongside.
+    """
+
+    usage: LlmUsage
+
+    def __new__(cls, text: str, usage: LlmUsage) -> "LlmResponse":
+        response = super().__new__(cls, text or "")
+        response.usage = usage
+        return response
+
+    @property
+    def text(self) -> str:
+        """The generated text as a plain str."""
+        return str.__str__(self)
+
+    def __reduce__(self):
+        return (LlmResponse, (self.text, self.usage))
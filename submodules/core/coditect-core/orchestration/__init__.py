@@ -29,8 +29,14 @@ Components:
     - AgentTask: Zero-ambiguity task specification
     - StateManager: Enterprise-grade state persistence
     - BackupManager: Backup and rollback functionality
+    - BackupStore: Deduplicated, compressed backup storage
     - AgentRegistry: LLM abstraction layer
     - TaskExecutor: Universal task executor
+    - MetricsRegistry: Counters, gauges and histograms with Prometheus export
+    - Tracer: Spans across router, executor and LLM providers (JSONL export)
+    - JobQueue: Prioritized background execution with a bounded worker pool
+    - ResultStore: Bounded (LRU+TTL) command results over optional SQLite
+    - UsageLedger: LLM tokens, latency and cost per agent/model
 
 Features:
     ✅ LLM-Agnostic (Claude, GPT, Gemini, Llama, custom)
@@ -68,6 +74,11 @@ from .backup_manager import (
     BackupMetadata,
 )
 
+from .backup_store import (
+    BackupStore,
+    CatalogEntry,
+)
+
 from .orchestrator import (
     ProjectOrchestrator,
     DependencyError,
@@ -85,6 +96,38 @@ from .executor import (
     ParallelExecutor,
 )
 
+from .metrics import (
+    MetricsRegistry,
+    get_registry,
+)
+
+from .tracing import (
+    Tracer,
+    Span,
+    configure_tracing,
+    get_tracer,
+)
+
+from .job_queue import (
+    Job,
+    JobQueue,
+    JobState,
+    JobStore,
+    QueueFullError,
+)
+
+from .result_store import (
+    ResultStore,
+    ResultSummary,
+    ResultPage,
+)
+
+from .usage_ledger import (
+    UsageLedger,
+    UsageTotals,
+    get_usage_ledger,
+)
+
 # Phase 2B: Slash Command Pipeline
 from .command_router import (
     SlashCommandRouter,
@@ -105,9 +148,25 @@ __all__ = [
     "AgentTask",
     "StateManager",
     "BackupManager",
+    "BackupStore",
     "AgentRegistry",
     "TaskExecutor",
     "ParallelExecutor",
+    "MetricsRegistry",
+    "get_registry",
+    "Tracer",
+    "configure_tracing",
+    "get_tracer",
+    "Job",
+    "JobQueue",
+    "JobState",
+    "JobStore",
+    "QueueFullError",
+    "ResultStore",
+    "ResultSummary",
+    "ResultPage",
+    "UsageLedger",
+    "get_usage_ledger",
 
     # Phase 2B: Command Router
     "SlashCommandRouter",
@@ -125,9 +184,12 @@ __all__ = [
 
     # Data classes
     "BackupMetadata",
+    "CatalogEntry",
     "ExecutionResult",
     "CommandResult",
     "CommandSpec",
+    "Span",
+    "UsageTotals",
 
     # Constants
     "COMMAND_REGISTRY",
@@ -11,6 +11,8 @@ Features:
 - ✅ Easy Rollback (restore to any point in time)
 - ✅ Organized Storage (dedicated backups/ directory)
 - ✅ Metadata Tracking (backup size, task count, completion %)
+- ✅ Deduplicated Storage (content-defined chunks, compressed, see BackupStore)
+- ✅ Fast Listing (served from the backup catalog, backups are never opened)
 
 Example:
     >>> from claude.orchestration import BackupManager
@@ -30,11 +32,12 @@ Example:
     >>> success = manager.rollback_to_backup("20251112-013045")
 
 Storage Strategy:
-    - Backups stored in {state_file_dir}/backups/
-    - Filename format: project_state.backup.{timestamp}.json
+    - Backups stored in {state_file_dir}/backups/store/ (BackupStore)
+    - Each backup = catalog line + references to shared, compressed chunks
+    - Storage grows with changes between backups, not with backup count
     - NEVER auto-deleted (permanent archive)
-    - User controls manual compression/archival
-    - ~50KB per backup, 1-5MB for 100 backups
+    - Legacy project_state.backup.{timestamp}.json files are imported into
+      the catalog on startup (files are left in place)
 
 Copyright © 2025 AZ1.AI INC. All rights reserved.
 Developer: Hal Casteel, CEO/CTO
@@ -42,16 +45,27 @@ Email: 1@az1.ai
 """
 
 import json
-import shutil
+import os
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+
+from .backup_store import BackupStore, CatalogEntry
+
+LEGACY_BACKUP_PATTERN = "project_state.backup.*.json"
 
 
 @dataclass
 class BackupMetadata:
-    """Metadata for a backup file."""
+    """
+    Metadata for a backup.
+
+    file_size_bytes is the size of the backed-up state; stored_size_bytes is
+    what the backup added to the store after deduplication and compression.
+    file_path is the store catalog, or for backups imported from an older
+    version, the legacy backup file they were imported from.
+    """
 
     timestamp: str
     file_path: Path
@@ -61,6 +75,8 @@ class BackupMetadata:
     completion_percentage: float
     format_version: int
     project_id: str
+    stored_size_bytes: int = 0
+    chunk_count: int = 0
 
     def __str__(self) -> str:
         """Human-readable representation."""
@@ -95,6 +111,7 @@ class BackupManager:
     Attributes:
         state_file: Path to primary state file
         backups_dir: Path to backups directory
+        store: Deduplicating chunk store holding the backups
 
     Example:
         >>> manager = BackupManager(state_file="project_state.json")
@@ -116,6 +133,9 @@ class BackupManager:
         # Ensure backups directory exists
         self.backups_dir.mkdir(parents=True, exist_ok=True)
 
+        self.store = BackupStore(self.backups_dir / "store")
+        self._import_legacy_backups()
+
     def create_backup(self) -> Optional[BackupMetadata]:
         """
         Create timestamped backup of current state.
@@ -135,17 +155,12 @@ class BackupManager:
         # Generate timestamp
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
 
-        # Create backup filename
-        backup_file = self.backups_dir / f"project_state.backup.{timestamp}.json"
-
         try:
-            # Copy state file to backup
-            shutil.copy2(self.state_file, backup_file)
-
-            # Extract metadata from backup
-            metadata = self._extract_metadata(backup_file, timestamp)
+            # Read state once; metadata is computed now, not on every listing
+            data = self.state_file.read_bytes()
+            entry = self.store.put(timestamp, data, self._summarize_state(data))
 
-            return metadata
+            return self._entry_to_metadata(entry)
 
         except Exception as e:
             raise IOError(f"Failed to create backup: {e}") from e
@@ -160,28 +175,15 @@ class BackupManager:
         Returns:
             List of BackupMetadata sorted by timestamp (newest first)
         """
-        backups = []
-
-        # Find all backup files
-        for backup_file in self.backups_dir.glob("project_state.backup.*.json"):
-            # Extract timestamp from filename
-            # Format: project_state.backup.20251112-013045.json
-            try:
-                timestamp = backup_file.stem.split(".")[-1]
-                metadata = self._extract_metadata(backup_file, timestamp)
-                backups.append(metadata)
-            except Exception:
-                # Skip corrupted/invalid backups
-                continue
-
-        # Sort by timestamp (newest first)
-        backups.sort(key=lambda b: b.timestamp, reverse=True)
+        # Catalog entries are sorted oldest first
+        entries = self.store.entries()
+        entries.reverse()
 
         # Apply limit if specified
         if limit is not None:
-            backups = backups[:limit]
+            entries = entries[:limit]
 
-        return backups
+        return [self._entry_to_metadata(entry) for entry in entries]
 
     def rollback_to_backup(
         self,
@@ -207,12 +209,18 @@ class BackupManager:
             FileNotFoundError: If backup doesn't exist
             IOError: If rollback fails
         """
-        # Find backup file
-        backup_file = self.backups_dir / f"project_state.backup.{timestamp}.json"
+        # Find and read the backup now: a pre-rollback backup taken in the
+        # same second replaces it (and frees chunks only it used)
+        entry = self.store.get_entry(timestamp)
 
-        if not backup_file.exists():
+        if entry is None:
             raise FileNotFoundError(f"Backup not found: {timestamp}")
 
+        try:
+            data = self.store.read_entry(entry)
+        except Exception as e:
+            raise IOError(f"Rollback failed: {e}") from e
+
         # User confirmation (if enabled)
         if confirm:
             print(f"\n⚠️  WARNING: ROLLBACK TO PREVIOUS STATE")
@@ -220,7 +228,7 @@ class BackupManager:
 
             # Load backup metadata
             try:
-                metadata = self._extract_metadata(backup_file, timestamp)
+                metadata = self._entry_to_metadata(entry)
                 print(f"   Backup details:")
                 print(f"   - Timestamp: {metadata.timestamp}")
                 print(f"   - Total tasks: {metadata.total_tasks}")
@@ -249,8 +257,8 @@ class BackupManager:
                     return False
 
         try:
-            # Perform rollback (copy backup to state file)
-            shutil.copy2(backup_file, self.state_file)
+            # Perform rollback (atomically replace state with the backup read above)
+            self._atomic_write_bytes(self.state_file, data)
             print(f"✅ State rolled back to: {timestamp}")
             return True
 
@@ -269,13 +277,24 @@ class BackupManager:
         Returns:
             True if deleted, False if backup doesn't exist
         """
+        deleted = self.store.delete(timestamp)
+
         backup_file = self.backups_dir / f"project_state.backup.{timestamp}.json"
+        if backup_file.exists():
+            backup_file.unlink()
+            deleted = True
+
+        return deleted
 
-        if not backup_file.exists():
-            return False
+    def get_storage_stats(self) -> Dict[str, Any]:
+        """
+        Backup storage statistics.
 
-        backup_file.unlink()
-        return True
+        Returns:
+            Dictionary with backup count, logical size, on-disk size and
+            deduplication ratio
+        """
+        return self.store.stats()
 
     def compress_old_backups(
         self,
@@ -302,48 +321,85 @@ class BackupManager:
         """
         raise NotImplementedError("Backup compression not yet implemented")
 
-    def _extract_metadata(
-        self,
-        backup_file: Path,
-        timestamp: str,
-    ) -> BackupMetadata:
+    def _import_legacy_backups(self) -> None:
         """
-        Extract metadata from backup file.
+        Import legacy full-copy backup files missing from the catalog.
 
-        Args:
-            backup_file: Path to backup file
-            timestamp: Backup timestamp
+        Each file is parsed once here; afterwards it is listed from the
+        catalog like any other backup. Corrupted files are skipped.
+        """
+        for backup_file in self.backups_dir.glob(LEGACY_BACKUP_PATTERN):
+            # Format: project_state.backup.20251112-013045.json
+            timestamp = backup_file.stem.split(".")[-1]
+            if timestamp in self.store:
+                continue
 
-        Returns:
-            BackupMetadata instance
+            try:
+                data = backup_file.read_bytes()
+                summary = self._summarize_state(data)
+            except Exception:
+                # Skip corrupted/invalid backups
+                continue
 
-        Raises:
-            json.JSONDecodeError: If backup file is corrupted
+            # Remembered so listing can point at the file without touching disk
+            summary["legacy_file"] = backup_file.name
+
+            self.store.put(timestamp, data, summary)
+
+    @staticmethod
+    def _summarize_state(data: bytes) -> Dict[str, Any]:
         """
-        # Load backup file
-        with open(backup_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        Compute catalog metadata from state content.
 
-        # Get file size
-        file_size = backup_file.stat().st_size
+        Raises:
+            json.JSONDecodeError: If the state is not valid JSON
+        """
+        state = json.loads(data.decode("utf-8"))
 
         # Extract metrics
-        metrics = data.get("metrics", {})
-        total_tasks = metrics.get("total_tasks", 0)
-        completed_tasks = metrics.get("completed_tasks", 0)
-        completion_percentage = metrics.get("completion_percentage", 0.0)
-
-        # Extract metadata
-        format_version = data.get("format_version", 1)
-        project_id = data.get("project_id", "")
+        metrics = state.get("metrics", {})
+
+        return {
+            "total_tasks": metrics.get("total_tasks", 0),
+            "completed_tasks": metrics.get("completed_tasks", 0),
+            "completion_percentage": metrics.get("completion_percentage", 0.0),
+            "format_version": state.get("format_version", 1),
+            "project_id": state.get("project_id", ""),
+        }
+
+    def _entry_to_metadata(self, entry: CatalogEntry) -> BackupMetadata:
+        """Build BackupMetadata from a catalog entry (no backup I/O)."""
+        summary = entry.metadata
+        legacy_file = summary.get("legacy_file")
+        if legacy_file:
+            file_path = self.backups_dir / legacy_file
+        else:
+            file_path = self.store.catalog_path
 
         return BackupMetadata(
-            timestamp=timestamp,
-            file_path=backup_file,
-            file_size_bytes=file_size,
-            total_tasks=total_tasks,
-            completed_tasks=completed_tasks,
-            completion_percentage=completion_percentage,
-            format_version=format_version,
-            project_id=project_id,
+            timestamp=entry.timestamp,
+            file_path=file_path,
+            file_size_bytes=entry.size_bytes,
+            total_tasks=summary.get("total_tasks", 0),
+            completed_tasks=summary.get("completed_tasks", 0),
+            completion_percentage=summary.get("completion_percentage", 0.0),
+            format_version=summary.get("format_version", 1),
+            project_id=summary.get("project_id", ""),
+            stored_size_bytes=entry.stored_bytes,
+            chunk_count=len(entry.chunks),
         )
+
+    @staticmethod
+    def _atomic_write_bytes(file_path: Path, data: bytes) -> None:
+        """Write bytes using the temp file + rename pattern."""
+        temp_path = file_path.parent / f".{file_path.name}.tmp.{os.getpid()}"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, file_path)
+        except Exception:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise
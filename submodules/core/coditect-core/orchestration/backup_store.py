@@ -0,0 +1,466 @@
+"""
+Backup Store - Content-Addressed, Compressed Backup Storage
+===========================================================
+
+Deduplicating storage engine behind BackupManager.
+
+Every backup is split into content-defined chunks (gear rolling hash), each
+chunk is stored once under its SHA256 and compressed (zstd when the
+``zstandard`` package is installed, gzip otherwise). A small append-only
+catalog records, per backup, the ordered chunk list plus precomputed
+metadata, so listing backups never opens the backups themselves.
+
+Features:
+- ✅ Deduplication (storage grows with changes, not snapshots × state size)
+- ✅ Content-Defined Chunking (an edit only re-stores the chunks it touches)
+- ✅ Compression (zstd if available, gzip fallback; both always readable)
+- ✅ O(catalog) Listing (metadata precomputed at backup time)
+- ✅ Verified Restore (SHA256 of the reconstructed content is checked)
+
+Storage Layout:
+    {backups_dir}/store/catalog.jsonl          one JSON line per backup
+    {backups_dir}/store/objects/ab/abcd....zst compressed chunk (or .gz)
+
+Example:
+    >>> store = BackupStore(Path("backups/store"))
+    >>> entry = store.put("20251112-013045", data, {"total_tasks": 12})
+    >>> store.get("20251112-013045") == data
+    True
+
+Copyright © 2025 AZ1.AI INC. All rights reserved.
+Developer: Hal Casteel, CEO/CTO
+Email: 1@az1.ai
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+
+# Content-defined chunking parameters (bytes)
+MIN_CHUNK_SIZE = 1024
+AVG_CHUNK_BITS = 12  # ~4 KB average chunk
+MAX_CHUNK_SIZE = 16 * 1024
+
+_HASH_MASK = (1 << 64) - 1
+# Test the high bits: with a shift-left gear hash they depend on the last
+# 64 bytes, while the low bits only see the last few bytes.
+_CHUNK_MASK = ((1 << AVG_CHUNK_BITS) - 1) << (64 - AVG_CHUNK_BITS)
+
+# Gear table derived from SHA256 so chunk boundaries are stable across
+# processes and Python versions.
+_GEAR = [
+    int.from_bytes(hashlib.sha256(bytes([i])).digest()[:8], "big")
+    for i in range(256)
+]
+
+
+def chunk_boundaries(data: bytes) -> Iterator[int]:
+    """
+    Yield chunk end offsets for content-defined chunking.
+
+    Boundaries depend only on nearby content, so inserting or removing bytes
+    shifts at most the chunks around the edit.
+
+    Args:
+        data: Content to chunk
+
+    Yields:
+        Exclusive end offset of each chunk (last one is len(data))
+    """
+    length = len(data)
+    start = 0
+    gear = _GEAR
+
+    while start < length:
+        end = min(start + MAX_CHUNK_SIZE, length)
+        pos = start + MIN_CHUNK_SIZE
+
+        if pos >= end:
+            yield end
+            start = end
+            continue
+
+        h = 0
+        while pos < end:
+            h = ((h << 1) + gear[data[pos]]) & _HASH_MASK
+            pos += 1
+            if not h & _CHUNK_MASK:
+                break
+
+        yield pos
+        start = pos
+
+
+@dataclass
+class CatalogEntry:
+    """Catalog record for one stored backup."""
+
+    timestamp: str
+    sha256: str
+    size_bytes: int
+    chunks: List[str]
+    stored_bytes: int = 0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to JSON-serializable dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CatalogEntry":
+        """Create entry from catalog line."""
+        return cls(
+            timestamp=data["timestamp"],
+            sha256=data["sha256"],
+            size_bytes=data["size_bytes"],
+            chunks=list(data["chunks"]),
+            stored_bytes=data.get("stored_bytes", 0),
+            metadata=data.get("metadata", {}),
+        )
+
+
+class BackupStore:
+    """
+    Content-addressed chunk store with a backup catalog.
+
+    Thread-safe within a process. Chunk files are written with the
+    temp file + rename pattern, and catalog lines are appended with a
+    single write, so concurrent writers never leave partial objects.
+
+    Attributes:
+        root: Store directory
+        objects_dir: Directory holding compressed chunks
+        catalog_path: Append-only catalog (JSON lines)
+        codec: Compression used for new chunks ("zst" or "gz")
+    """
+
+    def __init__(self, root: Path | str, compression_level: int = 3):
+        """
+        Initialize backup store.
+
+        Args:
+            root: Store directory (created if missing)
+            compression_level: zstd level (gzip uses level 6)
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.catalog_path = self.root / "catalog.jsonl"
+        self.codec = "zst" if ZSTD_AVAILABLE else "gz"
+        self.compression_level = compression_level
+
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._catalog_stamp: Optional[tuple] = None
+
+    # ------------------------------------------------------------------
+    # Catalog
+    # ------------------------------------------------------------------
+
+    def entries(self) -> List[CatalogEntry]:
+        """
+        Return all live catalog entries in timestamp order (oldest first).
+
+        The catalog is re-read only when its size or mtime changed.
+        """
+        with self._lock:
+            self._load_catalog()
+            return sorted(self._entries.values(), key=lambda e: e.timestamp)
+
+    def get_entry(self, timestamp: str) -> Optional[CatalogEntry]:
+        """Return the catalog entry for a timestamp, or None."""
+        with self._lock:
+            self._load_catalog()
+            return self._entries.get(timestamp)
+
+    def __contains__(self, timestamp: str) -> bool:
+        return self.get_entry(timestamp) is not None
+
+    def _load_catalog(self) -> None:
+        """(Re)load the catalog if it changed on disk. Caller holds the lock."""
+        try:
+            stat = self.catalog_path.stat()
+        except FileNotFoundError:
+            self._entries = {}
+            self._catalog_stamp = None
+            return
+
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        if stamp == self._catalog_stamp:
+            return
+
+        entries: Dict[str, CatalogEntry] = {}
+        with open(self.catalog_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn final line from an interrupted append
+                    continue
+                # Later lines win (a re-used timestamp replaces the backup)
+                entry = CatalogEntry.from_dict(record)
+                entries[entry.timestamp] = entry
+
+        self._entries = entries
+        self._catalog_stamp = stamp
+
+    def _append_catalog(self, record: Dict[str, Any]) -> None:
+        """Append one record to the catalog and fsync. Caller holds the lock."""
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        fd = os.open(self.catalog_path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            # Terminate a torn line left by an interrupted append
+            size = os.fstat(fd).st_size
+            if size and os.pread(fd, 1, size - 1) != b"\n":
+                line = b"\n" + line
+            os.write(fd, line)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _rewrite_catalog(self) -> None:
+        """Rewrite the catalog with only live entries. Caller holds the lock."""
+        temp_path = self.root / f".{self.catalog_path.name}.tmp.{os.getpid()}"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                for entry in sorted(self._entries.values(), key=lambda e: e.timestamp):
+                    f.write(json.dumps(entry.to_dict(), separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.catalog_path)
+        except Exception:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise
+        self._catalog_stamp = None
+
+    # ------------------------------------------------------------------
+    # Backups
+    # ------------------------------------------------------------------
+
+    def put(
+        self,
+        timestamp: str,
+        data: bytes,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> CatalogEntry:
+        """
+        Store a backup, writing only chunks not already in the store.
+
+        A backup with the same timestamp is replaced; chunks only the
+        replaced backup used are removed.
+
+        Args:
+            timestamp: Backup identifier
+            data: Backup content
+            metadata: Precomputed metadata kept in the catalog
+
+        Returns:
+            CatalogEntry for the stored backup
+
+        Raises:
+            IOError: If writing chunks or the catalog fails
+        """
+        chunks = []
+        spans = {}
+        stored_bytes = 0
+        start = 0
+
+        try:
+            for end in chunk_boundaries(data):
+                chunk = data[start:end]
+                digest = hashlib.sha256(chunk).hexdigest()
+                stored_bytes += self._write_chunk(digest, chunk)
+                chunks.append(digest)
+                spans[digest] = (start, end)
+                start = end
+
+            entry = CatalogEntry(
+                timestamp=timestamp,
+                sha256=hashlib.sha256(data).hexdigest(),
+                size_bytes=len(data),
+                chunks=chunks,
+                stored_bytes=stored_bytes,
+                metadata=dict(metadata or {}),
+            )
+
+            with self._lock:
+                # A concurrent delete() may have removed a chunk deduplicated
+                # above before this backup referenced it; restore it while
+                # holding the lock so no delete can run until it is cataloged
+                for digest, (chunk_start, chunk_end) in spans.items():
+                    entry.stored_bytes += self._write_chunk(digest, data[chunk_start:chunk_end])
+
+                self._load_catalog()
+                replaced = self._entries.get(timestamp)
+                self._append_catalog(entry.to_dict())
+                self._load_catalog()
+                self._entries[timestamp] = entry
+
+                if replaced is not None:
+                    self._remove_unreferenced_chunks(replaced.chunks)
+
+            return entry
+
+        except OSError as e:
+            raise IOError(f"Failed to store backup {timestamp}: {e}") from e
+
+    def get(self, timestamp: str) -> bytes:
+        """
+        Reconstruct a backup's content.
+
+        Args:
+            timestamp: Backup identifier
+
+        Returns:
+            Original backup bytes
+
+        Raises:
+            FileNotFoundError: If the backup or one of its chunks is missing
+            IOError: If the reconstructed content fails verification
+        """
+        entry = self.get_entry(timestamp)
+        if entry is None:
+            raise FileNotFoundError(f"Backup not found: {timestamp}")
+        return self.read_entry(entry)
+
+    def read_entry(self, entry: CatalogEntry) -> bytes:
+        """Reconstruct and verify the content described by a catalog entry."""
+        data = b"".join(self._read_chunk(digest) for digest in entry.chunks)
+        if hashlib.sha256(data).hexdigest() != entry.sha256:
+            raise IOError(f"Backup {entry.timestamp} failed integrity check")
+        return data
+
+    def delete(self, timestamp: str) -> bool:
+        """
+        Remove a backup and any chunks no other backup references.
+
+        Args:
+            timestamp: Backup identifier
+
+        Returns:
+            True if deleted, False if the backup doesn't exist
+        """
+        with self._lock:
+            self._load_catalog()
+            entry = self._entries.pop(timestamp, None)
+            if entry is None:
+                return False
+
+            self._rewrite_catalog()
+            self._remove_unreferenced_chunks(entry.chunks)
+            return True
+
+    def _remove_unreferenced_chunks(self, digests: List[str]) -> None:
+        """Delete those of digests no live backup references. Caller holds the lock."""
+        live: Set[str] = set()
+        for other in self._entries.values():
+            live.update(other.chunks)
+
+        for digest in set(digests) - live:
+            for path in self._chunk_paths(digest):
+                if path.exists():
+                    path.unlink()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Storage statistics.
+
+        Returns:
+            Dictionary with backup count, logical size and on-disk chunk size
+        """
+        entries = self.entries()
+        chunk_files = 0
+        stored_bytes = 0
+        for path in self.objects_dir.glob("*/*"):
+            if path.name.startswith("."):
+                continue
+            chunk_files += 1
+            stored_bytes += path.stat().st_size
+
+        logical_bytes = sum(e.size_bytes for e in entries)
+        return {
+            "backups": len(entries),
+            "chunks": chunk_files,
+            "logical_bytes": logical_bytes,
+            "stored_bytes": stored_bytes,
+            "dedup_ratio": (logical_bytes / stored_bytes) if stored_bytes else 0.0,
+            "codec": self.codec,
+        }
+
+    # ------------------------------------------------------------------
+    # Chunks
+    # ------------------------------------------------------------------
+
+    def _chunk_paths(self, digest: str) -> List[Path]:
+        """Candidate paths of a chunk (preferred codec first)."""
+        directory = self.objects_dir / digest[:2]
+        codecs = ["zst", "gz"] if self.codec == "zst" else ["gz", "zst"]
+        return [directory / f"{digest}.{codec}" for codec in codecs]
+
+    def _write_chunk(self, digest: str, chunk: bytes) -> int:
+        """
+        Store a chunk unless it already exists.
+
+        Returns:
+            Number of bytes written to disk (0 for a deduplicated chunk)
+        """
+        paths = self._chunk_paths(digest)
+        if any(path.exists() for path in paths):
+            return 0
+
+        if self.codec == "zst":
+            payload = zstandard.ZstdCompressor(level=self.compression_level).compress(chunk)
+        else:
+            payload = gzip.compress(chunk, compresslevel=6, mtime=0)
+
+        target = paths[0]
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.parent / f".{target.name}.tmp.{os.getpid()}.{threading.get_ident()}"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, target)
+        except Exception:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise
+
+        return len(payload)
+
+    def _read_chunk(self, digest: str) -> bytes:
+        """Read and decompress a chunk."""
+        for path in self._chunk_paths(digest):
+            try:
+                with open(path, "rb") as f:
+                    payload = f.read()
+            except FileNotFoundError:
+                continue
+
+            if path.suffix == ".gz":
+                return gzip.decompress(payload)
+            if zstandard is None:
+                raise IOError(f"Chunk {digest} is zstd-compressed but zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(payload)
+
+        raise FileNotFoundError(f"Backup chunk missing: {digest}")
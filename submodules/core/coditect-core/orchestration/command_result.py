@@ -77,6 +77,31 @@ class CommandResult:
             "error_type": self.error_type,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CommandResult":
+        """Rebuild a result from to_dict() output."""
+
+        def parse(value: Optional[str]) -> Optional[datetime]:
+            return datetime.fromisoformat(value) if value else None
+
+        return cls(
+            command=data["command"],
+            status=CommandStatus(data["status"]),
+            output=data.get("output") or "",
+            agent_used=data.get("agent_used"),
+            llm_provider=data.get("llm_provider"),
+            llm_model=data.get("llm_model"),
+            started_at=parse(data.get("started_at")),
+            completed_at=parse(data.get("completed_at")),
+            execution_time_seconds=data.get("execution_time_seconds"),
+            tokens_used=data.get("tokens_used"),
+            estimated_cost=data.get("estimated_cost"),
+            structured_data=data.get("structured_data") or {},
+            metadata=data.get("metadata") or {},
+            error_message=data.get("error_message"),
+            error_type=data.get("error_type"),
+        )
+
     @property
     def success(self) -> bool:
         """Check if command succeeded."""
@@ -109,6 +134,8 @@ class CommandSpec:
     # Execution configuration
     task_type: str = "general"  # For system prompt selection
     streaming_enabled: bool = False
+    # Identical concurrent requests share one execution (see SlashCommandRouter)
+    coalesce: bool = True
 
     # Examples
     examples: List[str] = field(default_factory=list)
@@ -232,6 +259,7 @@ COMMAND_REGISTRY: Dict[str, CommandSpec] = {
         optional_args=["type", "stack"],
         task_type="general",
         streaming_enabled=True,
+        coalesce=False,  # every request scaffolds its own project
         examples=[
             "/new-project description='Build SaaS API for project management'",
             "/new-project description='E-commerce platform' stack=rust",
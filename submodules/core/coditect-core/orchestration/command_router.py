@@ -5,14 +5,19 @@ Routes slash commands to appropriate agents via LLM bindings.
 Enables programmatic command execution with structured results.
 """
 
+import asyncio
+import json
 import re
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
+from uuid import uuid4
 
 from .task import AgentTask, TaskStatus
 from .executor import TaskExecutor
 from .agent_registry import AgentRegistry
+from .tracing import SpanKind, StatusCode, get_tracer
 from .command_result import (
     CommandResult,
     CommandStatus,
@@ -21,6 +26,21 @@ from .command_result import (
 )
 
 
+@dataclass
+class _Flight:
+    """
+    An in-flight execution shared by identical requests.
+
+    ``waiters`` holds the command ids awaiting the result, oldest first.
+    ``leader_id`` is the request the others report as ``coalesced_with``;
+    if the leader is cancelled, the oldest remaining waiter takes its place.
+    """
+
+    task: asyncio.Task
+    leader_id: str
+    waiters: List[str] = field(default_factory=list)
+
+
 class CommandParser:
     """Parses slash commands into structured format."""
 
@@ -98,6 +118,9 @@ class SlashCommandRouter:
         # Command registry
         self.commands = COMMAND_REGISTRY
 
+        # Coalescing key -> execution shared by identical in-flight requests
+        self._inflight: Dict[str, _Flight] = {}
+
     def list_commands(self, category: Optional[str] = None) -> List[CommandSpec]:
         """
         List all available commands.
@@ -163,16 +186,30 @@ class SlashCommandRouter:
         self,
         command_str: str,
         args: Optional[Dict[str, Any]] = None,
+        command_id: Optional[str] = None,
+        correlation_id: Optional[str] = None,
     ) -> CommandResult:
         """
         Execute a slash command.
 
+        The execution is traced as a "command.execute" root span carrying
+        command_id (see orchestration.tracing).
+
+        Concurrent calls with the same command, arguments and agent binding
+        share one execution (unless the command's spec sets coalesce=False):
+        the first caller runs it, later callers wait for it and receive a
+        copy of the result with metadata["coalesced_with"] set to the first
+        caller's command id.
+
         Args:
             command_str: Command string (e.g., "/analyze target=src/main.rs")
             args: Optional arguments dict (overrides parsed args)
+            command_id: Caller's id for this execution (generated if omitted)
+            correlation_id: Correlation id for the trace (e.g. a UnifiedLogger's)
 
         Returns:
-            CommandResult with structured execution data
+            CommandResult with structured execution data;
+            metadata["command_id"] holds the command id
 
         Example:
             >>> result = await router.execute("/analyze target=main.rs")
@@ -180,6 +217,101 @@ class SlashCommandRouter:
             >>> print(result.output)  # Analysis output
             >>> print(result.agent_used)  # "code-reviewer"
         """
+        command_id = command_id or f"CMD-{uuid4().hex[:12]}"
+
+        with get_tracer().start_as_current_span(
+            "command.execute",
+            {"command_id": command_id, "command": command_str.split(" ", 1)[0]},
+            kind=SpanKind.SERVER,
+            correlation_id=correlation_id,
+        ) as span:
+            key = self._coalesce_key(command_str, args)
+            if key is None:
+                result = await self._execute(command_str, args)
+            else:
+                result = await self._execute_coalesced(key, command_str, args, command_id)
+                if "coalesced_with" in result.metadata:
+                    span.set_attribute("coalesced_with", result.metadata["coalesced_with"])
+
+            result.metadata["command_id"] = command_id
+            span.set_attributes({"status": result.status.value, "agent": result.agent_used or ""})
+            if result.status == CommandStatus.FAILED:
+                span.set_status(StatusCode.ERROR, result.error_message or "")
+            return result
+
+    def _coalesce_key(
+        self, command_str: str, args: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Key identifying equivalent executions (None if not coalescable).
+
+        Normalizes argument order and quoting, and includes the agent's
+        binding (type and model) so rebinding an agent never shares results.
+        """
+        command, parsed_args = self.parser.parse(command_str)
+        spec = self.get_command_spec(command)
+        if spec is None or not spec.coalesce:
+            return None
+
+        agent = self.registry.get_agent(spec.agent_id)
+        binding = [spec.agent_id]
+        if agent is not None:
+            binding += [agent.agent_type.value, agent.model]
+
+        final_args = {**parsed_args, **(args or {})}
+        return json.dumps([command, final_args, binding], sort_keys=True, default=str)
+
+    async def _execute_coalesced(
+        self,
+        key: str,
+        command_str: str,
+        args: Optional[Dict[str, Any]],
+        command_id: str,
+    ) -> CommandResult:
+        """Join (or start) the shared execution for key."""
+        flight = self._inflight.get(key)
+        if flight is None:
+            flight = _Flight(
+                task=asyncio.ensure_future(self._execute(command_str, args)),
+                leader_id=command_id,
+            )
+            self._inflight[key] = flight
+
+            def land(_task: asyncio.Task, key: str = key, flight: _Flight = flight) -> None:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+
+            flight.task.add_done_callback(land)
+
+        flight.waiters.append(command_id)
+        try:
+            # Shielded so one caller's cancellation does not cancel the others
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            flight.waiters.remove(command_id)
+            if not flight.waiters:
+                if not flight.task.done():
+                    flight.task.cancel()  # nobody else is waiting
+            elif flight.leader_id == command_id:
+                # A cancelled leader never returns the result; name a caller that will
+                flight.leader_id = flight.waiters[0]
+            raise
+        flight.waiters.remove(command_id)
+
+        if flight.leader_id == command_id:
+            return result
+        return replace(
+            result,
+            structured_data=dict(result.structured_data),
+            metadata={**result.metadata, "coalesced_with": flight.leader_id},
+        )
+
+    async def _execute(
+        self,
+        command_str: str,
+        args: Optional[Dict[str, Any]] = None,
+    ) -> CommandResult:
+        """Parse, validate and run a command (see execute())."""
         started_at = datetime.now()
 
         # Parse command
@@ -45,6 +45,7 @@ import asyncio
 import json
 import subprocess
 import sys
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
@@ -52,7 +53,10 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from .agent_registry import AgentRegistry, AgentConfig, AgentInterface, AgentType
+from .metrics import MetricsRegistry, get_registry
 from .task import AgentTask, TaskStatus
+from .tracing import StatusCode, get_tracer
+from .usage_ledger import UsageLedger, get_usage_ledger
 
 # Import LLM abstraction layer (Phase 1C)
 try:
@@ -149,6 +153,7 @@ class TaskExecutor:
         registry: Agent registry
         scripts_dir: Path to scripts library (optional)
         default_agent: Default agent name if not specified
+        metrics: Metrics registry receiving execution counts and latencies
 
     Example:
         >>> executor = TaskExecutor(registry=registry)
@@ -159,7 +164,9 @@ class TaskExecutor:
         self,
         registry: AgentRegistry,
         scripts_dir: Optional[Path] = None,
-        default_agent: str = "claude-code"
+        default_agent: str = "claude-code",
+        metrics: Optional[MetricsRegistry] = None,
+        usage_ledger: Optional[UsageLedger] = None
     ):
         """
         Initialize task executor.
@@ -168,11 +175,30 @@ class TaskExecutor:
             registry: Agent registry
             scripts_dir: Path to scripts library
             default_agent: Default agent name
+            metrics: Metrics registry (default: process-wide registry)
+            usage_ledger: LLM usage ledger (default: process-wide ledger)
         """
         self.registry = registry
         self.scripts_dir = scripts_dir or Path(__file__).parent.parent / "scripts"
         self.default_agent = default_agent
 
+        self.metrics = metrics or get_registry()
+        self.usage_ledger = usage_ledger or get_usage_ledger()
+        self._executions_total = self.metrics.counter(
+            "coditect_task_executions_total",
+            "Task executions by agent, execution mode and final status",
+            ["agent", "mode", "status"],
+        )
+        self._execution_seconds = self.metrics.histogram(
+            "coditect_task_execution_seconds",
+            "Task execution latency in seconds",
+            ["agent", "mode"],
+        )
+        self._in_progress = self.metrics.gauge(
+            "coditect_tasks_in_progress",
+            "Tasks currently executing",
+        )
+
     async def execute(
         self,
         task: AgentTask,
@@ -219,24 +245,41 @@ class TaskExecutor:
             started_at=datetime.now(),
         )
 
-        try:
-            # Execute based on mode
-            if exec_mode == AgentInterface.TASK_TOOL.value or exec_mode == "interactive":
-                result = await self._execute_interactive(task, agent_config, result)
+        start = time.perf_counter()
+        self._in_progress.inc()
+        with get_tracer().start_as_current_span(
+            "task.execute",
+            {"task_id": task.task_id, "agent": agent_name, "mode": exec_mode},
+        ) as span:
+            try:
+                # Execute based on mode
+                if exec_mode == AgentInterface.TASK_TOOL.value or exec_mode == "interactive":
+                    result = await self._execute_interactive(task, agent_config, result)
 
-            elif exec_mode == AgentInterface.API.value:
-                result = await self._execute_api(task, agent_config, result)
+                elif exec_mode == AgentInterface.API.value:
+                    result = await self._execute_api(task, agent_config, result)
 
-            elif exec_mode == AgentInterface.HYBRID.value:
-                result = await self._execute_hybrid(task, agent_config, result)
+                elif exec_mode == AgentInterface.HYBRID.value:
+                    result = await self._execute_hybrid(task, agent_config, result)
 
-            else:
-                raise ValueError(f"Unknown execution mode: {exec_mode}")
+                else:
+                    raise ValueError(f"Unknown execution mode: {exec_mode}")
 
-        except Exception as e:
-            result.status = ExecutionStatus.FAILED
-            result.error = str(e)
-            result.completed_at = datetime.now()
+            except Exception as e:
+                result.status = ExecutionStatus.FAILED
+                result.error = str(e)
+                result.completed_at = datetime.now()
+                span.record_exception(e)
+
+            finally:
+                self._in_progress.dec()
+
+            span.set_attribute("status", result.status.value)
+            if result.status == ExecutionStatus.FAILED:
+                span.set_status(StatusCode.ERROR, result.error)
+
+        self._execution_seconds.labels(agent_name, exec_mode).observe(time.perf_counter() - start)
+        self._executions_total.labels(agent_name, exec_mode, result.status.value).inc()
 
         return result
 
@@ -408,20 +451,24 @@ class TaskExecutor:
 
                 # Phase 2C: Build framework-aware system prompt
                 if FRAMEWORK_KNOWLEDGE_AVAILABLE:
+                    tracer = get_tracer()
                     try:
-                        prompt_builder = SystemPromptBuilder()
+                        with tracer.start_as_current_span("framework_knowledge.load"):
+                            prompt_builder = SystemPromptBuilder()
 
                         # Determine task type from metadata
                         task_type = task.metadata.get("task_type", "general")
 
                         # Build comprehensive system prompt with framework knowledge
-                        system_prompt = prompt_builder.build_prompt(
-                            task_type=task_type,
-                            include_agents=True,
-                            include_skills=True,
-                            include_commands=True,
-                            custom_context=agent_config.metadata.get("system_prompt")
-                        )
+                        with tracer.start_as_current_span("prompt.build", {"task_type": task_type}) as span:
+                            system_prompt = prompt_builder.build_prompt(
+                                task_type=task_type,
+                                include_agents=True,
+                                include_skills=True,
+                                include_commands=True,
+                                custom_context=agent_config.metadata.get("system_prompt")
+                            )
+                            span.set_attribute("prompt_chars", len(system_prompt))
 
                         messages.append({
                             "role": "system",
@@ -465,13 +512,14 @@ class TaskExecutor:
 
                 # Success
                 result.status = ExecutionStatus.SUCCESS
-                result.output = response
+                result.output = str(response)
                 result.completed_at = datetime.now()
                 result.metadata["execution_method"] = "llm_bindings"  # Phase 2A
                 result.metadata["provider"] = llm_config.provider
                 result.metadata["model"] = llm_config.model
                 result.metadata["agent_id"] = agent_id
                 result.metadata["binding_source"] = "agent-llm-bindings.yaml"
+                self._record_usage(result, agent_id, llm_config, response)
 
                 return result
 
@@ -513,6 +561,35 @@ class TaskExecutor:
 
         return result
 
+    def _record_usage(
+        self,
+        result: ExecutionResult,
+        agent_id: str,
+        llm_config: Any,
+        response: Any
+    ) -> None:
+        """
+        Copy token usage and latency from an LlmResponse into result
+        metadata (tokens_used/estimated_cost are read by SlashCommandRouter)
+        and add it to the usage ledger.
+        """
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+
+        result.metadata.update({
+            "tokens_used": usage.total_tokens,
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens,
+            "cached_tokens": usage.cached_tokens,
+            "llm_latency_seconds": usage.latency_seconds,
+            "time_to_first_token_seconds": usage.time_to_first_token_seconds,
+            "estimated_cost": usage.estimated_cost,
+        })
+        self.usage_ledger.record(
+            agent_id, usage, provider=llm_config.provider, model=llm_config.model
+        )
+
     async def _execute_hybrid(
         self,
         task: AgentTask,
@@ -557,6 +634,22 @@ class TaskExecutor:
         Returns:
             Updated ExecutionResult
         """
+        with get_tracer().start_as_current_span(
+            "script.execute", {"script": script_path.name}
+        ) as span:
+            result = await self._run_script(task, script_path, result)
+            span.set_attribute("exit_code", result.metadata.get("exit_code"))
+            if result.status == ExecutionStatus.FAILED:
+                span.set_status(StatusCode.ERROR, result.error[:200])
+        return result
+
+    async def _run_script(
+        self,
+        task: AgentTask,
+        script_path: Path,
+        result: ExecutionResult
+    ) -> ExecutionResult:
+        """Run an execution script with the task as JSON on stdin."""
         try:
             # Prepare task data as JSON
             task_data = task.to_dict()
@@ -0,0 +1,638 @@
+"""
+Job Queue - Prioritized Background Execution with a Bounded Worker Pool
+=======================================================================
+
+Runs long jobs (slash command executions behind the REST API) outside the
+request that submitted them. Submissions go into a priority queue and a
+fixed number of asyncio workers pull from it, so the number of concurrent
+LLM executions stays bounded no matter how many clients are connected.
+
+Features:
+- ✅ Priority Ordering (higher priority first, FIFO within a priority)
+- ✅ Bounded Concurrency (N workers) and Bounded Backlog (QueueFullError)
+- ✅ Progress States (queued → running → completed / failed / cancelled)
+- ✅ Cancellation (queued jobs are dropped, running jobs are cancelled)
+- ✅ Completion Estimates (per-kind moving average of run time)
+- ✅ Optional SQLite Persistence (unfinished jobs are re-queued on restart)
+
+Example:
+    >>> async def run(job):
+    ...     job.report(50.0, "Halfway")
+    ...     return "success"
+    >>>
+    >>> queue = JobQueue(run, workers=4, store=JobStore("jobs.db"))
+    >>> await queue.start()
+    >>> job = queue.submit("/analyze", {"command": "/analyze"}, priority=5)
+    >>> await job.wait()
+    >>> job.state, job.outcome
+    (<JobState.COMPLETED: 'completed'>, 'success')
+    >>> await queue.stop()
+
+Copyright © 2025 AZ1.AI INC. All rights reserved.
+Developer: Hal Casteel, CEO/CTO
+Email: 1@az1.ai
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from enum import Enum
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+from uuid import uuid4
+
+from .metrics import MetricsRegistry, get_registry
+
+logger = logging.getLogger(__name__)
+
+# Smoothing factor for the per-kind run time moving average
+DURATION_EMA_ALPHA = 0.3
+
+# Running jobs never report an estimated progress above this until done
+MAX_ESTIMATED_PROGRESS = 95.0
+
+
+class QueueFullError(Exception):
+    """Raised when the job backlog is at capacity."""
+    pass
+
+
+class JobState(Enum):
+    """Lifecycle state of a job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    @property
+    def is_terminal(self) -> bool:
+        """Whether the job has finished (successfully or not)."""
+        return self in (JobState.COMPLETED, JobState.FAILED, JobState.CANCELLED)
+
+
+@dataclass
+class Job:
+    """
+    A unit of background work.
+
+    ``outcome`` is the runner's return value (stringified), e.g. the command
+    status "success" or "failed"; ``error`` is set when the runner raised.
+    """
+
+    job_id: str
+    kind: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    priority: int = 0
+    state: JobState = JobState.QUEUED
+    progress: float = 0.0
+    current_step: Optional[str] = None
+    submitted_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    outcome: Optional[str] = None
+    error: Optional[str] = None
+    seq: int = 0
+
+    def __post_init__(self):
+        self._done = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._cancel_requested = False
+        if self.state.is_terminal:
+            self._done.set()
+
+    def report(self, progress: float, step: Optional[str] = None) -> None:
+        """Record progress (0-100) and optionally the current step."""
+        self.progress = max(0.0, min(100.0, float(progress)))
+        if step is not None:
+            self.current_step = step
+
+    async def wait(self) -> "Job":
+        """Wait until the job reaches a terminal state."""
+        await self._done.wait()
+        return self
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished."""
+        return self.state.is_terminal
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "payload": self.payload,
+            "priority": self.priority,
+            "state": self.state.value,
+            "progress": self.progress,
+            "current_step": self.current_step,
+            "submitted_at": self.submitted_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "outcome": self.outcome,
+            "error": self.error,
+            "seq": self.seq,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        """Rebuild a job from to_dict() output."""
+
+        def parse(value: Optional[str]) -> Optional[datetime]:
+            return datetime.fromisoformat(value) if value else None
+
+        return cls(
+            job_id=data["job_id"],
+            kind=data["kind"],
+            payload=data.get("payload") or {},
+            priority=data.get("priority", 0),
+            state=JobState(data["state"]),
+            progress=data.get("progress", 0.0),
+            current_step=data.get("current_step"),
+            submitted_at=parse(data.get("submitted_at")) or datetime.now(),
+            started_at=parse(data.get("started_at")),
+            completed_at=parse(data.get("completed_at")),
+            outcome=data.get("outcome"),
+            error=data.get("error"),
+            seq=data.get("seq", 0),
+        )
+
+
+class JobStore:
+    """
+    SQLite persistence for jobs.
+
+    Jobs are written on every state transition (not on progress reports),
+    so the store always knows which jobs were still queued or running when
+    the process stopped. Like the queue's in-memory history, finished jobs
+    are kept up to ``max_finished``; the oldest finished rows are pruned in
+    batches, so the table may briefly hold up to a tenth more.
+    """
+
+    def __init__(self, path: Union[str, Path], max_finished: Optional[int] = 10000):
+        """
+        Open (or create) a job database.
+
+        Args:
+            path: SQLite database file (":memory:" for a private database)
+            max_finished: Finished jobs kept in the database, most recently
+                finished first (None keeps every job)
+        """
+        self.path = str(path)
+        self.max_finished = max_finished
+        self._prune_batch = max(1, (max_finished or 0) // 10)
+        self._finished_since_prune = 0
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                data TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs(state, seq)")
+        # Trim databases written before the limit (or with a larger one)
+        self._prune_finished()
+        self._conn.commit()
+
+    def save(self, job: Job) -> None:
+        """Insert or update a job, pruning old finished jobs now and then."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, state, seq, data) VALUES (?, ?, ?, ?)",
+                (job.job_id, job.state.value, job.seq, json.dumps(job.to_dict())),
+            )
+            if job.state.is_terminal:
+                self._finished_since_prune += 1
+                if self._finished_since_prune >= self._prune_batch:
+                    self._prune_finished()
+            self._conn.commit()
+
+    def _prune_finished(self) -> None:
+        """Delete finished jobs beyond the newest max_finished (caller commits)."""
+        self._finished_since_prune = 0
+        if self.max_finished is None:
+            return
+        # INSERT OR REPLACE gives a saved row the highest rowid, so finished
+        # rows in rowid order are in the order the jobs finished
+        self._conn.execute(
+            """
+            DELETE FROM jobs WHERE rowid IN (
+                SELECT rowid FROM jobs WHERE state IN (?, ?, ?)
+                ORDER BY rowid DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (
+                JobState.COMPLETED.value,
+                JobState.FAILED.value,
+                JobState.CANCELLED.value,
+                self.max_finished,
+            ),
+        )
+
+    def load(self, job_id: str) -> Optional[Job]:
+        """Load a job by id."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return Job.from_dict(json.loads(row[0])) if row else None
+
+    def unfinished(self) -> List[Job]:
+        """Jobs that were queued or running, in submission order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM jobs WHERE state IN (?, ?) ORDER BY seq",
+                (JobState.QUEUED.value, JobState.RUNNING.value),
+            ).fetchall()
+        return [Job.from_dict(json.loads(row[0])) for row in rows]
+
+    def max_seq(self) -> int:
+        """Highest sequence number stored (0 when empty)."""
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(seq) FROM jobs").fetchone()
+        return row[0] or 0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+JobRunner = Callable[[Job], Awaitable[Any]]
+
+
+class JobQueue:
+    """
+    Priority job queue drained by a fixed pool of asyncio workers.
+
+    The runner is called with the Job and may call ``job.report()`` to
+    publish progress; its return value becomes ``job.outcome``.
+    """
+
+    def __init__(
+        self,
+        runner: JobRunner,
+        workers: int = 4,
+        max_queued: int = 1000,
+        max_finished: int = 1000,
+        store: Optional[JobStore] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        """
+        Initialize job queue.
+
+        Args:
+            runner: Coroutine function executing one job
+            workers: Number of jobs run concurrently
+            max_queued: Maximum number of jobs waiting to run
+            max_finished: Finished jobs kept in memory for status lookups
+                (older ones are still found in the store, if any, up to
+                the store's own max_finished)
+            store: Optional JobStore for persistence across restarts
+            metrics: Metrics registry (defaults to the process-wide one)
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.runner = runner
+        self.workers = workers
+        self.max_queued = max_queued
+        self.max_finished = max_finished
+        self.store = store
+
+        self._jobs: Dict[str, Job] = {}
+        self._finished: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._seq = itertools.count((store.max_seq() if store else 0) + 1)
+        self._durations: Dict[str, float] = {}
+
+        metrics = metrics or get_registry()
+        self._queued_gauge = metrics.gauge("coditect_jobs_queued", "Jobs waiting to run")
+        self._running_gauge = metrics.gauge("coditect_jobs_running", "Jobs currently running")
+        self._jobs_total = metrics.counter(
+            "coditect_jobs_total", "Finished jobs by final state", ["state"]
+        )
+        self._wait_seconds = metrics.histogram(
+            "coditect_job_wait_seconds", "Time jobs spent queued before running"
+        )
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> int:
+        """
+        Start the workers, re-queueing unfinished jobs.
+
+        Jobs left queued by an earlier stop() and, with a store, jobs that
+        were queued or running when the process exited are queued again.
+
+        Returns:
+            Number of jobs re-queued
+        """
+        if self._worker_tasks:
+            return 0
+        self._queue = asyncio.PriorityQueue()
+
+        # Jobs left queued by an earlier stop() plus, for a persistent
+        # queue, whatever the store still has as unfinished
+        pending = {job.job_id: job for job in self._jobs.values()}
+        if self.store:
+            for job in self.store.unfinished():
+                pending.setdefault(job.job_id, job)
+
+        recovered = 0
+        for job in sorted(pending.values(), key=self._sort_key):
+            if job.state == JobState.RUNNING:
+                # Interrupted mid-run: start over from the queue
+                job.state = JobState.QUEUED
+                job.started_at = None
+                job.progress = 0.0
+                job.current_step = "Re-queued after restart"
+                if self.store:
+                    self.store.save(job)
+            self._enqueue(job)
+            recovered += 1
+        if recovered:
+            logger.info(f"Re-queued {recovered} unfinished job(s)")
+
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(self.workers)
+        ]
+        return recovered
+
+    async def stop(self) -> None:
+        """
+        Stop the workers.
+
+        Running jobs are cancelled and left QUEUED in the store, so a
+        persistent queue resumes them on the next start().
+        """
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    @property
+    def running(self) -> bool:
+        """Whether workers are active."""
+        return bool(self._worker_tasks)
+
+    # ------------------------------------------------------------------
+    # Submission and lookup
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        kind: str,
+        payload: Optional[Dict[str, Any]] = None,
+        priority: int = 0,
+        job_id: Optional[str] = None,
+    ) -> Job:
+        """
+        Queue a job.
+
+        Args:
+            kind: Job kind (e.g. the command name), used for run time estimates
+            payload: JSON-serializable job input
+            priority: Higher runs first; equal priorities run in FIFO order
+            job_id: Id to use (generated if omitted)
+
+        Returns:
+            The queued Job
+
+        Raises:
+            RuntimeError: If the queue has not been started
+            QueueFullError: If max_queued jobs are already waiting
+        """
+        if self._queue is None:
+            raise RuntimeError("JobQueue.start() has not been called")
+        if self.queued_count >= self.max_queued:
+            raise QueueFullError(f"Job queue is full ({self.max_queued} jobs waiting)")
+
+        job = Job(
+            job_id=job_id or f"JOB-{uuid4().hex[:12]}",
+            kind=kind,
+            payload=payload or {},
+            priority=priority,
+            current_step="Queued",
+            seq=next(self._seq),
+        )
+        if self.store:
+            self.store.save(job)
+        self._enqueue(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job (in memory first, then in the store)."""
+        job = self._jobs.get(job_id) or self._finished.get(job_id)
+        if job is None and self.store:
+            job = self.store.load(job_id)
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job.
+
+        Queued jobs are marked cancelled immediately; running jobs have their
+        task cancelled and become CANCELLED once it unwinds.
+
+        Returns:
+            True if the job was queued or running, False if unknown or finished
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.done:
+            return False
+
+        if job.state == JobState.QUEUED:
+            # Left in the heap; workers skip it when popped
+            self._finish(job, JobState.CANCELLED, step="Cancelled")
+            return True
+
+        job._cancel_requested = True
+        job.current_step = "Cancelling"
+        if job._task is not None:
+            job._task.cancel()
+        return True
+
+    @property
+    def queued_count(self) -> int:
+        """Number of jobs waiting to run."""
+        return sum(1 for job in self._jobs.values() if job.state == JobState.QUEUED)
+
+    @property
+    def running_count(self) -> int:
+        """Number of jobs currently running."""
+        return sum(1 for job in self._jobs.values() if job.state == JobState.RUNNING)
+
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based position of a queued job among waiting jobs (None if not queued)."""
+        job = self._jobs.get(job_id)
+        if job is None or job.state != JobState.QUEUED:
+            return None
+        key = self._sort_key(job)
+        return 1 + sum(
+            1
+            for other in self._jobs.values()
+            if other.state == JobState.QUEUED and self._sort_key(other) < key
+        )
+
+    # ------------------------------------------------------------------
+    # Estimates
+    # ------------------------------------------------------------------
+
+    def expected_duration(self, kind: str) -> Optional[float]:
+        """Moving average run time in seconds for a job kind (any kind as fallback)."""
+        if kind in self._durations:
+            return self._durations[kind]
+        if self._durations:
+            return sum(self._durations.values()) / len(self._durations)
+        return None
+
+    def estimated_progress(self, job: Job) -> float:
+        """
+        Progress for display: the runner's report, or for running jobs the
+        elapsed share of the expected run time if that is further along.
+        """
+        if job.state == JobState.COMPLETED:
+            return 100.0
+        if job.state != JobState.RUNNING or job.started_at is None:
+            return job.progress
+        expected = self.expected_duration(job.kind)
+        if not expected:
+            return job.progress
+        elapsed = (datetime.now() - job.started_at).total_seconds()
+        return max(job.progress, min(MAX_ESTIMATED_PROGRESS, 100.0 * elapsed / expected))
+
+    def estimated_completion(self, job: Job) -> Optional[datetime]:
+        """Expected completion time (actual completion time once finished)."""
+        if job.done:
+            return job.completed_at
+        expected = self.expected_duration(job.kind)
+        if expected is None:
+            return None
+        if job.state == JobState.RUNNING and job.started_at:
+            return max(datetime.now(), job.started_at + timedelta(seconds=expected))
+        ahead = (self.position(job.job_id) or 1) - 1
+        # Jobs ahead drain `workers` at a time, then this one runs
+        waves = ahead // self.workers + 1
+        return datetime.now() + timedelta(seconds=expected * waves)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _sort_key(job: Job):
+        return (-job.priority, job.seq)
+
+    def _enqueue(self, job: Job) -> None:
+        self._jobs[job.job_id] = job
+        self._queue.put_nowait((*self._sort_key(job), job.job_id))
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        self._queued_gauge.set(self.queued_count)
+        self._running_gauge.set(self.running_count)
+
+    def _finish(
+        self,
+        job: Job,
+        state: JobState,
+        step: Optional[str] = None,
+        outcome: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        job.state = state
+        job.completed_at = datetime.now()
+        job.outcome = outcome
+        job.error = error
+        if step is not None:
+            job.current_step = step
+        if state == JobState.COMPLETED:
+            job.progress = 100.0
+        job._task = None
+        job._done.set()
+
+        self._jobs.pop(job.job_id, None)
+        self._finished[job.job_id] = job
+        while len(self._finished) > self.max_finished:
+            self._finished.popitem(last=False)
+
+        if self.store:
+            self.store.save(job)
+        self._jobs_total.labels(state.value).inc()
+        self._update_gauges()
+
+    def _record_duration(self, job: Job) -> None:
+        duration = (job.completed_at - job.started_at).total_seconds()
+        previous = self._durations.get(job.kind)
+        self._durations[job.kind] = (
+            duration
+            if previous is None
+            else DURATION_EMA_ALPHA * duration + (1 - DURATION_EMA_ALPHA) * previous
+        )
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, job_id = await self._queue.get()
+            try:
+                job = self._jobs.get(job_id)
+                if job is None or job.state != JobState.QUEUED:
+                    continue  # cancelled while waiting
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.state = JobState.RUNNING
+        job.started_at = datetime.now()
+        job.current_step = "Running"
+        self._wait_seconds.observe((job.started_at - job.submitted_at).total_seconds())
+        if self.store:
+            self.store.save(job)
+        self._update_gauges()
+
+        job._task = asyncio.create_task(self.runner(job))
+        try:
+            outcome = await job._task
+        except asyncio.CancelledError:
+            if not job._cancel_requested:
+                # Worker shutdown: leave the job for the next start()
+                job._task.cancel()
+                job.state = JobState.QUEUED
+                job.started_at = None
+                job._task = None
+                if self.store:
+                    self.store.save(job)
+                raise
+            self._finish(job, JobState.CANCELLED, step="Cancelled")
+        except Exception as e:
+            logger.error(f"Job {job.job_id} failed: {e}", exc_info=True)
+            self._finish(job, JobState.FAILED, step="Failed", error=f"{type(e).__name__}: {e}")
+        else:
+            self._finish(
+                job,
+                JobState.COMPLETED,
+                step="Completed",
+                outcome=None if outcome is None else str(outcome),
+            )
+            self._record_duration(job)
@@ -0,0 +1,437 @@
+"""
+Metrics Registry - Aggregated Latency/Throughput Instrumentation
+================================================================
+
+Process-wide registry of labeled counters, gauges and fixed-bucket
+histograms, exported in the Prometheus text exposition format.
+
+Every update is O(1) and allocation-free: a labeled child is created once
+per label combination, after which increments only touch a few numbers
+under a per-child lock. Memory grows with the number of distinct label
+combinations, never with the number of observations.
+
+Standard metrics (registered by their instrumentation points):
+    - coditect_task_executions_total / coditect_task_execution_seconds
+      (TaskExecutor)
+    - coditect_llm_requests_total / coditect_llm_request_seconds /
+      coditect_llm_tokens_total (LlmFactory providers)
+    - coditect_http_requests_total / coditect_http_request_seconds
+      (REST API, served at /metrics)
+
+Example:
+    >>> from orchestration.metrics import get_registry
+    >>>
+    >>> registry = get_registry()
+    >>> requests = registry.counter(
+    ...     "myservice_requests_total", "Requests handled", ["endpoint"]
+    ... )
+    >>> requests.labels(endpoint="/users").inc()
+    >>>
+    >>> latency = registry.histogram(
+    ...     "myservice_request_seconds", "Request latency", ["endpoint"]
+    ... )
+    >>> with latency.labels(endpoint="/users").time():
+    ...     handle_request()
+    >>>
+    >>> print(registry.render())
+
+Copyright © 2025 AZ1.AI INC. All rights reserved.
+"""
+
+import math
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Prometheus text format version served by render()
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets (seconds) covering sub-millisecond calls to long LLM requests
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+_NAME_PATTERN = re.compile(r"^[a-zA-Z_:][a-zA-Z0-9_:]*$")
+_LABEL_PATTERN = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way Prometheus expects."""
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape_label_value(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _CounterChild:
+    """Single counter time series."""
+
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment by a non-negative amount."""
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts")
+        with self._lock:
+            self._value += amount
+
+    def get(self) -> float:
+        return self._value
+
+
+class _GaugeChild:
+    """Single gauge time series."""
+
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    @contextmanager
+    def track_inprogress(self) -> Iterator[None]:
+        """Increment while the block runs."""
+        self.inc()
+        try:
+            yield
+        finally:
+            self.dec()
+
+    def get(self) -> float:
+        return self._value
+
+
+class _HistogramChild:
+    """Single histogram time series with fixed bucket upper bounds."""
+
+    __slots__ = ("_upper_bounds", "_counts", "_sum", "_lock")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self._upper_bounds = upper_bounds
+        self._counts = [0] * (len(upper_bounds) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index = bisect_left(self._upper_bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the wall-clock duration of the block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def get(self) -> Dict:
+        """Cumulative bucket counts, sum and count."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self._upper_bounds + (math.inf,), counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"buckets": buckets, "sum": total, "count": cumulative}
+
+
+class _Metric:
+    """Metric family: one child per label combination."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        if not _NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid metric name: {name!r}")
+        for label in labelnames:
+            if not _LABEL_PATTERN.match(label) or label.startswith("__"):
+                raise ValueError(f"Invalid label name for {name}: {label!r}")
+
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+        if not self.labelnames:
+            self._default = self._get_child(())
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _get_child(self, key: Tuple[str, ...]):
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_child()
+        return child
+
+    def labels(self, *values: str, **kwargs: str):
+        """
+        Return the child for a label combination (created on first use).
+
+        Raises:
+            ValueError: If the labels don't match the metric's label names
+        """
+        if kwargs:
+            if values:
+                raise ValueError("Pass label values positionally or by name, not both")
+            if set(kwargs) != set(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {list(self.labelnames)}, got {sorted(kwargs)}"
+                )
+            values = tuple(kwargs[name] for name in self.labelnames)
+        elif len(values) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects {len(self.labelnames)} label values, got {len(values)}"
+            )
+
+        return self._get_child(tuple(str(value) for value in values))
+
+    def _unlabeled(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels {list(self.labelnames)}; use labels()")
+        return self._default
+
+    def samples(self) -> List[Tuple[Tuple[str, ...], object]]:
+        """Snapshot of (label values, child) pairs."""
+        with self._lock:
+            return list(self._children.items())
+
+    def clear(self) -> None:
+        """Drop all children (and reset the unlabeled series)."""
+        with self._lock:
+            self._children.clear()
+        if not self.labelnames:
+            self._default = self._get_child(())
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {_escape_help(self.documentation)}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for values, child in self.samples():
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.get())}"
+            )
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._unlabeled().inc(amount)
+
+    def get(self) -> float:
+        return self._unlabeled().get()
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._unlabeled().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._unlabeled().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._unlabeled().dec(amount)
+
+    def track_inprogress(self):
+        return self._unlabeled().track_inprogress()
+
+    def get(self) -> float:
+        return self._unlabeled().get()
+
+
+class Histogram(_Metric):
+    """Distribution of observations in fixed buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        upper_bounds = tuple(sorted(float(b) for b in buckets if b != math.inf))
+        if not upper_bounds:
+            raise ValueError(f"Histogram {name} needs at least one bucket")
+        if "le" in labelnames:
+            raise ValueError(f"Histogram {name} cannot use the reserved label 'le'")
+        self.upper_bounds = upper_bounds
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float) -> None:
+        self._unlabeled().observe(value)
+
+    def time(self):
+        return self._unlabeled().time()
+
+    def get(self) -> Dict:
+        return self._unlabeled().get()
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {_escape_help(self.documentation)}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for values, child in self.samples():
+            data = child.get()
+            for bound, count in data["buckets"].items():
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {count}"
+                )
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(data['sum'])}")
+            lines.append(f"{self.name}_count{labels} {data['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Collection of named metrics.
+
+    Registration is idempotent: asking for an existing metric with the same
+    type and label names returns it, so instrumentation points can declare
+    their metrics wherever they are used.
+
+    Example:
+        >>> registry = MetricsRegistry()
+        >>> registry.counter("jobs_total", "Jobs run", ["status"]).labels("ok").inc()
+        >>> "jobs_total" in registry.render()
+        True
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+                    return metric
+
+        if type(metric) is not cls or metric.labelnames != tuple(labelnames):
+            raise ValueError(
+                f"Metric {name} already registered as {metric.type_name} "
+                f"with labels {list(metric.labelnames)}"
+            )
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram (buckets apply on first registration)."""
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """Look up a registered metric by name."""
+        return self._metrics.get(name)
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def clear(self) -> None:
+        """Reset all values (metric definitions are kept)."""
+        for metric in list(self._metrics.values()):
+            metric.clear()
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+# Process-wide default registry
+REGISTRY = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """Return the process-wide default registry."""
+    return REGISTRY
@@ -0,0 +1,501 @@
+"""
+Result Store - Bounded, Persistent Storage for Command Results
+==============================================================
+
+Keeps CommandResults addressable by command id without holding every
+result (and its full LLM output) in memory forever.
+
+Two tiers:
+- Memory: LRU cache bounded by entry count and total output bytes, with a
+  TTL after which entries are dropped from memory
+- SQLite (optional): durable index of every result; outputs larger than
+  ``inline_limit`` are gzip-compressed into content-addressed blob files
+  instead of being stored in the row
+
+Lookups hit memory first and fall back to SQLite (promoting the result
+back into memory). Listing is paginated with an opaque cursor and never
+loads outputs.
+
+Storage Layout:
+    {path}                      SQLite index (results table)
+    {path}.blobs/ab/abcd....gz  compressed outputs above inline_limit
+
+Example:
+    >>> store = ResultStore(max_entries=500, ttl_seconds=900, path="results.db")
+    >>> store.put("CMD-analyze-1", result)
+    >>> store.get("CMD-analyze-1").output
+    'Analysis complete...'
+    >>> page = store.list(limit=20)
+    >>> more = store.list(limit=20, cursor=page.next_cursor)
+
+Copyright © 2025 AZ1.AI INC. All rights reserved.
+Developer: Hal Casteel, CEO/CTO
+Email: 1@az1.ai
+"""
+
+import gzip
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .command_result import CommandResult
+
+# Outputs above this many bytes (UTF-8) are stored out of line
+DEFAULT_INLINE_LIMIT = 16 * 1024
+
+# Prune the SQLite tier every this many puts
+PRUNE_EVERY = 100
+
+
+@dataclass
+class ResultSummary:
+    """Listing entry for a stored result (without its output)."""
+
+    command_id: str
+    command: str
+    status: str
+    agent_used: Optional[str] = None
+    completed_at: Optional[datetime] = None
+    execution_time_seconds: Optional[float] = None
+    output_size: int = 0
+
+    @classmethod
+    def from_result(cls, command_id: str, result: CommandResult) -> "ResultSummary":
+        """Summarize a CommandResult."""
+        return cls(
+            command_id=command_id,
+            command=result.command,
+            status=result.status.value,
+            agent_used=result.agent_used,
+            completed_at=result.completed_at,
+            execution_time_seconds=result.execution_time_seconds,
+            output_size=len((result.output or "").encode("utf-8")),
+        )
+
+
+@dataclass
+class ResultPage:
+    """One page of result summaries, newest first."""
+
+    items: List[ResultSummary] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+@dataclass
+class _CacheEntry:
+    seq: int
+    result: CommandResult
+    size: int
+    expires_at: float
+
+
+class ResultStore:
+    """
+    Two-tier command result store (memory LRU+TTL over optional SQLite).
+
+    Thread-safe; all methods are synchronous and cheap enough to call from
+    an event loop (SQLite writes are single-row, outputs above the inline
+    limit go to files).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: Optional[float] = 3600.0,
+        path: Optional[Union[str, Path]] = None,
+        inline_limit: int = DEFAULT_INLINE_LIMIT,
+        retention_seconds: Optional[float] = 7 * 24 * 3600.0,
+        max_persisted: Optional[int] = None,
+    ):
+        """
+        Initialize result store.
+
+        Args:
+            max_entries: Maximum results kept in memory
+            max_bytes: Maximum total output bytes kept in memory
+            ttl_seconds: Memory lifetime of a result (None = until evicted)
+            path: SQLite file for the persistent tier (None = memory only)
+            inline_limit: Outputs larger than this are stored as blob files
+            retention_seconds: Age after which persisted results are pruned
+                (None = keep forever)
+            max_persisted: Maximum persisted results, oldest pruned first
+                (None = unbounded)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.inline_limit = inline_limit
+        self.retention_seconds = retention_seconds
+        self.max_persisted = max_persisted
+
+        self._lock = threading.RLock()
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._cache_bytes = 0
+        self._puts = 0
+        self._seq = itertools.count(1)  # listing order without SQLite
+
+        self.path: Optional[Path] = None
+        self.blob_dir: Optional[Path] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self.path = Path(path)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.blob_dir = self.path.with_name(self.path.name + ".blobs")
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    command_id TEXT NOT NULL UNIQUE,
+                    stored_at REAL NOT NULL,
+                    status TEXT NOT NULL,
+                    summary TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    output TEXT,
+                    output_ref TEXT
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS results_ref ON results(output_ref)")
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def put(self, command_id: str, result: CommandResult) -> None:
+        """Store (or replace) the result for a command id."""
+        with self._lock:
+            if self._conn is not None:
+                seq = self._persist(command_id, result)
+                self._puts += 1
+                if self._puts % PRUNE_EVERY == 0:
+                    self.prune()
+            else:
+                seq = next(self._seq)
+            self._cache_put(command_id, result, seq)
+
+    def get(self, command_id: str) -> Optional[CommandResult]:
+        """Look up a result (memory first, then SQLite)."""
+        with self._lock:
+            entry = self._cache.get(command_id)
+            if entry is not None:
+                if self._expired(entry):
+                    self._cache_drop(command_id)
+                else:
+                    self._cache.move_to_end(command_id)
+                    return entry.result
+
+            if self._conn is None:
+                return None
+            loaded = self._load(command_id)
+            if loaded is None:
+                return None
+            seq, result = loaded
+            self._cache_put(command_id, result, seq)
+            return result
+
+    def __contains__(self, command_id: str) -> bool:
+        with self._lock:
+            entry = self._cache.get(command_id)
+            if entry is not None and not self._expired(entry):
+                return True
+            if self._conn is None:
+                return False
+            return self._conn.execute(
+                "SELECT 1 FROM results WHERE command_id = ?", (command_id,)
+            ).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._conn is not None:
+                return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            self._expire()
+            return len(self._cache)
+
+    def delete(self, command_id: str) -> bool:
+        """Remove a result from both tiers. Returns True if it existed."""
+        with self._lock:
+            existed = self._cache_drop(command_id)
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT output_ref FROM results WHERE command_id = ?", (command_id,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute("DELETE FROM results WHERE command_id = ?", (command_id,))
+                    self._conn.commit()
+                    self._release_blob(row[0])
+                    existed = True
+            return existed
+
+    def list(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> ResultPage:
+        """
+        List result summaries, newest first.
+
+        Args:
+            limit: Page size
+            cursor: next_cursor of the previous page
+            status: Only results with this status (e.g. "failed")
+
+        Returns:
+            ResultPage with items and the cursor of the next page (None at the end)
+        """
+        before = int(cursor) if cursor else None
+        with self._lock:
+            if self._conn is not None:
+                rows = self._query_page(limit + 1, before, status)
+            else:
+                self._expire()
+                rows = sorted(
+                    (
+                        (entry.seq, ResultSummary.from_result(command_id, entry.result))
+                        for command_id, entry in self._cache.items()
+                        if (before is None or entry.seq < before)
+                        and (status is None or entry.result.status.value == status)
+                    ),
+                    key=lambda row: row[0],
+                    reverse=True,
+                )[: limit + 1]
+
+        items = [summary for _, summary in rows[:limit]]
+        next_cursor = str(rows[limit - 1][0]) if len(rows) > limit else None
+        return ResultPage(items=items, next_cursor=next_cursor)
+
+    def prune(self) -> int:
+        """
+        Apply retention to the SQLite tier.
+
+        Returns:
+            Number of persisted results removed
+        """
+        if self._conn is None:
+            return 0
+        with self._lock:
+            doomed: List[Tuple[str, Optional[str]]] = []
+            if self.retention_seconds is not None:
+                cutoff = time.time() - self.retention_seconds
+                doomed += self._conn.execute(
+                    "SELECT command_id, output_ref FROM results WHERE stored_at < ?", (cutoff,)
+                ).fetchall()
+            if self.max_persisted is not None:
+                doomed += self._conn.execute(
+                    "SELECT command_id, output_ref FROM results ORDER BY seq DESC LIMIT -1 OFFSET ?",
+                    (self.max_persisted,),
+                ).fetchall()
+
+            removed = dict(doomed)
+            if not removed:
+                return 0
+            self._conn.executemany(
+                "DELETE FROM results WHERE command_id = ?", [(cid,) for cid in removed]
+            )
+            self._conn.commit()
+            for command_id, ref in removed.items():
+                self._cache_drop(command_id)
+                self._release_blob(ref)
+            return len(removed)
+
+    def stats(self) -> Dict[str, int]:
+        """Memory and persistent tier sizes."""
+        with self._lock:
+            stats = {"cached": len(self._cache), "cached_bytes": self._cache_bytes}
+            if self._conn is not None:
+                stats["persisted"], stats["out_of_line"] = self._conn.execute(
+                    "SELECT COUNT(*), COUNT(output_ref) FROM results"
+                ).fetchone()
+            return stats
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    def _expired(self, entry: _CacheEntry) -> bool:
+        return entry.expires_at <= time.monotonic()
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for command_id in [cid for cid, entry in self._cache.items() if entry.expires_at <= now]:
+            self._cache_drop(command_id)
+
+    def _cache_put(self, command_id: str, result: CommandResult, seq: int) -> None:
+        self._cache_drop(command_id)
+        size = len((result.output or "").encode("utf-8"))
+        if size > self.max_bytes:
+            return  # too big to cache; served from SQLite (or not kept at all)
+        expires_at = (
+            time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else float("inf")
+        )
+        self._cache[command_id] = _CacheEntry(seq, result, size, expires_at)
+        self._cache_bytes += size
+        while self._cache and (
+            len(self._cache) > self.max_entries or self._cache_bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._cache))
+            self._cache_drop(oldest)
+
+    def _cache_drop(self, command_id: str) -> bool:
+        entry = self._cache.pop(command_id, None)
+        if entry is None:
+            return False
+        self._cache_bytes -= entry.size
+        return True
+
+    # ------------------------------------------------------------------
+    # SQLite tier
+    # ------------------------------------------------------------------
+
+    def _persist(self, command_id: str, result: CommandResult) -> int:
+        data = result.to_dict()
+        output = data.pop("output") or ""
+        encoded = output.encode("utf-8")
+        output_ref = None
+        if len(encoded) > self.inline_limit:
+            output_ref = self._write_blob(encoded)
+            output = None
+
+        summary = ResultSummary.from_result(command_id, result)
+        previous = self._conn.execute(
+            "SELECT output_ref FROM results WHERE command_id = ?", (command_id,)
+        ).fetchone()
+        cursor = self._conn.execute(
+            "INSERT OR REPLACE INTO results "
+            "(command_id, stored_at, status, summary, data, output, output_ref) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                command_id,
+                time.time(),
+                summary.status,
+                json.dumps(_summary_to_dict(summary)),
+                json.dumps(data, default=str),
+                output,
+                output_ref,
+            ),
+        )
+        self._conn.commit()
+        if previous is not None and previous[0] != output_ref:
+            self._release_blob(previous[0])
+        return cursor.lastrowid
+
+    def _load(self, command_id: str) -> Optional[Tuple[int, CommandResult]]:
+        row = self._conn.execute(
+            "SELECT seq, data, output, output_ref FROM results WHERE command_id = ?",
+            (command_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        seq, data, output, output_ref = row
+        data = json.loads(data)
+        data["output"] = self._read_blob(output_ref).decode("utf-8") if output_ref else output
+        return seq, CommandResult.from_dict(data)
+
+    def _query_page(
+        self, limit: int, before: Optional[int], status: Optional[str]
+    ) -> List[Tuple[int, ResultSummary]]:
+        clauses, params = [], []
+        if before is not None:
+            clauses.append("seq < ?")
+            params.append(before)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn.execute(
+            f"SELECT seq, summary FROM results {where} ORDER BY seq DESC LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        return [(seq, _summary_from_dict(json.loads(summary))) for seq, summary in rows]
+
+    # ------------------------------------------------------------------
+    # Out-of-line outputs
+    # ------------------------------------------------------------------
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / f"{digest}.gz"
+
+    def _write_blob(self, content: bytes) -> str:
+        """Store content once under its SHA256; returns the digest."""
+        digest = hashlib.sha256(content).hexdigest()
+        target = self._blob_path(digest)
+        if target.exists():
+            return digest
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.parent / f".{target.name}.tmp.{os.getpid()}.{threading.get_ident()}"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(gzip.compress(content, compresslevel=6, mtime=0))
+            os.replace(temp_path, target)
+        except Exception:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise
+        return digest
+
+    def _read_blob(self, digest: str) -> bytes:
+        try:
+            with open(self._blob_path(digest), "rb") as f:
+                return gzip.decompress(f.read())
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Result output blob missing: {digest}") from None
+
+    def _release_blob(self, digest: Optional[str]) -> None:
+        """Delete a blob once no stored result references it."""
+        if not digest:
+            return
+        still_used = self._conn.execute(
+            "SELECT 1 FROM results WHERE output_ref = ? LIMIT 1", (digest,)
+        ).fetchone()
+        if still_used is None:
+            try:
+                self._blob_path(digest).unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _summary_to_dict(summary: ResultSummary) -> Dict:
+    return {
+        "command_id": summary.command_id,
+        "command": summary.command,
+        "status": summary.status,
+        "agent_used": summary.agent_used,
+        "completed_at": summary.completed_at.isoformat() if summary.completed_at else None,
+        "execution_time_seconds": summary.execution_time_seconds,
+        "output_size": summary.output_size,
+    }
+
+
+def _summary_from_dict(data: Dict) -> ResultSummary:
+    completed_at = data.get("completed_at")
+    return ResultSummary(
+        command_id=data["command_id"],
+        command=data["command"],
+        status=data["status"],
+        agent_used=data.get("agent_used"),
+        completed_at=datetime.fromisoformat(completed_at) if completed_at else None,
+        execution_time_seconds=data.get("execution_time_seconds"),
+        output_size=data.get("output_size", 0),
+    )
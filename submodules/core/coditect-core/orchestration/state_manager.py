@@ -43,6 +43,8 @@ from enum import IntEnum
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from .tracing import get_tracer
+
 
 class StateFormatVersion(IntEnum):
     """State file format version for migrations."""
@@ -137,60 +139,63 @@ class StateManager:
         if not tasks:
             raise ValueError("Cannot save empty task list")
 
-        # Load existing state to get metadata
-        existing_state = {}
-        if self.state_file.exists():
-            try:
-                existing_state = self._load_json(self.state_file)
-            except Exception:
-                pass  # Ignore errors loading existing state
-
-        # Initialize or update metadata
-        if metadata is None:
-            metadata = StateMetadata(
-                project_id=project_id or existing_state.get("project_id", ""),
-                created_at=(
-                    datetime.fromisoformat(existing_state["metadata"]["created_at"])
-                    if "metadata" in existing_state and "created_at" in existing_state["metadata"]
-                    else datetime.now()
-                ),
-                last_updated=datetime.now(),
-                last_updated_by="StateManager",
-                total_state_changes=existing_state.get("metadata", {}).get("total_state_changes", 0) + 1,
-            )
-
-        # Compute metrics
-        completed_tasks = sum(1 for t in tasks.values() if t.get("status") == "completed")
-        total_tasks = len(tasks)
-        completion_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0.0
-
-        # Build state structure
-        state = {
-            "version": metadata.version,
-            "format_version": metadata.format_version,
-            "project_id": metadata.project_id,
-            "last_updated": metadata.last_updated.isoformat(),
-            "last_updated_by": metadata.last_updated_by,
-            "tasks": tasks,
-            "metrics": {
-                "total_tasks": total_tasks,
-                "completed_tasks": completed_tasks,
-                "in_progress_tasks": sum(1 for t in tasks.values() if t.get("status") == "in_progress"),
-                "pending_tasks": sum(1 for t in tasks.values() if t.get("status") == "pending"),
-                "completion_percentage": round(completion_percentage, 2),
-            },
-            "metadata": {
-                "created_at": metadata.created_at.isoformat(),
-                "total_state_changes": metadata.total_state_changes,
-            },
-        }
-
-        # Add checksum if enabled
-        if self.checksum_enabled:
-            state["checksum"] = self._compute_checksum(tasks)
-
-        # Atomic write
-        self._atomic_write(self.state_file, state, fsync=self.fsync_enabled)
+        with get_tracer().start_as_current_span(
+            "state.save", {"state_file": self.state_file.name, "tasks": len(tasks)}
+        ):
+            # Load existing state to get metadata
+            existing_state = {}
+            if self.state_file.exists():
+                try:
+                    existing_state = self._load_json(self.state_file)
+                except Exception:
+                    pass  # Ignore errors loading existing state
+
+            # Initialize or update metadata
+            if metadata is None:
+                metadata = StateMetadata(
+                    project_id=project_id or existing_state.get("project_id", ""),
+                    created_at=(
+                        datetime.fromisoformat(existing_state["metadata"]["created_at"])
+                        if "metadata" in existing_state and "created_at" in existing_state["metadata"]
+                        else datetime.now()
+                    ),
+                    last_updated=datetime.now(),
+                    last_updated_by="StateManager",
+                    total_state_changes=existing_state.get("metadata", {}).get("total_state_changes", 0) + 1,
+                )
+
+            # Compute metrics
+            completed_tasks = sum(1 for t in tasks.values() if t.get("status") == "completed")
+            total_tasks = len(tasks)
+            completion_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0.0
+
+            # Build state structure
+            state = {
+                "version": metadata.version,
+                "format_version": metadata.format_version,
+                "project_id": metadata.project_id,
+                "last_updated": metadata.last_updated.isoformat(),
+                "last_updated_by": metadata.last_updated_by,
+                "tasks": tasks,
+                "metrics": {
+                    "total_tasks": total_tasks,
+                    "completed_tasks": completed_tasks,
+                    "in_progress_tasks": sum(1 for t in tasks.values() if t.get("status") == "in_progress"),
+                    "pending_tasks": sum(1 for t in tasks.values() if t.get("status") == "pending"),
+                    "completion_percentage": round(completion_percentage, 2),
+                },
+                "metadata": {
+                    "created_at": metadata.created_at.isoformat(),
+                    "total_state_changes": metadata.total_state_changes,
+                },
+            }
+
+            # Add checksum if enabled
+            if self.checksum_enabled:
+                state["checksum"] = self._compute_checksum(tasks)
+
+            # Atomic write
+            self._atomic_write(self.state_file, state, fsync=self.fsync_enabled)
 
     def load_state(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Trace Report - Flame-Style Breakdown of a Command's Spans
+=========================================================
+
+Reads spans exported by orchestration.tracing and prints where the time
+went for one command: each span with its total and self time, share of
+the root and a proportional bar, nested by parent.
+
+Usage:
+    python -m orchestration.trace_report COMMAND_ID [--file spans.jsonl]
+    python -m orchestration.trace_report --list [--file spans.jsonl]
+    python -m orchestration.trace_report --correlation ID
+
+Example output:
+    command.execute                 812.4ms 100.0%   0.9ms self  ████████████████████
+      task.execute                  811.2ms  99.9%   0.4ms self  ████████████████████
+        framework_knowledge.load     35.1ms   4.3%  35.1ms self  █
+        prompt.build                  2.2ms   0.3%   2.2ms self
+        llm.generate                773.5ms  95.2% 773.5ms self  ███████████████████
+
+Copyright © 2025 AZ1.AI INC. All rights reserved.
+"""
+
+import argparse
+import os
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from .tracing import TRACE_FILE_ENV, Span, SpanCollector, StatusCode
+
+BAR_WIDTH = 20
+
+
+def _children_by_parent(spans: List[Span]) -> Dict[Optional[str], List[Span]]:
+    ids = {span.span_id for span in spans}
+    children: Dict[Optional[str], List[Span]] = defaultdict(list)
+    for span in spans:
+        # Spans whose parent was not exported are shown as roots
+        parent = span.parent_span_id if span.parent_span_id in ids else None
+        children[parent].append(span)
+    for siblings in children.values():
+        siblings.sort(key=lambda span: span.start_time_unix_nano)
+    return children
+
+
+def render_flame(spans: List[Span], width: int = BAR_WIDTH) -> str:
+    """Render spans as an indented flame-style breakdown."""
+    if not spans:
+        return ""
+
+    children = _children_by_parent(spans)
+    roots = children[None]
+    total_ms = sum(root.duration_ms for root in roots) or 1.0
+    name_width = max(
+        len(span.name) + 2 * _depth(span, spans) for span in spans
+    ) + 2
+
+    lines: List[str] = []
+
+    def visit(span: Span, depth: int) -> None:
+        kids = children.get(span.span_id, [])
+        self_ms = max(0.0, span.duration_ms - sum(kid.duration_ms for kid in kids))
+        share = span.duration_ms / total_ms
+        label = ("  " * depth + span.name).ljust(name_width)
+        marker = "  ✗ " + span.status_message if span.status_code == StatusCode.ERROR else ""
+        lines.append(
+            f"{label}{span.duration_ms:9.1f}ms {share * 100:5.1f}% {self_ms:8.1f}ms self  "
+            f"{'█' * round(share * width)}{marker}"
+        )
+        for kid in kids:
+            visit(kid, depth + 1)
+
+    for root in roots:
+        visit(root, 0)
+    return "\n".join(lines)
+
+
+def _depth(span: Span, spans: List[Span]) -> int:
+    by_id = {s.span_id: s for s in spans}
+    depth = 0
+    while span.parent_span_id in by_id and depth < 64:
+        span = by_id[span.parent_span_id]
+        depth += 1
+    return depth
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Flame-style breakdown of a command's trace spans"
+    )
+    parser.add_argument("command_id", nargs="?", help="Command id to report on")
+    parser.add_argument(
+        "--file",
+        default=os.environ.get(TRACE_FILE_ENV),
+        help=f"Span JSONL file (default: ${TRACE_FILE_ENV})",
+    )
+    parser.add_argument("--list", action="store_true", help="List traced command ids")
+    parser.add_argument("--correlation", help="Report spans with this correlation id")
+    args = parser.parse_args(argv)
+
+    if not args.file:
+        parser.error(f"no span file: pass --file or set {TRACE_FILE_ENV}")
+    try:
+        collector = SpanCollector.from_file(args.file)
+    except OSError as e:
+        print(f"Cannot read spans: {e}", file=sys.stderr)
+        return 1
+
+    if args.list:
+        for command_id in collector.command_ids():
+            print(command_id)
+        return 0
+
+    if args.correlation:
+        spans = collector.find_correlation(args.correlation)
+        target = f"correlation id {args.correlation}"
+    elif args.command_id:
+        spans = collector.find_command(args.command_id)
+        target = f"command {args.command_id}"
+    else:
+        parser.error("give a command id, --correlation or --list")
+
+    if not spans:
+        print(f"No spans found for {target}", file=sys.stderr)
+        return 1
+
+    print(render_flame(spans))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
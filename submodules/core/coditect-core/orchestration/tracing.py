@@ -0,0 +1,566 @@
+"""
+Tracing - Lightweight Spans Across Router, Executor and LLM Providers
+=====================================================================
+
+Minimal in-process tracer following the OpenTelemetry data model (trace
+id, span id, parent span id, kind, start/end in Unix nanoseconds,
+attributes, status, events). Spans are exported as OTLP-style JSON lines,
+so they can be replayed into a real collector later.
+
+Tracing is off until an exporter is configured; until then spans are
+shared no-op objects and instrumentation costs a ContextVar lookup.
+
+Enable:
+    - set CODITECT_TRACE_FILE=/path/to/spans.jsonl, or
+    - call configure_tracing(path) / configure_tracing(exporter=...)
+
+Instrumented spans:
+    command.execute         SlashCommandRouter.execute (root, carries command_id)
+    task.execute            TaskExecutor.execute
+    framework_knowledge.load, prompt.build
+    llm.generate            every LlmFactory provider call
+    script.execute          script-based fallback
+    state.save              StateManager.save_state
+
+Every span carries a correlation_id attribute: the one passed to the root
+span (e.g. UnifiedLogger.get_correlation_id()) or else the trace id.
+UnifiedLogger adds trace_id/span_id of the current span to its entries.
+
+Example:
+    >>> from orchestration.tracing import configure_tracing, get_tracer
+    >>>
+    >>> configure_tracing("spans.jsonl")
+    >>> tracer = get_tracer()
+    >>> with tracer.start_as_current_span("work", {"items": 3}) as span:
+    ...     with tracer.start_as_current_span("step"):
+    ...         do_step()
+    ...     span.set_attribute("ok", True)
+
+    Render a flame breakdown:
+        python -m orchestration.trace_report CMD-analyze-20251120-101500-ab12cd34
+
+Copyright © 2025 AZ1.AI INC. All rights reserved.
+"""
+
+import atexit
+import json
+import os
+import secrets
+import threading
+import time
+import traceback
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+# Environment variable naming the JSONL file spans are exported to
+TRACE_FILE_ENV = "CODITECT_TRACE_FILE"
+
+CORRELATION_ATTRIBUTE = "correlation_id"
+
+
+class SpanKind(str, Enum):
+    """Role of a span (OpenTelemetry SpanKind)."""
+
+    INTERNAL = "SPAN_KIND_INTERNAL"
+    SERVER = "SPAN_KIND_SERVER"
+    CLIENT = "SPAN_KIND_CLIENT"
+
+
+class StatusCode(str, Enum):
+    """Span outcome (OpenTelemetry StatusCode)."""
+
+    UNSET = "STATUS_CODE_UNSET"
+    OK = "STATUS_CODE_OK"
+    ERROR = "STATUS_CODE_ERROR"
+
+
+@dataclass
+class SpanEvent:
+    """Timestamped annotation on a span."""
+
+    name: str
+    time_unix_nano: int
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Span:
+    """
+    A timed operation within a trace.
+
+    Attributes:
+        name: Operation name (e.g. "llm.generate")
+        trace_id: 32 hex chars, shared by every span of a trace
+        span_id: 16 hex chars
+        parent_span_id: Parent's span_id (None for the root span)
+        kind: SpanKind
+        start_time_unix_nano: Start time
+        end_time_unix_nano: End time (0 while the span is open)
+        attributes: Key/value annotations
+        status_code: StatusCode
+        status_message: Error description when status is ERROR
+        events: SpanEvents (e.g. recorded exceptions)
+    """
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str] = None
+    kind: SpanKind = SpanKind.INTERNAL
+    start_time_unix_nano: int = 0
+    end_time_unix_nano: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status_code: StatusCode = StatusCode.UNSET
+    status_message: str = ""
+    events: List[SpanEvent] = field(default_factory=list)
+
+    is_recording = True
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        self.events.append(SpanEvent(name, time.time_ns(), attributes or {}))
+
+    def record_exception(self, exc: BaseException) -> None:
+        """Add an "exception" event following OpenTelemetry semantic conventions."""
+        self.add_event("exception", {
+            "exception.type": type(exc).__name__,
+            "exception.message": str(exc),
+            "exception.stacktrace": "".join(
+                traceback.format_exception(type(exc), exc, exc.__traceback__)
+            ),
+        })
+
+    def set_status(self, code: StatusCode, message: str = "") -> None:
+        self.status_code = code
+        self.status_message = message
+
+    def end(self) -> None:
+        if not self.end_time_unix_nano:
+            self.end_time_unix_nano = time.time_ns()
+
+    @property
+    def correlation_id(self) -> Optional[str]:
+        return self.attributes.get(CORRELATION_ATTRIBUTE)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_time_unix_nano or time.time_ns()
+        return (end - self.start_time_unix_nano) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize using OTLP JSON field names."""
+        data = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind.value,
+            "startTimeUnixNano": self.start_time_unix_nano,
+            "endTimeUnixNano": self.end_time_unix_nano,
+            "attributes": self.attributes,
+            "status": {"code": self.status_code.value},
+        }
+        if self.parent_span_id:
+            data["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            data["status"]["message"] = self.status_message
+        if self.events:
+            data["events"] = [
+                {"name": e.name, "timeUnixNano": e.time_unix_nano, "attributes": e.attributes}
+                for e in self.events
+            ]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Span":
+        """Deserialize from to_dict() output."""
+        status = data.get("status", {})
+        return cls(
+            name=data["name"],
+            trace_id=data["traceId"],
+            span_id=data["spanId"],
+            parent_span_id=data.get("parentSpanId"),
+            kind=SpanKind(data.get("kind", SpanKind.INTERNAL.value)),
+            start_time_unix_nano=data.get("startTimeUnixNano", 0),
+            end_time_unix_nano=data.get("endTimeUnixNano", 0),
+            attributes=data.get("attributes", {}),
+            status_code=StatusCode(status.get("code", StatusCode.UNSET.value)),
+            status_message=status.get("message", ""),
+            events=[
+                SpanEvent(e["name"], e.get("timeUnixNano", 0), e.get("attributes", {}))
+                for e in data.get("events", [])
+            ],
+        )
+
+
+class _NonRecordingSpan:
+    """Shared no-op span returned while tracing is disabled."""
+
+    is_recording = False
+    trace_id = None
+    span_id = None
+    correlation_id = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+    def set_status(self, code: StatusCode, message: str = "") -> None:
+        pass
+
+
+NON_RECORDING_SPAN = _NonRecordingSpan()
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("coditect_current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """The active span in this context (thread / asyncio task), if any."""
+    return _current_span.get()
+
+
+# ============================================================================
+# Exporters & Processors
+# ============================================================================
+
+class InMemorySpanExporter:
+    """Keeps exported spans in a list (tests, notebooks)."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        with self._lock:
+            self.spans.extend(spans)
+
+    def shutdown(self) -> None:
+        pass
+
+
+class JsonlSpanExporter:
+    """Appends one OTLP-style JSON object per span to a file."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        data = "".join(
+            json.dumps(span.to_dict(), separators=(",", ":"), default=str) + "\n" for span in spans
+        )
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(data)
+
+    def shutdown(self) -> None:
+        pass
+
+
+class SimpleSpanProcessor:
+    """Exports each span synchronously when it ends."""
+
+    def __init__(self, exporter):
+        self.exporter = exporter
+
+    def on_end(self, span: Span) -> None:
+        try:
+            self.exporter.export([span])
+        except Exception:
+            pass  # tracing must never break the traced operation
+
+    def force_flush(self, timeout: Optional[float] = None) -> bool:
+        return True
+
+    def shutdown(self) -> None:
+        self.exporter.shutdown()
+
+
+class BatchSpanProcessor:
+    """
+    Queues ended spans and exports them in batches on a background thread.
+
+    Ending a span only appends to a deque; when the queue is full new spans
+    are dropped (and counted) rather than blocking the traced code.
+    """
+
+    def __init__(
+        self,
+        exporter,
+        max_queue_size: int = 2048,
+        max_export_batch_size: int = 256,
+        schedule_delay: float = 1.0,
+    ):
+        self.exporter = exporter
+        self.max_queue_size = max_queue_size
+        self.max_export_batch_size = max_export_batch_size
+        self.schedule_delay = schedule_delay
+        self.dropped_spans = 0
+
+        self._queue: List[Span] = []
+        self._condition = threading.Condition()
+        self._exported = 0
+        self._enqueued = 0
+        self._shutdown = False
+        self._worker = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._worker.start()
+
+    def on_end(self, span: Span) -> None:
+        with self._condition:
+            if self._shutdown or len(self._queue) >= self.max_queue_size:
+                self.dropped_spans += 1
+                return
+            self._queue.append(span)
+            self._enqueued += 1
+            if len(self._queue) >= self.max_export_batch_size:
+                self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._queue and not self._shutdown:
+                    self._condition.wait(self.schedule_delay)
+                if self._shutdown and not self._queue:
+                    return
+                batch = self._queue[:self.max_export_batch_size]
+                del self._queue[:len(batch)]
+
+            if batch:
+                try:
+                    self.exporter.export(batch)
+                except Exception:
+                    pass
+
+            with self._condition:
+                self._exported += len(batch)
+                self._condition.notify_all()
+
+    def force_flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Wait until every span ended so far has been exported."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            target = self._enqueued
+            self._condition.notify_all()
+            while self._exported < target:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def shutdown(self) -> None:
+        with self._condition:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            self._condition.notify_all()
+        self._worker.join(timeout=10.0)
+        self.exporter.shutdown()
+
+
+# ============================================================================
+# Tracer
+# ============================================================================
+
+class Tracer:
+    """
+    Creates spans and hands ended spans to its processors.
+
+    The current span lives in a ContextVar, so nesting works across
+    threads and asyncio tasks (each task inherits its creator's span).
+    """
+
+    def __init__(self):
+        self._processors: List[Any] = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._processors)
+
+    def add_span_processor(self, processor) -> None:
+        self._processors.append(processor)
+
+    @contextmanager
+    def start_as_current_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        kind: SpanKind = SpanKind.INTERNAL,
+        correlation_id: Optional[str] = None,
+    ) -> Iterator[Union[Span, _NonRecordingSpan]]:
+        """
+        Open a span as a child of the current one for the duration of the block.
+
+        Exceptions escaping the block are recorded and set the status to
+        ERROR. Yields a no-op span while tracing is disabled.
+        """
+        if not self._processors:
+            yield NON_RECORDING_SPAN
+            return
+
+        parent = _current_span.get()
+        trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        span = Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=secrets.token_hex(8),
+            parent_span_id=parent.span_id if parent else None,
+            kind=kind,
+            start_time_unix_nano=time.time_ns(),
+            attributes=dict(attributes or {}),
+        )
+        span.attributes[CORRELATION_ATTRIBUTE] = (
+            correlation_id or (parent.correlation_id if parent else None) or trace_id
+        )
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.record_exception(exc)
+            span.set_status(StatusCode.ERROR, str(exc))
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+            for processor in self._processors:
+                processor.on_end(span)
+
+    def force_flush(self, timeout: Optional[float] = 10.0) -> bool:
+        return all(processor.force_flush(timeout) for processor in self._processors)
+
+    def shutdown(self) -> None:
+        processors, self._processors = self._processors, []
+        for processor in processors:
+            processor.shutdown()
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer (configured from CODITECT_TRACE_FILE on first use)."""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                tracer = Tracer()
+                trace_file = os.environ.get(TRACE_FILE_ENV)
+                if trace_file:
+                    tracer.add_span_processor(BatchSpanProcessor(JsonlSpanExporter(trace_file)))
+                atexit.register(tracer.shutdown)
+                _tracer = tracer
+    return _tracer
+
+
+def configure_tracing(
+    path: Optional[Union[str, Path]] = None,
+    exporter=None,
+    batch: bool = True,
+) -> Tracer:
+    """
+    (Re)configure the process-wide tracer.
+
+    Args:
+        path: JSONL file to export spans to
+        exporter: Custom exporter (e.g. InMemorySpanExporter); overrides path
+        batch: Export on a background thread (False exports synchronously)
+
+    Returns:
+        The process-wide Tracer; with neither path nor exporter, tracing
+        is disabled
+    """
+    tracer = get_tracer()
+    tracer.shutdown()
+
+    if exporter is None and path is not None:
+        exporter = JsonlSpanExporter(path)
+    if exporter is not None:
+        processor = BatchSpanProcessor(exporter) if batch else SimpleSpanProcessor(exporter)
+        tracer.add_span_processor(processor)
+    return tracer
+
+
+# ============================================================================
+# Collector stand-in
+# ============================================================================
+
+class SpanCollector:
+    """
+    Local stand-in for a trace collector: loads exported spans and
+    reassembles them into traces.
+
+    Example:
+        >>> collector = SpanCollector.from_file("spans.jsonl")
+        >>> spans = collector.find_command("CMD-analyze-...")
+    """
+
+    def __init__(self, spans: Optional[List[Span]] = None):
+        self.traces: Dict[str, List[Span]] = defaultdict(list)
+        for span in spans or []:
+            self.add(span)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "SpanCollector":
+        """Load a JSONL span file (malformed lines are skipped)."""
+        collector = cls()
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    collector.add(Span.from_dict(json.loads(line)))
+                except (ValueError, KeyError):
+                    continue
+        return collector
+
+    def add(self, span: Span) -> None:
+        self.traces[span.trace_id].append(span)
+
+    def find_command(self, command_id: str) -> List[Span]:
+        """Spans of the trace(s) whose spans carry attribute command_id."""
+        spans: List[Span] = []
+        for trace_spans in self.traces.values():
+            if any(s.attributes.get("command_id") == command_id for s in trace_spans):
+                spans.extend(trace_spans)
+        return spans
+
+    def find_correlation(self, correlation_id: str) -> List[Span]:
+        """Spans carrying the given correlation id."""
+        return [
+            span
+            for trace_spans in self.traces.values()
+            for span in trace_spans
+            if span.correlation_id == correlation_id
+        ]
+
+    def command_ids(self) -> List[str]:
+        """Command ids seen in the loaded traces (oldest first)."""
+        roots = [
+            span
+            for trace_spans in self.traces.values()
+            for span in trace_spans
+            if "command_id" in span.attributes
+        ]
+        roots.sort(key=lambda span: span.start_time_unix_nano)
+        seen: Dict[str, None] = {}
+        for span in roots:
+            seen.setdefault(span.attributes["command_id"], None)
+        return list(seen)
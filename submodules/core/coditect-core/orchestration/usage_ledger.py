@@ -0,0 +1,204 @@
+"""
+Usage Ledger - Per-Agent/Model LLM Usage Aggregation
+====================================================
+
+Running totals of LLM requests, tokens, latency and cost, keyed by
+(agent, provider, model). TaskExecutor records every LLM call here; the
+ledger is the input for capacity planning and concurrency tuning
+(tokens per request, latency percentiles come from the metrics registry).
+
+Memory grows with the number of distinct agent/model combinations, never
+with the number of requests.
+
+Example:
+    >>> from orchestration.usage_ledger import get_usage_ledger
+    >>>
+    >>> ledger = get_usage_ledger()
+    >>> for entry in ledger.entries():
+    ...     print(entry.agent_id, entry.model, entry.total_tokens,
+    ...           entry.average_latency_seconds)
+    >>>
+    >>> ledger.totals(by="model")["gpt-4o"].estimated_cost
+
+Copyright © 2025 AZ1.AI INC. All rights reserved.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class UsageTotals:
+    """Aggregated usage for one agent/provider/model combination."""
+
+    agent_id: Optional[str]
+    provider: Optional[str]
+    model: Optional[str]
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    # Requests whose provider reported no token counts
+    unmetered_requests: int = 0
+    latency_seconds: float = 0.0
+    time_to_first_token_seconds: float = 0.0
+    time_to_first_token_samples: int = 0
+    estimated_cost: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    @property
+    def average_latency_seconds(self) -> Optional[float]:
+        return self.latency_seconds / self.requests if self.requests else None
+
+    @property
+    def average_time_to_first_token_seconds(self) -> Optional[float]:
+        if not self.time_to_first_token_samples:
+            return None
+        return self.time_to_first_token_seconds / self.time_to_first_token_samples
+
+    @property
+    def cache_hit_ratio(self) -> Optional[float]:
+        """Fraction of input tokens served from a prompt cache."""
+        return self.cached_tokens / self.input_tokens if self.input_tokens else None
+
+    def add(self, usage: Any) -> None:
+        """Add one request's LlmUsage."""
+        self.requests += 1
+        if usage.input_tokens is None and usage.output_tokens is None:
+            self.unmetered_requests += 1
+        self.input_tokens += usage.input_tokens or 0
+        self.output_tokens += usage.output_tokens or 0
+        self.cached_tokens += usage.cached_tokens or 0
+        self.latency_seconds += usage.latency_seconds or 0.0
+        if usage.time_to_first_token_seconds is not None:
+            self.time_to_first_token_seconds += usage.time_to_first_token_seconds
+            self.time_to_first_token_samples += 1
+        self.estimated_cost += usage.estimated_cost or 0.0
+
+    def merge(self, other: "UsageTotals") -> None:
+        """Add another total into this one."""
+        for name in (
+            "requests", "input_tokens", "output_tokens", "cached_tokens",
+            "unmetered_requests", "latency_seconds", "time_to_first_token_seconds",
+            "time_to_first_token_samples", "estimated_cost",
+        ):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "agent_id": self.agent_id,
+            "provider": self.provider,
+            "model": self.model,
+            "requests": self.requests,
+            "unmetered_requests": self.unmetered_requests,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cached_tokens": self.cached_tokens,
+            "total_tokens": self.total_tokens,
+            "average_latency_seconds": self.average_latency_seconds,
+            "average_time_to_first_token_seconds": self.average_time_to_first_token_seconds,
+            "cache_hit_ratio": self.cache_hit_ratio,
+            "estimated_cost": round(self.estimated_cost, 6),
+        }
+
+
+class UsageLedger:
+    """
+    Thread-safe usage totals per (agent, provider, model).
+
+    Example:
+        >>> ledger = UsageLedger()
+        >>> ledger.record("code-reviewer", response.usage)
+        >>> ledger.entries()[0].requests
+        1
+    """
+
+    GROUPINGS = ("agent", "provider", "model")
+
+    def __init__(self):
+        self._totals: Dict[Tuple[Optional[str], Optional[str], Optional[str]], UsageTotals] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        agent_id: Optional[str],
+        usage: Any,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> None:
+        """
+        Add an LlmUsage to the agent's totals.
+
+        Args:
+            agent_id: Agent that made the request
+            usage: LlmUsage from response.usage
+            provider: Overrides usage.provider (e.g. the configured binding)
+            model: Overrides usage.model
+        """
+        provider = provider or usage.provider
+        model = model or usage.model
+        key = (agent_id, provider, model)
+        with self._lock:
+            totals = self._totals.get(key)
+            if totals is None:
+                totals = self._totals[key] = UsageTotals(agent_id, provider, model)
+            totals.add(usage)
+
+    def entries(self) -> List[UsageTotals]:
+        """Copies of all per-agent/model totals, highest token use first."""
+        with self._lock:
+            entries = [UsageTotals(**vars(totals)) for totals in self._totals.values()]
+        return sorted(entries, key=lambda entry: (-entry.total_tokens, -entry.requests))
+
+    def totals(self, by: str = "model") -> Dict[Optional[str], UsageTotals]:
+        """
+        Totals rolled up by "agent", "provider" or "model".
+
+        Raises:
+            ValueError: If by is not a supported grouping
+        """
+        if by not in self.GROUPINGS:
+            raise ValueError(f"Unknown grouping {by!r} (expected one of {', '.join(self.GROUPINGS)})")
+
+        field_name = "agent_id" if by == "agent" else by
+        rollup: Dict[Optional[str], UsageTotals] = {}
+        for entry in self.entries():
+            key = getattr(entry, field_name)
+            if key not in rollup:
+                rollup[key] = UsageTotals(
+                    agent_id=entry.agent_id if by == "agent" else None,
+                    provider=entry.provider if by == "provider" else None,
+                    model=entry.model if by == "model" else None,
+                )
+            rollup[key].merge(entry)
+        return rollup
+
+    def to_dict(self) -> Dict[str, Any]:
+        """All entries plus a grand total, for JSON export."""
+        entries = self.entries()
+        overall = UsageTotals(None, None, None)
+        for entry in entries:
+            overall.merge(entry)
+        return {
+            "entries": [entry.to_dict() for entry in entries],
+            "total": overall.to_dict(),
+        }
+
+    def reset(self) -> None:
+        """Drop all totals."""
+        with self._lock:
+            self._totals.clear()
+
+
+# Process-wide default ledger
+LEDGER = UsageLedger()
+
+
+def get_usage_ledger() -> UsageLedger:
+    """Return the process-wide usage ledger."""
+    return LEDGER
@@ -16,9 +16,13 @@ Features:
 8. Production-grade error handling with logging and rollback
 9. Network retry logic for push operations
 10. Resource cleanup and proper exit codes
+11. Concurrent execution: submodules are committed in parallel (nested
+    submodules before the submodules containing them), pushes run
+    concurrently with a per-remote limit, and the parent repository is
+    committed and pushed only after every submodule
 
 Usage:
-    python3 scripts/checkpoint-with-submodules.py "Sprint description" [--auto-push]
+    python3 scripts/checkpoint-with-submodules.py "Sprint description" [--no-push] [--jobs N]
 
 Author: AZ1.AI INC.
 Framework: CODITECT
@@ -29,10 +33,13 @@ import os
 import sys
 import subprocess
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, List, Dict, Tuple, Optional
+from urllib.parse import urlparse
 import argparse
 from collections import defaultdict
 
@@ -47,6 +54,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Submodules committed (and detected) concurrently
+DEFAULT_MAX_PARALLEL = 4
+
+# Concurrent pushes to the same remote host
+DEFAULT_PUSHES_PER_REMOTE = 2
+
 
 # Custom Exception Hierarchy
 class CheckpointError(Exception):
@@ -77,11 +90,18 @@ class ValidationError(CheckpointError):
 class SubmoduleCheckpointManager:
     """Manages checkpoint creation across parent and all modified submodules."""
 
-    def __init__(self, repo_root: str = None):
+    def __init__(
+        self,
+        repo_root: str = None,
+        max_parallel: int = DEFAULT_MAX_PARALLEL,
+        pushes_per_remote: int = DEFAULT_PUSHES_PER_REMOTE,
+    ):
         """Initialize checkpoint manager.
 
         Args:
             repo_root: Root directory of the repository (defaults to current directory)
+            max_parallel: Submodules committed/pushed concurrently (1 = sequential)
+            pushes_per_remote: Concurrent pushes to the same remote host
         """
         if repo_root is None:
             self.repo_root = Path.cwd()
@@ -99,6 +119,13 @@ class SubmoduleCheckpointManager:
         self.max_retries = 3
         self.retry_delay = 2  # seconds
 
+        # Concurrency configuration
+        self.max_parallel = max(1, max_parallel)
+        self.pushes_per_remote = max(1, pushes_per_remote)
+        self._log_lock = threading.Lock()
+        self._remote_limits: Dict[str, threading.Semaphore] = {}
+        self._remote_limits_lock = threading.Lock()
+
     def validate_inputs(self, sprint_description: str) -> None:
         """
         Validate input parameters.
@@ -195,7 +222,8 @@ class SubmoduleCheckpointManager:
             'status': status,
             'details': details
         }
-        self.operations_log.append(log_entry)
+        with self._log_lock:
+            self.operations_log.append(log_entry)
 
         # Also log to logger
         level = {
@@ -309,26 +337,37 @@ class SubmoduleCheckpointManager:
 
             print(f"Found {len(submodule_paths)} submodules configured")
 
-            # Check each submodule for modifications
-            for submodule_path in submodule_paths:
+            def check(submodule_path: str) -> Tuple[int, str, Optional[str]]:
                 submodule_full_path = self.repo_root / submodule_path
-
                 if not submodule_full_path.exists():
-                    print(f"⚠️  Submodule path does not exist: {submodule_path}")
-                    self.log_operation(submodule_path, "detect", "warning", "Path does not exist")
-                    continue
-
-                # Check if submodule has uncommitted changes
+                    return -1, "", None
                 returncode, status, _ = self.run_command(
                     "git status --porcelain",
                     cwd=submodule_full_path
                 )
-
+                head = None
                 if returncode == 0 and status.strip():
-                    # Save submodule state for potential rollback
                     head_code, head_commit, _ = self.run_command("git rev-parse HEAD", cwd=submodule_full_path)
                     if head_code == 0:
-                        self.submodule_states[submodule_path] = {'head': head_commit.strip()}
+                        head = head_commit.strip()
+                return returncode, status, head
+
+            # Check all submodules for modifications concurrently
+            with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+                checks = list(pool.map(check, submodule_paths))
+
+            for submodule_path, (returncode, status, head) in zip(submodule_paths, checks):
+                submodule_full_path = self.repo_root / submodule_path
+
+                if returncode == -1:
+                    print(f"⚠️  Submodule path does not exist: {submodule_path}")
+                    self.log_operation(submodule_path, "detect", "warning", "Path does not exist")
+                    continue
+
+                if returncode == 0 and status.strip():
+                    # Save submodule state for potential rollback
+                    if head is not None:
+                        self.submodule_states[submodule_path] = {'head': head}
 
                     # Has changes
                     modified_submodules[submodule_path] = {
@@ -485,6 +524,115 @@ Copyright: © 2025 AZ1.AI INC. All rights reserved.
             self.log_operation(submodule_path, "push", "error", str(e))
             return False
 
+    @staticmethod
+    def submodule_levels(submodule_paths: List[str]) -> List[List[str]]:
+        """Group submodules into dependency levels.
+
+        A submodule nested inside another one must be committed (and
+        pushed) before the outer submodule records its new pointer, so
+        level 0 holds submodules with no nested modified submodules, level 1
+        those containing only level-0 submodules, and so on. Submodules in
+        the same level are independent and may run concurrently.
+
+        Args:
+            submodule_paths: Relative submodule paths
+
+        Returns:
+            Lists of paths, innermost level first
+        """
+        paths = sorted(set(submodule_paths))
+        parts = {path: Path(path).parts for path in paths}
+
+        def contains(outer: str, inner: str) -> bool:
+            return outer != inner and parts[inner][:len(parts[outer])] == parts[outer]
+
+        height: Dict[str, int] = {}
+        # Deeper paths first so nested heights are known before their containers
+        for path in sorted(paths, key=lambda p: len(parts[p]), reverse=True):
+            nested = [height[other] for other in paths if other in height and contains(path, other)]
+            height[path] = 1 + max(nested) if nested else 0
+
+        levels: List[List[str]] = [[] for _ in range(max(height.values(), default=-1) + 1)]
+        for path in paths:
+            levels[height[path]].append(path)
+        return levels
+
+    def _run_levels(self, paths: List[str], action: Callable[[str], bool]) -> Dict[str, bool]:
+        """Run action over paths level by level, concurrently within a level."""
+        results: Dict[str, bool] = {}
+        for level in self.submodule_levels(paths):
+            workers = min(self.max_parallel, len(level))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="checkpoint") as pool:
+                for path, ok in zip(level, pool.map(action, level)):
+                    results[path] = ok
+        return results
+
+    @staticmethod
+    def _remote_key(url: str) -> str:
+        """Host a remote URL points at ("local" for filesystem remotes)."""
+        url = url.strip()
+        if "://" in url:
+            parsed = urlparse(url)
+            return parsed.hostname or parsed.scheme
+        if ":" in url and not url.startswith("/") and "@" in url.split(":", 1)[0]:
+            # scp-like syntax: user@host:path
+            return url.split(":", 1)[0].split("@", 1)[1]
+        return "local"
+
+    def _remote_limit(self, submodule_full_path: Path) -> threading.Semaphore:
+        """Semaphore bounding concurrent pushes to this submodule's remote."""
+        returncode, url, _ = self.run_command("git remote get-url origin", cwd=submodule_full_path)
+        key = self._remote_key(url) if returncode == 0 else "unknown"
+        with self._remote_limits_lock:
+            if key not in self._remote_limits:
+                self._remote_limits[key] = threading.Semaphore(self.pushes_per_remote)
+            return self._remote_limits[key]
+
+    def commit_submodules(
+        self,
+        modified_submodules: Dict[str, Dict],
+        sprint_description: str
+    ) -> Dict[str, bool]:
+        """Commit all modified submodules, nested ones first, in parallel.
+
+        Args:
+            modified_submodules: Output of detect_modified_submodules()
+            sprint_description: Description for commit messages
+
+        Returns:
+            Dictionary mapping submodule path to commit success
+        """
+        return self._run_levels(
+            list(modified_submodules),
+            lambda path: self.commit_submodule_changes(
+                path, modified_submodules[path]['path'], sprint_description
+            ),
+        )
+
+    def push_submodules(
+        self,
+        modified_submodules: Dict[str, Dict],
+        submodule_paths: List[str]
+    ) -> Dict[str, bool]:
+        """Push submodules concurrently, bounded per remote host.
+
+        Nested submodules are pushed before the submodules containing them,
+        so no pushed commit references an unpushed one.
+
+        Args:
+            modified_submodules: Output of detect_modified_submodules()
+            submodule_paths: Submodules to push (those committed successfully)
+
+        Returns:
+            Dictionary mapping submodule path to push success
+        """
+        def push(path: str) -> bool:
+            full_path = modified_submodules[path]['path']
+            with self._remote_limit(full_path):
+                return self.push_submodule_changes(path, full_path)
+
+        return self._run_levels(submodule_paths, push)
+
     def commit_parent_repo(self, sprint_description: str) -> bool:
         """Commit submodule pointer updates in parent repository.
 
@@ -700,31 +848,26 @@ Copyright: © 2025 AZ1.AI INC. All rights reserved.
                 print("\n⚪ No modified submodules detected")
                 print("   Will proceed with parent repository changes only")
 
-            # Step 2: Commit and push each modified submodule
-            if auto_push:
+            # Step 2: Commit (and push) each modified submodule
+            if modified_submodules:
                 print(f"\n{'='*80}")
-                print(f"Step 2: Committing and pushing modified submodules")
+                if auto_push:
+                    print(f"Step 2: Committing and pushing modified submodules")
+                else:
+                    print(f"Step 2: Committing modified submodules")
                 print(f"{'='*80}\n")
 
-                all_submodule_success = True
-                for submodule_path, info in modified_submodules.items():
-                    success = self.commit_submodule_changes(
-                        submodule_path,
-                        info['path'],
-                        sprint_description
-                    )
-
-                    if success:
-                        success = self.push_submodule_changes(
-                            submodule_path,
-                            info['path']
-                        )
-
-                    if not success:
-                        all_submodule_success = False
-                        print(f"  ⚠️  Issues with {submodule_path}")
-
-                if not all_submodule_success:
+                committed = self.commit_submodules(modified_submodules, sprint_description)
+                outcomes = dict(committed)
+                if auto_push:
+                    pushable = [path for path, ok in committed.items() if ok]
+                    outcomes.update(self.push_submodules(modified_submodules, pushable))
+
+                failed = [path for path in modified_submodules if not outcomes.get(path)]
+                for submodule_path in failed:
+                    print(f"  ⚠️  Issues with {submodule_path}")
+
+                if failed:
                     print(f"\n⚠️  Some submodules had issues - continuing with parent repo")
 
             # Step 3: Commit parent repository with submodule references
@@ -838,10 +981,28 @@ For more information: https://github.com/coditect-ai/coditect-rollout-master
         help='Root directory of the repository'
     )
 
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=DEFAULT_MAX_PARALLEL,
+        help=f'Submodules committed and pushed concurrently (default: {DEFAULT_MAX_PARALLEL})'
+    )
+
+    parser.add_argument(
+        '--pushes-per-remote',
+        type=int,
+        default=DEFAULT_PUSHES_PER_REMOTE,
+        help=f'Concurrent pushes to the same remote host (default: {DEFAULT_PUSHES_PER_REMOTE})'
+    )
+
     args = parser.parse_args()
 
     try:
-        manager = SubmoduleCheckpointManager(repo_root=args.repo_root)
+        manager = SubmoduleCheckpointManager(
+            repo_root=args.repo_root,
+            max_parallel=args.jobs,
+            pushes_per_remote=args.pushes_per_remote,
+        )
         success = manager.run_full_checkpoint(
             sprint_description=args.description,
             auto_push=not args.no_push
@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+CODITECT Buffered Audit Writer
+
+Background audit trail writer for privacy and compliance operations.
+
+Callers enqueue audit entries and return immediately; a single writer thread
+drains a bounded queue and appends batches to numbered segment files. Each
+batch is written as one gzip member containing JSONL records, followed by an
+fsync, so a crash can at most lose the batch that was in flight. Readers skip
+a truncated trailing member instead of failing on it.
+
+Segment Layout:
+    <directory>/<prefix>-000001.jsonl.gz
+    <directory>/<prefix>-000002.jsonl.gz
+    ...
+
+Every writer process starts a fresh segment, so segments written by a crashed
+process are never appended to again.
+
+Usage:
+    from audit_writer import get_audit_writer, read_audit_log
+
+    writer = get_audit_writer(Path("MEMORY-CONTEXT/archive/privacy_audit"))
+    writer.write({'operation': 'pii_detected', 'details': {...}})
+    writer.flush()
+
+    for entry in read_audit_log(Path("MEMORY-CONTEXT/archive/privacy_audit")):
+        print(entry['operation'])
+
+CLI (the prefix is detected from the segment names unless --prefix is given):
+    python3 audit_writer.py MEMORY-CONTEXT/archive/privacy_audit --tail 20
+
+Author: AZ1.AI CODITECT Team
+Sprint: Sprint +1 - MEMORY-CONTEXT Implementation
+Date: 2025-11-16
+"""
+
+import os
+import re
+import sys
+import json
+import gzip
+import zlib
+import queue
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Custom exception hierarchy for better error handling
+class AuditWriterError(Exception):
+    """Base exception for audit writer errors."""
+    pass
+
+
+class AuditWriterClosedError(AuditWriterError):
+    """Raised when writing to an audit writer that has been closed."""
+    pass
+
+
+SEGMENT_SUFFIX = ".jsonl.gz"
+
+# Queue control markers (compared by identity)
+_STOP = object()
+
+
+class AuditWriter:
+    """
+    Buffered, thread-backed audit trail writer.
+
+    Entries are flushed to disk when `flush_size` entries are pending, when
+    `flush_interval` seconds have passed since the last flush, or when
+    `flush()`/`close()` is called explicitly.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        prefix: str = "audit",
+        max_queue: int = 10000,
+        flush_size: int = 256,
+        flush_interval: float = 1.0,
+        segment_max_bytes: int = 4 * 1024 * 1024,
+        fsync: bool = True
+    ):
+        """
+        Initialize AuditWriter and start the background writer thread.
+
+        Args:
+            directory: Directory holding the segment files (created lazily)
+            prefix: Segment file name prefix
+            max_queue: Maximum queued entries before `write()` blocks
+            flush_size: Number of pending entries that triggers a flush
+            flush_interval: Maximum seconds an entry stays buffered
+            segment_max_bytes: Segment size that triggers rotation
+            fsync: Whether to fsync the segment after every flush
+
+        Raises:
+            AuditWriterError: If arguments are invalid
+        """
+        if max_queue < 1 or flush_size < 1:
+            raise AuditWriterError("max_queue and flush_size must be positive")
+        if flush_interval <= 0:
+            raise AuditWriterError("flush_interval must be positive")
+
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync = fsync
+
+        self.entries_written = 0
+        self.batches_written = 0
+        self.write_errors = 0
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._segment_seq: Optional[int] = None
+        self._segment_file = None
+        self._segment_size = 0
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"audit-writer-{prefix}",
+            daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def segment_path(self) -> Optional[Path]:
+        """Path of the segment currently being written (None before first flush)."""
+        if self._segment_seq is None:
+            return None
+        return segment_path(self.directory, self.prefix, self._segment_seq)
+
+    def write(self, entry: Dict) -> None:
+        """
+        Enqueue an audit entry.
+
+        Blocks only when the queue is full, which applies backpressure instead
+        of silently dropping audit records.
+
+        Args:
+            entry: JSON-serializable audit entry
+
+        Raises:
+            AuditWriterClosedError: If the writer has been closed
+        """
+        if self._closed:
+            raise AuditWriterClosedError(f"Audit writer for {self.directory} is closed")
+        self._queue.put(entry)
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Write every entry enqueued before this call and fsync the segment.
+
+        Args:
+            timeout: Seconds to wait for the writer thread (None waits forever)
+
+        Returns:
+            True if the flush completed within the timeout
+        """
+        if self._closed or not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """
+        Flush pending entries and stop the writer thread.
+
+        Args:
+            timeout: Seconds to wait for the writer thread to finish
+        """
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """Writer thread main loop."""
+        pending: List[Dict] = []
+        waiters: List[threading.Event] = []
+        last_flush = time.monotonic()
+
+        while True:
+            if pending:
+                wait = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            else:
+                wait = None
+
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                item = None
+
+            stop = item is _STOP
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not None and not stop:
+                pending.append(item)
+
+            due = (
+                stop
+                or waiters
+                or len(pending) >= self.flush_size
+                or (pending and time.monotonic() - last_flush >= self.flush_interval)
+            )
+            if due:
+                if pending:
+                    self._write_batch(pending)
+                    pending = []
+                last_flush = time.monotonic()
+                for waiter in waiters:
+                    waiter.set()
+                waiters = []
+
+            if stop:
+                self._close_segment()
+                return
+
+    def _open_segment(self) -> None:
+        """Open the next segment file for this process."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self._segment_seq is None:
+            existing = list_segments(self.directory, self.prefix)
+            self._segment_seq = existing[-1][0] + 1 if existing else 1
+        else:
+            self._segment_seq += 1
+
+        # 'xb' guarantees we never append to another process's segment
+        while True:
+            path = segment_path(self.directory, self.prefix, self._segment_seq)
+            try:
+                self._segment_file = open(path, 'xb')
+                break
+            except FileExistsError:
+                self._segment_seq += 1
+        self._segment_size = 0
+
+    def _close_segment(self) -> None:
+        """Close the current segment file."""
+        if self._segment_file is not None:
+            try:
+                self._segment_file.close()
+            except OSError as e:
+                logger.warning(f"Failed to close audit segment: {e}")
+            self._segment_file = None
+
+    def _write_batch(self, entries: List[Dict]) -> None:
+        """Append one gzip member holding `entries` to the current segment."""
+        try:
+            payload = ''.join(
+                json.dumps(entry, separators=(',', ':'), default=str) + '\n'
+                for entry in entries
+            ).encode('utf-8')
+            member = gzip.compress(payload, compresslevel=6)
+
+            if self._segment_file is None or self._segment_size >= self.segment_max_bytes:
+                self._close_segment()
+                self._open_segment()
+
+            self._segment_file.write(member)
+            self._segment_file.flush()
+            if self.fsync:
+                os.fsync(self._segment_file.fileno())
+
+            self._segment_size += len(member)
+            self.entries_written += len(entries)
+            self.batches_written += 1
+        except Exception as e:
+            # Audit failures must never take down the caller's workflow
+            self.write_errors += 1
+            logger.error(f"Failed to write {len(entries)} audit entries to {self.directory}: {e}")
+            self._close_segment()
+
+
+# Process-wide writers, one per (directory, prefix) destination
+_writers: Dict[Tuple[str, str], AuditWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_audit_writer(directory: Path, prefix: str = "audit", **kwargs) -> AuditWriter:
+    """
+    Get the shared AuditWriter for a destination, creating it if needed.
+
+    Sharing one writer per destination keeps a single background thread and a
+    single open segment even when many short-lived objects audit to the same
+    directory.
+
+    Args:
+        directory: Directory holding the segment files
+        prefix: Segment file name prefix
+        **kwargs: AuditWriter options, used only when the writer is created
+
+    Returns:
+        AuditWriter instance
+    """
+    key = (str(Path(directory).resolve()), prefix)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None or writer._closed:
+            writer = AuditWriter(directory, prefix=prefix, **kwargs)
+            _writers[key] = writer
+        return writer
+
+
+@atexit.register
+def close_all_audit_writers() -> None:
+    """Flush and close every shared audit writer (registered with atexit)."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+
+def segment_path(directory: Path, prefix: str, seq: int) -> Path:
+    """Build the path for segment number `seq`."""
+    return Path(directory) / f"{prefix}-{seq:06d}{SEGMENT_SUFFIX}"
+
+
+def list_segments(directory: Path, prefix: str = "audit") -> List[Tuple[int, Path]]:
+    """
+    List segment files in sequence order.
+
+    Returns:
+        List of (sequence_number, path) tuples
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+
+    pattern = re.compile(rf"^{re.escape(prefix)}-(\d+){re.escape(SEGMENT_SUFFIX)}$")
+    segments = []
+    for path in directory.iterdir():
+        match = pattern.match(path.name)
+        if match:
+            segments.append((int(match.group(1)), path))
+    segments.sort()
+    return segments
+
+
+def segment_prefixes(directory: Path) -> List[str]:
+    """
+    List the distinct prefixes of the segment files in `directory`.
+
+    Returns:
+        Sorted list of prefixes (empty if the directory has no segments)
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+
+    pattern = re.compile(rf"^(.+)-\d+{re.escape(SEGMENT_SUFFIX)}$")
+    prefixes = set()
+    for path in directory.iterdir():
+        match = pattern.match(path.name)
+        if match:
+            prefixes.add(match.group(1))
+    return sorted(prefixes)
+
+
+def iter_segment(path: Path) -> Iterator[Dict]:
+    """
+    Yield audit entries from one segment file.
+
+    A truncated or corrupt trailing gzip member (interrupted write) is skipped
+    with a warning; every complete member before it is still returned.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    while data:
+        decompressor = zlib.decompressobj(wbits=31)
+        try:
+            payload = decompressor.decompress(data)
+        except zlib.error as e:
+            logger.warning(f"Corrupt audit batch in {path}, skipping remainder: {e}")
+            return
+        if not decompressor.eof:
+            logger.warning(f"Truncated audit batch at end of {path}, skipping it")
+            return
+
+        for line in payload.splitlines():
+            if line.strip():
+                yield json.loads(line)
+        data = decompressor.unused_data
+
+
+def read_audit_log(directory: Path, prefix: str = "audit") -> Iterator[Dict]:
+    """
+    Yield every audit entry under `directory` in write order.
+
+    Args:
+        directory: Directory holding the segment files
+        prefix: Segment file name prefix
+
+    Returns:
+        Iterator of audit entry dictionaries
+    """
+    for _, path in list_segments(directory, prefix):
+        yield from iter_segment(path)
+
+
+def main():
+    """
+    CLI entry point - dump audit segments as JSONL.
+
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='CODITECT Audit Reader - dump buffered audit segments as JSONL'
+    )
+    parser.add_argument('directory', type=str, help='Audit segment directory')
+    parser.add_argument('--prefix', type=str, default=None,
+                        help='Segment prefix (default: detected from the segment files)')
+    parser.add_argument('--operation', type=str, help='Only show entries with this operation')
+    parser.add_argument('--tail', type=int, help='Only show the last N entries')
+    parser.add_argument('--count', action='store_true', help='Only print the entry count')
+
+    args = parser.parse_args()
+    directory = Path(args.directory)
+
+    if not directory.is_dir():
+        print(f"❌ Audit directory not found: {directory}", file=sys.stderr)
+        return 1
+
+    # Writers choose their own prefix (PrivacyIntegration uses 'privacy-audit',
+    # PrivacyManager 'privacy_audit'), so read it from the segment names
+    prefixes = segment_prefixes(directory)
+    prefix = args.prefix
+    if prefix is None:
+        if len(prefixes) > 1:
+            print(f"❌ Several audit logs in {directory} ({', '.join(prefixes)}); "
+                  f"choose one with --prefix", file=sys.stderr)
+            return 1
+        prefix = prefixes[0] if prefixes else directory.name
+
+    if prefix not in prefixes:
+        found = f" (found: {', '.join(prefixes)})" if prefixes else ""
+        print(f"⚠️  No audit segments named {prefix}-NNNNNN{SEGMENT_SUFFIX} in {directory}{found}",
+              file=sys.stderr)
+
+    try:
+        entries: Iterator[Dict] = read_audit_log(directory, prefix)
+        if args.operation:
+            entries = (e for e in entries if e.get('operation') == args.operation)
+        if args.tail:
+            entries = iter(deque(entries, maxlen=args.tail))
+
+        if args.count:
+            print(sum(1 for _ in entries))
+        else:
+            for entry in entries:
+                print(json.dumps(entry))
+        return 0
+
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"❌ Failed to read audit log: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
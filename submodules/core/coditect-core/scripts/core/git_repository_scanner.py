@@ -17,13 +17,40 @@ Framework: CODITECT
 License: MIT
 """
 
+import os
 import subprocess
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Set, Optional
+from typing import List, Dict, Set, Optional, Tuple
 from dataclasses import dataclass, field
 
 
+# Directories never descended into while looking for repositories
+DEFAULT_EXCLUDE_DIRS = frozenset({
+    "node_modules",
+    "__pycache__",
+    ".venv",
+    "venv",
+    ".tox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".next",
+    "dist",
+    "build",
+    "target",
+})
+
+# Concurrent `git status` processes
+DEFAULT_MAX_WORKERS = 8
+
+# Seconds a cached status stays valid while HEAD and the index are unchanged
+# (worktree edits do not touch either, so the cache must also expire)
+DEFAULT_CACHE_TTL = 5.0
+
+
 @dataclass
 class GitRepository:
     """Represents a discovered git repository."""
@@ -40,20 +67,44 @@ class GitRepository:
 class GitRepositoryScanner:
     """
     Scans directory tree for all git repositories and tracks their status.
+
+    Discovery is a pruned os.scandir walk (excluded directories such as
+    node_modules are never entered); each repository's branch and status
+    come from a single `git status --porcelain=v2 --branch -z`, run for
+    up to max_workers repositories concurrently.
     """
 
-    def __init__(self, root_path: Path, logger: logging.Logger):
+    def __init__(
+        self,
+        root_path: Path,
+        logger: logging.Logger,
+        exclude_dirs: Optional[Set[str]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+    ):
         """
         Initialize repository scanner.
 
         Args:
             root_path: Root directory to scan from (usually PROJECTS/)
             logger: Logger instance
+            exclude_dirs: Directory names to skip (default: DEFAULT_EXCLUDE_DIRS)
+            max_workers: Repositories analyzed concurrently
+            cache_ttl: Seconds a status is reused while HEAD and index
+                mtimes are unchanged (0 disables the cache)
         """
         self.root_path = Path(root_path)
         self.logger = logger
+        self.exclude_dirs = set(DEFAULT_EXCLUDE_DIRS if exclude_dirs is None else exclude_dirs)
+        self.max_workers = max(1, max_workers)
+        self.cache_ttl = cache_ttl
         self.repositories: List[GitRepository] = []
 
+        # repo path -> (HEAD/index fingerprint, cached at, (branch, modified, untracked))
+        self._status_cache: Dict[str, Tuple[tuple, float, Tuple[str, List[str], List[str]]]] = {}
+        self._cache_lock = threading.Lock()
+        self._gitmodules: Dict[Path, str] = {}
+
     def find_all_repositories(self) -> List[GitRepository]:
         """
         Recursively find ALL .git directories under root_path.
@@ -66,37 +117,21 @@ class GitRepositoryScanner:
         self.logger.info(f"{'='*60}")
 
         repositories = []
-        seen_repos = set()
+        self._gitmodules = {}
 
         try:
-            # Find all .git directories
-            for git_dir in self.root_path.rglob('.git'):
-                # Skip if this is a file (submodule pointer)
-                if git_dir.is_file():
-                    self.logger.debug(f"Skipping git file (submodule pointer): {git_dir}")
-                    continue
-
-                # Get repository path (parent of .git)
-                repo_path = git_dir.parent
-
-                # Skip if we've already seen this repo
-                repo_key = str(repo_path.resolve())
-                if repo_key in seen_repos:
-                    continue
-
-                seen_repos.add(repo_key)
-
-                # Analyze repository
-                try:
-                    repo_info = self._analyze_repository(repo_path)
+            repo_paths = self._discover_repositories()
+        except Exception as e:
+            self.logger.error(f"Error scanning for repositories: {e}")
+            repo_paths = []
+
+        if repo_paths:
+            workers = min(self.max_workers, len(repo_paths))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="git-scan") as pool:
+                for repo_path, repo_info in zip(repo_paths, pool.map(self._safe_analyze, repo_paths)):
                     if repo_info:
                         repositories.append(repo_info)
                         self.logger.debug(f"Found repo: {repo_info.name} at {repo_path}")
-                except Exception as e:
-                    self.logger.warning(f"Failed to analyze repository at {repo_path}: {e}")
-
-        except Exception as e:
-            self.logger.error(f"Error scanning for repositories: {e}")
 
         # Sort by path for consistent ordering
         repositories.sort(key=lambda r: str(r.path))
@@ -108,6 +143,59 @@ class GitRepositoryScanner:
 
         return repositories
 
+    def invalidate_cache(self) -> None:
+        """Forget cached statuses (e.g. after committing)."""
+        with self._cache_lock:
+            self._status_cache.clear()
+
+    def _discover_repositories(self) -> List[Path]:
+        """
+        Walk root_path with os.scandir, returning directories containing a
+        .git directory. Excluded directories, .git internals and symlinks
+        are not descended into; nested repositories are still found.
+        """
+        found: List[Path] = []
+        seen_repos: Set[str] = set()
+        stack = [str(self.root_path)]
+
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    subdirs = []
+                    for entry in entries:
+                        try:
+                            if not entry.is_dir(follow_symlinks=False):
+                                if entry.name == ".git":
+                                    # Skip if this is a file (submodule pointer)
+                                    self.logger.debug(f"Skipping git file (submodule pointer): {entry.path}")
+                                continue
+                        except OSError:
+                            continue
+
+                        if entry.name == ".git":
+                            repo_key = os.path.realpath(directory)
+                            if repo_key not in seen_repos:
+                                seen_repos.add(repo_key)
+                                found.append(Path(directory))
+                        elif entry.name not in self.exclude_dirs:
+                            subdirs.append(entry.path)
+            except OSError as e:
+                self.logger.debug(f"Cannot scan {directory}: {e}")
+                continue
+
+            # Reversed so the walk visits siblings in directory order
+            stack.extend(reversed(subdirs))
+
+        return found
+
+    def _safe_analyze(self, repo_path: Path) -> Optional[GitRepository]:
+        try:
+            return self._analyze_repository(repo_path)
+        except Exception as e:
+            self.logger.warning(f"Failed to analyze repository at {repo_path}: {e}")
+            return None
+
     def _analyze_repository(self, repo_path: Path) -> Optional[GitRepository]:
         """
         Analyze a single git repository.
@@ -125,11 +213,9 @@ class GitRepositoryScanner:
             # Check if this is a submodule
             is_submodule = self._is_submodule(repo_path)
 
-            # Get current branch
-            branch = self._get_branch(repo_path)
-
-            # Get repository status
-            is_dirty, modified, untracked = self._get_status(repo_path)
+            # Get current branch and repository status
+            branch, modified, untracked = self._get_status(repo_path)
+            is_dirty = bool(modified or untracked)
 
             return GitRepository(
                 path=repo_path,
@@ -137,7 +223,7 @@ class GitRepositoryScanner:
                 is_submodule=is_submodule,
                 is_dirty=is_dirty,
                 branch=branch,
-                has_uncommitted=(len(modified) > 0 or len(untracked) > 0),
+                has_uncommitted=is_dirty,
                 modified_files=modified,
                 untracked_files=untracked
             )
@@ -156,79 +242,72 @@ class GitRepositoryScanner:
 
             # Check if parent has .gitmodules mentioning this path
             parent = repo_path.parent
-            gitmodules = parent / ".gitmodules"
+            content = self._gitmodules.get(parent)
+            if content is None:
+                gitmodules = parent / ".gitmodules"
+                content = gitmodules.read_text() if gitmodules.exists() else ""
+                self._gitmodules[parent] = content
 
-            if gitmodules.exists():
-                with open(gitmodules, 'r') as f:
-                    content = f.read()
-                    if repo_path.name in content:
-                        return True
-
-            return False
+            return bool(content) and repo_path.name in content
 
         except Exception:
             return False
 
-    def _get_branch(self, repo_path: Path) -> str:
-        """Get current branch name."""
+    def _status_fingerprint(self, repo_path: Path) -> Optional[tuple]:
+        """mtimes of HEAD and the index (None if unreadable)."""
+        git_dir = repo_path / ".git"
         try:
-            result = subprocess.run(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                capture_output=True,
-                text=True,
-                cwd=repo_path,
-                timeout=5
+            return tuple(
+                os.stat(git_dir / name).st_mtime_ns if (git_dir / name).exists() else 0
+                for name in ("HEAD", "index")
             )
+        except OSError:
+            return None
 
-            if result.returncode == 0:
-                return result.stdout.strip()
-
-            return "unknown"
-
-        except Exception:
-            return "unknown"
-
-    def _get_status(self, repo_path: Path) -> tuple[bool, List[str], List[str]]:
+    def _get_status(self, repo_path: Path) -> Tuple[str, List[str], List[str]]:
         """
-        Get repository status.
+        Get current branch and repository status.
 
         Returns:
-            Tuple of (is_dirty, modified_files, untracked_files)
+            Tuple of (branch, modified_files, untracked_files)
         """
+        key = str(repo_path)
+        fingerprint = self._status_fingerprint(repo_path) if self.cache_ttl > 0 else None
+        if fingerprint is not None:
+            with self._cache_lock:
+                cached = self._status_cache.get(key)
+            if (
+                cached
+                and cached[0] == fingerprint
+                and time.monotonic() - cached[1] < self.cache_ttl
+            ):
+                branch, modified, untracked = cached[2]
+                return branch, list(modified), list(untracked)
+
         try:
+            # --no-optional-locks: never rewrite the index (which would
+            # change the fingerprint and contend with concurrent git commands)
             result = subprocess.run(
-                ["git", "status", "--porcelain"],
+                ["git", "--no-optional-locks", "status", "--porcelain=v2", "--branch", "-z"],
                 capture_output=True,
-                text=True,
                 cwd=repo_path,
                 timeout=10
             )
-
-            if result.returncode != 0:
-                return False, [], []
-
-            modified = []
-            untracked = []
-
-            for line in result.stdout.splitlines():
-                if not line.strip():
-                    continue
-
-                status = line[:2]
-                filename = line[3:].strip()
-
-                if status[0] == '?' or status[1] == '?':
-                    untracked.append(filename)
-                else:
-                    modified.append(filename)
-
-            is_dirty = (len(modified) > 0 or len(untracked) > 0)
-
-            return is_dirty, modified, untracked
-
         except Exception as e:
             self.logger.debug(f"Failed to get status for {repo_path}: {e}")
-            return False, [], []
+            return "unknown", [], []
+
+        if result.returncode != 0:
+            return "unknown", [], []
+
+        status = parse_porcelain_v2(result.stdout.decode("utf-8", errors="replace"))
+        if fingerprint is not None:
+            # Fingerprint taken before running git: a concurrent change
+            # leaves the entry stale-keyed rather than wrongly fresh
+            with self._cache_lock:
+                self._status_cache[key] = (fingerprint, time.monotonic(), status)
+        branch, modified, untracked = status
+        return branch, list(modified), list(untracked)
 
     def _log_repository_summary(self):
         """Log summary of discovered repositories."""
@@ -301,6 +380,43 @@ class GitRepositoryScanner:
                 self.logger.info(f"   Status: CLEAN")
 
 
+def parse_porcelain_v2(output: str) -> Tuple[str, List[str], List[str]]:
+    """
+    Parse `git status --porcelain=v2 --branch -z` output.
+
+    Returns:
+        Tuple of (branch, modified_files, untracked_files); branch is
+        "HEAD" when detached (matching `git rev-parse --abbrev-ref HEAD`)
+    """
+    branch = "unknown"
+    modified: List[str] = []
+    untracked: List[str] = []
+
+    records = iter(output.split("\0"))
+    for record in records:
+        if not record:
+            continue
+        kind = record[0]
+        if kind == "#":
+            if record.startswith("# branch.head "):
+                head = record[len("# branch.head "):]
+                branch = "HEAD" if head == "(detached)" else head
+        elif kind == "1":
+            # 1 XY sub mH mI mW hH hI path
+            modified.append(record.split(" ", 8)[8])
+        elif kind == "2":
+            # 2 XY sub mH mI mW hH hI Xscore path, then the original path
+            modified.append(record.split(" ", 9)[9])
+            next(records, None)
+        elif kind == "u":
+            # u XY sub m1 m2 m3 mW h1 h2 h3 path
+            modified.append(record.split(" ", 10)[10])
+        elif kind == "?":
+            untracked.append(record[2:])
+
+    return branch, modified, untracked
+
+
 if __name__ == "__main__":
     """Test repository scanner"""
     import sys
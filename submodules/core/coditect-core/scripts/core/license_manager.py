@@ -20,6 +20,8 @@ Features:
 - Multi-user license support
 - Offline validation (cached for 24 hours)
 - Database-backed persistence (SQLite/PostgreSQL)
+- Hot-path quota checks served from memory: verified-token LRU, short-lived
+  license cache, pooled connections and write-behind usage counters
 
 Usage:
     from license_manager import LicenseManager, LicenseTier
@@ -42,6 +44,12 @@ Usage:
     # Record usage
     lm.record_usage(license_key, operation_type="ai_operation")
 
+    # Check and record atomically (preferred before every AI operation)
+    lm.check_and_record(license_key, operation_type="ai_operation")
+
+    # Persist buffered usage counters (also done automatically in batches)
+    lm.flush_usage()
+
 Author: AZ1.AI CODITECT Team
 Sprint: Phase 4 - License Management Implementation
 Date: 2025-11-22
@@ -50,13 +58,20 @@ Date: 2025-11-22
 import os
 import sys
 import json
+import time
+import queue
+import atexit
 import logging
 import sqlite3
 import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, asdict, field
 from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
@@ -225,6 +240,40 @@ class UsageStats:
         return asdict(self)
 
 
+@dataclass
+class _UsageCounter:
+    """
+    In-memory usage for one license and day.
+
+    Values include changes not yet flushed to license_usage; the pending_*
+    and *_dirty fields describe what the next flush must write, the
+    inflight_* fields what a running flush is writing but has not committed.
+    """
+    ai_operations: int = 0
+    projects: int = 0
+    users: int = 0
+    pending_ai_operations: int = 0
+    projects_dirty: bool = False
+    users_dirty: bool = False
+    inflight_ai_operations: int = 0
+    projects_inflight: bool = False
+    users_inflight: bool = False
+    loaded_at: float = 0.0
+    # Incremented on every reload from the database
+    loads: int = 0
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self.pending_ai_operations) or self.projects_dirty or self.users_dirty
+
+
+@dataclass
+class _CachedLicense:
+    """Validated license row cached in memory."""
+    info: LicenseInfo
+    cached_at: float
+
+
 # ============================================================================
 # TIER CONFIGURATIONS
 # ============================================================================
@@ -283,6 +332,13 @@ class LicenseManager:
     GRACE_PERIOD_DAYS = 7
     CACHE_VALIDATION_HOURS = 24
 
+    # Hot-path caching
+    TOKEN_CACHE_SIZE = 1024             # Verified JWT payloads kept in LRU
+    LICENSE_CACHE_SECONDS = 30          # Re-read license rows/usage from DB after this
+    CONNECTION_POOL_SIZE = 4            # Idle SQLite connections kept open
+    USAGE_FLUSH_BATCH = 100             # Flush usage after this many recorded events
+    USAGE_FLUSH_INTERVAL_SECONDS = 5.0  # ...or when the oldest unflushed event is this old
+
     def __init__(
         self,
         db_path: Optional[Path] = None,
@@ -324,9 +380,22 @@ class LicenseManager:
                 encryption_key = Fernet.generate_key()
             self.cipher = Fernet(encryption_key)
 
+            # In-memory caches and write-behind usage counters. A single lock
+            # makes check_and_record atomic within this process.
+            self._lock = threading.RLock()
+            self._flush_lock = threading.Lock()
+            self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(self.CONNECTION_POOL_SIZE)
+            self._token_cache: "OrderedDict[str, Dict]" = OrderedDict()
+            self._license_cache: Dict[str, _CachedLicense] = {}
+            self._usage: Dict[Tuple[str, str], _UsageCounter] = {}
+            self._unflushed_events = 0
+            self._first_unflushed_at: Optional[float] = None
+
             # Initialize database
             self._init_database()
 
+            _managers.add(self)
+
             logger.info(f"LicenseManager initialized (database: {self.db_path})")
 
         except (ConfigurationError, DatabaseError):
@@ -348,8 +417,7 @@ class LicenseManager:
             DatabaseError: If schema creation fails
         """
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            conn.execute("PRAGMA foreign_keys = ON")
+            conn = self._new_connection()
 
             cursor = conn.cursor()
 
@@ -391,7 +459,7 @@ class LicenseManager:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_usage_license_date ON license_usage(license_id, date)")
 
             conn.commit()
-            conn.close()
+            self._release_connection(conn)
 
             logger.info("Database schema initialized successfully")
 
@@ -400,6 +468,76 @@ class LicenseManager:
             logger.error(error_msg)
             raise DatabaseError(error_msg) from e
 
+    # ========================================================================
+    # CONNECTION POOL AND CACHES
+    # ========================================================================
+
+    def _new_connection(self) -> sqlite3.Connection:
+        """Open a configured SQLite connection."""
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _release_connection(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool, closing it if the pool is full."""
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection; rolled back and discarded on error."""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._new_connection()
+
+        try:
+            yield conn
+        except BaseException:
+            try:
+                conn.rollback()
+                conn.close()
+            except sqlite3.Error:
+                pass
+            raise
+        else:
+            self._release_connection(conn)
+
+    def _decode_license_key(self, license_key: str) -> Dict:
+        """
+        Decode and verify a license JWT, using the verified-token LRU.
+
+        Tokens carrying a standard ``exp`` claim are re-verified once that
+        time has passed, so expiry is never masked by the cache.
+
+        Raises:
+            jwt.InvalidTokenError: If the token is invalid or expired
+        """
+        with self._lock:
+            payload = self._token_cache.get(license_key)
+            if payload is not None:
+                exp = payload.get('exp')
+                if exp is None or time.time() < exp:
+                    self._token_cache.move_to_end(license_key)
+                    return payload
+                del self._token_cache[license_key]
+
+        payload = jwt.decode(license_key, self.secret_key, algorithms=[self.JWT_ALGORITHM])
+
+        with self._lock:
+            self._token_cache[license_key] = payload
+            if len(self._token_cache) > self.TOKEN_CACHE_SIZE:
+                self._token_cache.popitem(last=False)
+        return payload
+
+    def _invalidate_license(self, license_id: str) -> None:
+        """Drop cached license state after a status or expiration change."""
+        with self._lock:
+            self._license_cache.pop(license_id, None)
+
     def generate_license(
         self,
         tier: LicenseTier,
@@ -455,10 +593,8 @@ class LicenseManager:
             encrypted_key = self.cipher.encrypt(license_key.encode()).decode()
 
             # Store in database
-            conn = sqlite3.connect(str(self.db_path))
-            conn.execute("PRAGMA foreign_keys = ON")
-
-            conn.execute("""
+            with self._connection() as conn:
+                conn.execute("""
                 INSERT INTO licenses (
                     license_id, license_key, tier, user_email, organization,
                     status, created_at, expires_at, max_users, max_projects,
@@ -476,10 +612,8 @@ class LicenseManager:
                 tier_config.max_users,
                 tier_config.max_projects,
                 tier_config.max_ai_operations_per_day
-            ))
-
-            conn.commit()
-            conn.close()
+                ))
+                conn.commit()
 
             logger.info(f"License generated: {license_id} ({tier.value}) for {user_email}")
 
@@ -508,10 +642,28 @@ class LicenseManager:
             LicenseValidationError: If validation fails
             LicenseExpiredError: If license expired (beyond grace period)
         """
+        self._validated_license(license_key)
+        return True
+
+    def _validated_license(self, license_key: str) -> LicenseInfo:
+        """
+        Validate license key and return its license row.
+
+        The row is served from memory for LICENSE_CACHE_SECONDS, so status
+        changes made by other processes take up to that long to apply
+        (suspend/revoke/activate/renew through this manager invalidate the
+        cached row at once). Expiration (with grace period) is re-checked
+        against the clock on every call.
+
+        Raises:
+            LicenseValidationError: If validation fails
+            LicenseExpiredError: If license expired (beyond grace period)
+            LicenseNotFoundError: If license does not exist
+        """
         try:
             # Decode JWT
             try:
-                payload = jwt.decode(license_key, self.secret_key, algorithms=[self.JWT_ALGORITHM])
+                payload = self._decode_license_key(license_key)
             except jwt.ExpiredSignatureError:
                 raise LicenseExpiredError("License has expired")
             except jwt.InvalidTokenError as e:
@@ -521,40 +673,38 @@ class LicenseManager:
             if not license_id:
                 raise LicenseValidationError("License ID missing from token")
 
-            # Check database
-            conn = sqlite3.connect(str(self.db_path))
-            conn.row_factory = sqlite3.Row
-
-            cursor = conn.execute(
-                "SELECT * FROM licenses WHERE license_id = ?",
-                (license_id,)
-            )
-            row = cursor.fetchone()
-            conn.close()
-
-            if not row:
-                raise LicenseNotFoundError(f"License not found: {license_id}")
+            # Check cache, then database
+            with self._lock:
+                cached = self._license_cache.get(license_id)
+            if cached is not None and time.monotonic() - cached.cached_at < self.LICENSE_CACHE_SECONDS:
+                license_info = cached.info
+                refreshed = False
+            else:
+                license_info = self._get_license_info(license_id)
+                refreshed = True
 
             # Check status
-            status = LicenseStatus(row['status'])
-            if status == LicenseStatus.REVOKED:
+            if license_info.status == LicenseStatus.REVOKED:
                 raise LicenseValidationError("License has been revoked")
 
-            if status == LicenseStatus.SUSPENDED:
+            if license_info.status == LicenseStatus.SUSPENDED:
                 raise LicenseValidationError("License is suspended")
 
             # Check expiration with grace period
-            expires_at = datetime.fromisoformat(row['expires_at'])
+            expires_at = license_info.expires_at
             now = datetime.now(timezone.utc)
 
             if now > expires_at + timedelta(days=self.GRACE_PERIOD_DAYS):
                 raise LicenseExpiredError(f"License expired on {expires_at.date()}")
 
-            # Update last validated timestamp
-            self._update_last_validated(license_id)
+            if refreshed:
+                # Update last validated timestamp (once per cache period)
+                self._update_last_validated(license_id)
+                with self._lock:
+                    self._license_cache[license_id] = _CachedLicense(license_info, time.monotonic())
+                logger.info(f"License validated successfully: {license_id}")
 
-            logger.info(f"License validated successfully: {license_id}")
-            return True
+            return license_info
 
         except (LicenseValidationError, LicenseExpiredError, LicenseNotFoundError):
             raise
@@ -571,6 +721,9 @@ class LicenseManager:
         """
         Check if operation is within quota limits.
 
+        Asks whether one more unit fits, like check_and_record with count=1:
+        once usage has reached the tier limit the check fails.
+
         Args:
             license_key: JWT license key
             operation_type: Type of operation (ai_operation, project, user)
@@ -582,18 +735,12 @@ class LicenseManager:
             QuotaExceededError: If quota exceeded
             LicenseValidationError: If license invalid
         """
-        # Validate license first
-        self.validate_license(license_key)
+        # Validate license first (served from memory on the hot path)
+        license_info = self._validated_license(license_key)
 
         try:
-            payload = jwt.decode(license_key, self.secret_key, algorithms=[self.JWT_ALGORITHM])
-            license_id = payload['license_id']
-
-            # Get license info
-            license_info = self._get_license_info(license_id)
-
             # Get current usage
-            usage_stats = self._get_usage_stats(license_id)
+            usage_stats = self._get_usage_stats(license_info.license_id)
 
             # Check quota based on operation type
             if operation_type == "ai_operation":
@@ -644,54 +791,242 @@ class LicenseManager:
         """
         Record usage event.
 
+        Usage is buffered in memory and written to the database in batches
+        (see flush_usage); quota checks already see it.
+
         Args:
             license_key: JWT license key
             operation_type: Type of operation
-            count: Number of operations to record
+            count: Number of operations to record (AI operations are added;
+                project and user counts are set to this value)
 
         Raises:
-            DatabaseError: If recording fails
+            DatabaseError: If a triggered flush fails
         """
-        try:
-            payload = jwt.decode(license_key, self.secret_key, algorithms=[self.JWT_ALGORITHM])
-            license_id = payload['license_id']
-            today = datetime.now(timezone.utc).date()
+        license_id = self._decode_license_key(license_key)['license_id']
 
-            conn = sqlite3.connect(str(self.db_path))
-            conn.execute("PRAGMA foreign_keys = ON")
+        with self._lock:
+            counter = self._usage_counter(license_id)
+            self._apply_usage(counter, operation_type, count)
 
-            # Insert or update usage record
-            if operation_type == "ai_operation":
-                conn.execute("""
-                    INSERT INTO license_usage (usage_id, license_id, date, ai_operations_count)
-                    VALUES (?, ?, ?, ?)
-                    ON CONFLICT(license_id, date) DO UPDATE SET
-                        ai_operations_count = ai_operations_count + ?
-                """, (str(uuid4()), license_id, today.isoformat(), count, count))
+        logger.debug(f"Usage recorded: {operation_type} count={count} for {license_id}")
+        self._maybe_flush_usage()
 
-            elif operation_type == "project":
-                conn.execute("""
-                    INSERT INTO license_usage (usage_id, license_id, date, projects_count)
-                    VALUES (?, ?, ?, ?)
-                    ON CONFLICT(license_id, date) DO UPDATE SET
-                        projects_count = ?
-                """, (str(uuid4()), license_id, today.isoformat(), count, count))
+    def check_and_record(
+        self,
+        license_key: str,
+        operation_type: str = "ai_operation",
+        count: int = 1
+    ) -> bool:
+        """
+        Check quota and record usage as one atomic step.
+
+        Reserves `count` more units of `operation_type` (AI operations,
+        projects or users) only if the result stays within the tier limit.
+        Concurrent callers in this process can never jointly exceed the quota.
 
+        Args:
+            license_key: JWT license key
+            operation_type: Type of operation (ai_operation, project, user)
+            count: Number of units to reserve
+
+        Returns:
+            True if the usage was within quota and has been recorded
+
+        Raises:
+            QuotaExceededError: If recording would exceed the quota
+            LicenseValidationError: If license invalid
+        """
+        license_info = self._validated_license(license_key)
+
+        with self._lock:
+            counter = self._usage_counter(license_info.license_id)
+
+            if operation_type == "ai_operation":
+                current, limit, label = counter.ai_operations, license_info.max_ai_operations_per_day, "Daily AI operations"
+            elif operation_type == "project":
+                current, limit, label = counter.projects, license_info.max_projects, "Project"
             elif operation_type == "user":
-                conn.execute("""
-                    INSERT INTO license_usage (usage_id, license_id, date, active_users_count)
-                    VALUES (?, ?, ?, ?)
-                    ON CONFLICT(license_id, date) DO UPDATE SET
-                        active_users_count = ?
-                """, (str(uuid4()), license_id, today.isoformat(), count, count))
+                current, limit, label = counter.users, license_info.max_users, "User"
+            else:
+                raise LicenseError(f"Unknown operation type: {operation_type}")
 
-            conn.commit()
-            conn.close()
+            if limit != -1 and current + count > limit:
+                raise QuotaExceededError(f"{label} quota exceeded ({current}/{limit})")
 
-            logger.debug(f"Usage recorded: {operation_type} count={count} for {license_id}")
+            if operation_type == "ai_operation":
+                self._apply_usage(counter, operation_type, count)
+            else:
+                self._apply_usage(counter, operation_type, current + count)
+
+        self._maybe_flush_usage()
+        return True
+
+    def flush_usage(self) -> int:
+        """
+        Write buffered usage counters to license_usage in one transaction.
+
+        Returns:
+            Number of (license, day) rows written
+
+        Raises:
+            DatabaseError: If the write fails (counters stay buffered)
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows = []
+                snapshot = []
+                for (license_id, day), counter in self._usage.items():
+                    if not counter.dirty:
+                        continue
+                    projects = counter.projects if counter.projects_dirty else None
+                    users = counter.users if counter.users_dirty else None
+                    rows.append((
+                        str(uuid4()), license_id, day,
+                        counter.pending_ai_operations, projects or 0, users or 0,
+                        projects, users
+                    ))
+                    snapshot.append((counter, counter.pending_ai_operations, counter.loads))
+                    # Reloads until the commit lands must still count these
+                    counter.inflight_ai_operations += counter.pending_ai_operations
+                    counter.projects_inflight = counter.projects_dirty
+                    counter.users_inflight = counter.users_dirty
+                    counter.pending_ai_operations = 0
+                    counter.projects_dirty = False
+                    counter.users_dirty = False
+                self._unflushed_events = 0
+                self._first_unflushed_at = None
+
+            if not rows:
+                return 0
+
+            try:
+                with self._connection() as conn:
+                    conn.executemany("""
+                        INSERT INTO license_usage (
+                            usage_id, license_id, date,
+                            ai_operations_count, projects_count, active_users_count
+                        ) VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(license_id, date) DO UPDATE SET
+                            ai_operations_count = ai_operations_count + excluded.ai_operations_count,
+                            projects_count = COALESCE(?, projects_count),
+                            active_users_count = COALESCE(?, active_users_count)
+                    """, rows)
+                    conn.commit()
+            except sqlite3.Error as e:
+                # Put the deltas back so the next flush retries them
+                with self._lock:
+                    for (counter, pending, _), row in zip(snapshot, rows):
+                        counter.inflight_ai_operations -= pending
+                        counter.pending_ai_operations += pending
+                        counter.projects_dirty = counter.projects_dirty or row[6] is not None
+                        counter.users_dirty = counter.users_dirty or row[7] is not None
+                        counter.projects_inflight = False
+                        counter.users_inflight = False
+                error_msg = f"Failed to record usage: {e}"
+                logger.error(error_msg)
+                raise DatabaseError(error_msg) from e
+
+            with self._lock:
+                for counter, pending, loads in snapshot:
+                    counter.inflight_ai_operations -= pending
+                    counter.projects_inflight = False
+                    counter.users_inflight = False
+                    # A reload between commit and now counted the deltas twice
+                    if counter.loads != loads:
+                        counter.loaded_at = float('-inf')
+
+            logger.debug(f"Flushed usage for {len(rows)} license/day rows")
+            return len(rows)
+
+    def close(self) -> None:
+        """Flush buffered usage and close pooled connections."""
+        try:
+            self.flush_usage()
+        finally:
+            while True:
+                try:
+                    self._pool.get_nowait().close()
+                except queue.Empty:
+                    break
+            _managers.discard(self)
+
+    def _usage_counter(self, license_id: str) -> _UsageCounter:
+        """
+        Get today's usage counter, (re)loading the persisted values when stale.
+
+        Must be called with self._lock held.
+        """
+        day = datetime.now(timezone.utc).date().isoformat()
+        key = (license_id, day)
+        counter = self._usage.get(key)
+        now = time.monotonic()
+
+        if counter is None or now - counter.loaded_at >= self.LICENSE_CACHE_SECONDS:
+            if counter is None:
+                counter = _UsageCounter()
+                self._usage[key] = counter
+                # Drop counters from previous days once they are persisted
+                for old_key in [k for k, c in self._usage.items() if k[1] != day and not c.dirty]:
+                    del self._usage[old_key]
+
+            row = self._read_usage_row(license_id, day)
+            if row is not None:
+                counter.ai_operations = (
+                    (row['ai_operations_count'] or 0)
+                    + counter.pending_ai_operations
+                    + counter.inflight_ai_operations
+                )
+                if not (counter.projects_dirty or counter.projects_inflight):
+                    counter.projects = row['projects_count'] or 0
+                if not (counter.users_dirty or counter.users_inflight):
+                    counter.users = row['active_users_count'] or 0
+            counter.loaded_at = now
+            counter.loads += 1
+
+        return counter
+
+    def _apply_usage(self, counter: _UsageCounter, operation_type: str, count: int) -> None:
+        """Apply a usage event to a counter. Must be called with self._lock held."""
+        if operation_type == "ai_operation":
+            counter.ai_operations += count
+            counter.pending_ai_operations += count
+        elif operation_type == "project":
+            counter.projects = count
+            counter.projects_dirty = True
+        elif operation_type == "user":
+            counter.users = count
+            counter.users_dirty = True
+        else:
+            return
+
+        self._unflushed_events += 1
+        if self._first_unflushed_at is None:
+            self._first_unflushed_at = time.monotonic()
+
+    def _maybe_flush_usage(self) -> None:
+        """Flush buffered usage once the batch size or age threshold is reached."""
+        with self._lock:
+            due = (
+                self._unflushed_events >= self.USAGE_FLUSH_BATCH
+                or (
+                    self._first_unflushed_at is not None
+                    and time.monotonic() - self._first_unflushed_at >= self.USAGE_FLUSH_INTERVAL_SECONDS
+                )
+            )
+        if due:
+            self.flush_usage()
 
+    def _read_usage_row(self, license_id: str, day: str) -> Optional[sqlite3.Row]:
+        """Read the persisted usage row for a license and day."""
+        try:
+            with self._connection() as conn:
+                return conn.execute(
+                    "SELECT * FROM license_usage WHERE license_id = ? AND date = ?",
+                    (license_id, day)
+                ).fetchone()
         except sqlite3.Error as e:
-            error_msg = f"Failed to record usage: {e}"
+            error_msg = f"Failed to get usage stats: {e}"
             logger.error(error_msg)
             raise DatabaseError(error_msg) from e
 
@@ -706,7 +1041,7 @@ class LicenseManager:
             Dictionary with license info and remaining quotas
         """
         try:
-            payload = jwt.decode(license_key, self.secret_key, algorithms=[self.JWT_ALGORITHM])
+            payload = self._decode_license_key(license_key)
             license_id = payload['license_id']
 
             license_info = self._get_license_info(license_id)
@@ -760,7 +1095,7 @@ class LicenseManager:
             New license key with updated expiration
         """
         try:
-            payload = jwt.decode(license_key, self.secret_key, algorithms=[self.JWT_ALGORITHM])
+            payload = self._decode_license_key(license_key)
             license_id = payload['license_id']
 
             # Get current license
@@ -777,15 +1112,15 @@ class LicenseManager:
             # Update database
             encrypted_key = self.cipher.encrypt(new_license_key.encode()).decode()
 
-            conn = sqlite3.connect(str(self.db_path))
-            conn.execute("""
-                UPDATE licenses
-                SET license_key = ?, expires_at = ?, status = ?
-                WHERE license_id = ?
-            """, (encrypted_key, new_expires_at.isoformat(), LicenseStatus.ACTIVE.value, license_id))
+            with self._connection() as conn:
+                conn.execute("""
+                    UPDATE licenses
+                    SET license_key = ?, expires_at = ?, status = ?
+                    WHERE license_id = ?
+                """, (encrypted_key, new_expires_at.isoformat(), LicenseStatus.ACTIVE.value, license_id))
+                conn.commit()
 
-            conn.commit()
-            conn.close()
+            self._invalidate_license(license_id)
 
             logger.info(f"License renewed: {license_id} until {new_expires_at.date()}")
 
@@ -811,16 +1146,17 @@ class LicenseManager:
     def _update_license_status(self, license_key: str, status: LicenseStatus) -> None:
         """Update license status in database."""
         try:
-            payload = jwt.decode(license_key, self.secret_key, algorithms=[self.JWT_ALGORITHM])
+            payload = self._decode_license_key(license_key)
             license_id = payload['license_id']
 
-            conn = sqlite3.connect(str(self.db_path))
-            conn.execute(
-                "UPDATE licenses SET status = ? WHERE license_id = ?",
-                (status.value, license_id)
-            )
-            conn.commit()
-            conn.close()
+            with self._connection() as conn:
+                conn.execute(
+                    "UPDATE licenses SET status = ? WHERE license_id = ?",
+                    (status.value, license_id)
+                )
+                conn.commit()
+
+            self._invalidate_license(license_id)
 
             logger.info(f"License status updated: {license_id} -> {status.value}")
 
@@ -832,15 +1168,11 @@ class LicenseManager:
     def _get_license_info(self, license_id: str) -> LicenseInfo:
         """Retrieve license info from database."""
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            conn.row_factory = sqlite3.Row
-
-            cursor = conn.execute(
-                "SELECT * FROM licenses WHERE license_id = ?",
-                (license_id,)
-            )
-            row = cursor.fetchone()
-            conn.close()
+            with self._connection() as conn:
+                row = conn.execute(
+                    "SELECT * FROM licenses WHERE license_id = ?",
+                    (license_id,)
+                ).fetchone()
 
             if not row:
                 raise LicenseNotFoundError(f"License not found: {license_id}")
@@ -869,55 +1201,47 @@ class LicenseManager:
             raise DatabaseError(error_msg) from e
 
     def _get_usage_stats(self, license_id: str) -> UsageStats:
-        """Get current usage statistics."""
-        try:
-            today = datetime.now(timezone.utc).date()
-
-            conn = sqlite3.connect(str(self.db_path))
-            conn.row_factory = sqlite3.Row
-
-            cursor = conn.execute(
-                "SELECT * FROM license_usage WHERE license_id = ? AND date = ?",
-                (license_id, today.isoformat())
+        """Get current usage statistics, including not-yet-flushed usage."""
+        with self._lock:
+            counter = self._usage_counter(license_id)
+            return UsageStats(
+                projects_count=counter.projects,
+                ai_operations_today=counter.ai_operations,
+                active_users_count=counter.users
             )
-            row = cursor.fetchone()
-            conn.close()
-
-            if row:
-                return UsageStats(
-                    projects_count=row['projects_count'] or 0,
-                    ai_operations_today=row['ai_operations_count'] or 0,
-                    active_users_count=row['active_users_count'] or 0
-                )
-            else:
-                return UsageStats(
-                    projects_count=0,
-                    ai_operations_today=0,
-                    active_users_count=0
-                )
-
-        except sqlite3.Error as e:
-            error_msg = f"Failed to get usage stats: {e}"
-            logger.error(error_msg)
-            raise DatabaseError(error_msg) from e
 
     def _update_last_validated(self, license_id: str) -> None:
         """Update last validation timestamp."""
         try:
             now = datetime.now(timezone.utc)
 
-            conn = sqlite3.connect(str(self.db_path))
-            conn.execute(
-                "UPDATE licenses SET last_validated = ? WHERE license_id = ?",
-                (now.isoformat(), license_id)
-            )
-            conn.commit()
-            conn.close()
+            with self._connection() as conn:
+                conn.execute(
+                    "UPDATE licenses SET last_validated = ? WHERE license_id = ?",
+                    (now.isoformat(), license_id)
+                )
+                conn.commit()
 
         except sqlite3.Error as e:
             logger.warning(f"Failed to update last_validated: {e}")
 
 
+# Live managers, flushed at interpreter exit so buffered usage is not lost
+_managers: "weakref.WeakSet[LicenseManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all_managers() -> None:
+    """Flush buffered usage of every live LicenseManager (registered with atexit)."""
+    for manager in list(_managers):
+        if not manager.db_path.exists():
+            continue
+        try:
+            manager.flush_usage()
+        except LicenseError as e:
+            print(f"Warning: Failed to flush license usage: {e}", file=sys.stderr)
+
+
 # ============================================================================
 # CLI ENTRY POINT
 # ============================================================================
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Non-Blocking Logging Pipeline
+
+Moves log I/O off the caller's thread. Callers log through a QueueHandler that
+only enqueues the record; a single listener thread drains the queue in batches
+and hands each batch to the output handlers:
+
+- Handlers with an ``emit_batch(records)`` method (SegmentedRollingFileHandler,
+  StructuredBatchHandler) receive the whole batch in one call.
+- Plain StreamHandler/FileHandler instances get one write + one flush per batch.
+- Any other handler falls back to per-record ``handle()`` on the listener thread.
+
+Backpressure (drop-debug-first):
+    When the queue is full, DEBUG records are dropped first (the incoming one,
+    or the oldest queued one to make room). INFO records are dropped only when
+    no DEBUG record can be evicted. WARNING and above wait for space (up to
+    ``block_timeout`` seconds) so errors are not silently lost.
+
+Every started pipeline is flushed and stopped at interpreter exit.
+
+Usage:
+    pipeline = LogPipeline([file_handler, console_handler])
+    logger.addHandler(pipeline.queue_handler)
+    ...
+    pipeline.flush()   # wait until everything logged so far is written
+
+Author: AZ1.AI INC (Hal Casteel)
+Framework: CODITECT
+License: MIT
+"""
+
+import sys
+import atexit
+import logging
+import logging.handlers
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional, Set
+
+
+class _FlushMarker:
+    """Queue marker that is signalled once every earlier record is handled."""
+
+    def __init__(self):
+        self.event = threading.Event()
+
+
+class DropDebugFirstQueue:
+    """
+    Bounded record queue with a drop-debug-first overflow policy.
+
+    DEBUG records are kept in a separate deque so the oldest one can be
+    evicted in O(1); records are returned in submission order across both.
+    The stop sentinel (None) and flush markers bypass the capacity limit.
+    """
+
+    def __init__(self, capacity: int = 10000, block_timeout: float = 1.0):
+        """
+        Initialize queue.
+
+        Args:
+            capacity: Maximum number of queued records
+            block_timeout: Seconds a WARNING+ record waits for space before
+                being dropped
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.block_timeout = block_timeout
+        self.dropped: Counter = Counter()
+
+        self._seq = 0
+        self._debug: deque = deque()
+        self._other: deque = deque()
+        self._cond = threading.Condition()
+
+    def __len__(self) -> int:
+        return len(self._debug) + len(self._other)
+
+    def put_nowait(self, record) -> None:
+        """Enqueue a record, applying the overflow policy if the queue is full."""
+        self.put(record)
+
+    def put(self, record, block: bool = True, timeout: Optional[float] = None) -> None:
+        """Enqueue a record, applying the overflow policy if the queue is full."""
+        with self._cond:
+            is_record = isinstance(record, logging.LogRecord)
+
+            if is_record and len(self) >= self.capacity:
+                if record.levelno <= logging.DEBUG:
+                    self.dropped['DEBUG'] += 1
+                    return
+                if self._debug:
+                    self._debug.popleft()
+                    self.dropped['DEBUG'] += 1
+                elif record.levelno < logging.WARNING:
+                    self.dropped[record.levelname] += 1
+                    return
+                else:
+                    deadline = time.monotonic() + self.block_timeout
+                    while len(self) >= self.capacity:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0 or not self._cond.wait(remaining):
+                            self.dropped[record.levelname] += 1
+                            return
+
+            self._seq += 1
+            if is_record and record.levelno <= logging.DEBUG:
+                self._debug.append((self._seq, record))
+            else:
+                self._other.append((self._seq, record))
+            self._cond.notify_all()
+
+    def get_batch(self, max_items: int) -> List[Any]:
+        """
+        Block until at least one item is queued, then return up to `max_items`
+        items in submission order.
+        """
+        with self._cond:
+            while not self._debug and not self._other:
+                self._cond.wait()
+
+            batch = []
+            while len(batch) < max_items and (self._debug or self._other):
+                if not self._other or (self._debug and self._debug[0][0] < self._other[0][0]):
+                    batch.append(self._debug.popleft()[1])
+                else:
+                    batch.append(self._other.popleft()[1])
+            self._cond.notify_all()
+            return batch
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        """Return the next item (QueueListener compatibility)."""
+        return self.get_batch(1)[0]
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener that delivers records to its handlers in batches.
+
+    The listener takes whatever is queued (up to `batch_size`) on each wake-up,
+    so batches grow under load while an idle logger still writes promptly.
+    Handler levels are always respected.
+    """
+
+    def __init__(self, queue: DropDebugFirstQueue, *handlers: logging.Handler, batch_size: int = 256):
+        super().__init__(queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+
+    def _monitor(self):
+        """Drain the queue in batches until the stop sentinel is seen."""
+        while True:
+            items = self.queue.get_batch(self.batch_size)
+            records = []
+            stop = False
+
+            for item in items:
+                if item is self._sentinel:
+                    stop = True
+                elif isinstance(item, _FlushMarker):
+                    self.handle_batch(records)
+                    records = []
+                    item.event.set()
+                else:
+                    records.append(item)
+
+            self.handle_batch(records)
+            if stop:
+                return
+
+    def handle_batch(self, records: List[logging.LogRecord]) -> None:
+        """Offer a batch of records to every handler."""
+        if not records:
+            return
+
+        for handler in self.handlers:
+            eligible = [
+                r for r in records
+                if r.levelno >= handler.level and handler.filter(r)
+            ]
+            if not eligible:
+                continue
+
+            try:
+                if hasattr(handler, 'emit_batch'):
+                    handler.acquire()
+                    try:
+                        handler.emit_batch(eligible)
+                    finally:
+                        handler.release()
+                elif _is_plain_stream_handler(handler):
+                    _emit_stream_batch(handler, eligible)
+                else:
+                    for record in eligible:
+                        handler.handle(record)
+            except Exception:
+                handler.handleError(eligible[0])
+
+
+class StructuredBatchHandler(logging.Handler):
+    """
+    Uploads structured payloads in batches via a Cloud Logging style logger.
+
+    Records must carry a ``structured`` attribute (dict payload). The target
+    logger must provide ``batch()`` returning an object with ``log_struct()``
+    and ``commit()`` - google.cloud.logging.Logger does, and so does
+    LocalStructuredSink for tests and offline runs.
+    """
+
+    def __init__(self, structured_logger: Any, resource: Optional[Dict[str, Any]] = None):
+        super().__init__(logging.DEBUG)
+        self.structured_logger = structured_logger
+        self.resource = resource
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Upload a single record (used only outside the pipeline)."""
+        self.emit_batch([record])
+
+    def emit_batch(self, records: List[logging.LogRecord]) -> None:
+        """Upload all structured records in one batch commit."""
+        batch = self.structured_logger.batch()
+        count = 0
+        for record in records:
+            payload = getattr(record, 'structured', None)
+            if payload is None:
+                continue
+            kwargs = {'severity': payload.get('severity', record.levelname)}
+            if self.resource is not None:
+                kwargs['resource'] = self.resource
+            batch.log_struct(payload, **kwargs)
+            count += 1
+        if count:
+            batch.commit()
+
+
+class _LocalBatch:
+    """Batch object returned by LocalStructuredSink.batch()."""
+
+    def __init__(self, sink: 'LocalStructuredSink'):
+        self._sink = sink
+        self._entries: List[Dict[str, Any]] = []
+
+    def log_struct(self, info: Dict[str, Any], **kwargs) -> None:
+        self._entries.append({'payload': info, **kwargs})
+
+    def commit(self) -> None:
+        with self._sink._lock:
+            self._sink.entries.extend(self._entries)
+            self._sink.commits += 1
+        self._entries = []
+
+
+class LocalStructuredSink:
+    """
+    In-process stand-in for a Cloud Logging logger.
+
+    Collects committed batches in memory so tests and offline runs can
+    exercise the structured upload path without GCP credentials.
+    """
+
+    def __init__(self):
+        self.entries: List[Dict[str, Any]] = []
+        self.commits = 0
+        self._lock = threading.Lock()
+
+    def batch(self) -> _LocalBatch:
+        return _LocalBatch(self)
+
+
+class LogPipeline:
+    """
+    Queue + batching listener pair wired to a set of output handlers.
+
+    `queue_handler` is the only handler that should be attached to the
+    producing logger; the output handlers run on the listener thread.
+    """
+
+    def __init__(
+        self,
+        handlers: List[logging.Handler],
+        capacity: int = 10000,
+        batch_size: int = 256,
+        block_timeout: float = 1.0
+    ):
+        """
+        Initialize and start the pipeline.
+
+        Args:
+            handlers: Output handlers (file, console, structured upload)
+            capacity: Maximum queued records before the overflow policy applies
+            batch_size: Maximum records delivered to handlers per batch
+            block_timeout: Seconds WARNING+ records wait for queue space
+        """
+        self.handlers = list(handlers)
+        self.queue = DropDebugFirstQueue(capacity, block_timeout)
+        self.queue_handler = logging.handlers.QueueHandler(self.queue)
+        self.listener = BatchingQueueListener(self.queue, *self.handlers, batch_size=batch_size)
+        self._stopped = False
+        self._lock = threading.Lock()
+
+        self.listener.start()
+        _pipelines.add(self)
+
+    @property
+    def dropped(self) -> Dict[str, int]:
+        """Number of dropped records by level name."""
+        return dict(self.queue.dropped)
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Wait until every record enqueued before this call has been written.
+
+        Returns:
+            True if the listener caught up within the timeout
+        """
+        if self._stopped:
+            return True
+        marker = _FlushMarker()
+        self.queue.put(marker)
+        if not marker.event.wait(timeout):
+            return False
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+        return True
+
+    def stop(self) -> None:
+        """Drain the queue, stop the listener thread and close the handlers."""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+        self.listener.stop()
+        for handler in self.handlers:
+            try:
+                handler.flush()
+                handler.close()
+            except Exception:
+                pass
+        _pipelines.discard(self)
+
+
+# Running pipelines, stopped at interpreter exit
+_pipelines: 'Set[LogPipeline]' = set()
+
+
+@atexit.register
+def stop_all_pipelines() -> None:
+    """Flush and stop every running pipeline (registered with atexit)."""
+    for pipeline in list(_pipelines):
+        try:
+            pipeline.stop()
+        except Exception as e:
+            print(f"Warning: Failed to stop log pipeline: {e}", file=sys.stderr)
+
+
+def _is_plain_stream_handler(handler: logging.Handler) -> bool:
+    """True if the handler writes with the stock StreamHandler/FileHandler emit."""
+    return (
+        isinstance(handler, logging.StreamHandler)
+        and type(handler).emit in (logging.StreamHandler.emit, logging.FileHandler.emit)
+    )
+
+
+def _emit_stream_batch(handler: logging.StreamHandler, records: List[logging.LogRecord]) -> None:
+    """Write a batch to a stream handler with one write and one flush."""
+    text = ''.join(handler.format(r) + handler.terminator for r in records)
+    handler.acquire()
+    try:
+        if handler.stream is None and isinstance(handler, logging.FileHandler):
+            handler.stream = handler._open()
+        handler.stream.write(text)
+        handler.flush()
+    finally:
+        handler.release()
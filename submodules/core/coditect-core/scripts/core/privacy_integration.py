@@ -21,7 +21,6 @@ Date: 2025-11-16
 
 import os
 import sys
-import json
 import logging
 from pathlib import Path
 from typing import Dict, Optional, Tuple
@@ -38,6 +37,8 @@ except ImportError as e:
     print("Make sure privacy_manager.py is in the same directory")
     sys.exit(1)
 
+from audit_writer import AuditWriterError, get_audit_writer
+
 # Configure logging to output to both stdout and file
 logging.basicConfig(
     level=logging.INFO,
@@ -100,12 +101,13 @@ class PrivacyIntegration:
             self.memory_context_dir = self.repo_root.parent.parent.parent / "MEMORY-CONTEXT"
             self.audit_dir = self.memory_context_dir / "audit"
 
-            # Create audit directory
+            # Buffered audit trail (segments created lazily on first flush)
             try:
-                self.audit_dir.mkdir(parents=True, exist_ok=True)
-            except OSError as e:
-                logger.warning(f"Cannot create audit directory: {e}")
-                # Non-fatal, continue without audit directory
+                self.audit_writer = get_audit_writer(self.audit_dir, prefix="privacy-audit")
+            except AuditWriterError as e:
+                logger.warning(f"Cannot start audit writer: {e}")
+                self.audit_writer = None
+                # Non-fatal, continue without audit logging
 
             # Initialize privacy manager
             try:
@@ -194,8 +196,9 @@ class PrivacyIntegration:
         return processed_content, report
 
     def _write_audit_log(self, report: Dict):
-        """Write privacy audit log."""
-        audit_file = self.audit_dir / "privacy-audit.log"
+        """Queue privacy report for the audit trail (non-blocking)."""
+        if self.audit_writer is None:
+            return
 
         log_entry = {
             'timestamp': report['timestamp'],
@@ -208,11 +211,23 @@ class PrivacyIntegration:
         }
 
         try:
-            with open(audit_file, 'a') as f:
-                f.write(json.dumps(log_entry) + '\n')
-        except Exception as e:
+            self.audit_writer.write(log_entry)
+        except AuditWriterError as e:
             logger.error(f"Failed to write audit log: {e}")
 
+    def flush_audit(self, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Wait until queued audit entries from both this integration and its
+        PrivacyManager are written and fsynced.
+
+        Returns:
+            True if both audit trails were flushed within the timeout
+        """
+        flushed = self.privacy_manager.flush_audit(timeout)
+        if self.audit_writer is not None:
+            flushed = self.audit_writer.flush(timeout) and flushed
+        return flushed
+
 
 # Convenience functions for common workflows
 
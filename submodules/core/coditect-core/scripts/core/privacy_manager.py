@@ -16,7 +16,7 @@ Features:
 - Configurable redaction strategies
 - Privacy-aware export filtering
 - GDPR compliance support
-- Audit trail for privacy operations
+- Buffered audit trail for privacy operations (see audit_writer.py)
 
 Usage:
     from privacy_manager import PrivacyManager, PrivacyLevel
@@ -50,6 +50,7 @@ from datetime import datetime, timezone
 
 # Import core utilities
 from utils import find_git_root, GitRepositoryNotFoundError, InvalidPathError
+from audit_writer import AuditWriterError, get_audit_writer
 
 # Configure logging to output to both stdout and file
 logging.basicConfig(
@@ -217,15 +218,16 @@ class PrivacyManager:
             else:
                 self.config = config
 
-            # Audit log setup
-            self.audit_log_path = self.memory_context_dir / "archive" / "privacy_audit.log"
+            # Audit trail setup - entries are buffered and written as
+            # gzip-compressed JSONL segments by a background thread
+            self.audit_dir = self.memory_context_dir / "archive" / "privacy_audit"
+            self.audit_writer = None
 
-            # Ensure audit directory exists
             if self.config.audit_enabled:
                 try:
-                    self.audit_log_path.parent.mkdir(parents=True, exist_ok=True)
-                except OSError as e:
-                    logger.warning(f"Cannot create audit log directory: {e}")
+                    self.audit_writer = get_audit_writer(self.audit_dir, prefix="privacy_audit")
+                except AuditWriterError as e:
+                    logger.warning(f"Cannot start audit writer: {e}")
                     # Non-fatal, continue without audit logging
 
             logger.info(f"PrivacyManager initialized (level: {self.config.default_level.value})")
@@ -330,12 +332,10 @@ class PrivacyManager:
         logger.info(f"Privacy config saved to {self.config_path}")
 
     def _log_audit(self, operation: str, details: Dict) -> None:
-        """Log privacy operation to audit trail."""
-        if not self.config.audit_enabled:
+        """Queue privacy operation for the audit trail (non-blocking)."""
+        if self.audit_writer is None:
             return
 
-        self.audit_log_path.parent.mkdir(parents=True, exist_ok=True)
-
         timestamp = datetime.now(timezone.utc).isoformat()
         audit_entry = {
             'timestamp': timestamp,
@@ -343,8 +343,24 @@ class PrivacyManager:
             'details': details
         }
 
-        with open(self.audit_log_path, 'a') as f:
-            f.write(json.dumps(audit_entry) + '\n')
+        try:
+            self.audit_writer.write(audit_entry)
+        except AuditWriterError as e:
+            logger.warning(f"Audit entry dropped: {e}")
+
+    def flush_audit(self, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Wait until all queued audit entries are written and fsynced.
+
+        Args:
+            timeout: Seconds to wait (None waits forever)
+
+        Returns:
+            True if the audit trail is durable on disk (or auditing is disabled)
+        """
+        if self.audit_writer is None:
+            return True
+        return self.audit_writer.flush(timeout)
 
     def detect_pii(
         self,
@@ -2,10 +2,17 @@
 """
 Rolling Log Handler with Line-Based Trimming
 
-Maintains a log file with a maximum of 5000 lines. When the limit is reached,
-the oldest lines (from the head) are removed to make room for new entries.
+Maintains a log with a maximum of 5000 lines. When the limit is reached,
+the oldest lines are dropped to make room for new entries.
 
-This ensures the log file never grows unbounded while preserving the most
+Two handlers are provided:
+- SegmentedRollingFileHandler (default): writes numbered segment files of
+  fixed line count and drops the oldest whole segment in O(1). Use
+  read_last_lines() to view the most recent lines across segments.
+- RollingLineFileHandler (legacy): a single file trimmed by rewriting it,
+  which blocks every logging thread while the whole file is rewritten.
+
+This ensures the log never grows unbounded while preserving the most
 recent information for debugging and auditing.
 
 Author: AZ1.AI INC (Hal Casteel)
@@ -13,11 +20,13 @@ Framework: CODITECT
 License: MIT
 """
 
+import os
+import re
 import logging
 from pathlib import Path
 from collections import deque
 from threading import Lock
-from typing import Optional
+from typing import List, Optional, Tuple
 
 
 class RollingLineFileHandler(logging.FileHandler):
@@ -26,6 +35,9 @@ class RollingLineFileHandler(logging.FileHandler):
 
     When the line limit is reached, the oldest lines are trimmed from the head
     of the file, keeping only the most recent lines.
+
+    Trimming rewrites the whole file under the handler lock; prefer
+    SegmentedRollingFileHandler for long-running processes.
     """
 
     def __init__(
@@ -139,22 +151,238 @@ class RollingLineFileHandler(logging.FileHandler):
                     pass
 
 
+class SegmentedRollingFileHandler(logging.FileHandler):
+    """
+    File handler that keeps a bounded number of lines in numbered segments.
+
+    Records are appended to the newest segment (e.g. ``export-dedup.log.000042``).
+    Once a segment holds ``max_lines / segments`` lines the handler opens the
+    next one and deletes the oldest segment beyond ``segments``, so rolling
+    costs one file open and at most one unlink, never a rewrite.
+
+    Between ``max_lines - max_lines / segments`` and ``max_lines`` of the most
+    recent lines are always retained.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_lines: int = 5000,
+        segments: int = 5,
+        encoding: Optional[str] = 'utf-8',
+        delay: bool = False
+    ):
+        """
+        Initialize segmented rolling file handler.
+
+        Args:
+            filename: Base log file path (segments are ``<filename>.NNNNNN``)
+            max_lines: Maximum number of lines to keep across all segments
+            segments: Number of segments to keep (default: 5)
+            encoding: File encoding (default: 'utf-8')
+            delay: Delay file opening until first emit
+        """
+        if max_lines < 1 or segments < 1:
+            raise ValueError("max_lines and segments must be positive")
+
+        # Absolute like FileHandler.baseFilename, so a later chdir cannot
+        # send rolled segments to a different directory
+        self.base_path = Path(os.path.abspath(filename))
+        self.max_lines = max_lines
+        self.segments = segments
+        self.segment_lines = max(1, -(-max_lines // segments))  # ceil division
+
+        self.base_path.parent.mkdir(parents=True, exist_ok=True)
+        existing = list_log_segments(self.base_path)
+        self.segment_seqs = deque(seq for seq, _ in existing)
+
+        if self.segment_seqs:
+            # Resume the newest segment; it holds at most segment_lines lines
+            self.current_seq = self.segment_seqs[-1]
+            self.line_count = _count_lines(existing[-1][1], encoding)
+        else:
+            self.current_seq = 1
+            self.segment_seqs.append(self.current_seq)
+            self.line_count = 0
+
+        super().__init__(
+            str(segment_file_path(self.base_path, self.current_seq)),
+            mode='a',
+            encoding=encoding,
+            delay=delay
+        )
+
+        if self.line_count >= self.segment_lines:
+            self._roll_segment()
+
+    def emit(self, record):
+        """
+        Emit a record, rolling to a new segment if the current one is full.
+
+        Args:
+            record: LogRecord to emit
+        """
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            msg = self.format(record)
+            self.stream.write(msg + self.terminator)
+            self.flush()
+
+            # Multi-line messages (banners, tracebacks) count every line
+            self.line_count += msg.count('\n') + 1
+            if self.line_count >= self.segment_lines:
+                self._roll_segment()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def emit_batch(self, records):
+        """
+        Write a batch of records with one write per segment touched.
+
+        Called by the log pipeline listener with the handler lock held.
+
+        Args:
+            records: LogRecords to emit, in order
+        """
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+
+            pending = []
+            for record in records:
+                msg = self.format(record)
+                pending.append(msg + self.terminator)
+                self.line_count += msg.count('\n') + 1
+                if self.line_count >= self.segment_lines:
+                    self.stream.write(''.join(pending))
+                    pending = []
+                    self._roll_segment()
+
+            if pending:
+                self.stream.write(''.join(pending))
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(records[-1] if records else None)
+
+    def _roll_segment(self):
+        """Open the next segment and drop the oldest one beyond the limit."""
+        if self.stream is not None:
+            self.stream.flush()
+            self.stream.close()
+            self.stream = None
+
+        self.current_seq += 1
+        self.segment_seqs.append(self.current_seq)
+        self.baseFilename = str(segment_file_path(self.base_path, self.current_seq))
+        self.line_count = 0
+        self.stream = self._open()
+
+        while len(self.segment_seqs) > self.segments:
+            oldest = self.segment_seqs.popleft()
+            try:
+                segment_file_path(self.base_path, oldest).unlink()
+            except FileNotFoundError:
+                pass
+
+
+def segment_file_path(base_path: Path, seq: int) -> Path:
+    """Build the path for log segment number `seq`."""
+    base_path = Path(base_path)
+    return base_path.with_name(f"{base_path.name}.{seq:06d}")
+
+
+def list_log_segments(base_path: Path) -> List[Tuple[int, Path]]:
+    """
+    List segment files for a segmented log in sequence order.
+
+    Args:
+        base_path: Base log file path given to SegmentedRollingFileHandler
+
+    Returns:
+        List of (sequence_number, path) tuples, oldest first
+    """
+    base_path = Path(base_path)
+    if not base_path.parent.is_dir():
+        return []
+
+    pattern = re.compile(rf"^{re.escape(base_path.name)}\.(\d{{6,}})$")
+    segments = []
+    for path in base_path.parent.iterdir():
+        match = pattern.match(path.name)
+        if match:
+            segments.append((int(match.group(1)), path))
+    segments.sort()
+    return segments
+
+
+def read_last_lines(base_path: Path, n: int, encoding: str = 'utf-8') -> List[str]:
+    """
+    Return the last `n` lines of a segmented log, oldest first.
+
+    Only the newest segments needed to satisfy `n` are read.
+
+    Args:
+        base_path: Base log file path given to SegmentedRollingFileHandler
+        n: Number of lines to return
+        encoding: File encoding
+
+    Returns:
+        List of lines (without trailing newlines)
+    """
+    if n <= 0:
+        return []
+
+    collected: List[List[str]] = []
+    remaining = n
+    for _, path in reversed(list_log_segments(base_path)):
+        try:
+            with open(path, 'r', encoding=encoding) as f:
+                tail = deque((line.rstrip('\n') for line in f), maxlen=remaining)
+        except FileNotFoundError:
+            continue  # Dropped by a concurrent roll
+        collected.append(list(tail))
+        remaining -= len(tail)
+        if remaining <= 0:
+            break
+
+    lines: List[str] = []
+    for chunk in reversed(collected):
+        lines.extend(chunk)
+    return lines
+
+
+def _count_lines(path: Path, encoding: Optional[str]) -> int:
+    """Count lines in a file, returning 0 if it cannot be read."""
+    try:
+        with open(path, 'r', encoding=encoding) as f:
+            return sum(1 for _ in f)
+    except OSError:
+        return 0
+
+
 def setup_rolling_logger(
     log_file: Path,
     logger_name: str = "export_dedup",
     max_lines: int = 5000,
     console_level: int = logging.INFO,
-    file_level: int = logging.DEBUG
+    file_level: int = logging.DEBUG,
+    segments: int = 5
 ) -> logging.Logger:
     """
-    Setup a logger with rolling file handler and console output.
+    Setup a logger with segmented rolling file handler and console output.
 
     Args:
-        log_file: Path to log file
+        log_file: Base path for log segments
         logger_name: Name of the logger
-        max_lines: Maximum lines in log file
+        max_lines: Maximum lines kept across all segments
         console_level: Console logging level
         file_level: File logging level
+        segments: Number of segments to keep
 
     Returns:
         Configured logger instance
@@ -170,10 +398,10 @@ def setup_rolling_logger(
     logger.handlers = []
 
     # Rolling file handler - detailed logs with line limit
-    file_handler = RollingLineFileHandler(
+    file_handler = SegmentedRollingFileHandler(
         str(log_file),
         max_lines=max_lines,
-        mode='a',
+        segments=segments,
         encoding='utf-8'
     )
     file_handler.setLevel(file_level)
@@ -199,18 +427,25 @@ def setup_rolling_logger(
 
 
 if __name__ == "__main__":
-    """Test the rolling log handler"""
+    """Test the rolling log handler, or tail a segmented log"""
+    import sys
     import tempfile
-    from pathlib import Path
 
-    # Create temporary log file
+    if len(sys.argv) > 1:
+        # Usage: rolling_log_handler.py <base log path> [lines]
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+        for line in read_last_lines(Path(sys.argv[1]), count):
+            print(line)
+        sys.exit(0)
+
+    # Create temporary log directory
     with tempfile.TemporaryDirectory() as tmpdir:
         log_file = Path(tmpdir) / "test_rolling.log"
 
         # Setup logger with small max_lines for testing
-        logger = setup_rolling_logger(log_file, max_lines=20)
+        logger = setup_rolling_logger(log_file, max_lines=20, segments=4)
 
-        # Write 30 lines to trigger trimming
+        # Write 30 lines to trigger rolling
         print("\n" + "=" * 60)
         print("Testing Rolling Log Handler")
         print("=" * 60)
@@ -222,16 +457,15 @@ if __name__ == "__main__":
             if i % 10 == 0:
                 logger.debug(f"Debug info at entry {i}")
 
-        # Read final log to verify trimming
+        # Read final log to verify rolling
         print("\n" + "=" * 60)
         print("Final log contents:")
         print("=" * 60)
-        with open(log_file, 'r') as f:
-            content = f.read()
-            print(content)
+        lines = read_last_lines(log_file, 20)
+        print("\n".join(lines))
 
-        line_count = len(content.splitlines())
         print("=" * 60)
-        print(f"Final line count: {line_count}")
-        print("Expected: ~16-20 lines (trimmed from 30)")
+        print(f"Segments: {[p.name for _, p in list_log_segments(log_file)]}")
+        print(f"Final line count: {len(lines)}")
+        print("Expected: 15-20 lines (oldest segments dropped)")
         print("=" * 60)
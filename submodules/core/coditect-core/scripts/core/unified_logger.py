@@ -3,7 +3,7 @@
 Unified Logging Module - Dual-Mode (Local + GCP Cloud Logging)
 
 Automatically detects environment and configures appropriate logging backend:
-- LOCAL: File-based logging with RollingLineFileHandler
+- LOCAL: File-based logging with SegmentedRollingFileHandler
 - GCP: Cloud Logging with structured logs, correlation IDs, resource labels
 
 Design principles:
@@ -13,6 +13,8 @@ Design principles:
 4. Resource labels for GKE pod metadata
 5. Log-based metrics for monitoring
 6. Automatic environment detection
+7. Non-blocking: log I/O (file writes, Cloud Logging uploads) runs in batches
+   on a background pipeline thread (see log_pipeline.py)
 
 Author: AZ1.AI INC (Hal Casteel)
 Framework: CODITECT
@@ -26,7 +28,7 @@ import json
 import uuid
 import socket
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, List, Optional, Union
 from datetime import datetime, timezone
 from dataclasses import dataclass, field, asdict
 
@@ -40,11 +42,18 @@ except ImportError:
 
 # Import local rolling log handler
 try:
-    from rolling_log_handler import RollingLineFileHandler
+    from rolling_log_handler import SegmentedRollingFileHandler
     ROLLING_HANDLER_AVAILABLE = True
 except ImportError:
     ROLLING_HANDLER_AVAILABLE = False
 
+# Import non-blocking queue pipeline
+try:
+    from log_pipeline import LogPipeline, StructuredBatchHandler
+    PIPELINE_AVAILABLE = True
+except ImportError:
+    PIPELINE_AVAILABLE = False
+
 
 # ============================================================================
 # ENVIRONMENT DETECTION
@@ -89,6 +98,24 @@ def get_gcp_resource_labels() -> Dict[str, str]:
     }
 
 
+def current_trace_context() -> Dict[str, Optional[str]]:
+    """
+    trace_id/span_id/correlation_id of the active orchestration span.
+
+    Only consults orchestration.tracing if the process already imported it,
+    so logging never pulls in the orchestration stack.
+    """
+    tracing = sys.modules.get('orchestration.tracing')
+    span = tracing.current_span() if tracing is not None else None
+    if span is None:
+        return {}
+    return {
+        'trace_id': span.trace_id,
+        'span_id': span.span_id,
+        'correlation_id': span.correlation_id,
+    }
+
+
 # ============================================================================
 # STRUCTURED LOG ENTRY
 # ============================================================================
@@ -108,6 +135,8 @@ class StructuredLogEntry:
     step_name: Optional[str] = None
     workflow_id: Optional[str] = None
     correlation_id: Optional[str] = None
+    trace_id: Optional[str] = None
+    span_id: Optional[str] = None
     duration_ms: Optional[float] = None
     metrics: Optional[Dict[str, Any]] = None
     metadata: Optional[Dict[str, Any]] = None
@@ -131,7 +160,7 @@ class UnifiedLogger:
     Dual-mode logger that works in both local and GCP environments.
 
     Automatically detects environment and configures appropriate backend:
-    - Local: RollingLineFileHandler with console output
+    - Local: SegmentedRollingFileHandler with console output
     - GCP: Cloud Logging with structured logs
 
     Features:
@@ -141,6 +170,7 @@ class UnifiedLogger:
     - Step-based logging
     - Metrics tracking
     - Automatic environment detection
+    - Non-blocking batched output (call flush() before reading the log back)
     """
 
     def __init__(
@@ -151,7 +181,9 @@ class UnifiedLogger:
         console_level: int = logging.INFO,
         file_level: int = logging.DEBUG,
         workflow_id: Optional[str] = None,
-        force_environment: Optional[str] = None
+        force_environment: Optional[str] = None,
+        structured_logger: Optional[Any] = None,
+        use_pipeline: bool = True
     ):
         """
         Initialize unified logger.
@@ -164,21 +196,37 @@ class UnifiedLogger:
             file_level: File logging level
             workflow_id: Optional workflow ID for correlation
             force_environment: Force 'local' or 'gcp' (overrides auto-detection)
+            structured_logger: Cloud Logging style logger (anything with
+                batch().log_struct()/commit(), e.g. log_pipeline.LocalStructuredSink)
+                used for structured uploads instead of creating a GCP client
+            use_pipeline: Write through the non-blocking batching pipeline
         """
         self.component = component
         self.workflow_id = workflow_id or str(uuid.uuid4())
         self.environment = force_environment or detect_environment()
+        self.pipeline = None
 
         # Initialize base logger
         self.logger = logging.getLogger(f"{component}-{self.workflow_id[:8]}")
         self.logger.setLevel(logging.DEBUG)
         self.logger.handlers = []  # Clear existing handlers
+        self.logger.propagate = False
 
         # Configure backend based on environment
-        if self.environment == 'gcp' and GCP_AVAILABLE:
-            self._configure_gcp_logging()
+        if structured_logger is not None:
+            handlers = self._configure_structured_logging(structured_logger)
+        elif self.environment == 'gcp' and GCP_AVAILABLE:
+            handlers = self._configure_gcp_logging()
         else:
-            self._configure_local_logging(log_file, max_lines, console_level, file_level)
+            handlers = self._configure_local_logging(log_file, max_lines, console_level, file_level)
+
+        # Route records through the background pipeline, or attach directly
+        if use_pipeline and PIPELINE_AVAILABLE:
+            self.pipeline = LogPipeline(handlers)
+            self.logger.addHandler(self.pipeline.queue_handler)
+        else:
+            for handler in handlers:
+                self.logger.addHandler(handler)
 
         # Log initialization
         self.info(f"UnifiedLogger initialized", metadata={
@@ -195,7 +243,7 @@ class UnifiedLogger:
         max_lines: int,
         console_level: int,
         file_level: int
-    ):
+    ) -> List[logging.Handler]:
         """Configure local file-based logging with rolling handler."""
         # Default log file location
         if log_file is None:
@@ -206,12 +254,12 @@ class UnifiedLogger:
             log_file = Path(log_file)
             log_file.parent.mkdir(parents=True, exist_ok=True)
 
-        # File handler (rolling with line limit)
+        # File handler (segmented rolling with line limit; log_file is the
+        # segment base path, read it back with rolling_log_handler.read_last_lines)
         if ROLLING_HANDLER_AVAILABLE:
-            file_handler = RollingLineFileHandler(
+            file_handler = SegmentedRollingFileHandler(
                 str(log_file),
                 max_lines=max_lines,
-                mode='a',
                 encoding='utf-8'
             )
         else:
@@ -223,37 +271,32 @@ class UnifiedLogger:
             datefmt="%Y-%m-%d %H:%M:%S"
         )
         file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(file_handler)
 
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(console_level)
         console_formatter = logging.Formatter("%(message)s")
         console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
 
         self.log_file = log_file
+        self.structured = False
+        return [file_handler, console_handler]
 
-    def _configure_gcp_logging(self):
+    def _configure_gcp_logging(self) -> List[logging.Handler]:
         """Configure GCP Cloud Logging with structured logs."""
         # Initialize Cloud Logging client
         self.gcp_client = cloud_logging.Client()
-        self.gcp_logger = self.gcp_client.logger(self.component)
+        return self._configure_structured_logging(self.gcp_client.logger(self.component))
 
-        # Add Cloud Logging handler for standard Python logging
-        cloud_handler = CloudLoggingHandler(self.gcp_client, name=self.component)
-        cloud_handler.setLevel(logging.DEBUG)
-        self.logger.addHandler(cloud_handler)
-
-        # Also add console handler for local debugging
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.INFO)
-        console_formatter = logging.Formatter("%(message)s")
-        console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
+    def _configure_structured_logging(self, structured_logger: Any) -> List[logging.Handler]:
+        """Configure batched structured uploads (log_struct) to `structured_logger`."""
+        self.gcp_logger = structured_logger
 
         # Get resource labels
         self.resource_labels = get_gcp_resource_labels()
+        self.structured = True
+
+        return [StructuredBatchHandler(self.gcp_logger, resource=self._get_gcp_resource())]
 
     def _log_structured(
         self,
@@ -271,7 +314,12 @@ class UnifiedLogger:
         Log structured entry.
 
         Works in both local (JSON to file) and GCP (Cloud Logging) modes.
+        Only enqueues the entry; file writes and uploads happen in batches on
+        the pipeline thread.
         """
+        # Link the entry to the active trace span, if any
+        trace_context = current_trace_context()
+
         # Create structured log entry
         entry = StructuredLogEntry(
             message=message,
@@ -281,25 +329,22 @@ class UnifiedLogger:
             step=step,
             step_name=step_name,
             workflow_id=self.workflow_id,
-            correlation_id=correlation_id,
+            correlation_id=correlation_id or trace_context.get('correlation_id'),
+            trace_id=trace_context.get('trace_id'),
+            span_id=trace_context.get('span_id'),
             duration_ms=duration_ms,
             metrics=metrics,
             metadata=metadata
         )
 
+        log_method = getattr(self.logger, severity.lower(), self.logger.info)
+
         # Log to appropriate backend
-        if self.environment == 'gcp' and GCP_AVAILABLE:
-            # GCP Cloud Logging (structured)
-            self.gcp_logger.log_struct(
-                entry.to_dict(),
-                severity=severity,
-                resource=self._get_gcp_resource()
-            )
+        if self.structured:
+            # Cloud Logging (structured payload uploaded in batches)
+            log_method(message, extra={'structured': entry.to_dict()})
         else:
             # Local logging (JSON string in file, plain message to console)
-            log_method = getattr(self.logger, severity.lower(), self.logger.info)
-
-            # File gets JSON structure
             json_msg = entry.to_json()
             log_method(json_msg)
 
@@ -527,6 +572,51 @@ class UnifiedLogger:
         """Get correlation ID for this logger (workflow_id)."""
         return self.workflow_id
 
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        """
+        Open an orchestration trace span correlated with this logger.
+
+        Spans opened inside it (router, executor, LLM calls) inherit this
+        logger's workflow_id as their correlation_id, and entries logged
+        meanwhile carry the span's trace_id/span_id.
+
+        Requires the orchestration package to be importable.
+        """
+        from orchestration.tracing import get_tracer
+        return get_tracer().start_as_current_span(name, attributes, correlation_id=self.workflow_id)
+
+    # ========================================================================
+    # PIPELINE CONTROL
+    # ========================================================================
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Wait until every entry logged so far has been written/uploaded.
+
+        Args:
+            timeout: Seconds to wait (None waits forever)
+
+        Returns:
+            True if all pending entries were written within the timeout
+        """
+        if self.pipeline is None:
+            for handler in self.logger.handlers:
+                handler.flush()
+            return True
+        return self.pipeline.flush(timeout)
+
+    def close(self):
+        """Flush pending entries and release file handles and threads."""
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+            handler.close()
+
+    def get_dropped_counts(self) -> Dict[str, int]:
+        """Records dropped by the pipeline's backpressure policy, by level."""
+        return self.pipeline.dropped if self.pipeline is not None else {}
+
 
 # ============================================================================
 # CONVENIENCE FUNCTIONS
@@ -40,11 +40,13 @@ try:
 except ImportError:
     UNIFIED_LOGGER_AVAILABLE = False
 
+LOG_FILE = Path("checkpoint-creation.log").resolve()
+
 # Configure logging using UnifiedLogger (auto-detects local vs GCP)
 if UNIFIED_LOGGER_AVAILABLE:
     logger = setup_unified_logger(
         component="create-checkpoint",
-        log_file=Path("checkpoint-creation.log"),
+        log_file=LOG_FILE,
         max_lines=5000,
         console_level=logging.INFO,
         file_level=logging.DEBUG
@@ -56,11 +58,27 @@ else:
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
             logging.StreamHandler(sys.stdout),
-            logging.FileHandler('checkpoint-creation.log', mode='a')
+            logging.FileHandler(LOG_FILE, mode='a')
         ]
     )
     logger = logging.getLogger(__name__)
 
+
+def log_file_hint() -> str:
+    """Describe where log details were written, naming the newest segment if any."""
+    if not UNIFIED_LOGGER_AVAILABLE:
+        return str(LOG_FILE)
+    try:
+        from rolling_log_handler import list_log_segments
+        segments = list_log_segments(LOG_FILE)
+    except (ImportError, OSError):
+        segments = []
+    pattern = f"{LOG_FILE}.NNNNNN"
+    if segments:
+        return f"{segments[-1][1]} (older lines in {pattern})"
+    return pattern
+
+
 # Privacy integration (optional - fail gracefully if not available)
 try:
     from privacy_integration import process_checkpoint_with_privacy
@@ -1374,7 +1392,7 @@ For more information: https://github.com/coditect-ai/coditect-rollout-master
         print(f"{'='*80}")
         print(f"\n{e}\n")
         print("Git operations failed. Check the log file for details:")
-        print("  checkpoint-creation.log")
+        print(f"  {log_file_hint()}")
         return 2
 
     except FileOperationError as e:
@@ -1393,7 +1411,7 @@ For more information: https://github.com/coditect-ai/coditect-rollout-master
         print(f"{'='*80}")
         print(f"\n{e}\n")
         print("Checkpoint creation failed. See log for details:")
-        print("  checkpoint-creation.log")
+        print(f"  {log_file_hint()}")
         return 4
 
     except KeyboardInterrupt:
@@ -1409,7 +1427,7 @@ For more information: https://github.com/coditect-ai/coditect-rollout-master
         print(f"{'='*80}")
         print(f"\n{e}\n")
         print("An unexpected error occurred. Full details in log file:")
-        print("  checkpoint-creation.log")
+        print(f"  {log_file_hint()}")
         print("\nPlease report this issue if it persists.")
         return 255
 
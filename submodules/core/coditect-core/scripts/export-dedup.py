@@ -105,7 +105,7 @@ def setup_logging(log_dir: Path) -> logging.Logger:
     Configure dual logging (rolling file + stdout) with step tracking.
 
     Uses UnifiedLogger with automatic environment detection (local vs GCP).
-    - Local: RollingLineFileHandler with 5000-line limit
+    - Local: SegmentedRollingFileHandler with 5000-line limit
     - GCP: Cloud Logging with structured logs
 
     Args:
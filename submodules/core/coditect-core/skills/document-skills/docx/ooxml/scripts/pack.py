@@ -2,37 +2,97 @@
 """
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
+XML parts are condensed in memory (in parallel for large packages) and
+streamed straight into the zip; already-compressed media is stored as-is.
+
 Example usage:
     python pack.py <input_directory> <office_file> [--force]
+
+    # Several packages: validated together in one batch on the office workers
+    python pack.py unpacked-a a.docx unpacked-b b.docx
+
+Library usage:
+    from ooxml.scripts.pack import OfficePackage
+
+    package = OfficePackage.open("deck.pptx")
+    xml = package.read_xml("ppt/slides/slide1.xml")
+    package.write("ppt/slides/slide1.xml", xml.replace("Draft", "Final"))
+    package.save("deck-final.pptx")
 """
 
 import argparse
-import shutil
-import subprocess
+import os
 import sys
 import tempfile
 import defusedxml.minidom
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
+try:
+    from .office import OfficeError, OfficeNotFoundError, OfficeTimeoutError, get_office_service
+except ImportError:  # Run as a script
+    from office import OfficeError, OfficeNotFoundError, OfficeTimeoutError, get_office_service
+
+XML_EXTENSIONS = (".xml", ".rels")
+
+# Already-compressed media: deflating it again costs CPU and saves nothing
+STORED_EXTENSIONS = frozenset(
+    {
+        ".png", ".jpg", ".jpeg", ".gif", ".wdp", ".webp",
+        ".mp3", ".m4a", ".wma", ".mp4", ".m4v", ".mov", ".wmv",
+        ".zip", ".docx", ".docm", ".xlsx", ".xlsm", ".pptx", ".pptm",
+    }
+)
+
+# Fewer XML parts than this are condensed in-process
+MIN_PARALLEL_PARTS = 16
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument(
+        "more",
+        nargs="*",
+        metavar="input_directory output_file",
+        help="Further directories to pack, each followed by its output file",
+    )
     parser.add_argument("--force", action="store_true", help="Skip validation")
     args = parser.parse_args()
+    if len(args.more) % 2:
+        parser.error("every input directory needs an output file")
+
+    pairs = [(args.input_directory, args.output_file)] + list(
+        zip(args.more[::2], args.more[1::2])
+    )
 
     try:
-        success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
-        )
+        for input_directory, output_file in pairs:
+            _check_arguments(Path(input_directory), Path(output_file))
+        for input_directory, output_file in pairs:
+            pack_document(input_directory, output_file)
 
         # Show warning if validation was skipped
         if args.force:
             print("Warning: Skipped validation, file may be corrupt", file=sys.stderr)
+            return
+
+        output_files = [Path(output_file) for _, output_file in pairs]
+        failed = [
+            output_file
+            for output_file, valid in zip(output_files, validate_documents(output_files))
+            if not valid
+        ]
         # Exit with error if validation failed
-        elif not success:
+        if failed:
+            for output_file in failed:
+                output_file.unlink()  # Delete the corrupt file
+            if len(pairs) > 1:
+                names = ", ".join(str(output_file) for output_file in failed)
+                print(f"Not packed: {names}", file=sys.stderr)
             print("Contents would produce a corrupt file.", file=sys.stderr)
             print("Please validate XML before repacking.", file=sys.stderr)
             print("Use --force to skip validation and pack anyway.", file=sys.stderr)
@@ -42,98 +102,127 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(input_dir, output_file, validate=False, workers=None):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        workers: Processes for condensing XML (default: CPU count)
 
     Returns:
         bool: True if successful, False if validation failed
     """
     input_dir = Path(input_dir)
     output_file = Path(output_file)
+    _check_arguments(input_dir, output_file)
+
+    files = _package_order(
+        (f.relative_to(input_dir).as_posix(), f) for f in input_dir.rglob("*") if f.is_file()
+    )
+
+    # Remove pretty-printing whitespace from XML parts, in memory (the input is not modified)
+    xml_files = [f for name, f in files if name.endswith(XML_EXTENSIONS)]
+    condensed = dict(zip(xml_files, _map_parts(_condense_file, xml_files, workers)))
+
+    # Create final Office file as zip archive, streaming everything else from disk
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, f in files:
+            if f in condensed:
+                info = zipfile.ZipInfo.from_file(f, name)
+                info.compress_type = compression_for(name)
+                zf.writestr(info, condensed[f])
+            else:
+                zf.write(f, name, compress_type=compression_for(name))
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file):
+            output_file.unlink()  # Delete the corrupt file
+            return False
+
+    return True
+
 
+def _check_arguments(input_dir, output_file):
     if not input_dir.is_dir():
         raise ValueError(f"{input_dir} is not a directory")
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
 
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
+def validate_document(doc_path):
+    """Validate document by converting to HTML with soffice (shared office workers)."""
+    return validate_documents([doc_path])[0]
 
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
 
-    return True
+def validate_documents(doc_paths):
+    """Validate documents like validate_document, converting them in one batch.
 
+    Returns a bool for each document, in order.
+    """
+    doc_paths = [Path(doc_path) for doc_path in doc_paths]
 
-def validate_document(doc_path):
-    """Validate document by converting to HTML with soffice."""
     # Determine the correct filter based on file extension
-    match doc_path.suffix.lower():
-        case ".docx":
-            filter_name = "html:HTML"
-        case ".pptx":
-            filter_name = "html:impress_html_Export"
-        case ".xlsx":
-            filter_name = "html:HTML (StarCalc)"
+    by_filter = {}
+    for index, doc_path in enumerate(doc_paths):
+        match doc_path.suffix.lower():
+            case ".docx":
+                filter_name = "html:HTML"
+            case ".pptx":
+                filter_name = "html:impress_html_Export"
+            case ".xlsx":
+                filter_name = "html:HTML (StarCalc)"
+        by_filter.setdefault(filter_name, []).append(index)
 
+    outcomes = [None] * len(doc_paths)
     with tempfile.TemporaryDirectory() as temp_dir:
-        try:
-            result = subprocess.run(
-                [
-                    "soffice",
-                    "--headless",
-                    "--convert-to",
-                    filter_name,
-                    "--outdir",
-                    temp_dir,
-                    str(doc_path),
-                ],
-                capture_output=True,
+        for filter_name, indices in by_filter.items():
+            results = get_office_service().convert_many(
+                [(doc_paths[index], _output_dir(temp_dir, index)) for index in indices],
+                filter_name,
                 timeout=10,
-                text=True,
             )
-            if not (Path(temp_dir) / f"{doc_path.stem}.html").exists():
-                error_msg = result.stderr.strip() or "Document validation failed"
-                print(f"Validation error: {error_msg}", file=sys.stderr)
-                return False
-            return True
-        except FileNotFoundError:
-            print("Warning: soffice not found. Skipping validation.", file=sys.stderr)
-            return True
-        except subprocess.TimeoutExpired:
-            print("Validation error: Timeout during conversion", file=sys.stderr)
-            return False
-        except Exception as e:
-            print(f"Validation error: {e}", file=sys.stderr)
-            return False
+            for index, result in zip(indices, results):
+                outcomes[index] = result
+
+    if any(isinstance(outcome, OfficeNotFoundError) for outcome in outcomes):
+        print("Warning: soffice not found. Skipping validation.", file=sys.stderr)
+
+    valid = []
+    for doc_path, outcome in zip(doc_paths, outcomes):
+        source = f" ({doc_path})" if len(doc_paths) > 1 else ""
+        if isinstance(outcome, OfficeNotFoundError):
+            valid.append(True)
+        elif isinstance(outcome, OfficeTimeoutError):
+            print(f"Validation error{source}: Timeout during conversion", file=sys.stderr)
+            valid.append(False)
+        elif isinstance(outcome, OfficeError):
+            print(f"Validation error{source}: {outcome}", file=sys.stderr)
+            valid.append(False)
+        else:
+            valid.append(True)
+    return valid
+
+
+def _output_dir(temp_dir, index):
+    """A separate output directory per document, so equal file names don't clash."""
+    output_dir = Path(temp_dir) / str(index)
+    output_dir.mkdir()
+    return output_dir
 
 
 def condense_xml(xml_file):
-    """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
+    """Strip unnecessary whitespace and remove comments, in place."""
+    xml_file = Path(xml_file)
+    xml_file.write_bytes(condense_xml_data(xml_file.read_bytes()))
+
+
+def condense_xml_data(data):
+    """Return XML bytes with unnecessary whitespace and comments removed."""
+    dom = defusedxml.minidom.parseString(data.decode("utf-8"))
 
     # Process each element to remove whitespace and comments
     for element in dom.getElementsByTagName("*"):
@@ -150,9 +239,164 @@ def condense_xml(xml_file):
             ) or child.nodeType == child.COMMENT_NODE:
                 element.removeChild(child)
 
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+    return dom.toxml(encoding="UTF-8")
+
+
+def pretty_xml_data(data):
+    """Return XML bytes pretty-printed the way unpack.py writes them."""
+    dom = defusedxml.minidom.parseString(data.decode("utf-8"))
+    return dom.toprettyxml(indent="  ", encoding="ascii")
+
+
+def compression_for(name):
+    """Zip compression for a part: stored for compressed media, deflated otherwise."""
+    if Path(name).suffix.lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+class OfficePackage:
+    """An Office file (.docx/.pptx/.xlsx) held in memory as part name -> bytes.
+
+    The zip is read once; parts are edited in memory and save() streams them
+    back into a zip, so no unpacked copy ever touches the disk.
+    """
+
+    def __init__(self, parts=None):
+        self.parts = dict(parts or {})
+
+    @classmethod
+    def open(cls, office_file):
+        """Read every part of an Office file (path or binary file object)."""
+        with zipfile.ZipFile(office_file) as zf:
+            return cls(
+                (info.filename, zf.read(info)) for info in zf.infolist() if not info.is_dir()
+            )
+
+    @classmethod
+    def from_directory(cls, input_dir):
+        """Read every file of an unpacked Office document directory."""
+        input_dir = Path(input_dir)
+        if not input_dir.is_dir():
+            raise ValueError(f"{input_dir} is not a directory")
+        return cls(
+            (f.relative_to(input_dir).as_posix(), f.read_bytes())
+            for f in input_dir.rglob("*")
+            if f.is_file()
+        )
+
+    def __contains__(self, name):
+        return name in self.parts
+
+    def __iter__(self):
+        return iter(self.parts)
+
+    def __len__(self):
+        return len(self.parts)
+
+    def read(self, name):
+        """Return the bytes of a part.
+
+        Raises:
+            KeyError: If the package has no such part
+        """
+        return self.parts[name]
+
+    def read_xml(self, name):
+        """Return an XML part as text."""
+        return self.read(name).decode("utf-8")
+
+    def write(self, name, data):
+        """Add or replace a part (str is encoded as UTF-8)."""
+        self.parts[name] = data.encode("utf-8") if isinstance(data, str) else data
+
+    def delete(self, name):
+        """Remove a part.
+
+        Raises:
+            KeyError: If the package has no such part
+        """
+        del self.parts[name]
+
+    def xml_parts(self):
+        """Names of the XML and relationship parts."""
+        return [name for name in self.parts if name.endswith(XML_EXTENSIONS)]
+
+    def save(self, output_file, condense=True, workers=None):
+        """Write the package to an Office file (path or binary file object).
+
+        Args:
+            output_file: Destination .docx/.pptx/.xlsx
+            condense: If True, strips pretty-printing whitespace from XML parts
+            workers: Processes for condensing XML (default: CPU count)
+        """
+        parts = dict(self.parts)
+        if condense:
+            names = self.xml_parts()
+            data = [self.parts[name] for name in names]
+            parts.update(zip(names, _map_parts(condense_xml_data, data, workers)))
+
+        if isinstance(output_file, (str, os.PathLike)):
+            Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, data in _package_order(parts.items()):
+                zf.writestr(name, data, compress_type=compression_for(name))
+
+    def extract(self, output_dir, pretty=True, workers=None):
+        """Write the parts to a directory, the same layout unpack.py produces.
+
+        Args:
+            output_dir: Destination directory (created if missing)
+            pretty: If True, pretty-prints XML parts for editing
+            workers: Processes for pretty-printing XML (default: CPU count)
+
+        Raises:
+            ValueError: If a part name would escape output_dir
+        """
+        output_dir = Path(output_dir).resolve()
+        targets = {}
+        for name in self.parts:
+            target = (output_dir / name).resolve()
+            if not target.is_relative_to(output_dir):
+                raise ValueError(f"Unsafe part name in package: {name}")
+            targets[name] = target
+
+        parts = dict(self.parts)
+        if pretty:
+            names = self.xml_parts()
+            data = [self.parts[name] for name in names]
+            parts.update(zip(names, _map_parts(pretty_xml_data, data, workers)))
+
+        for name, data in parts.items():
+            targets[name].parent.mkdir(parents=True, exist_ok=True)
+            targets[name].write_bytes(data)
+
+
+def _package_order(items):
+    """Sort (name, value) pairs by part name, [Content_Types].xml first."""
+    return sorted(items, key=lambda item: (item[0] != "[Content_Types].xml", item[0]))
+
+
+def _condense_file(xml_file):
+    return condense_xml_data(xml_file.read_bytes())
+
+
+def _map_parts(func, items, workers=None):
+    """Apply func to items, in a process pool when there are enough of them.
+
+    Results are in the order of items. Falls back to in-process work if a
+    pool cannot be started.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(items))
+    if workers > 1 and len(items) >= MIN_PARALLEL_PARTS:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(
+                    pool.map(func, items, chunksize=max(1, len(items) // (workers * 4)))
+                )
+        except (OSError, BrokenProcessPool):
+            pass
+    return [func(item) for item in items]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,249 @@
+import contextlib
+import io
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+import defusedxml.minidom
+
+import pack
+from office import FakeBackend, OfficeError, OfficeNotFoundError, OfficeService
+from pack import OfficePackage, pack_document, validate_documents
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+# Written out of package order, with [Content_Types].xml last, the way
+# some producers do
+PARTS = {
+    "word/document.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<w:document xmlns:w="{W_NS}"><w:body>'
+        "<w:p><w:r><w:t>Hello</w:t></w:r></w:p>"
+        '<w:p><w:r><w:t xml:space="preserve"> two  spaces </w:t></w:r></w:p>'
+        "<!-- a comment -->"
+        "</w:body></w:document>"
+    ).encode("utf-8"),
+    "word/_rels/document.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+        'relationships/image" Target="media/image1.png"/></Relationships>'
+    ).encode("utf-8"),
+    "word/media/image1.png": b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 8,
+    "word/embeddings/data.bin": b"\x00binary\x00" * 64,
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+        'relationships/officeDocument" Target="word/document.xml"/></Relationships>'
+    ).encode("utf-8"),
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/'
+        'vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="png" ContentType="image/png"/>'
+        '<Default Extension="bin" ContentType="application/octet-stream"/>'
+        '<Override PartName="/word/document.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        "</Types>"
+    ).encode("utf-8"),
+}
+
+
+def write_zip(path, parts):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+
+
+def read_zip(path):
+    with zipfile.ZipFile(path) as zf:
+        return {info.filename: zf.read(info) for info in zf.infolist()}
+
+
+def texts(document_xml):
+    dom = defusedxml.minidom.parseString(document_xml.decode("utf-8"))
+    return [node.firstChild.nodeValue for node in dom.getElementsByTagName("w:t")]
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestOfficePackageRoundTrip(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.source = self.root / "source.docx"
+        write_zip(self.source, PARTS)
+
+        # Condensed once, XML parts are in the canonical form pack.py writes
+        self.packed = self.root / "packed.docx"
+        OfficePackage.open(self.source).save(self.packed)
+
+    def unpack(self, office_file, name="unpacked"):
+        output_dir = self.root / name
+        OfficePackage.open(office_file).extract(output_dir)
+        return output_dir
+
+    def test_unpack_then_pack_keeps_part_bytes(self):
+        unpacked = self.unpack(self.packed)
+        repacked = self.root / "repacked.docx"
+        self.assertTrue(pack_document(unpacked, repacked))
+        self.assertEqual(read_zip(repacked), read_zip(self.packed))
+
+        # Same through OfficePackage, with and without condensing
+        saved = self.root / "saved.docx"
+        OfficePackage.from_directory(unpacked).save(saved)
+        self.assertEqual(read_zip(saved), read_zip(self.packed))
+        OfficePackage.open(self.packed).save(saved, condense=False)
+        self.assertEqual(read_zip(saved), read_zip(self.packed))
+
+    def test_round_trip_preserves_content(self):
+        repacked = self.root / "repacked.docx"
+        pack_document(self.unpack(self.source), repacked)
+        parts = read_zip(repacked)
+
+        self.assertEqual(set(parts), set(PARTS))
+        for name in ("word/media/image1.png", "word/embeddings/data.bin"):
+            self.assertEqual(parts[name], PARTS[name])
+        document_xml = parts["word/document.xml"]
+        self.assertEqual(texts(document_xml), ["Hello", " two  spaces "])
+        self.assertNotIn(b"a comment", document_xml)
+        self.assertNotIn(b"\n  ", document_xml)
+
+    def test_media_is_stored_and_xml_deflated(self):
+        unpacked = self.unpack(self.source)
+        packed_dir = self.root / "from-dir.docx"
+        pack_document(unpacked, packed_dir)
+        for office_file in (self.packed, packed_dir):
+            with zipfile.ZipFile(office_file) as zf:
+                compression = {info.filename: info.compress_type for info in zf.infolist()}
+            self.assertEqual(compression["word/media/image1.png"], zipfile.ZIP_STORED)
+            self.assertEqual(compression["word/embeddings/data.bin"], zipfile.ZIP_DEFLATED)
+            self.assertEqual(compression["word/document.xml"], zipfile.ZIP_DEFLATED)
+            self.assertEqual(compression["[Content_Types].xml"], zipfile.ZIP_DEFLATED)
+
+    def test_content_types_come_first(self):
+        unpacked = self.unpack(self.source)
+        packed_dir = self.root / "from-dir.docx"
+        pack_document(unpacked, packed_dir)
+        for office_file in (self.packed, packed_dir):
+            with zipfile.ZipFile(office_file) as zf:
+                names = zf.namelist()
+            self.assertEqual(names[0], "[Content_Types].xml")
+            self.assertEqual(names[1:], sorted(names[1:]))
+
+    def test_save_to_file_object(self):
+        buffer = io.BytesIO()
+        OfficePackage.open(self.packed).save(buffer)
+        buffer.seek(0)
+        self.assertEqual(read_zip(buffer), read_zip(self.packed))
+
+    def test_parallel_condensing_matches_in_process(self):
+        unpacked = self.unpack(self.source)
+        with mock.patch.object(pack, "MIN_PARALLEL_PARTS", 1):
+            parallel = self.root / "parallel.docx"
+            pack_document(unpacked, parallel, workers=2)
+        serial = self.root / "serial.docx"
+        pack_document(unpacked, serial, workers=1)
+        self.assertEqual(read_zip(parallel), read_zip(serial))
+
+    def test_unsafe_part_names_are_rejected(self):
+        for name in ("../evil.xml", "word/../../evil.xml", "/tmp/evil.xml"):
+            with self.subTest(name=name):
+                package = OfficePackage.open(self.packed)
+                package.write(name, b"<evil/>")
+                output_dir = self.root / "safe" / "unpacked"
+                with self.assertRaisesRegex(ValueError, "Unsafe part name"):
+                    package.extract(output_dir)
+                # Nothing is written when any part name is unsafe
+                self.assertFalse(output_dir.exists())
+                self.assertFalse((self.root / "safe" / "evil.xml").exists())
+
+    def test_pack_document_rejects_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            pack_document(self.root / "missing", self.root / "out.docx")
+        with self.assertRaises(ValueError):
+            pack_document(self.unpack(self.packed), self.root / "out.zip")
+
+
+class TestBatchValidation(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.source = self.root / "source.docx"
+        write_zip(self.source, PARTS)
+        self.unpacked = self.root / "unpacked"
+        OfficePackage.open(self.source).extract(self.unpacked)
+
+        def convert(input_path, convert_to, output_path):
+            if input_path.parent.name == "broken":
+                raise OfficeError("General input/output error")
+            output_path.write_bytes(b"<html/>")
+
+        self.backend = FakeBackend(convert_handler=convert, batches=True)
+        self.use_backend(self.backend)
+
+    def use_backend(self, backend):
+        service = OfficeService(backend, workers=1)
+        self.addCleanup(service.close)
+        patcher = mock.patch.object(pack, "get_office_service", return_value=service)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_documents_are_validated_in_one_batch_per_format(self):
+        docs = [self.root / "a" / "doc.docx", self.root / "broken" / "doc.docx", self.root / "deck.pptx"]
+        for doc in docs:
+            doc.parent.mkdir(exist_ok=True)
+            doc.write_bytes(b"")
+
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            self.assertEqual(validate_documents(docs), [True, False, True])
+
+        self.assertEqual(self.backend.batch_sizes, [2, 1])
+        self.assertEqual(
+            [(call[1], call[2]) for call in self.backend.calls],
+            [(docs[0], "html:HTML"), (docs[1], "html:HTML"), (docs[2], "html:impress_html_Export")],
+        )
+        self.assertIn(f"Validation error ({docs[1]}): General input/output error", stderr.getvalue())
+
+    def test_missing_soffice_skips_validation(self):
+        class NoOffice(FakeBackend):
+            def start_worker(self, index):
+                raise OfficeNotFoundError("soffice not found")
+
+        self.use_backend(NoOffice())
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            self.assertEqual(validate_documents([self.source, self.source]), [True, True])
+        self.assertEqual(stderr.getvalue().count("soffice not found"), 1)
+
+    def test_main_packs_several_directories(self):
+        good = self.root / "out" / "good.docx"
+        broken = self.root / "broken" / "bad.docx"
+        argv = ["pack.py", str(self.unpacked), str(good), str(self.unpacked), str(broken)]
+        with mock.patch("sys.argv", argv), contextlib.redirect_stderr(io.StringIO()) as stderr:
+            with self.assertRaises(SystemExit) as raised:
+                pack.main()
+
+        self.assertEqual(raised.exception.code, 1)
+        self.assertEqual(self.backend.batch_sizes, [2])
+        self.assertTrue(good.exists())
+        self.assertFalse(broken.exists())
+        self.assertIn(f"Not packed: {broken}", stderr.getvalue())
+
+    def test_main_checks_every_pair_before_packing(self):
+        good = self.root / "good.docx"
+        argv = ["pack.py", str(self.unpacked), str(good), str(self.root / "missing"), "x.docx"]
+        with mock.patch("sys.argv", argv), self.assertRaises(SystemExit) as raised:
+            pack.main()
+        self.assertIn("is not a directory", str(raised.exception.code))
+        self.assertFalse(good.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
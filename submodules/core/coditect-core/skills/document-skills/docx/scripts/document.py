@@ -8,6 +8,7 @@ Usage:
     # Initialize
     doc = Document('workspace/unpacked')
     doc = Document('workspace/unpacked', author="John Doe", initials="JD")
+    doc = Document('workspace/report.docx')  # No separate unpack step
 
     # Find nodes
     node = doc["word/document.xml"].get_node(tag="w:del", attrs={"w:id": "1"})
@@ -24,6 +25,7 @@ Usage:
 
     # Save
     doc.save()
+    doc.save('workspace/reviewed.docx')  # Pack straight to a .docx
 """
 
 import html
@@ -34,7 +36,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from defusedxml import minidom
-from ooxml.scripts.pack import pack_document
+from ooxml.scripts.pack import OfficePackage, pack_document
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
 from ooxml.scripts.validation.redlining import RedliningValidator
 
@@ -610,7 +612,7 @@ def _generate_rsid() -> str:
 
 
 class Document:
-    """Manages comments in unpacked Word documents."""
+    """Manages comments in unpacked Word documents (or .docx files)."""
 
     def __init__(
         self,
@@ -621,29 +623,43 @@ class Document:
         initials="C",
     ):
         """
-        Initialize with path to unpacked Word document directory.
+        Initialize with path to unpacked Word document directory or .docx file.
         Automatically sets up comment infrastructure (people.xml, RSIDs).
 
         Args:
-            unpacked_dir: Path to unpacked DOCX directory (must contain word/ subdirectory)
+            unpacked_dir: Path to unpacked DOCX directory (must contain word/ subdirectory),
+                or to a .docx file, which is read in memory and saved back as a .docx
             rsid: Optional RSID to use for all comment elements. If not provided, one will be generated.
             track_revisions: If True, enables track revisions in settings.xml (default: False)
             author: Default author name for comments (default: "Claude")
             initials: Default author initials for comments (default: "C")
         """
         self.original_path = Path(unpacked_dir)
+        self.is_packed = (
+            self.original_path.is_file() and self.original_path.suffix.lower() == ".docx"
+        )
 
-        if not self.original_path.exists() or not self.original_path.is_dir():
+        if not self.is_packed and (
+            not self.original_path.exists() or not self.original_path.is_dir()
+        ):
             raise ValueError(f"Directory not found: {unpacked_dir}")
 
         # Create temporary directory with subdirectories for unpacked content and baseline
         self.temp_dir = tempfile.mkdtemp(prefix="docx_")
         self.unpacked_path = Path(self.temp_dir) / "unpacked"
-        shutil.copytree(self.original_path, self.unpacked_path)
 
-        # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
         self.original_docx = Path(self.temp_dir) / "original.docx"
-        pack_document(self.original_path, self.original_docx, validate=False)
+
+        if self.is_packed:
+            # Editors need the pretty-printed working copy (line numbers match
+            # unpack.py output); the .docx itself is the validation baseline
+            OfficePackage.open(self.original_path).extract(self.unpacked_path)
+            shutil.copyfile(self.original_path, self.original_docx)
+        else:
+            shutil.copytree(self.original_path, self.unpacked_path)
+
+            # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
+            pack_document(self.original_path, self.original_docx, validate=False)
 
         self.word_path = self.unpacked_path / "word"
 
@@ -863,7 +879,8 @@ class Document:
         This persists all changes made via add_comment() and reply_to_comment().
 
         Args:
-            destination: Optional path to save to. If None, saves back to original directory.
+            destination: Optional path to save to. If None, saves back to the original
+                directory or .docx file. A destination ending in .docx is packed directly.
             validate: If True, validates document before saving (default: True).
         """
         # Only ensure comment relationships and content types if comment files exist
@@ -879,9 +896,12 @@ class Document:
         if validate:
             self.validate()
 
-        # Copy contents from temp directory to destination (or original directory)
+        # Copy contents from temp directory to destination (or original directory/file)
         target_path = Path(destination) if destination else self.original_path
-        shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+        if target_path.suffix.lower() == ".docx" and not target_path.is_dir():
+            pack_document(self.unpacked_path, target_path, validate=False)
+        else:
+            shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
 
     # ==================== Private: Initialization ====================
 
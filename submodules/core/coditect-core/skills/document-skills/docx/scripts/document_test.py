@@ -0,0 +1,88 @@
+import shutil
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+import docx
+from docx.shared import Inches
+from PIL import Image
+
+from ooxml.scripts.pack import OfficePackage
+from scripts.document import Document
+
+
+def read_zip(path):
+    with zipfile.ZipFile(path) as zf:
+        return {info.filename: zf.read(info) for info in zf.infolist()}
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+# Run from the docx skill directory: python -m unittest scripts.document_test
+class TestDocumentFromDocx(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+
+        image = self.root / "image.png"
+        Image.new("RGB", (64, 64), "teal").save(image)
+        source = docx.Document()
+        source.add_paragraph("First paragraph")
+        source.add_paragraph("Second paragraph")
+        source.add_picture(str(image), width=Inches(1))
+        self.docx_path = self.root / "report.docx"
+        source.save(str(self.docx_path))
+        self.original_bytes = self.docx_path.read_bytes()
+
+        self.unpacked = self.root / "unpacked"
+        OfficePackage.open(self.docx_path).extract(self.unpacked)
+
+    def save_docx(self, source, name):
+        doc = Document(source, rsid="00AB12CD")
+        target = self.root / name
+        doc.save(target, validate=False)
+        return read_zip(target)
+
+    def test_docx_and_unpacked_directory_give_identical_parts(self):
+        from_docx = self.save_docx(self.docx_path, "from-docx.docx")
+        from_dir = self.save_docx(self.unpacked, "from-dir.docx")
+
+        self.assertEqual(from_docx, from_dir)
+        self.assertIn("word/people.xml", from_docx)
+        # The source file is only read
+        self.assertEqual(self.docx_path.read_bytes(), self.original_bytes)
+
+    def test_saved_docx_layout(self):
+        self.save_docx(self.docx_path, "out.docx")
+        with zipfile.ZipFile(self.root / "out.docx") as zf:
+            infos = zf.infolist()
+            document_xml = zf.read("word/document.xml")
+
+        self.assertEqual(infos[0].filename, "[Content_Types].xml")
+        compression = {info.filename: info.compress_type for info in infos}
+        media = [name for name in compression if name.startswith("word/media/")]
+        self.assertEqual(len(media), 1)
+        self.assertEqual(compression[media[0]], zipfile.ZIP_STORED)
+        self.assertEqual(compression["word/document.xml"], zipfile.ZIP_DEFLATED)
+        self.assertIn(b"Second paragraph", document_xml)
+        self.assertNotIn(b"\n  <w:p", document_xml)
+
+    def test_save_back_to_source_docx(self):
+        copy = self.root / "copy.docx"
+        shutil.copyfile(self.docx_path, copy)
+        doc = Document(copy, rsid="00AB12CD")
+        node = doc["word/document.xml"].get_node(tag="w:p", contains="First paragraph")
+        doc.add_comment(start=node, end=node, text="Looks good")
+        doc.save(validate=False)
+
+        parts = read_zip(copy)
+        self.assertIn(b"Looks good", parts["word/comments.xml"])
+        for name, data in read_zip(self.docx_path).items():
+            if name.startswith("word/media/"):
+                self.assertEqual(parts[name], data)
+
+
+if __name__ == "__main__":
+    unittest.main()
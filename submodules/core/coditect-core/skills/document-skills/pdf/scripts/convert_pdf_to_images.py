@@ -1,29 +1,122 @@
 import os
+import shutil
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
+from PIL import Image
+from pypdf import PdfReader
 
 
 # Converts each page of a PDF to a PNG image.
+#
+# Pages are rasterized in ranges directly at the resolution that fits `max_dim`
+# and pdftoppm writes each page to disk as it is produced, so memory stays at
+# about one page regardless of the document size. Ranges run in parallel
+# processes.
 
+MAX_DPI = 200
+PAGES_PER_RANGE = 8
 
-def convert(pdf_path, output_dir, max_dim=1000):
-    images = convert_from_path(pdf_path, dpi=200)
 
-    for i, image in enumerate(images):
-        # Scale image if needed to keep width/height under `max_dim`
-        width, height = image.size
-        if width > max_dim or height > max_dim:
-            scale_factor = min(max_dim / width, max_dim / height)
-            new_width = int(width * scale_factor)
-            new_height = int(height * scale_factor)
-            image = image.resize((new_width, new_height))
-        
-        image_path = os.path.join(output_dir, f"page_{i+1}.png")
-        image.save(image_path)
-        print(f"Saved page {i+1} as {image_path} (size: {image.size})")
+def page_dpis(pdf_path, max_dim, max_dpi=MAX_DPI):
+    """Render DPI for each page so its longer side fits in `max_dim` pixels."""
+    try:
+        reader = PdfReader(pdf_path)
+        dpis = []
+        for page in reader.pages:
+            # render_range asks pdftoppm for the crop box (the visible page area,
+            # the media box when none is set); rotation does not change the longer side
+            longest = max(float(page.cropbox.width), float(page.cropbox.height))
+            dpis.append(min(max_dpi, max_dim * 72 / longest) if longest > 0 else max_dpi)
+        return dpis
+    except Exception:
+        # Let poppler handle PDFs pypdf cannot read; pages are downscaled after rendering
+        return [max_dpi] * pdfinfo_from_path(pdf_path)["Pages"]
 
-    print(f"Converted {len(images)} pages to PNG images")
+
+def page_ranges(dpis, range_size):
+    """Split pages into (first, last, dpi) ranges of at most `range_size` pages with one DPI each."""
+    ranges = []
+    for page, dpi in enumerate(dpis, start=1):
+        if ranges and ranges[-1][2] == dpi and page - ranges[-1][0] < range_size:
+            ranges[-1] = (ranges[-1][0], page, dpi)
+        else:
+            ranges.append((page, page, dpi))
+    return ranges
+
+
+def render_range(pdf_path, output_dir, first_page, last_page, dpi, max_dim):
+    """Rasterize pages first_page..last_page into page_<n>.png files; returns (page, path, size) per page."""
+    saved = []
+    with tempfile.TemporaryDirectory(dir=output_dir) as range_dir:
+        paths = convert_from_path(
+            pdf_path,
+            dpi=dpi,
+            first_page=first_page,
+            last_page=last_page,
+            fmt="png",
+            output_folder=range_dir,
+            paths_only=True,
+            use_cropbox=True,
+        )
+        for page, rendered_path in enumerate(sorted(paths), start=first_page):
+            image_path = os.path.join(output_dir, f"page_{page}.png")
+            with Image.open(rendered_path) as image:
+                # Scale image if needed to keep width/height under `max_dim`
+                # (rounding in the renderer can overshoot by a pixel)
+                width, height = image.size
+                resized = None
+                if width > max_dim or height > max_dim:
+                    scale_factor = min(max_dim / width, max_dim / height)
+                    new_width = int(width * scale_factor)
+                    new_height = int(height * scale_factor)
+                    resized = image.resize((new_width, new_height))
+            if resized is None:
+                shutil.move(rendered_path, image_path)
+                size = (width, height)
+            else:
+                resized.save(image_path)
+                size = resized.size
+            saved.append((page, image_path, size))
+    return saved
+
+
+def _render_range_task(args):
+    return render_range(*args)
+
+
+def convert(pdf_path, output_dir, max_dim=1000, workers=None):
+    dpis = page_dpis(pdf_path, max_dim)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(dpis)))
+
+    # Spread short documents over all workers, cap range length for long ones
+    range_size = max(1, min(PAGES_PER_RANGE, -(-len(dpis) // workers)))
+    tasks = [
+        (pdf_path, output_dir, first_page, last_page, dpi, max_dim)
+        for first_page, last_page, dpi in page_ranges(dpis, range_size)
+    ]
+
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_render_range_task, tasks)
+            page_count = _report(results)
+    else:
+        page_count = _report(map(_render_range_task, tasks))
+
+    print(f"Converted {page_count} pages to PNG images")
+
+
+def _report(results):
+    page_count = 0
+    for saved in results:
+        for page, image_path, size in saved:
+            print(f"Saved page {page} as {image_path} (size: {size})")
+            page_count += 1
+    return page_count
 
 
 if __name__ == "__main__":
@@ -0,0 +1,216 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from PIL import Image
+from pypdf import PdfWriter
+from pypdf.generic import RectangleObject
+
+import convert_pdf_to_images
+from convert_pdf_to_images import MAX_DPI, convert, page_dpis, page_ranges, render_range
+
+
+def write_pdf(path, pages):
+    """Write a blank PDF; each page is (width, height) or (width, height, cropbox, rotation)."""
+    writer = PdfWriter()
+    for spec in pages:
+        width, height = spec[:2]
+        page = writer.add_blank_page(width=width, height=height)
+        if len(spec) > 2 and spec[2] is not None:
+            page.cropbox = RectangleObject(spec[2])
+        if len(spec) > 3:
+            page.rotate(spec[3])
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def fake_convert_from_path(calls, oversize_pages=()):
+    """Stand-in for pdf2image that writes one PNG per page, `page` pixels wide, named like pdftoppm."""
+
+    def convert_from_path(pdf_path, dpi, first_page, last_page, fmt, output_folder, paths_only, use_cropbox):
+        calls.append((first_page, last_page, dpi, use_cropbox))
+        paths = []
+        digits = len(str(last_page))
+        # Return the pages out of order; render_range must not rely on it
+        for page in reversed(range(first_page, last_page + 1)):
+            path = os.path.join(output_folder, f"out-{page:0{digits}d}.png")
+            size = (1001, 500) if page in oversize_pages else (page, 1)
+            Image.new("RGB", size).save(path)
+            paths.append(path)
+        return paths
+
+    return convert_from_path
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestPageRanges(unittest.TestCase):
+
+    def test_empty_document(self):
+        """No pages give no ranges"""
+        self.assertEqual(page_ranges([], 8), [])
+
+    def test_ranges_are_capped_at_range_size(self):
+        """Pages with one DPI are grouped into ranges of at most range_size pages"""
+        self.assertEqual(
+            page_ranges([100] * 7, 3),
+            [(1, 3, 100), (4, 6, 100), (7, 7, 100)],
+        )
+
+    def test_dpi_change_starts_a_new_range(self):
+        """A page with a different DPI never shares a range with its neighbours"""
+        self.assertEqual(
+            page_ranges([100, 100, 50, 100, 100], 8),
+            [(1, 2, 100), (3, 3, 50), (4, 5, 100)],
+        )
+
+    def test_ranges_cover_every_page_once(self):
+        """Ranges are contiguous and in page order"""
+        dpis = [72, 72, 72, 90, 90, 72, 72, 72, 72, 72]
+        pages = []
+        for first, last, dpi in page_ranges(dpis, 4):
+            self.assertLessEqual(last - first + 1, 4)
+            for page in range(first, last + 1):
+                self.assertEqual(dpis[page - 1], dpi)
+                pages.append(page)
+        self.assertEqual(pages, list(range(1, len(dpis) + 1)))
+
+
+class TestPageDpis(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.temp_dir, "input.pdf")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_longer_side_fits_max_dim(self):
+        """The DPI scales the longer side of each page to max_dim pixels"""
+        write_pdf(self.pdf_path, [(720, 360), (360, 1440)])
+        self.assertEqual(page_dpis(self.pdf_path, 1000), [100, 50])
+
+    def test_dpi_is_capped(self):
+        """Small pages are not rendered above max_dpi"""
+        write_pdf(self.pdf_path, [(72, 36)])
+        self.assertEqual(page_dpis(self.pdf_path, 1000), [MAX_DPI])
+        self.assertEqual(page_dpis(self.pdf_path, 1000, max_dpi=300), [300])
+
+    def test_sized_from_crop_box(self):
+        """A crop box smaller than the media box sets the DPI"""
+        write_pdf(self.pdf_path, [(1440, 1440, [0, 0, 720, 360])])
+        self.assertEqual(page_dpis(self.pdf_path, 1000), [100])
+
+    def test_rotation_keeps_the_longer_side(self):
+        """Rotating a page does not change its DPI"""
+        write_pdf(self.pdf_path, [(720, 360, None, 90), (720, 360)])
+        self.assertEqual(page_dpis(self.pdf_path, 1000), [100, 100])
+
+    def test_unreadable_pdf_falls_back_to_page_count(self):
+        """PDFs pypdf cannot read render every page at max_dpi"""
+        with open(self.pdf_path, "wb") as f:
+            f.write(b"not a pdf")
+        with mock.patch.object(convert_pdf_to_images, "pdfinfo_from_path", return_value={"Pages": 3}):
+            self.assertEqual(page_dpis(self.pdf_path, 1000), [MAX_DPI] * 3)
+
+
+class TestPageNumbering(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.temp_dir, "input.pdf")
+        self.output_dir = os.path.join(self.temp_dir, "out")
+        os.mkdir(self.output_dir)
+        self.calls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def patch_renderer(self, oversize_pages=()):
+        return mock.patch.object(
+            convert_pdf_to_images, "convert_from_path",
+            fake_convert_from_path(self.calls, oversize_pages),
+        )
+
+    def assert_page_files(self, pages):
+        """Each page_<n>.png holds the image rendered for page n"""
+        self.assertEqual(
+            sorted(os.listdir(self.output_dir)),
+            sorted(f"page_{page}.png" for page in pages),
+        )
+        for page in pages:
+            with Image.open(os.path.join(self.output_dir, f"page_{page}.png")) as image:
+                self.assertEqual(image.size, (page, 1))
+
+    def test_render_range_numbers_from_first_page(self):
+        """Rendered pages are saved under their page number in the document"""
+        with self.patch_renderer():
+            saved = render_range(self.pdf_path, self.output_dir, 8, 11, 100, 1000)
+        self.assertEqual([page for page, _, _ in saved], [8, 9, 10, 11])
+        self.assertEqual(
+            [path for _, path, _ in saved],
+            [os.path.join(self.output_dir, f"page_{page}.png") for page in range(8, 12)],
+        )
+        self.assert_page_files(range(8, 12))
+        self.assertEqual(self.calls, [(8, 11, 100, True)])
+
+    def test_render_range_downscales_overshoot(self):
+        """A page rendered a pixel over max_dim is scaled down to fit"""
+        with self.patch_renderer(oversize_pages={2}):
+            saved = render_range(self.pdf_path, self.output_dir, 1, 2, 100, 1000)
+        self.assertEqual(saved[1][2], (1000, 499))
+        with Image.open(saved[1][1]) as image:
+            self.assertEqual(image.size, (1000, 499))
+
+    def test_convert_numbers_pages_across_ranges(self):
+        """Pages split over several ranges and DPIs keep their document numbering"""
+        write_pdf(self.pdf_path, [(720, 360)] * 10 + [(360, 1440)] + [(720, 360)] * 2)
+        with self.patch_renderer(), redirect_stdout(io.StringIO()) as output:
+            convert(self.pdf_path, self.output_dir, max_dim=1000, workers=1)
+        self.assert_page_files(range(1, 14))
+        self.assertEqual(
+            self.calls,
+            [(1, 8, 100, True), (9, 10, 100, True), (11, 11, 50, True), (12, 13, 100, True)],
+        )
+        self.assertIn("Converted 13 pages to PNG images", output.getvalue())
+
+
+@unittest.skipUnless(shutil.which("pdftoppm"), "pdftoppm (poppler) is not installed")
+class TestConvert(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.temp_dir, "input.pdf")
+        self.output_dir = os.path.join(self.temp_dir, "out")
+        os.mkdir(self.output_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_pages_fit_max_dim(self):
+        """Every page is rendered once, with its longer side at max_dim"""
+        write_pdf(self.pdf_path, [(612, 792), (792, 612), (1440, 1440, [0, 0, 720, 360])])
+        with redirect_stdout(io.StringIO()):
+            convert(self.pdf_path, self.output_dir, max_dim=500, workers=2)
+        self.assertEqual(
+            sorted(os.listdir(self.output_dir)),
+            ["page_1.png", "page_2.png", "page_3.png"],
+        )
+        sizes = []
+        for page in range(1, 4):
+            with Image.open(os.path.join(self.output_dir, f"page_{page}.png")) as image:
+                sizes.append(image.size)
+        for width, height in sizes:
+            self.assertLessEqual(max(width, height), 500)
+            self.assertGreaterEqual(max(width, height), 498)
+        self.assertGreater(sizes[0][1], sizes[0][0])
+        self.assertGreater(sizes[1][0], sizes[1][1])
+        # The crop box, not the larger media box, is rendered
+        self.assertAlmostEqual(sizes[2][0] / sizes[2][1], 2, delta=0.02)
+
+
+if __name__ == "__main__":
+    unittest.main()
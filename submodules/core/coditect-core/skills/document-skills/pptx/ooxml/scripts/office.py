@@ -0,0 +1,835 @@
+#!/usr/bin/env python3
+"""
+Shared LibreOffice conversion service.
+
+Keeps a small pool of long-lived headless LibreOffice workers so document
+conversion (thumbnails, soffice validation, formula recalculation) does not
+pay office startup for every file. Requests queue for a free worker; each
+worker is health-checked before use and restarted if it died or hung.
+
+Backends:
+    UnoBackend: a warm soffice per worker, driven over UNO (needs LibreOffice's
+        Python bridge, usually the system python3 with python3-uno)
+    CliBackend: one soffice process per request or batch of requests, each worker
+        with its own profile so requests can run side by side (used when uno is missing)
+    FakeBackend: in-process stand-in for tests, writes placeholder outputs
+
+The pool lives in one process: separate script runs each start their own
+service, so pass every file to one run (thumbnail.py, recalc.py and pack.py
+accept several inputs) and submit them together with convert_many() or
+recalculate_many(). UnoBackend spreads the files over its warm workers;
+CliBackend hands each worker its share in a single soffice run, so a batch
+pays office startup once per worker rather than once per file. Worker
+profiles persist under PROFILE_DIR so that LibreOffice's first-start profile
+setup (and installing the recalc macro) happens once per profile, not once
+per run.
+
+Usage:
+    from office import get_office_service
+
+    service = get_office_service()
+    pdf_path = service.convert("deck.pptx", "pdf", "out/")
+    service.convert("report.docx", "html:HTML", "out/", timeout=10)
+    service.recalculate("model.xlsx")
+
+    # Many files at once: results in input order, failures as OfficeError
+    results = service.convert_many([("a.pptx", "out/"), ("b.pptx", "out/")], "pdf")
+
+Environment:
+    OFFICE_WORKERS: Number of workers in the shared service (default: 2)
+"""
+
+import atexit
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: every worker gets a temporary profile
+    fcntl = None
+
+DEFAULT_WORKERS = 2
+DEFAULT_TIMEOUT = 120  # Seconds per request
+STARTUP_TIMEOUT = 60  # Seconds for a worker to accept connections
+HEALTH_CHECK_TIMEOUT = 5  # Seconds for a worker to answer a health check
+SHUTDOWN_TIMEOUT = 5  # Seconds to wait for a worker to exit before killing it
+# Extra wait beyond a request's timeout before a worker is considered hung
+HANG_GRACE = 5
+
+# Persistent worker profiles, reused across runs (one process at a time each)
+PROFILE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "office-profiles"
+)
+MAX_PERSISTENT_PROFILES = 8
+
+# Export filters for bare "pdf" requests, by document service
+PDF_FILTERS = (
+    ("com.sun.star.presentation.PresentationDocument", "impress_pdf_Export"),
+    ("com.sun.star.sheet.SpreadsheetDocument", "calc_pdf_Export"),
+    ("com.sun.star.drawing.DrawingDocument", "draw_pdf_Export"),
+    ("com.sun.star.text.TextDocument", "writer_pdf_Export"),
+)
+
+RECALC_MACRO = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE script:module PUBLIC "-//OpenOffice.org//DTD OfficeDocument 1.0//EN" "module.dtd">
+<script:module xmlns:script="http://openoffice.org/2000/script" script:name="Module1" script:language="StarBasic">
+    Sub RecalculateAndSave()
+      ThisComponent.calculateAll()
+      ThisComponent.store()
+      ThisComponent.close(True)
+    End Sub
+
+    Sub RecalculateFiles(listPath As String)
+      Dim props(0) As New com.sun.star.beans.PropertyValue
+      props(0).Name = "Hidden"
+      props(0).Value = True
+      files = createUnoService("com.sun.star.ucb.SimpleFileAccess")
+      stream = createUnoService("com.sun.star.io.TextInputStream")
+      stream.setInputStream(files.openFileRead(ConvertToURL(listPath)))
+      stream.setEncoding("UTF-8")
+      On Error Resume Next
+      Do While Not stream.isEOF()
+        path = stream.readLine()
+        If path &lt;&gt; "" Then
+          doc = Nothing
+          doc = StarDesktop.loadComponentFromURL(ConvertToURL(path), "_blank", 0, props())
+          If Not IsNull(doc) Then
+            doc.calculateAll()
+            doc.store()
+            doc.close(True)
+          End If
+        End If
+      Loop
+      stream.closeInput()
+      StarDesktop.terminate()
+    End Sub
+</script:module>"""
+
+
+class OfficeError(Exception):
+    """A LibreOffice request failed."""
+
+
+class OfficeNotFoundError(OfficeError, FileNotFoundError):
+    """LibreOffice (soffice) is not installed."""
+
+
+class OfficeTimeoutError(OfficeError, TimeoutError):
+    """A LibreOffice request did not finish in time."""
+
+
+def find_soffice():
+    """Return the soffice executable.
+
+    Raises:
+        OfficeNotFoundError: If LibreOffice is not installed
+    """
+    for name in ("soffice", "libreoffice"):
+        path = shutil.which(name)
+        if path:
+            return path
+    if platform.system() == "Darwin":
+        app = Path("/Applications/LibreOffice.app/Contents/MacOS/soffice")
+        if app.exists():
+            return str(app)
+    raise OfficeNotFoundError("soffice not found")
+
+
+def output_path_for(input_path, convert_to, output_dir):
+    """Path soffice writes for a conversion ("pdf", "html:HTML", ...)."""
+    extension = convert_to.split(":", 1)[0]
+    return Path(output_dir) / f"{Path(input_path).stem}.{extension}"
+
+
+def _distinct_name_groups(requests, convert_to):
+    """Split (index, (input_path, output_dir)) pairs so no group repeats an output name."""
+    groups = []
+    for index, (input_path, output_dir) in requests:
+        name = output_path_for(input_path, convert_to, ".").name
+        for names, group in groups:
+            if name not in names:
+                break
+        else:
+            names, group = set(), []
+            groups.append((names, group))
+        names.add(name)
+        group.append((index, (input_path, output_dir)))
+    return [group for _, group in groups]
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _call_with_timeout(func, timeout):
+    """Run func in a daemon thread; raise OfficeTimeoutError if it takes too long.
+
+    A thread stuck in a hung office call is abandoned (it ends once the
+    worker is killed).
+    """
+    outcome = {}
+    done = threading.Event()
+
+    def target():
+        try:
+            outcome["result"] = func()
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            done.set()
+
+    threading.Thread(target=target, name="office-request", daemon=True).start()
+    if not done.wait(timeout):
+        raise OfficeTimeoutError(f"LibreOffice did not respond within {timeout:g}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("result")
+
+
+class _Profile:
+    """A LibreOffice user profile used by one worker at a time.
+
+    Claims the first free persistent profile in profile_dir (an exclusive
+    lock file keeps other workers and processes off it), so the profile
+    is already initialized on later runs. Falls back to a temporary profile
+    when all persistent ones are in use or cannot be locked.
+    """
+
+    def __init__(self, profile_dir=None, max_profiles=None):
+        profile_dir = Path(profile_dir) if profile_dir else PROFILE_DIR
+        max_profiles = MAX_PERSISTENT_PROFILES if max_profiles is None else max_profiles
+        self._lock_file = None
+        self.temporary = True
+        for index in range(max_profiles):
+            lock_file = _try_lock(profile_dir / f"profile-{index}.lock")
+            if lock_file is not None:
+                self._lock_file = lock_file
+                self.path = profile_dir / f"profile-{index}"
+                self.temporary = False
+                break
+        else:
+            self.path = Path(tempfile.mkdtemp(prefix="office-profile-"))
+        self.env_arg = f"-env:UserInstallation={self.path.as_uri()}"
+
+    def release(self, reset=False):
+        """Give the profile up; reset deletes it (e.g. after killing soffice mid-write)."""
+        if self.temporary or reset:
+            shutil.rmtree(self.path, ignore_errors=True)
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+def _try_lock(lock_path):
+    """Open and exclusively lock lock_path without blocking; None if taken."""
+    if fcntl is None:
+        return None
+    try:
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(lock_path, "a")
+    except OSError:
+        return None
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+class CliWorker:
+    """Runs one soffice process per request, reusing a persistent profile."""
+
+    def __init__(self, soffice):
+        self.soffice = soffice
+        self.profile = _Profile()
+        self._process = None
+
+    def _run(self, args, timeout):
+        """Run soffice with this worker's profile; returns (returncode, stderr)."""
+        self._process = subprocess.Popen(
+            [self.soffice, self.profile.env_arg, "--headless", "--norestore", *args],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            _, stderr = self._process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.communicate()
+            raise
+        finally:
+            process, self._process = self._process, None
+        return process.returncode, stderr
+
+    def convert(self, input_path, convert_to, output_dir, timeout):
+        output_path = output_path_for(input_path, convert_to, output_dir)
+        try:
+            _, stderr = self._run(
+                ["--convert-to", convert_to, "--outdir", str(output_dir), str(input_path)],
+                timeout,
+            )
+        except subprocess.TimeoutExpired:
+            raise OfficeTimeoutError(f"Conversion of {input_path} timed out") from None
+        if not output_path.exists():
+            raise OfficeError(stderr.strip() or f"Conversion of {input_path} failed")
+        return output_path
+
+    def convert_batch(self, requests, convert_to, timeout):
+        """Convert (input_path, output_dir) pairs with one soffice run.
+
+        soffice writes every output of a run to one directory, so documents
+        that would produce the same output name go to separate runs. Returns
+        the output path, or an OfficeError, for each request in order.
+        """
+        results = [None] * len(requests)
+        for group in _distinct_name_groups(enumerate(requests), convert_to):
+            with tempfile.TemporaryDirectory(prefix="office-batch-") as batch_dir:
+                try:
+                    _, stderr = self._run(
+                        ["--convert-to", convert_to, "--outdir", batch_dir]
+                        + [str(input_path) for _, (input_path, _) in group],
+                        timeout * len(group),
+                    )
+                except subprocess.TimeoutExpired:
+                    raise OfficeTimeoutError(
+                        f"Conversion of {len(group)} documents timed out"
+                    ) from None
+                for index, (input_path, output_dir) in group:
+                    produced = output_path_for(input_path, convert_to, batch_dir)
+                    if not produced.exists():
+                        results[index] = OfficeError(
+                            stderr.strip() or f"Conversion of {input_path} failed"
+                        )
+                        continue
+                    output_path = output_path_for(input_path, convert_to, output_dir)
+                    shutil.move(str(produced), str(output_path))
+                    results[index] = output_path
+        return results
+
+    def recalculate(self, path, timeout):
+        self._install_recalc_macro()
+        try:
+            returncode, stderr = self._run(
+                [
+                    "vnd.sun.star.script:Standard.Module1.RecalculateAndSave"
+                    "?language=Basic&location=application",
+                    str(Path(path).absolute()),
+                ],
+                timeout,
+            )
+        except subprocess.TimeoutExpired:
+            # soffice may linger after the macro has stored the file
+            return
+        if returncode != 0:
+            raise OfficeError(stderr.strip() or "Unknown error during recalculation")
+
+    def recalculate_batch(self, paths, timeout):
+        """Recalculate spreadsheets with one soffice run (the RecalculateFiles macro).
+
+        A file counts as recalculated once the macro has stored it. Returns
+        None, or an OfficeError, for each path in order.
+        """
+        if len(paths) == 1:
+            try:
+                self.recalculate(paths[0], timeout)
+                return [None]
+            except OfficeError as e:
+                return [e]
+
+        paths = [Path(path).absolute() for path in paths]
+        self._install_recalc_macro()
+        before = [_mtime(path) for path in paths]
+        with tempfile.TemporaryDirectory(prefix="office-batch-") as batch_dir:
+            list_path = Path(batch_dir) / "files.txt"
+            list_path.write_text("".join(f"{path}\n" for path in paths), encoding="utf-8")
+            try:
+                _, stderr = self._run(
+                    [f'macro:///Standard.Module1.RecalculateFiles("{list_path}")'],
+                    timeout * len(paths),
+                )
+            except subprocess.TimeoutExpired:
+                # soffice may linger after the macro has stored the files
+                stderr = ""
+        return [
+            None
+            if _mtime(path) not in (None, mtime)
+            else OfficeError(stderr.strip() or f"Recalculation of {path} failed")
+            for path, mtime in zip(paths, before)
+        ]
+
+    def _install_recalc_macro(self):
+        """Put the recalculation macros into this worker's profile."""
+        macro_dir = self.profile.path / "user" / "basic" / "Standard"
+        macro_file = macro_dir / "Module1.xba"
+        if macro_file.exists() and "RecalculateFiles" in macro_file.read_text():
+            return
+        if not macro_dir.exists():
+            try:
+                self._run(["--terminate_after_init"], timeout=30)
+            except subprocess.TimeoutExpired:
+                pass
+            macro_dir.mkdir(parents=True, exist_ok=True)
+        macro_file.write_text(RECALC_MACRO)
+
+    def is_alive(self):
+        return True
+
+    def stop(self):
+        killed = self._process is not None
+        if killed:
+            self._process.kill()
+        self.profile.release(reset=killed)
+
+
+class CliBackend:
+    """Backend that starts soffice per request (no UNO bridge needed)."""
+
+    # Startup is paid per soffice run, so workers take whole batches
+    batches = True
+
+    def start_worker(self, index):
+        return CliWorker(find_soffice())
+
+
+class UnoWorker:
+    """A long-lived headless soffice driven over a UNO pipe connection."""
+
+    def __init__(self, soffice):
+        import uno
+
+        self._uno = uno
+        self.profile = _Profile()
+        self.pipe_name = f"office-{os.getpid()}-{uuid.uuid4().hex[:12]}"
+        connection = f"pipe,name={self.pipe_name};urp;StarOffice.ComponentContext"
+        self.process = subprocess.Popen(
+            [
+                soffice,
+                self.profile.env_arg,
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--nodefault",
+                "--norestore",
+                "--nolockcheck",
+                f"--accept={connection}",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local
+        )
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            try:
+                context = resolver.resolve(f"uno:{connection}")
+                break
+            except Exception:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.stop()
+                    raise OfficeError("LibreOffice worker failed to start")
+                time.sleep(0.25)
+        self.desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+
+    def _properties(self, **values):
+        from com.sun.star.beans import PropertyValue
+
+        return tuple(PropertyValue(Name=name, Value=value) for name, value in values.items())
+
+    def _load(self, path, **options):
+        url = self._uno.systemPathToFileUrl(str(Path(path).resolve()))
+        document = self.desktop.loadComponentFromURL(
+            url, "_blank", 0, self._properties(Hidden=True, **options)
+        )
+        if document is None:
+            raise OfficeError(f"LibreOffice could not open {path}")
+        return document
+
+    def convert(self, input_path, convert_to, output_dir, timeout):
+        output_path = output_path_for(input_path, convert_to, output_dir)
+        extension, _, filter_name = convert_to.partition(":")
+        document = self._load(input_path, ReadOnly=True)
+        try:
+            if not filter_name:
+                if extension != "pdf":
+                    raise OfficeError(f"Specify an export filter, e.g. '{extension}:FilterName'")
+                filter_name = next(
+                    (name for service, name in PDF_FILTERS if document.supportsService(service)),
+                    "writer_pdf_Export",
+                )
+            document.storeToURL(
+                self._uno.systemPathToFileUrl(str(output_path.resolve())),
+                self._properties(FilterName=filter_name),
+            )
+        finally:
+            document.close(True)
+        return output_path
+
+    def recalculate(self, path, timeout):
+        document = self._load(path)
+        try:
+            document.calculateAll()
+            document.store()
+        finally:
+            document.close(True)
+
+    def is_alive(self):
+        if self.process.poll() is not None:
+            return False
+        try:
+            self.desktop.getComponents()
+            return True
+        except Exception:
+            return False
+
+    def stop(self):
+        killed = False
+        if self.process.poll() is None:
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass
+            try:
+                self.process.wait(SHUTDOWN_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+                killed = True
+        self.profile.release(reset=killed)
+
+
+class UnoBackend:
+    """Backend that keeps warm soffice processes (needs the uno module)."""
+
+    def start_worker(self, index):
+        return UnoWorker(find_soffice())
+
+
+class FakeWorker:
+    """Worker of FakeBackend."""
+
+    def __init__(self, backend, index):
+        self.backend = backend
+        self.index = index
+        self.alive = True
+
+    def convert(self, input_path, convert_to, output_dir, timeout):
+        self.backend.calls.append(("convert", Path(input_path), convert_to, self.index))
+        if self.backend.delay:
+            time.sleep(self.backend.delay)
+        output_path = output_path_for(input_path, convert_to, output_dir)
+        if self.backend.convert_handler:
+            self.backend.convert_handler(Path(input_path), convert_to, output_path)
+        else:
+            output_path.write_bytes(b"")
+        return output_path
+
+    def recalculate(self, path, timeout):
+        self.backend.calls.append(("recalculate", Path(path), None, self.index))
+        if self.backend.delay:
+            time.sleep(self.backend.delay)
+        if self.backend.recalculate_handler:
+            self.backend.recalculate_handler(Path(path))
+
+    def convert_batch(self, requests, convert_to, timeout):
+        self.backend.batch_sizes.append(len(requests))
+        return [
+            self._try(self.convert, input_path, convert_to, output_dir, timeout)
+            for input_path, output_dir in requests
+        ]
+
+    def recalculate_batch(self, paths, timeout):
+        self.backend.batch_sizes.append(len(paths))
+        return [self._try(self.recalculate, path, timeout) for path in paths]
+
+    def _try(self, action, *args):
+        try:
+            return action(*args)
+        except OfficeError as e:
+            return e
+
+    def is_alive(self):
+        return self.alive
+
+    def stop(self):
+        self.alive = False
+        self.backend.stopped += 1
+
+
+class FakeBackend:
+    """In-process backend for tests.
+
+    Records every request in calls as (action, path, convert_to, worker index).
+    Conversions write an empty output file unless convert_handler(input_path,
+    convert_to, output_path) is given; delay makes each request sleep. With
+    batches, workers take whole batches like CliBackend; their sizes are
+    recorded in batch_sizes.
+    """
+
+    def __init__(self, convert_handler=None, recalculate_handler=None, delay=0, batches=False):
+        self.convert_handler = convert_handler
+        self.recalculate_handler = recalculate_handler
+        self.delay = delay
+        self.batches = batches
+        self.calls = []
+        self.batch_sizes = []
+        self.workers = []
+        self.stopped = 0
+
+    def start_worker(self, index):
+        worker = FakeWorker(self, index)
+        self.workers.append(worker)
+        return worker
+
+
+def default_backend():
+    """UnoBackend when LibreOffice's Python bridge is importable, else CliBackend."""
+    try:
+        import uno  # noqa: F401
+    except ImportError:
+        return CliBackend()
+    return UnoBackend()
+
+
+class _Slot:
+    """A pool position; its worker is started on first use."""
+
+    def __init__(self, index):
+        self.index = index
+        self.worker = None
+
+
+class OfficeService:
+    """Pool of LibreOffice workers with request queueing and restart-on-hang.
+
+    Thread-safe: concurrent callers wait for a free worker. Workers start
+    lazily; a worker that fails its health check, dies during a request or
+    exceeds a request's timeout is stopped and replaced before the next use.
+    """
+
+    def __init__(self, backend=None, workers=None, timeout=DEFAULT_TIMEOUT):
+        self.backend = backend or default_backend()
+        self.size = max(1, workers or DEFAULT_WORKERS)
+        self.timeout = timeout
+        # Workers replaced after dying or hanging
+        self.restarts = 0
+        self._idle = []
+        self._available = threading.Condition()
+        self._slots = [_Slot(index) for index in range(self.size)]
+        self._idle.extend(self._slots)
+        self._closed = False
+
+    def convert(self, input_path, convert_to, output_dir, timeout=None):
+        """Convert a document with a LibreOffice export filter.
+
+        Args:
+            input_path: Document to convert
+            convert_to: Target as for soffice --convert-to ("pdf", "html:HTML", ...)
+            output_dir: Directory for the output file
+            timeout: Seconds before the request is abandoned (default: service timeout)
+
+        Returns:
+            Path of the converted file (output_dir/<input stem>.<extension>)
+
+        Raises:
+            OfficeNotFoundError: If LibreOffice is not installed
+            OfficeTimeoutError: If the conversion did not finish in time
+            OfficeError: If the conversion failed
+        """
+        return self._request(
+            lambda worker, limit: worker.convert(
+                Path(input_path), convert_to, Path(output_dir), limit
+            ),
+            timeout,
+        )
+
+    def recalculate(self, path, timeout=None):
+        """Recalculate all formulas of a spreadsheet and save it in place.
+
+        Raises:
+            OfficeNotFoundError: If LibreOffice is not installed
+            OfficeTimeoutError: If the worker hung
+            OfficeError: If recalculation failed
+        """
+        self._request(lambda worker, limit: worker.recalculate(Path(path), limit), timeout)
+
+    def convert_many(self, requests, convert_to, timeout=None):
+        """Convert many documents, spread over the workers.
+
+        Args:
+            requests: (input_path, output_dir) pairs
+            convert_to: Target as for convert()
+            timeout: Seconds allowed per document (default: service timeout)
+
+        Returns:
+            For each request in order, the converted file's path or the
+            OfficeError it failed with
+        """
+        requests = [(Path(input_path), Path(output_dir)) for input_path, output_dir in requests]
+        return self._map(
+            requests,
+            lambda worker, request, limit: worker.convert(request[0], convert_to, request[1], limit),
+            lambda worker, chunk, limit: worker.convert_batch(chunk, convert_to, limit),
+            timeout,
+        )
+
+    def recalculate_many(self, paths, timeout=None):
+        """Recalculate and save many spreadsheets, spread over the workers.
+
+        Returns:
+            For each path in order, None or the OfficeError it failed with
+        """
+        return self._map(
+            [Path(path) for path in paths],
+            lambda worker, path, limit: worker.recalculate(path, limit),
+            lambda worker, chunk, limit: worker.recalculate_batch(chunk, limit),
+            timeout,
+        )
+
+    def close(self):
+        """Stop all workers; later requests raise OfficeError."""
+        with self._available:
+            self._closed = True
+            self._available.notify_all()
+        for slot in self._slots:
+            self._stop(slot)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _map(self, items, single, batch, timeout):
+        """Run single(worker, item, timeout) for every item, or batch() per worker share.
+
+        Backends with `batches` get one contiguous chunk per worker, so a
+        batch costs one request per worker; the others get one request per
+        item, queued for whichever worker is free.
+        """
+        timeout = timeout or self.timeout
+        if getattr(self.backend, "batches", False):
+            chunk_size = -(-len(items) // self.size)
+            tasks = [
+                (
+                    range(start, min(start + chunk_size, len(items))),
+                    lambda worker, limit, chunk=items[start:start + chunk_size]: batch(
+                        worker, chunk, timeout
+                    ),
+                    timeout * len(items[start:start + chunk_size]),
+                )
+                for start in range(0, len(items), chunk_size)
+            ]
+        else:
+            tasks = [
+                ([index], lambda worker, limit, item=item: [single(worker, item, limit)], timeout)
+                for index, item in enumerate(items)
+            ]
+
+        results = [None] * len(items)
+        if not tasks:
+            return results
+        with ThreadPoolExecutor(max_workers=min(self.size, len(tasks))) as executor:
+            futures = [
+                (indices, executor.submit(self._request, action, limit))
+                for indices, action, limit in tasks
+            ]
+            for indices, future in futures:
+                try:
+                    task_results = future.result()
+                except OfficeError as e:
+                    task_results = [e] * len(indices)
+                for index, result in zip(indices, task_results):
+                    results[index] = result
+        return results
+
+    def _request(self, action, timeout):
+        timeout = timeout or self.timeout
+        slot = self._acquire()
+        try:
+            worker = self._healthy_worker(slot)
+            try:
+                return _call_with_timeout(lambda: action(worker, timeout), timeout + HANG_GRACE)
+            except OfficeTimeoutError:
+                self._discard(slot)
+                raise
+            except Exception as e:
+                if not self._is_alive(worker):
+                    self._discard(slot)
+                if isinstance(e, OfficeError):
+                    raise
+                raise OfficeError(str(e) or type(e).__name__) from e
+        finally:
+            self._release(slot)
+
+    def _acquire(self):
+        with self._available:
+            while not self._idle and not self._closed:
+                self._available.wait()
+            if self._closed:
+                raise OfficeError("Office service is closed")
+            return self._idle.pop()
+
+    def _release(self, slot):
+        with self._available:
+            self._idle.append(slot)
+            self._available.notify()
+
+    def _healthy_worker(self, slot):
+        if slot.worker is not None and not self._is_alive(slot.worker):
+            self._discard(slot)
+        if slot.worker is None:
+            slot.worker = self.backend.start_worker(slot.index)
+        return slot.worker
+
+    def _is_alive(self, worker):
+        try:
+            return _call_with_timeout(worker.is_alive, HEALTH_CHECK_TIMEOUT)
+        except Exception:
+            return False
+
+    def _discard(self, slot):
+        """Stop a failed worker; the slot starts a new one on next use."""
+        self.restarts += 1
+        self._stop(slot)
+
+    def _stop(self, slot):
+        worker, slot.worker = slot.worker, None
+        if worker is not None:
+            try:
+                worker.stop()
+            except Exception:
+                pass
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_office_service():
+    """Return the process-wide OfficeService (stopped at interpreter exit)."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = OfficeService(
+                workers=int(os.environ.get("OFFICE_WORKERS", DEFAULT_WORKERS))
+            )
+            atexit.register(_service.close)
+        return _service
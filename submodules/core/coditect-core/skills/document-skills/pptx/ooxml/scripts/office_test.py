@@ -0,0 +1,420 @@
+import os
+import tempfile
+import textwrap
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import office
+from office import (
+    CliBackend,
+    FakeBackend,
+    OfficeError,
+    OfficeService,
+    OfficeTimeoutError,
+    get_office_service,
+)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestOfficeService(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.output_dir = Path(self.temp_dir.name)
+        self.input_path = self.output_dir / "deck.pptx"
+        self.input_path.write_bytes(b"")
+        # Treat a request as hung as soon as its own timeout passes
+        patcher = mock.patch.object(office, "HANG_GRACE", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_convert_returns_output_path(self):
+        backend = FakeBackend()
+        with OfficeService(backend, workers=1) as service:
+            output = service.convert(self.input_path, "pdf", self.output_dir)
+        self.assertEqual(output, self.output_dir / "deck.pdf")
+        self.assertTrue(output.exists())
+        self.assertEqual(backend.calls, [("convert", self.input_path, "pdf", 0)])
+
+    def test_concurrent_callers_queue_for_workers(self):
+        """Never more requests in flight than workers; every caller is served."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def handler(input_path, convert_to, output_path):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+            output_path.write_bytes(b"")
+
+        backend = FakeBackend(convert_handler=handler)
+        results = []
+        with OfficeService(backend, workers=2) as service:
+            threads = [
+                threading.Thread(
+                    target=lambda: results.append(
+                        service.convert(self.input_path, "pdf", self.output_dir)
+                    )
+                )
+                for _ in range(6)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(len(backend.workers), 2)
+        self.assertEqual({index for *_, index in backend.calls}, {0, 1})
+
+    def test_hung_worker_is_replaced(self):
+        hang = threading.Event()
+        hang.set()
+
+        def handler(input_path, convert_to, output_path):
+            if hang.is_set():
+                hang.clear()
+                time.sleep(0.5)
+            output_path.write_bytes(b"")
+
+        backend = FakeBackend(convert_handler=handler)
+        with OfficeService(backend, workers=1) as service:
+            with self.assertRaises(OfficeTimeoutError):
+                service.convert(self.input_path, "pdf", self.output_dir, timeout=0.1)
+            self.assertEqual(service.restarts, 1)
+            self.assertFalse(backend.workers[0].alive)
+
+            # The next request gets a fresh worker
+            service.convert(self.input_path, "pdf", self.output_dir, timeout=1)
+            self.assertEqual(len(backend.workers), 2)
+            self.assertEqual(backend.stopped, 1)
+
+    def test_dead_worker_fails_health_check_and_is_restarted(self):
+        backend = FakeBackend()
+        with OfficeService(backend, workers=1) as service:
+            service.recalculate(self.input_path)
+            backend.workers[0].alive = False
+
+            service.recalculate(self.input_path)
+            self.assertEqual(service.restarts, 1)
+            self.assertEqual(len(backend.workers), 2)
+            self.assertEqual([call[3] for call in backend.calls], [0, 0])
+
+    def test_worker_dying_during_request(self):
+        backend = FakeBackend()
+
+        def crash(path):
+            backend.workers[-1].alive = False
+            raise RuntimeError("connection lost")
+
+        backend.recalculate_handler = crash
+        with OfficeService(backend, workers=1) as service:
+            with self.assertRaisesRegex(OfficeError, "connection lost"):
+                service.recalculate(self.input_path)
+            self.assertEqual(service.restarts, 1)
+
+            backend.recalculate_handler = None
+            service.recalculate(self.input_path)
+            self.assertEqual(len(backend.workers), 2)
+
+    def test_request_error_keeps_healthy_worker(self):
+        def fail(path):
+            raise RuntimeError("bad file")
+
+        backend = FakeBackend(recalculate_handler=fail)
+        with OfficeService(backend, workers=1) as service:
+            with self.assertRaises(OfficeError):
+                service.recalculate(self.input_path)
+            self.assertEqual(service.restarts, 0)
+            self.assertTrue(backend.workers[0].alive)
+
+    def test_close_stops_workers_and_releases_waiters(self):
+        started = threading.Event()
+        finish = threading.Event()
+
+        def handler(input_path, convert_to, output_path):
+            started.set()
+            finish.wait(5)
+            output_path.write_bytes(b"")
+
+        backend = FakeBackend(convert_handler=handler)
+        service = OfficeService(backend, workers=1)
+        busy = threading.Thread(
+            target=service.convert, args=(self.input_path, "pdf", self.output_dir)
+        )
+        busy.start()
+        started.wait(5)
+
+        waiter_errors = []
+
+        def wait_for_worker():
+            try:
+                service.convert(self.input_path, "pdf", self.output_dir)
+            except OfficeError as e:
+                waiter_errors.append(e)
+
+        waiter = threading.Thread(target=wait_for_worker)
+        waiter.start()
+        time.sleep(0.05)
+
+        service.close()
+        waiter.join(5)
+        finish.set()
+        busy.join(5)
+
+        self.assertEqual(len(waiter_errors), 1)
+        self.assertIn("closed", str(waiter_errors[0]))
+        self.assertEqual(backend.stopped, 1)
+        with self.assertRaises(OfficeError):
+            service.recalculate(self.input_path)
+
+    def test_convert_many_returns_results_in_order(self):
+        inputs = [self.output_dir / f"deck{n}.pptx" for n in range(5)]
+
+        def handler(input_path, convert_to, output_path):
+            if input_path.stem == "deck2":
+                raise OfficeError("bad deck")
+            time.sleep(0.01 * (5 - int(input_path.stem[-1])))
+            output_path.write_bytes(b"")
+
+        backend = FakeBackend(convert_handler=handler)
+        with OfficeService(backend, workers=2) as service:
+            results = service.convert_many(
+                [(path, self.output_dir) for path in inputs], "pdf"
+            )
+
+        self.assertEqual(
+            [result if isinstance(result, Path) else str(result) for result in results],
+            [self.output_dir / f"deck{n}.pdf" if n != 2 else "bad deck" for n in range(5)],
+        )
+        # One request per document
+        self.assertEqual(len(backend.calls), 5)
+        self.assertEqual(backend.batch_sizes, [])
+
+    def test_batching_backend_gets_one_batch_per_worker(self):
+        inputs = [self.output_dir / f"deck{n}.pptx" for n in range(5)]
+        backend = FakeBackend(batches=True)
+        with OfficeService(backend, workers=2) as service:
+            results = service.convert_many(
+                [(path, self.output_dir) for path in inputs], "pdf"
+            )
+            recalculated = service.recalculate_many(inputs[:3])
+
+        self.assertEqual(results, [self.output_dir / f"deck{n}.pdf" for n in range(5)])
+        self.assertEqual(recalculated, [None, None, None])
+        self.assertEqual(sorted(backend.batch_sizes), [1, 2, 2, 3])
+        self.assertEqual(len(backend.workers), 2)
+
+    def test_hung_batch_fails_its_documents(self):
+        def handler(input_path, convert_to, output_path):
+            if input_path.stem == "slow":
+                time.sleep(0.5)
+            output_path.write_bytes(b"")
+
+        inputs = [self.output_dir / name for name in ("a.pptx", "slow.pptx", "b.pptx", "c.pptx")]
+        backend = FakeBackend(convert_handler=handler, batches=True)
+        with OfficeService(backend, workers=2) as service:
+            results = service.convert_many(
+                [(path, self.output_dir) for path in inputs], "pdf", timeout=0.1
+            )
+            self.assertEqual(service.restarts, 1)
+
+        self.assertIsInstance(results[0], OfficeTimeoutError)
+        self.assertIsInstance(results[1], OfficeTimeoutError)
+        self.assertEqual(results[2:], [self.output_dir / "b.pdf", self.output_dir / "c.pdf"])
+
+    def test_empty_batch(self):
+        with OfficeService(FakeBackend(), workers=2) as service:
+            self.assertEqual(service.convert_many([], "pdf"), [])
+            self.assertEqual(service.recalculate_many([]), [])
+
+    def test_office_workers_environment_variable(self):
+        with mock.patch.object(office, "_service", None), mock.patch.dict(
+            os.environ, {"OFFICE_WORKERS": "3"}
+        ), mock.patch.object(office.atexit, "register"):
+            service = get_office_service()
+            self.assertEqual(service.size, 3)
+            self.assertIs(get_office_service(), service)
+            service.close()
+
+
+@unittest.skipIf(office.fcntl is None, "persistent profiles need fcntl")
+class TestProfiles(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.profile_dir = Path(self.temp_dir.name)
+
+    def test_profile_is_reused_across_runs(self):
+        first = office._Profile(self.profile_dir)
+        (first.path / "user").mkdir(parents=True)
+        first.release()
+
+        again = office._Profile(self.profile_dir)
+        self.assertEqual(again.path, first.path)
+        self.assertTrue((again.path / "user").exists())
+        again.release()
+
+    def test_profiles_are_exclusive(self):
+        first = office._Profile(self.profile_dir, max_profiles=1)
+        second = office._Profile(self.profile_dir, max_profiles=1)
+        self.assertFalse(first.temporary)
+        self.assertTrue(second.temporary)
+        self.assertNotEqual(first.path, second.path)
+
+        second_path = second.path
+        second.release()
+        self.assertFalse(second_path.exists())
+        first.release()
+
+    def test_cli_worker_initializes_profile_once(self):
+        """A later run reuses the initialized profile and macro (no extra soffice launch)."""
+        log = self.profile_dir / "soffice.log"
+        soffice = self.profile_dir / "soffice"
+        soffice.write_text(f'#!/bin/sh\necho "$*" >> "{log}"\n')
+        soffice.chmod(0o755)
+        spreadsheet = self.profile_dir / "model.xlsx"
+        spreadsheet.write_bytes(b"")
+
+        with mock.patch.object(office, "PROFILE_DIR", self.profile_dir / "profiles"):
+            for _ in range(2):
+                worker = office.CliWorker(str(soffice))
+                worker.recalculate(spreadsheet, timeout=5)
+                worker.stop()
+
+        runs = log.read_text().splitlines()
+        self.assertEqual(sum("--terminate_after_init" in run for run in runs), 1)
+        self.assertEqual(sum("RecalculateAndSave" in run for run in runs), 2)
+
+    def test_reset_deletes_profile(self):
+        profile = office._Profile(self.profile_dir)
+        profile.path.mkdir(parents=True)
+        profile.release(reset=True)
+        self.assertFalse(profile.path.exists())
+
+
+# Stand-in for soffice: logs its arguments; "converts" and "recalculates"
+# every file whose name does not start with "bad"
+FAKE_SOFFICE = """\
+#!/bin/sh
+echo "$*" >> "{log}"
+outdir=""
+for arg in "$@"; do
+  case "$arg" in
+    macro:///*RecalculateFiles*)
+      list=$(echo "$arg" | sed 's/.*RecalculateFiles("\\(.*\\)").*/\\1/')
+      while read -r path; do
+        case "$(basename "$path")" in bad*) ;; *) echo recalculated >> "$path" ;; esac
+      done < "$list"
+      ;;
+  esac
+done
+while [ $# -gt 0 ]; do
+  case "$1" in
+    --outdir) outdir="$2"; shift 2; continue ;;
+    --convert-to) shift 2; continue ;;
+    -*|macro:*) shift; continue ;;
+  esac
+  name=$(basename "$1")
+  case "$name" in bad*) ;; *) echo "converted $1" > "$outdir/${{name%.*}}.pdf" ;; esac
+  shift
+done
+"""
+
+
+@unittest.skipIf(office.fcntl is None, "the fake soffice needs a POSIX shell")
+class TestCliBatches(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.log = self.root / "soffice.log"
+        soffice = self.root / "soffice"
+        soffice.write_text(textwrap.dedent(FAKE_SOFFICE.format(log=self.log)))
+        soffice.chmod(0o755)
+        patcher = mock.patch.object(office, "PROFILE_DIR", self.root / "profiles")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.worker = office.CliWorker(str(soffice))
+        self.addCleanup(self.worker.stop)
+
+    def make_inputs(self, *relative_paths):
+        paths = []
+        for relative_path in relative_paths:
+            path = self.root / relative_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("input\n")
+            paths.append(path)
+        return paths
+
+    def soffice_runs(self):
+        return [run for run in self.log.read_text().splitlines() if "--terminate_after_init" not in run]
+
+    def test_batch_is_one_soffice_run(self):
+        inputs = self.make_inputs("a.pptx", "b.pptx", "bad.pptx", "sub/c.pptx")
+        out_a, out_b = self.root / "out-a", self.root / "out-b"
+        out_a.mkdir()
+        out_b.mkdir()
+
+        results = self.worker.convert_batch(
+            [(inputs[0], out_a), (inputs[1], out_b), (inputs[2], out_a), (inputs[3], out_b)],
+            "pdf",
+            timeout=10,
+        )
+
+        self.assertEqual(len(self.soffice_runs()), 1)
+        self.assertEqual(results[0], out_a / "a.pdf")
+        self.assertEqual(results[1], out_b / "b.pdf")
+        self.assertIsInstance(results[2], OfficeError)
+        self.assertEqual(results[3], out_b / "c.pdf")
+        self.assertEqual((out_b / "c.pdf").read_text(), f"converted {inputs[3]}\n")
+
+    def test_same_output_name_goes_to_separate_runs(self):
+        inputs = self.make_inputs("one/deck.pptx", "two/deck.pptx", "other.pptx")
+        outputs = [self.root / f"out-{n}" for n in range(3)]
+        for output_dir in outputs:
+            output_dir.mkdir()
+
+        results = self.worker.convert_batch(list(zip(inputs, outputs)), "pdf", timeout=10)
+
+        self.assertEqual(len(self.soffice_runs()), 2)
+        self.assertEqual(results, [outputs[0] / "deck.pdf", outputs[1] / "deck.pdf", outputs[2] / "other.pdf"])
+        self.assertEqual(results[0].read_text(), f"converted {inputs[0]}\n")
+        self.assertEqual(results[1].read_text(), f"converted {inputs[1]}\n")
+
+    def test_recalculate_batch_is_one_soffice_run(self):
+        inputs = self.make_inputs("a.xlsx", "bad.xlsx", "dir with space/c.xlsx")
+
+        results = self.worker.recalculate_batch(inputs, timeout=10)
+
+        self.assertEqual(len(self.soffice_runs()), 1)
+        self.assertIsNone(results[0])
+        self.assertIsInstance(results[1], OfficeError)
+        self.assertIsNone(results[2])
+        self.assertEqual(inputs[2].read_text(), "input\nrecalculated\n")
+        macro = self.worker.profile.path / "user" / "basic" / "Standard" / "Module1.xba"
+        self.assertIn("RecalculateFiles", macro.read_text())
+
+    def test_service_batches_with_cli_backend(self):
+        inputs = self.make_inputs(*(f"deck{n}.pptx" for n in range(6)))
+        with mock.patch.object(office, "find_soffice", return_value=str(self.root / "soffice")):
+            with OfficeService(CliBackend(), workers=2) as service:
+                results = service.convert_many([(path, self.root) for path in inputs], "pdf")
+
+        self.assertEqual(results, [self.root / f"deck{n}.pdf" for n in range(6)])
+        self.assertEqual(len(self.soffice_runs()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
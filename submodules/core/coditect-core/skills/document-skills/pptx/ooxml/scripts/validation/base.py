@@ -1,12 +1,55 @@
 """
 Base validator with common validation logic for document files.
+
+Every XML part is parsed once into a per-validator document cache that the
+rule checks share; XSD validation is distributed across a process pool.
 """
 
+import io
+import os
+import pickle
 import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
 import lxml.etree
 
+# Compiled XSD schemas by path, shared by all validators for the process lifetime
+_SCHEMA_CACHE = {}
+
+
+def load_schema(schema_path):
+    """Return the compiled XMLSchema for schema_path, compiling it only once."""
+    key = str(schema_path)
+    schema = _SCHEMA_CACHE.get(key)
+    if schema is None:
+        with open(schema_path, "rb") as xsd_file:
+            parser = lxml.etree.XMLParser()
+            xsd_doc = lxml.etree.parse(xsd_file, parser=parser, base_url=key)
+        schema = _SCHEMA_CACHE[key] = lxml.etree.XMLSchema(xsd_doc)
+    return schema
+
+
+# Validator used by XSD process-pool workers, unpickled once per worker
+_worker_validator = None
+
+
+def _init_xsd_worker(validator):
+    global _worker_validator
+    _worker_validator = validator
+
+
+def _validate_file_in_worker(xml_file):
+    return _validate_file_sorted(_worker_validator, xml_file)
+
+
+def _validate_file_sorted(validator, xml_file):
+    # Sorted so results do not depend on set order, which differs between processes
+    is_valid, errors = validator.validate_file_against_xsd(xml_file)
+    return is_valid, sorted(errors)
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -103,10 +146,15 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    # Fewer XML parts than this are validated in-process
+    MIN_PARALLEL_FILES = 8
+
+    def __init__(self, unpacked_dir, original_file, verbose=False, workers=None):
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
+        # Processes for XSD validation (1 = validate in-process)
+        self.workers = workers or os.cpu_count() or 1
 
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
@@ -120,6 +168,39 @@ class BaseSchemaValidator:
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # XML parts of the original file, read from the zip on first use
+        self._original_parts = None
+        # XSD errors of original parts, by part name
+        self._original_errors = {}
+        # Parsed XML parts (or their parse errors), by path
+        self._documents = {}
+
+    def __getstate__(self):
+        # Parsed trees are not picklable; process-pool workers re-read parts
+        state = self.__dict__.copy()
+        state["_documents"] = {}
+        state["_original_parts"] = None
+        state["_original_errors"] = {}
+        return state
+
+    def _parse(self, xml_file):
+        """Parse an XML part, once per validator.
+
+        Later calls return the cached tree (or re-raise the cached parse
+        error). The tree is shared by all checks and must not be modified.
+        """
+        key = Path(xml_file)
+        document = self._documents.get(key)
+        if document is None:
+            try:
+                document = lxml.etree.parse(str(key))
+            except Exception as e:
+                document = e
+            self._documents[key] = document
+        if isinstance(document, Exception):
+            raise document
+        return document
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
@@ -131,7 +212,7 @@ class BaseSchemaValidator:
         for xml_file in self.xml_files:
             try:
                 # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
+                self._parse(xml_file)
             except lxml.etree.XMLSyntaxError as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: "
@@ -159,7 +240,7 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
                 declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
 
                 for attr_val in [
@@ -190,18 +271,11 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
                 file_ids = {}  # Track IDs that must be unique within this file
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
+                # Check IDs outside mc:AlternateContent elements
+                for elem in self._iter_without_alternate_content(root):
                     # Get the element name without namespace
                     tag = (
                         elem.tag.split("}")[-1].lower()
@@ -274,6 +348,17 @@ class BaseSchemaValidator:
                 print("PASSED - All required IDs are unique")
             return True
 
+    def _iter_without_alternate_content(self, root):
+        """Iterate like root.iter(), skipping mc:AlternateContent subtrees."""
+        alternate_content = f"{{{self.MC_NAMESPACE}}}AlternateContent"
+        stack = [root]
+        while stack:
+            elem = stack.pop()
+            yield elem
+            stack.extend(
+                child for child in reversed(elem) if child.tag != alternate_content
+            )
+
     def validate_file_references(self):
         """
         Validate that all .rels files properly reference files and that all files are referenced.
@@ -310,7 +395,7 @@ class BaseSchemaValidator:
         for rels_file in rels_files:
             try:
                 # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self._parse(rels_file).getroot()
 
                 # Get the directory where this .rels file is located
                 rels_dir = rels_file.parent
@@ -390,8 +475,6 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
         errors = []
 
         # Process each XML file that might contain r:id references
@@ -411,7 +494,7 @@ class BaseSchemaValidator:
 
             try:
                 # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self._parse(rels_file).getroot()
                 rid_to_type = {}
 
                 for rel in rels_root.findall(
@@ -434,7 +517,7 @@ class BaseSchemaValidator:
                         rid_to_type[rid] = type_name
 
                 # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
+                xml_root = self._parse(xml_file).getroot()
 
                 # Find all elements with r:id attributes
                 for elem in xml_root.iter():
@@ -531,7 +614,7 @@ class BaseSchemaValidator:
 
         try:
             # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
+            root = self._parse(content_types_file).getroot()
             declared_parts = set()
             declared_extensions = set()
 
@@ -593,7 +676,7 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    root_tag = self._parse(xml_file).getroot().tag
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
                     if root_name in declarable_roots and path_str not in declared_parts:
@@ -673,7 +756,7 @@ class BaseSchemaValidator:
             if verbose:
                 relative_path = xml_file.relative_to(unpacked_dir)
                 print(f"FAILED - {relative_path}: {len(new_errors)} new error(s)")
-                for error in list(new_errors)[:3]:
+                for error in sorted(new_errors)[:3]:
                     truncated = error[:250] + "..." if len(error) > 250 else error
                     print(f"  - {truncated}")
             return False, new_errors
@@ -692,11 +775,10 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        results = self._validate_files_against_xsd(self.xml_files)
+
+        for xml_file, (is_valid, new_file_errors) in zip(self.xml_files, results):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -712,7 +794,7 @@ class BaseSchemaValidator:
 
             # Has new errors
             new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
+            for error in sorted(new_file_errors)[:3]:  # Show first 3 errors
                 new_errors.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
@@ -738,6 +820,34 @@ class BaseSchemaValidator:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _validate_files_against_xsd(self, xml_files):
+        """Run validate_file_against_xsd over xml_files, in parallel when worthwhile.
+
+        Results are (is_valid, sorted new errors) in the order of xml_files,
+        the same whether or not a pool is used. Falls back to in-process
+        validation if a process pool cannot be used.
+        """
+        workers = min(self.workers, len(xml_files))
+        if workers > 1 and len(xml_files) >= self.MIN_PARALLEL_FILES:
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_xsd_worker,
+                    initargs=(self,),
+                ) as pool:
+                    return list(
+                        pool.map(
+                            _validate_file_in_worker,
+                            xml_files,
+                            chunksize=max(1, len(xml_files) // (workers * 4)),
+                        )
+                    )
+            except (OSError, BrokenProcessPool, pickle.PicklingError) as e:
+                if self.verbose:
+                    print(f"Parallel XSD validation unavailable ({e}), validating in-process")
+
+        return [_validate_file_sorted(self, f) for f in xml_files]
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -830,23 +940,24 @@ class BaseSchemaValidator:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            schema = load_schema(schema_path)
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+            xml_doc = self._parse(xml_file)
 
+            return self._validate_xsd_doc(
+                schema, xml_doc, xml_file.relative_to(base_path)
+            )
+
+        except Exception as e:
+            return False, {str(e)}
+
+    def _validate_xsd_doc(self, schema, xml_doc, relative_path):
+        """Preprocess a parsed part and validate it. Returns (is_valid, errors_set)."""
+        try:
             xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
             xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
 
             # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
             if (
                 relative_path.parts
                 and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
@@ -875,33 +986,53 @@ class BaseSchemaValidator:
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
+        part_name = relative_path.as_posix()
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        if part_name not in self._original_errors:
+            self._original_errors[part_name] = self._validate_original_part(
+                xml_file, relative_path
+            )
+        return self._original_errors[part_name]
 
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
+    def _validate_original_part(self, xml_file, relative_path):
+        """Validate the original document's copy of a part, read from memory."""
+        data = self._get_original_part(relative_path.as_posix())
+        if data is None:
+            # File didn't exist in original, so no original errors
+            return set()
+
+        schema_path = self._get_schema_path(xml_file)
+        if not schema_path:
+            return set()
 
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
+        try:
+            schema = load_schema(schema_path)
+            # Named like the part on disk so parse errors read as they do for it
+            xml_doc = lxml.etree.parse(io.BytesIO(data), base_url=str(xml_file))
+        except Exception as e:
+            return {str(e)}
 
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
+        is_valid, errors = self._validate_xsd_doc(schema, xml_doc, relative_path)
+        return errors if errors else set()
 
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
+    def _get_original_part(self, part_name):
+        """Return the bytes of an XML part of the original file (None if absent).
+
+        The original zip is read once per validator; only XML and .rels parts
+        are kept in memory.
+        """
+        if self._original_parts is None:
+            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
+                self._original_parts = {
+                    info.filename: zip_ref.read(info)
+                    for info in zip_ref.infolist()
+                    if info.filename.endswith((".xml", ".rels"))
+                }
+        return self._original_parts.get(part_name)
 
     def _remove_template_tags_from_text_nodes(self, xml_doc):
         """Remove template tags from XML text nodes and collect warnings.
@@ -0,0 +1,304 @@
+import contextlib
+import io
+import shutil
+import tempfile
+import unittest
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+import lxml.etree
+
+from validation import base
+from validation.base import BaseSchemaValidator
+
+RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+
+def rels(*relationships):
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>\n<Relationships xmlns="{RELS_NS}">'
+        + "".join(relationships)
+        + "</Relationships>"
+    )
+
+
+VALID_RELS = rels('<Relationship Id="rId1" Type="t" Target="a.xml"/>')
+# Missing Target, an unknown attribute and an unknown element: three XSD errors
+INVALID_RELS = rels('<Relationship Id="rId1" Type="t" Bogus="1"/><Other/>')
+MISSING_TARGET_RELS = rels('<Relationship Id="rId1" Type="t"/>')
+
+
+def write_parts(directory, parts):
+    for name, text in parts.items():
+        path = Path(directory) / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+
+def write_zip(path, parts):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, text in parts.items():
+            zf.writestr(name, text)
+
+
+class ValidatorTestCase(unittest.TestCase):
+    """Unpacked parts in a temporary directory next to an original file."""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.unpacked_dir = self.temp_dir / "unpacked"
+        self.original_file = self.temp_dir / "original.docx"
+        self.unpacked_dir.mkdir()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def make_validator(self, parts, original_parts=None, workers=1):
+        write_parts(self.unpacked_dir, parts)
+        write_zip(self.original_file, original_parts or {})
+        return BaseSchemaValidator(self.unpacked_dir, self.original_file, workers=workers)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestParallelXsdValidation(ValidatorTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Enough parts to use the pool, valid and invalid interleaved
+        self.parts = {}
+        for i in range(BaseSchemaValidator.MIN_PARALLEL_FILES + 4):
+            text = (VALID_RELS, INVALID_RELS, MISSING_TARGET_RELS)[i % 3]
+            self.parts[f"part{i}/_rels/item.xml.rels"] = text
+        self.parts["broken/_rels/item.xml.rels"] = "<Relationships"
+
+    def run_validation(self, workers):
+        validator = self.make_validator(self.parts, workers=workers)
+        with mock.patch.object(
+            base, "ProcessPoolExecutor", wraps=ProcessPoolExecutor
+        ) as pool:
+            results = validator._validate_files_against_xsd(validator.xml_files)
+        return validator, results, pool.called
+
+    def test_pooled_and_in_process_results_are_identical(self):
+        """Pooled runs report exactly the errors of in-process runs"""
+        validator, pooled, used_pool = self.run_validation(workers=2)
+        self.assertTrue(used_pool)
+        in_process = [
+            base._validate_file_sorted(validator, f) for f in validator.xml_files
+        ]
+        self.assertEqual(pooled, in_process)
+
+        _, single, used_pool = self.run_validation(workers=1)
+        self.assertFalse(used_pool)
+        self.assertEqual(pooled, single)
+
+    def test_results_follow_file_order(self):
+        """Results line up with the files passed in"""
+        validator, results, _ = self.run_validation(workers=2)
+        # (is_valid, error count) by part content
+        expected = {
+            VALID_RELS: (True, 0),
+            INVALID_RELS: (False, 3),
+            MISSING_TARGET_RELS: (False, 1),
+            "<Relationships": (False, 1),
+        }
+        for xml_file, (is_valid, errors) in zip(validator.xml_files, results):
+            text = xml_file.read_text(encoding="utf-8")
+            self.assertEqual((is_valid, len(errors)), expected[text], xml_file)
+
+        reversed_files = list(reversed(validator.xml_files))
+        self.assertEqual(
+            validator._validate_files_against_xsd(reversed_files),
+            list(reversed(results)),
+        )
+
+    def test_errors_are_in_deterministic_order(self):
+        """Errors of each part are sorted, and reports repeat exactly"""
+        _, results, _ = self.run_validation(workers=2)
+        for _, errors in results:
+            self.assertEqual(errors, sorted(errors))
+
+        reports = []
+        for workers in (2, 1, 2):
+            validator = BaseSchemaValidator(
+                self.unpacked_dir, self.original_file, workers=workers
+            )
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                self.assertFalse(validator.validate_against_xsd())
+            reports.append(output.getvalue())
+        self.assertEqual(reports[0], reports[1])
+        self.assertEqual(reports[0], reports[2])
+        self.assertIn("FAILED - Found NEW validation errors", reports[0])
+
+
+class TestParseCache(ValidatorTestCase):
+
+    def test_document_is_parsed_once(self):
+        """Repeated lookups return the same cached tree"""
+        validator = self.make_validator({"_rels/.rels": VALID_RELS})
+        path = self.unpacked_dir / "_rels/.rels"
+        with mock.patch.object(lxml.etree, "parse", wraps=lxml.etree.parse) as parse:
+            first = validator._parse(path)
+            second = validator._parse(str(path))
+        self.assertIs(first, second)
+        self.assertEqual(parse.call_count, 1)
+
+    def test_cached_parse_failure_is_raised_again(self):
+        """A part that failed to parse fails the same way on the next lookup"""
+        validator = self.make_validator({"_rels/.rels": "<Relationships"})
+        path = self.unpacked_dir / "_rels/.rels"
+        with mock.patch.object(lxml.etree, "parse", wraps=lxml.etree.parse) as parse:
+            with self.assertRaises(lxml.etree.XMLSyntaxError) as first:
+                validator._parse(path)
+            with self.assertRaises(lxml.etree.XMLSyntaxError) as second:
+                validator._parse(path)
+        self.assertIs(first.exception, second.exception)
+        self.assertEqual(parse.call_count, 1)
+
+    def test_parse_failure_reported_by_every_check(self):
+        """validate_xml and XSD validation both see the cached failure"""
+        validator = self.make_validator({"_rels/.rels": "<Relationships"})
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertFalse(validator.validate_xml())
+        self.assertIn("_rels/.rels: Line 1", output.getvalue())
+
+        [(is_valid, errors)] = validator._validate_files_against_xsd(validator.xml_files)
+        self.assertFalse(is_valid)
+        self.assertEqual(len(errors), 1)
+
+
+class TestOriginalErrors(ValidatorTestCase):
+
+    W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+    def document(self, body):
+        return (
+            f'<?xml version="1.0" encoding="UTF-8"?>\n<w:document xmlns:w="{self.W_NS}">'
+            f"<w:body>{body}</w:body></w:document>"
+        )
+
+    def extracted_errors(self, validator, part_name):
+        """Errors of the original part validated from disk, the way the original file used to be checked"""
+        extract_dir = self.temp_dir / "extracted"
+        with zipfile.ZipFile(self.original_file) as zf:
+            zf.extractall(extract_dir)
+        is_valid, errors = validator._validate_single_file_xsd(
+            extract_dir / part_name, extract_dir
+        )
+        return errors if errors else set()
+
+    def test_existing_errors_are_filtered(self):
+        """Errors the original part already had are not reported again"""
+        validator = self.make_validator(
+            {"_rels/.rels": INVALID_RELS}, {"_rels/.rels": MISSING_TARGET_RELS}
+        )
+        is_valid, errors = validator.validate_file_against_xsd(
+            self.unpacked_dir / "_rels/.rels"
+        )
+        self.assertFalse(is_valid)
+        self.assertEqual(len(errors), 2)
+        self.assertFalse(any("'Target' is required" in error for error in errors))
+
+    def test_unchanged_errors_pass(self):
+        """A part with only the original's errors passes"""
+        validator = self.make_validator(
+            {"_rels/.rels": MISSING_TARGET_RELS}, {"_rels/.rels": MISSING_TARGET_RELS}
+        )
+        self.assertEqual(
+            validator.validate_file_against_xsd(self.unpacked_dir / "_rels/.rels"),
+            (True, set()),
+        )
+
+    def test_new_part_reports_all_errors(self):
+        """Parts missing from the original have no errors to filter"""
+        validator = self.make_validator(
+            {"_rels/.rels": INVALID_RELS}, {"other/_rels/.rels": INVALID_RELS}
+        )
+        is_valid, errors = validator.validate_file_against_xsd(
+            self.unpacked_dir / "_rels/.rels"
+        )
+        self.assertFalse(is_valid)
+        self.assertEqual(len(errors), 3)
+
+    def test_matches_validating_extracted_original(self):
+        """Original errors read from memory equal those of an extracted copy"""
+        original = {
+            "_rels/.rels": INVALID_RELS,
+            "word/_rels/document.xml.rels": VALID_RELS,
+            "word/document.xml": self.document(
+                "<w:p><w:bogus/></w:p><w:p><w:r><w:t>{{name}}</w:t></w:r></w:p>"
+                '<x:ext xmlns:x="urn:example"/>'
+            ),
+            "broken/_rels/item.xml.rels": "<Relationships",
+        }
+        validator = self.make_validator(original, original)
+        for part_name in original:
+            xml_file = self.unpacked_dir / part_name
+            self.assertEqual(
+                validator._get_original_file_errors(xml_file),
+                self.extracted_errors(validator, part_name),
+                part_name,
+            )
+            # Every part is unchanged, so nothing is new
+            is_valid, errors = validator.validate_file_against_xsd(xml_file)
+            self.assertEqual(errors, set(), part_name)
+        self.assertTrue(
+            validator._get_original_file_errors(self.unpacked_dir / "word/document.xml")
+        )
+
+    def test_original_file_is_read_once(self):
+        """The original zip is opened once, however many parts are checked"""
+        parts = {f"part{i}/_rels/item.xml.rels": INVALID_RELS for i in range(4)}
+        validator = self.make_validator(parts, parts)
+        with mock.patch.object(zipfile, "ZipFile", wraps=zipfile.ZipFile) as zip_file:
+            results = validator._validate_files_against_xsd(validator.xml_files)
+        self.assertEqual(results, [(True, [])] * 4)
+        self.assertEqual(zip_file.call_count, 1)
+
+
+class TestLoadSchema(ValidatorTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.dict(base._SCHEMA_CACHE, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_schema_is_compiled_once_per_path(self):
+        """load_schema returns the cached schema for a path it has seen"""
+        validator = self.make_validator({"_rels/.rels": VALID_RELS})
+        rels_path = validator.schemas_dir / BaseSchemaValidator.SCHEMA_MAPPINGS[".rels"]
+        types_path = (
+            validator.schemas_dir
+            / BaseSchemaValidator.SCHEMA_MAPPINGS["[Content_Types].xml"]
+        )
+        with mock.patch.object(
+            lxml.etree, "XMLSchema", wraps=lxml.etree.XMLSchema
+        ) as compile_schema:
+            first = base.load_schema(rels_path)
+            self.assertIs(base.load_schema(str(rels_path)), first)
+            self.assertIsNot(base.load_schema(types_path), first)
+        self.assertEqual(compile_schema.call_count, 2)
+
+    def test_validation_compiles_each_schema_once(self):
+        """Checking many parts and their originals compiles their schema once"""
+        parts = {f"part{i}/_rels/item.xml.rels": INVALID_RELS for i in range(5)}
+        validator = self.make_validator(parts, parts)
+        with mock.patch.object(
+            lxml.etree, "XMLSchema", wraps=lxml.etree.XMLSchema
+        ) as compile_schema:
+            results = validator._validate_files_against_xsd(validator.xml_files)
+            self.assertEqual(results, [(True, [])] * 5)
+            # A second validator in the same process reuses the schema too
+            BaseSchemaValidator(
+                self.unpacked_dir, self.original_file, workers=1
+            )._validate_files_against_xsd(validator.xml_files)
+        self.assertEqual(compile_schema.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -18,15 +18,28 @@ Main Functions:
     extract_text_inventory: Extract all text from a presentation
     save_inventory: Save extracted data to JSON
 
+Text overflow estimates (the expensive part) are computed per slide in a
+process pool and cached on disk by a hash of the slide, layout and master
+XML, so re-running inventory after an edit only re-measures changed slides.
+The least recently used entries are deleted once the cache exceeds
+INVENTORY_CACHE_MAX_BYTES.
+
 Usage:
     python inventory.py input.pptx output.json
 """
 
 import argparse
+import hashlib
 import json
+import os
 import platform
 import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -46,6 +59,23 @@ InventoryData = Dict[
 ]  # Dict of slide_id -> {shape_id -> ShapeData}
 InventoryDict = Dict[str, Dict[str, ShapeDict]]  # JSON-serializable inventory
 
+# Minimum overlap in inches for two shapes to count as overlapping
+OVERLAP_TOLERANCE = 0.05
+
+# Per-slide overflow cache; bump the version when the estimate changes
+INVENTORY_CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "pptx-inventory"
+)
+INVENTORY_CACHE_MAX_BYTES = 16 * 1024 * 1024
+CACHE_PRUNE_GRACE = 600  # Seconds an entry is kept after use, for runs in progress
+
+# Fewer uncached slides than this are measured in-process
+MIN_PARALLEL_SLIDES = 8
+
+# Shared drawing context for text measurement (textlength ignores the image)
+_MEASURE_DRAW = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
 
 def main():
     """Main entry point for command-line usage."""
@@ -76,6 +106,18 @@ The output JSON includes:
         action="store_true",
         help="Include only text shapes that have overflow or overlap issues",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Re-measure every slide instead of using the cache in {DEFAULT_CACHE_DIR}",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Processes for measuring slides (default: CPU count)",
+    )
 
     args = parser.parse_args()
 
@@ -94,7 +136,12 @@ The output JSON includes:
             print(
                 "Filtering to include only text shapes with issues (overflow/overlap)"
             )
-        inventory = extract_text_inventory(input_path, issues_only=args.issues_only)
+        inventory = extract_text_inventory(
+            input_path,
+            issues_only=args.issues_only,
+            cache=not args.no_cache,
+            workers=args.jobs,
+        )
 
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -285,62 +332,11 @@ class ShapeData:
 
         Returns:
             Path to the font file, or None if not found
-        """
-        system = platform.system()
-
-        # Common font file variations to try
-        font_variations = [
-            font_name,
-            font_name.lower(),
-            font_name.replace(" ", ""),
-            font_name.replace(" ", "-"),
-        ]
 
-        # Define font directories and extensions by platform
-        if system == "Darwin":  # macOS
-            font_dirs = [
-                "/System/Library/Fonts/",
-                "/Library/Fonts/",
-                "~/Library/Fonts/",
-            ]
-            extensions = [".ttf", ".otf", ".ttc", ".dfont"]
-        else:  # Linux
-            font_dirs = [
-                "/usr/share/fonts/truetype/",
-                "/usr/local/share/fonts/",
-                "~/.fonts/",
-            ]
-            extensions = [".ttf", ".otf"]
-
-        # Try to find the font file
-        from pathlib import Path
-
-        for font_dir in font_dirs:
-            font_dir_path = Path(font_dir).expanduser()
-            if not font_dir_path.exists():
-                continue
-
-            # First try exact matches
-            for variant in font_variations:
-                for ext in extensions:
-                    font_path = font_dir_path / f"{variant}{ext}"
-                    if font_path.exists():
-                        return str(font_path)
-
-            # Then try fuzzy matching - find files containing the font name
-            try:
-                for file_path in font_dir_path.iterdir():
-                    if file_path.is_file():
-                        file_name_lower = file_path.name.lower()
-                        font_name_lower = font_name.lower().replace(" ", "")
-                        if font_name_lower in file_name_lower and any(
-                            file_name_lower.endswith(ext) for ext in extensions
-                        ):
-                            return str(file_path)
-            except (OSError, PermissionError):
-                continue
-
-        return None
+        Font directories are listed once per process and results are
+        memoized by font name (see _font_directory_index).
+        """
+        return _resolve_font_path(font_name)
 
     @staticmethod
     def get_slide_dimensions(slide: Any) -> tuple[Optional[int], Optional[int]]:
@@ -391,6 +387,7 @@ class ShapeData:
         absolute_left: Optional[int] = None,
         absolute_top: Optional[int] = None,
         slide: Optional[Any] = None,
+        estimate_overflow: bool = True,
     ):
         """Initialize from a PowerPoint shape object.
 
@@ -399,6 +396,8 @@ class ShapeData:
             absolute_left: Absolute left position in EMUs (for shapes in groups)
             absolute_top: Absolute top position in EMUs (for shapes in groups)
             slide: Optional slide object to get dimensions and layout information
+            estimate_overflow: If False, skips text measurement and leaves
+                frame_overflow_bottom for the caller to set (e.g. from the cache)
         """
         self.shape = shape  # Store reference to original shape
         self.shape_id: str = ""  # Will be set after sorting
@@ -461,7 +460,8 @@ class ShapeData:
             str, float
         ] = {}  # Dict of shape_id -> overlap area in sq inches
         self.warnings: List[str] = []
-        self._estimate_frame_overflow()
+        if estimate_overflow:
+            self._estimate_frame_overflow()
         self._calculate_slide_overflow()
         self._detect_bullet_issues()
 
@@ -531,13 +531,16 @@ class ShapeData:
             self.inches_to_pixels(usable_height),
         )
 
-    def _wrap_text_line(self, line: str, max_width_px: int, draw, font) -> List[str]:
-        """Wrap a single line of text to fit within max_width_px."""
+    def _wrap_text_line(self, line: str, max_width_px: int, measure) -> List[str]:
+        """Wrap a single line of text to fit within max_width_px.
+
+        Args:
+            measure: Callable returning the width of a string in pixels
+        """
         if not line:
             return [""]
 
-        # Use textlength for efficient width calculation
-        if draw.textlength(line, font=font) <= max_width_px:
+        if measure(line) <= max_width_px:
             return [line]
 
         # Need to wrap - split into words
@@ -547,7 +550,7 @@ class ShapeData:
 
         for word in words:
             test_line = current_line + (" " if current_line else "") + word
-            if draw.textlength(test_line, font=font) <= max_width_px:
+            if measure(test_line) <= max_width_px:
                 current_line = test_line
             else:
                 if current_line:
@@ -573,10 +576,6 @@ class ShapeData:
         if usable_width_px <= 0 or usable_height_px <= 0:
             return
 
-        # Set up PIL for text measurement
-        dummy_img = Image.new("RGB", (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
-
         # Get default font size from placeholder or use conservative estimate
         default_font_size = self._get_default_font_size()
 
@@ -593,20 +592,12 @@ class ShapeData:
             font_name = para_data.font_name or "Arial"
             font_size = int(para_data.font_size or default_font_size)
 
-            font = None
-            font_path = self.get_font_path(font_name)
-            if font_path:
-                try:
-                    font = ImageFont.truetype(font_path, size=font_size)
-                except Exception:
-                    font = ImageFont.load_default()
-            else:
-                font = ImageFont.load_default()
+            measure = partial(_text_length, self.get_font_path(font_name), font_size)
 
             # Wrap all lines in this paragraph
             all_wrapped_lines = []
             for line in paragraph.text.split("\n"):
-                wrapped = self._wrap_text_line(line, usable_width_px, draw, font)
+                wrapped = self._wrap_text_line(line, usable_width_px, measure)
                 all_wrapped_lines.extend(wrapped)
 
             if all_wrapped_lines:
@@ -739,6 +730,295 @@ class ShapeData:
         return result
 
 
+@lru_cache(maxsize=1)
+def _font_directory_index() -> Tuple[
+    Tuple[Tuple[Path, Optional[frozenset], Tuple[Path, ...]], ...], Tuple[str, ...], bool
+]:
+    """List the platform font directories once per process.
+
+    Returns:
+        Tuple of (directories, extensions, case_insensitive) where each
+        directory is (path, entry names or None if unreadable, font files
+        in listing order). Call _font_directory_index.cache_clear() (and
+        _resolve_font_path.cache_clear()) after installing fonts.
+    """
+    system = platform.system()
+
+    # Define font directories and extensions by platform
+    if system == "Darwin":  # macOS
+        font_dirs = [
+            "/System/Library/Fonts/",
+            "/Library/Fonts/",
+            "~/Library/Fonts/",
+        ]
+        extensions = (".ttf", ".otf", ".ttc", ".dfont")
+    else:  # Linux
+        font_dirs = [
+            "/usr/share/fonts/truetype/",
+            "/usr/local/share/fonts/",
+            "~/.fonts/",
+        ]
+        extensions = (".ttf", ".otf")
+
+    # macOS file systems match names case-insensitively
+    case_insensitive = system == "Darwin"
+
+    directories = []
+    for font_dir in font_dirs:
+        font_dir_path = Path(font_dir).expanduser()
+        if not font_dir_path.exists():
+            continue
+        try:
+            entries = list(font_dir_path.iterdir())
+        except (OSError, PermissionError):
+            directories.append((font_dir_path, None, ()))
+            continue
+        names = frozenset(
+            entry.name.lower() if case_insensitive else entry.name for entry in entries
+        )
+        files = tuple(entry for entry in entries if entry.is_file())
+        directories.append((font_dir_path, names, files))
+
+    return tuple(directories), extensions, case_insensitive
+
+
+@lru_cache(maxsize=None)
+def _resolve_font_path(font_name: str) -> Optional[str]:
+    """Find the font file for font_name in the font directory index."""
+    directories, extensions, case_insensitive = _font_directory_index()
+
+    # Common font file variations to try
+    font_variations = [
+        font_name,
+        font_name.lower(),
+        font_name.replace(" ", ""),
+        font_name.replace(" ", "-"),
+    ]
+    font_name_lower = font_name.lower().replace(" ", "")
+
+    for font_dir_path, names, files in directories:
+        # First try exact matches
+        for variant in font_variations:
+            for ext in extensions:
+                file_name = f"{variant}{ext}"
+                if names is None:
+                    found = (font_dir_path / file_name).exists()
+                else:
+                    found = (file_name.lower() if case_insensitive else file_name) in names
+                if found:
+                    return str(font_dir_path / file_name)
+
+        # Then try fuzzy matching - find files containing the font name
+        for file_path in files:
+            file_name_lower = file_path.name.lower()
+            if font_name_lower in file_name_lower and any(
+                file_name_lower.endswith(ext) for ext in extensions
+            ):
+                return str(file_path)
+
+    return None
+
+
+@lru_cache(maxsize=128)
+def _load_font(font_path: Optional[str], size: int) -> Any:
+    """Load a PIL font once per (path, size), falling back to the default font."""
+    if font_path:
+        try:
+            return ImageFont.truetype(font_path, size=size)
+        except Exception:
+            pass
+    return ImageFont.load_default()
+
+
+@lru_cache(maxsize=65536)
+def _text_length(font_path: Optional[str], size: int, text: str) -> float:
+    """Width of text in pixels, memoized per font (see _load_font)."""
+    return _MEASURE_DRAW.textlength(text, font=_load_font(font_path, size))
+
+
+@lru_cache(maxsize=1)
+def font_directory_digest() -> str:
+    """Fingerprint of the installed fonts (measurements and renders depend on them)."""
+    directories, _, _ = _font_directory_index()
+    listing = [(str(path), sorted(names or ())) for path, names, _ in directories]
+    return hashlib.sha256(json.dumps(listing).encode("utf-8")).hexdigest()
+
+
+def slide_cache_key(slide: Any, part_digests: Optional[Dict[str, str]] = None) -> str:
+    """Hash of everything a slide's overflow estimates depend on.
+
+    Covers the slide, its layout and master XML (placeholder geometry and
+    default text styles), the installed fonts and INVENTORY_CACHE_VERSION.
+    Must be computed before the slide is inspected: python-pptx adds
+    elements to the XML when some properties are read (text frames, colors).
+
+    Args:
+        slide: Slide to key
+        part_digests: Optional dict reused across slides so shared layouts
+            and masters are hashed once
+    """
+    if part_digests is None:
+        part_digests = {}
+    layout = slide.slide_layout
+    digest = hashlib.sha256(
+        f"{INVENTORY_CACHE_VERSION}:{font_directory_digest()}".encode("utf-8")
+    )
+    digest.update(slide.part.blob)
+    for part in (layout.part, layout.slide_master.part):
+        name = str(part.partname)
+        if name not in part_digests:
+            part_digests[name] = hashlib.sha256(part.blob).hexdigest()
+        digest.update(f":{name}:{part_digests[name]}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _read_cached_overflow(cache_dir: Path, key: str) -> Optional[List[Optional[float]]]:
+    """Cached frame_overflow_bottom values for a slide, or None on a miss."""
+    path = cache_dir / f"{key}.json"
+    try:
+        with open(path, encoding="utf-8") as f:
+            overflow = json.load(f)
+    except (OSError, ValueError):
+        return None
+    mark_cache_used(path)
+    return overflow
+
+
+def _write_cached_overflow(
+    cache_dir: Path, key: str, overflow: List[Optional[float]]
+) -> None:
+    """Store a slide's frame_overflow_bottom values (best effort, atomic)."""
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(overflow, f)
+        os.replace(tmp_name, cache_dir / f"{key}.json")
+    except OSError:
+        pass
+
+
+def mark_cache_used(path: Path) -> None:
+    """Refresh a cache entry's mtime, which prune_cache uses as its last use."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def prune_cache(
+    directory: Path, pattern: str, max_bytes: int, grace: float = CACHE_PRUNE_GRACE
+) -> None:
+    """Delete least recently used files matching pattern until they fit in max_bytes.
+
+    Files used in the last `grace` seconds are kept even over the limit,
+    since a run in progress (this one or a concurrent one) may still read
+    them. Temporary files left behind by interrupted writes are removed
+    once they are older than `grace`.
+    """
+    directory = Path(directory)
+    now = time.time()
+    entries = []
+    total = 0
+    try:
+        paths = list(directory.glob(pattern))
+        stale_temps = list(directory.glob("*.tmp"))
+    except OSError:
+        return
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    entries.sort()
+    for mtime, size, path in entries:
+        if total <= max_bytes or now - mtime < grace:
+            break
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError:
+            continue
+        total -= size
+
+    for path in stale_temps:
+        try:
+            if now - path.stat().st_mtime >= grace:
+                path.unlink()
+        except OSError:
+            pass
+
+
+def collect_slide_shapes(slide: Any) -> List[ShapeWithPosition]:
+    """Collect all valid text shapes of a slide with absolute positions."""
+    shapes_with_positions = []
+    for shape in slide.shapes:  # type: ignore
+        shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
+    return shapes_with_positions
+
+
+def _slide_overflow(slide: Any) -> List[Optional[float]]:
+    """frame_overflow_bottom of each collected shape, in collection order."""
+    return [
+        ShapeData(swp.shape, swp.absolute_left, swp.absolute_top, slide).frame_overflow_bottom
+        for swp in collect_slide_shapes(slide)
+    ]
+
+
+# Presentation opened by each inventory worker process, and its part digests
+_worker_presentation = None
+_worker_part_digests: Dict[str, str] = {}
+
+
+def _init_inventory_worker(pptx_path: str) -> None:
+    global _worker_presentation
+    _worker_presentation = Presentation(pptx_path)
+
+
+def _measure_slide_in_worker(task: Tuple[int, str]) -> Optional[List[Optional[float]]]:
+    slide_idx, key = task
+    slide = _worker_presentation.slides[slide_idx]  # type: ignore
+    # The caller's Presentation may differ from the file on disk
+    if slide_cache_key(slide, _worker_part_digests) != key:
+        return None
+    return _slide_overflow(slide)
+
+
+def _measure_slides_in_pool(
+    pptx_path: Path, tasks: List[Tuple[int, str]], workers: Optional[int]
+) -> Dict[int, List[Optional[float]]]:
+    """Measure slides (index, cache key) in worker processes that open pptx_path.
+
+    Returns overflow values by slide index; slides whose XML on disk no
+    longer matches their key are left out for the caller to measure.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers < 2 or len(tasks) < MIN_PARALLEL_SLIDES or not Path(pptx_path).is_file():
+        return {}
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_inventory_worker,
+            initargs=(str(pptx_path),),
+        ) as pool:
+            results = pool.map(
+                _measure_slide_in_worker,
+                tasks,
+                chunksize=max(1, len(tasks) // (workers * 4)),
+            )
+            return {
+                slide_idx: overflow
+                for (slide_idx, _), overflow in zip(tasks, results)
+                if overflow is not None
+            }
+    except (OSError, BrokenProcessPool):
+        return {}
+
+
 def is_valid_shape(shape: BaseShape) -> bool:
     """Check if a shape contains meaningful text content."""
     # Must have a text frame with content
@@ -849,7 +1129,7 @@ def sort_shapes_by_position(shapes: List[ShapeData]) -> List[ShapeData]:
 def calculate_overlap(
     rect1: Tuple[float, float, float, float],
     rect2: Tuple[float, float, float, float],
-    tolerance: float = 0.05,
+    tolerance: float = OVERLAP_TOLERANCE,
 ) -> Tuple[bool, float]:
     """Calculate if and how much two rectangles overlap.
 
@@ -885,34 +1165,47 @@ def detect_overlaps(shapes: List[ShapeData]) -> None:
     This function requires each ShapeData to have its shape_id already set.
     It modifies the shapes in-place, adding shape IDs with overlap areas in square inches.
 
+    Candidate pairs come from a sweep over left edges: a shape stays active
+    only while its right edge extends more than OVERLAP_TOLERANCE past the
+    current left edge, so shapes that cannot overlap horizontally are never
+    compared. Results (including dictionary order) match comparing every pair.
+
     Args:
         shapes: List of ShapeData objects with shape_id attributes set
     """
-    n = len(shapes)
-
-    # Compare each pair of shapes
-    for i in range(n):
-        for j in range(i + 1, n):
-            shape1 = shapes[i]
-            shape2 = shapes[j]
-
-            # Ensure shape IDs are set
-            assert shape1.shape_id, f"Shape at index {i} has no shape_id"
-            assert shape2.shape_id, f"Shape at index {j} has no shape_id"
-
-            rect1 = (shape1.left, shape1.top, shape1.width, shape1.height)
-            rect2 = (shape2.left, shape2.top, shape2.width, shape2.height)
-
-            overlaps, overlap_area = calculate_overlap(rect1, rect2)
-
+    for index, shape in enumerate(shapes):
+        assert shape.shape_id, f"Shape at index {index} has no shape_id"
+
+    rects = [(shape.left, shape.top, shape.width, shape.height) for shape in shapes]
+    pairs = []
+    active: List[int] = []
+
+    for j in sorted(range(len(shapes)), key=lambda index: rects[index][0]):
+        left = rects[j][0]
+        active = [i for i in active if rects[i][0] + rects[i][2] - left > OVERLAP_TOLERANCE]
+        for i in active:
+            first, second = min(i, j), max(i, j)
+            overlaps, overlap_area = calculate_overlap(rects[first], rects[second])
             if overlaps:
-                # Add shape IDs with overlap area in square inches
-                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
-                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+                pairs.append((first, second, overlap_area))
+        active.append(j)
+
+    # Record pairs in index order, as a pairwise scan would
+    for first, second, overlap_area in sorted(pairs):
+        shape1 = shapes[first]
+        shape2 = shapes[second]
+        # Add shape IDs with overlap area in square inches
+        shape1.overlapping_shapes[shape2.shape_id] = overlap_area
+        shape2.overlapping_shapes[shape1.shape_id] = overlap_area
 
 
 def extract_text_inventory(
-    pptx_path: Path, prs: Optional[Any] = None, issues_only: bool = False
+    pptx_path: Path,
+    prs: Optional[Any] = None,
+    issues_only: bool = False,
+    cache: bool = True,
+    cache_dir: Optional[Path] = None,
+    workers: Optional[int] = None,
 ) -> InventoryData:
     """Extract text content from all slides in a PowerPoint presentation.
 
@@ -920,6 +1213,9 @@ def extract_text_inventory(
         pptx_path: Path to the PowerPoint file
         prs: Optional Presentation object to use. If not provided, will load from pptx_path.
         issues_only: If True, only include shapes that have overflow or overlap issues
+        cache: If True, reuses overflow estimates of unchanged slides (default: True)
+        cache_dir: Cache location (default: DEFAULT_CACHE_DIR)
+        workers: Processes for measuring uncached slides (default: CPU count)
 
     Returns a nested dictionary: {slide-N: {shape-N: ShapeData}}
     Shapes are sorted by visual position (top-to-bottom, left-to-right).
@@ -928,16 +1224,34 @@ def extract_text_inventory(
     """
     if prs is None:
         prs = Presentation(str(pptx_path))
+    cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
     inventory: InventoryData = {}
 
+    # Key slides by their XML before anything inspects (and touches) it, then
+    # collect all valid shapes from each slide with absolute positions
+    slides = []
+    part_digests: Dict[str, str] = {}
     for slide_idx, slide in enumerate(prs.slides):
-        # Collect all valid shapes from this slide with absolute positions
-        shapes_with_positions = []
-        for shape in slide.shapes:  # type: ignore
-            shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
-
-        if not shapes_with_positions:
-            continue
+        key = slide_cache_key(slide, part_digests)
+        shapes_with_positions = collect_slide_shapes(slide)
+        if shapes_with_positions:
+            slides.append((slide_idx, slide, shapes_with_positions, key))
+
+    overflow_by_slide: Dict[int, List[Optional[float]]] = {}
+    if cache:
+        for slide_idx, _, shapes_with_positions, key in slides:
+            overflow = _read_cached_overflow(cache_dir, key)
+            if overflow is not None and len(overflow) == len(shapes_with_positions):
+                overflow_by_slide[slide_idx] = overflow
+
+    # Measure uncached slides in parallel (workers re-open pptx_path)
+    misses = [(slide_idx, key) for slide_idx, _, _, key in slides if slide_idx not in overflow_by_slide]
+    measured = _measure_slides_in_pool(pptx_path, misses, workers)
+    overflow_by_slide.update(measured)
+
+    cache_written = False
+    for slide_idx, slide, shapes_with_positions, key in slides:
+        overflow = overflow_by_slide.get(slide_idx)
 
         # Convert to ShapeData with absolute positions and slide reference
         shape_data_list = [
@@ -946,9 +1260,21 @@ def extract_text_inventory(
                 swp.absolute_left,
                 swp.absolute_top,
                 slide,
+                estimate_overflow=overflow is None,
             )
             for swp in shapes_with_positions
         ]
+        if overflow is None:
+            overflow = [shape_data.frame_overflow_bottom for shape_data in shape_data_list]
+            if cache:
+                _write_cached_overflow(cache_dir, key, overflow)
+                cache_written = True
+        else:
+            for shape_data, frame_overflow_bottom in zip(shape_data_list, overflow):
+                shape_data.frame_overflow_bottom = frame_overflow_bottom
+            if cache and slide_idx in measured:
+                _write_cached_overflow(cache_dir, key, overflow)
+                cache_written = True
 
         # Sort by visual position and assign stable IDs in one step
         sorted_shapes = sort_shapes_by_position(shape_data_list)
@@ -971,6 +1297,10 @@ def extract_text_inventory(
             shape_data.shape_id: shape_data for shape_data in sorted_shapes
         }
 
+    # Entries are only added when slides were measured; warm runs skip the scan
+    if cache_written:
+        prune_cache(cache_dir, "*.json", INVENTORY_CACHE_MAX_BYTES)
+
     return inventory
 
 
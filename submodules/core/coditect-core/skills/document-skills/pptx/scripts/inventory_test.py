@@ -0,0 +1,351 @@
+import os
+import random
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from PIL import ImageFont
+from pptx import Presentation
+
+import inventory
+from inventory import (
+    OVERLAP_TOLERANCE,
+    ShapeData,
+    calculate_overlap,
+    detect_overlaps,
+    extract_text_inventory,
+    slide_cache_key,
+)
+
+
+def make_shapes(rects):
+    return [
+        SimpleNamespace(
+            shape_id=f"shape-{index}",
+            left=left,
+            top=top,
+            width=width,
+            height=height,
+            overlapping_shapes={},
+        )
+        for index, (left, top, width, height) in enumerate(rects)
+    ]
+
+
+def pairwise_overlaps(shapes):
+    """Reference: compare every pair of shapes in index order."""
+    for i in range(len(shapes)):
+        for j in range(i + 1, len(shapes)):
+            shape1, shape2 = shapes[i], shapes[j]
+            overlaps, overlap_area = calculate_overlap(
+                (shape1.left, shape1.top, shape1.width, shape1.height),
+                (shape2.left, shape2.top, shape2.width, shape2.height),
+            )
+            if overlaps:
+                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
+                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestDetectOverlaps(unittest.TestCase):
+
+    def assert_matches_pairwise(self, rects):
+        swept = make_shapes(rects)
+        reference = make_shapes(rects)
+        detect_overlaps(swept)
+        pairwise_overlaps(reference)
+        # Compare as item lists so dictionary order must match too
+        self.assertEqual(
+            [list(shape.overlapping_shapes.items()) for shape in swept],
+            [list(shape.overlapping_shapes.items()) for shape in reference],
+        )
+        return swept
+
+    def test_random_layouts_match_pairwise_scan(self):
+        rnd = random.Random(42)
+        for _ in range(300):
+            # Coordinates on a OVERLAP_TOLERANCE grid hit exact-tolerance edges;
+            # zero widths and heights are included
+            step = rnd.choice([OVERLAP_TOLERANCE, 0.01, 0.25])
+            rects = [
+                (
+                    rnd.randrange(40) * step,
+                    rnd.randrange(40) * step,
+                    rnd.randrange(0, 12) * step,
+                    rnd.randrange(0, 12) * step,
+                )
+                for _ in range(rnd.randrange(0, 40))
+            ]
+            self.assert_matches_pairwise(rects)
+
+    def test_random_floats_match_pairwise_scan(self):
+        rnd = random.Random(7)
+        for _ in range(200):
+            rects = [
+                (rnd.uniform(0, 10), rnd.uniform(0, 7.5), rnd.uniform(0, 4), rnd.uniform(0, 2))
+                for _ in range(rnd.randrange(0, 40))
+            ]
+            self.assert_matches_pairwise(rects)
+
+    def test_exact_tolerance_is_not_an_overlap(self):
+        shapes = self.assert_matches_pairwise(
+            [
+                (0.0, 0.0, 1.0, 1.0),
+                (0.0, 0.0, OVERLAP_TOLERANCE, 1.0),  # overlaps shape 0 by exactly the tolerance
+                (0.25, 0.0, 1.0, OVERLAP_TOLERANCE),
+                (0.5, 0.5, 0.0, 1.0),  # zero width
+                (0.5, 0.5, 1.0, 1.0),
+            ]
+        )
+        self.assertEqual(
+            [shape.overlapping_shapes for shape in shapes],
+            [{"shape-4": 0.25}, {}, {}, {}, {"shape-0": 0.25}],
+        )
+
+    def test_identical_and_nested_shapes(self):
+        shapes = self.assert_matches_pairwise(
+            [(1.0, 1.0, 2.0, 2.0), (1.0, 1.0, 2.0, 2.0), (1.5, 1.5, 0.5, 0.5)]
+        )
+        self.assertEqual(shapes[0].overlapping_shapes, {"shape-1": 4.0, "shape-2": 0.25})
+        self.assertEqual(shapes[2].overlapping_shapes, {"shape-0": 0.25, "shape-1": 0.25})
+
+
+LONG_TEXT = " ".join(["An overflowing paragraph of body text."] * 200)
+
+
+def build_deck(path, slide_count=10):
+    prs = Presentation()
+    for slide_num in range(slide_count):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {slide_num}"
+        slide.placeholders[1].text = LONG_TEXT if slide_num % 3 == 0 else "Short body"
+    prs.save(str(path))
+
+
+def as_dicts(inventory_data):
+    return {
+        slide_key: {shape_key: shape.to_dict() for shape_key, shape in shapes.items()}
+        for slide_key, shapes in inventory_data.items()
+    }
+
+
+def edit_slide(prs, slide_idx):
+    """Change a slide in memory only, so it differs from the file on disk."""
+    prs.slides[slide_idx].placeholders[1].text = LONG_TEXT
+
+
+class TestInventoryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.deck = Path(self.temp_dir.name) / "deck.pptx"
+        self.cache_dir = Path(self.temp_dir.name) / "cache"
+        build_deck(self.deck)
+
+    def inventory(self, prs=None, **kwargs):
+        return as_dicts(extract_text_inventory(self.deck, prs, **kwargs))
+
+    def test_warm_run_matches_cold_run(self):
+        uncached = self.inventory(cache=False, workers=1)
+        self.assertTrue(
+            any(
+                shape.get("overflow")
+                for shapes in uncached.values()
+                for shape in shapes.values()
+            )
+        )
+
+        cold = self.inventory(cache_dir=self.cache_dir, workers=1)
+        self.assertEqual(len(list(self.cache_dir.glob("*.json"))), 10)
+
+        # A warm run must not measure any text frame
+        with mock.patch.object(
+            ShapeData, "_estimate_frame_overflow", side_effect=AssertionError("measured")
+        ):
+            warm = self.inventory(cache_dir=self.cache_dir, workers=1)
+
+        self.assertEqual(cold, uncached)
+        self.assertEqual(warm, uncached)
+
+    def test_in_memory_edit_misses_the_cache(self):
+        on_disk = self.inventory(cache_dir=self.cache_dir, workers=1)
+
+        prs = Presentation(str(self.deck))
+        edit_slide(prs, 1)
+        cached = self.inventory(prs, cache_dir=self.cache_dir, workers=1)
+
+        reference_prs = Presentation(str(self.deck))
+        edit_slide(reference_prs, 1)
+        reference = self.inventory(reference_prs, cache=False, workers=1)
+
+        self.assertEqual(cached, reference)
+        self.assertNotEqual(cached["slide-1"], on_disk["slide-1"])
+        self.assertEqual(len(list(self.cache_dir.glob("*.json"))), 11)
+
+    def test_cache_is_pruned_least_recently_used_first(self):
+        self.inventory(cache_dir=self.cache_dir, workers=1)
+        old = time.time() - 2 * inventory.CACHE_PRUNE_GRACE
+        junk = self.cache_dir / ("0" * 64 + ".json")
+        junk.write_text("[null]", encoding="utf-8")
+        for path in self.cache_dir.glob("*.json"):
+            os.utime(path, (old, old))
+        entries = set(self.cache_dir.glob("*.json"))
+
+        with mock.patch.object(inventory, "INVENTORY_CACHE_MAX_BYTES", 0):
+            # Nothing new to store: the cache is not scanned
+            self.inventory(cache_dir=self.cache_dir, workers=1)
+            self.assertEqual(set(self.cache_dir.glob("*.json")), entries)
+
+            for path in entries:
+                os.utime(path, (old, old))
+            prs = Presentation(str(self.deck))
+            edit_slide(prs, 1)
+            self.inventory(prs, cache_dir=self.cache_dir, workers=1)
+
+        # Entries read or written by this run are kept; the rest were over the limit
+        remaining = set(self.cache_dir.glob("*.json"))
+        self.assertEqual(len(remaining), 10)
+        self.assertNotIn(junk, remaining)
+        self.assertEqual(len(remaining & entries), 9)
+
+    def test_workers_measure_the_in_memory_presentation(self):
+        """Slides edited in memory are measured by the caller, not from the file."""
+        prs = Presentation(str(self.deck))
+        edit_slide(prs, 1)
+        pooled = self.inventory(prs, cache=False, workers=2)
+
+        reference_prs = Presentation(str(self.deck))
+        edit_slide(reference_prs, 1)
+        reference = self.inventory(reference_prs, cache=False, workers=1)
+
+        self.assertEqual(pooled, reference)
+
+    def test_worker_rejects_key_mismatch(self):
+        edited = Presentation(str(self.deck))
+        edit_slide(edited, 1)
+        unchanged = Presentation(str(self.deck))
+
+        with mock.patch.object(inventory, "_worker_presentation", None), \
+                mock.patch.object(inventory, "_worker_part_digests", {}):
+            inventory._init_inventory_worker(str(self.deck))
+            self.assertIsNone(
+                inventory._measure_slide_in_worker((1, slide_cache_key(edited.slides[1])))
+            )
+            self.assertEqual(
+                inventory._measure_slide_in_worker((1, slide_cache_key(unchanged.slides[1]))),
+                inventory._slide_overflow(unchanged.slides[1]),
+            )
+
+
+class TestFontResolution(unittest.TestCase):
+    """Fonts are looked up in fake font directories under a temporary HOME."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        home = Path(self.temp_dir.name)
+        self.linux_dir = home / ".fonts"
+        self.mac_dir = home / "Library" / "Fonts"
+        self.linux_dir.mkdir()
+        self.mac_dir.mkdir(parents=True)
+
+        patcher = mock.patch.dict(os.environ, {"HOME": str(home)})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.clear_caches()
+        self.addCleanup(self.clear_caches)
+
+    def clear_caches(self):
+        inventory._font_directory_index.cache_clear()
+        inventory._resolve_font_path.cache_clear()
+        inventory._load_font.cache_clear()
+
+    def add_fonts(self, font_dir, *names):
+        for name in names:
+            (font_dir / name).write_bytes(b"not a real font")
+
+    def resolve(self, font_name, system="Linux"):
+        self.clear_caches()
+        with mock.patch.object(inventory.platform, "system", return_value=system):
+            return ShapeData.get_font_path(font_name)
+
+    def test_exact_name_variations(self):
+        self.add_fonts(self.linux_dir, "Zorblax Sans.ttf", "zorblaxmono.ttf", "Zorblax-Serif.otf")
+        self.assertEqual(self.resolve("Zorblax Sans"), str(self.linux_dir / "Zorblax Sans.ttf"))
+        self.assertEqual(self.resolve("ZorblaxMono"), str(self.linux_dir / "zorblaxmono.ttf"))
+        self.assertEqual(self.resolve("Zorblax Serif"), str(self.linux_dir / "Zorblax-Serif.otf"))
+
+    def test_case_insensitive_names_on_macos(self):
+        self.add_fonts(self.mac_dir, "ZorblaxSans.TTF")
+        # The file system matches names case-insensitively, so the name built
+        # from the font name is returned as is
+        path = self.resolve("ZORBLAXSANS", system="Darwin")
+        self.assertEqual(path, str(self.mac_dir / "ZORBLAXSANS.ttf"))
+        self.assertEqual(self.resolve("zorblax sans", system="Darwin"), str(self.mac_dir / "zorblaxsans.ttf"))
+
+    def test_case_insensitive_names_on_linux(self):
+        self.add_fonts(self.linux_dir, "ZorblaxSans.ttf")
+        # No exact variation matches; the fuzzy pass ignores case and spaces
+        # and returns the file as it is named on disk
+        self.assertEqual(self.resolve("zorblax sans"), str(self.linux_dir / "ZorblaxSans.ttf"))
+        self.assertEqual(self.resolve("ZORBLAXSANS"), str(self.linux_dir / "ZorblaxSans.ttf"))
+
+    def test_bold_italic_suffix_fallback(self):
+        # A family installed only in styled cuts resolves to one of them
+        self.add_fonts(self.linux_dir, "Zorblax-Bold.ttf", "Zorblax-Italic.ttf", "Zorblax-Bold.woff2")
+        self.assertIn(
+            self.resolve("Zorblax"),
+            {str(self.linux_dir / "Zorblax-Bold.ttf"), str(self.linux_dir / "Zorblax-Italic.ttf")},
+        )
+        self.add_fonts(self.linux_dir, "ZorblaxSans-BoldItalic.otf")
+        self.assertEqual(
+            self.resolve("Zorblax Sans"), str(self.linux_dir / "ZorblaxSans-BoldItalic.otf")
+        )
+
+    def test_regular_file_wins_over_styled_cuts(self):
+        self.add_fonts(self.linux_dir, "Zorblax-Bold.ttf", "Zorblax-Italic.ttf", "Zorblax.ttf")
+        self.assertEqual(self.resolve("Zorblax"), str(self.linux_dir / "Zorblax.ttf"))
+
+    def test_missing_font(self):
+        self.add_fonts(self.linux_dir, "Zorblax.ttf", "Quuxfont.woff")
+        self.assertIsNone(self.resolve("Quuxfont"))
+        self.assertIsNone(self.resolve("No Such Font Zorblax2"))
+
+    def test_index_is_built_once_until_cleared(self):
+        with mock.patch.object(inventory.platform, "system", return_value="Linux"):
+            self.assertIsNone(ShapeData.get_font_path("Zorblax"))
+            # Installed after the directories were listed: not seen until the caches are cleared
+            self.add_fonts(self.linux_dir, "Zorblax.ttf")
+            self.assertIsNone(ShapeData.get_font_path("Zorblax"))
+            self.assertIsNone(ShapeData.get_font_path("Zorblax Sans"))
+            self.assertEqual(inventory._font_directory_index.cache_info().misses, 1)
+        self.assertEqual(self.resolve("Zorblax"), str(self.linux_dir / "Zorblax.ttf"))
+
+    def test_missing_or_unreadable_font_loads_default(self):
+        self.add_fonts(self.linux_dir, "Zorblax.ttf")
+        default_width = inventory._MEASURE_DRAW.textlength(
+            "Hello world", font=ImageFont.load_default()
+        )
+        for font_path in (None, str(self.linux_dir / "Zorblax.ttf"), str(self.linux_dir / "Missing.ttf")):
+            font = inventory._load_font(font_path, 12)
+            self.assertIs(inventory._load_font(font_path, 12), font)
+            self.assertEqual(inventory._text_length(font_path, 12, "Hello world"), default_width)
+
+
+    def test_truetype_font_is_loaded_at_size(self):
+        font_files = sorted(Path("/usr/share/fonts/truetype").glob("*/*.ttf"))
+        if not font_files:
+            self.skipTest("no TrueType fonts installed")
+        font_path = str(font_files[0])
+        font = inventory._load_font(font_path, 24)
+        self.assertIsInstance(font, ImageFont.FreeTypeFont)
+        self.assertEqual((font.path, font.size), (font_path, 24))
+        self.assertEqual(inventory._load_font(font_path, 12).size, 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -18,8 +18,18 @@ Grid limits by column count:
 - 5 cols: max 30 slides per grid (5×6) [default]
 - 6 cols: max 42 slides per grid (6×7)
 
+Rendered slides and grid tiles are cached by content hash (see
+DEFAULT_CACHE_DIR), so re-running after an edit only renders the slides that
+changed and only redraws their tiles. The least recently used entries are
+deleted once the cache exceeds CACHE_MAX_BYTES / TILE_CACHE_MAX_BYTES.
+
+Several decks can be given at once. Their changed slides are converted in
+one batch on the shared office workers (ooxml/scripts/office.py), so a deck
+library pays office startup once per run instead of once per deck. Each
+deck's grids are named {prefix}-{deck name}.jpg (or {prefix}-{deck name}-N.jpg).
+
 Usage:
-    python thumbnail.py input.pptx [output_prefix] [--cols N] [--outline-placeholders]
+    python thumbnail.py input.pptx [more.pptx ...] [output_prefix] [--cols N] [--outline-placeholders] [--no-cache]
 
 Examples:
     python thumbnail.py presentation.pptx
@@ -38,17 +48,37 @@ Examples:
 
     python thumbnail.py template.pptx analysis --outline-placeholders
     # Creates thumbnail grids with red outlines around text placeholders
+
+    python thumbnail.py decks/*.pptx library/grid
+    # Creates: library/grid-intro.jpg, library/grid-roadmap-1.jpg, ...
 """
 
 import argparse
+import hashlib
+import json
+import os
+import shutil
 import subprocess
 import sys
 import tempfile
 from pathlib import Path
 
-from inventory import extract_text_inventory
+from inventory import (
+    CACHE_PRUNE_GRACE,
+    extract_text_inventory,
+    font_directory_digest,
+    mark_cache_used,
+    prune_cache,
+)
+from lxml import etree
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+# The office service lives in the skill's ooxml/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from ooxml.scripts.office import OfficeError, get_office_service  # noqa: E402
 
 # Constants
 THUMBNAIL_WIDTH = 300  # Fixed thumbnail width in pixels
@@ -63,17 +93,31 @@ BORDER_WIDTH = 2  # Border width around thumbnails
 FONT_SIZE_RATIO = 0.12  # Font size as fraction of thumbnail width
 LABEL_PADDING_RATIO = 0.4  # Label padding as fraction of font size
 
+# Slide render and tile cache; bump the version when rendering or tiles change
+THUMBNAIL_CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "pptx-thumbnails"
+)
+CACHE_MAX_BYTES = 256 * 1024 * 1024  # Rendered slide images
+TILE_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Grid tiles (DEFAULT_CACHE_DIR/tiles)
+
+# Relationships that do not affect how a slide renders (notes, links to
+# other slides, a master's other layouts)
+_RENDER_IGNORED_RELS = {RT.NOTES_SLIDE, RT.SLIDE}
+
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Create thumbnail grids from PowerPoint slides."
+        description="Create thumbnail grids from PowerPoint slides.",
+        usage="%(prog)s input.pptx [more.pptx ...] [output_prefix] [options]",
     )
-    parser.add_argument("input", help="Input PowerPoint file (.pptx)")
     parser.add_argument(
-        "output_prefix",
-        nargs="?",
-        default="thumbnails",
-        help="Output prefix for image files (default: thumbnails, will create prefix.jpg or prefix-N.jpg)",
+        "inputs",
+        nargs="+",
+        metavar="input",
+        help="Input PowerPoint file(s) (.pptx), optionally followed by an output "
+        "prefix for image files (default: thumbnails, will create prefix.jpg or "
+        "prefix-N.jpg; prefix-<deck name>.jpg for several decks)",
     )
     parser.add_argument(
         "--cols",
@@ -86,6 +130,11 @@ def main():
         action="store_true",
         help="Outline text placeholders with a colored border",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Render every slide instead of reusing cached images in {DEFAULT_CACHE_DIR}",
+    )
 
     args = parser.parse_args()
 
@@ -94,52 +143,71 @@ def main():
     if args.cols > MAX_COLS:
         print(f"Warning: Columns limited to {MAX_COLS} (requested {args.cols})")
 
-    # Validate input
-    input_path = Path(args.input)
-    if not input_path.exists() or input_path.suffix.lower() != ".pptx":
-        print(f"Error: Invalid PowerPoint file: {args.input}")
-        sys.exit(1)
-
-    # Construct output path (always JPG)
-    output_path = Path(f"{args.output_prefix}.jpg")
+    # Split off the output prefix
+    inputs = list(args.inputs)
+    output_prefix = "thumbnails"
+    if len(inputs) > 1 and not inputs[-1].lower().endswith(".pptx"):
+        output_prefix = inputs.pop()
 
-    print(f"Processing: {args.input}")
+    # Validate input
+    input_paths = [Path(name) for name in inputs]
+    for input_path in input_paths:
+        if not input_path.exists() or input_path.suffix.lower() != ".pptx":
+            print(f"Error: Invalid PowerPoint file: {input_path}")
+            sys.exit(1)
+
+    # Construct output paths (always JPG)
+    if len(input_paths) == 1:
+        output_paths = [Path(f"{output_prefix}.jpg")]
+    else:
+        output_paths = [Path(f"{output_prefix}-{path.stem}.jpg") for path in input_paths]
+        if len(set(output_paths)) != len(output_paths):
+            print("Error: Several decks have the same name; thumbnail them in separate runs")
+            sys.exit(1)
 
     try:
         with tempfile.TemporaryDirectory() as temp_dir:
-            # Get placeholder regions if outlining is enabled
-            placeholder_regions = None
-            slide_dimensions = None
-            if args.outline_placeholders:
-                print("Extracting placeholder regions...")
-                placeholder_regions, slide_dimensions = get_placeholder_regions(
-                    input_path
-                )
-                if placeholder_regions:
-                    print(f"Found placeholders on {len(placeholder_regions)} slides")
-
-            # Convert slides to images
-            slide_images = convert_to_images(input_path, Path(temp_dir), CONVERSION_DPI)
-            if not slide_images:
-                print("Error: No slides found")
-                sys.exit(1)
-
-            print(f"Found {len(slide_images)} slides")
-
-            # Create grids (max cols×(cols+1) images per grid)
-            grid_files = create_grids(
-                slide_images,
-                cols,
-                THUMBNAIL_WIDTH,
-                output_path,
-                placeholder_regions,
-                slide_dimensions,
+            # Convert slides to images, all decks in one batch
+            deck_images = convert_decks_to_images(
+                input_paths, Path(temp_dir), CONVERSION_DPI, cache=not args.no_cache
             )
 
-            # Print saved files
-            print(f"Created {len(grid_files)} grid(s):")
-            for grid_file in grid_files:
-                print(f"  - {grid_file}")
+            for input_path, output_path, slide_images in zip(
+                input_paths, output_paths, deck_images
+            ):
+                print(f"Processing: {input_path}")
+                if not slide_images:
+                    print("Error: No slides found")
+                    sys.exit(1)
+
+                print(f"Found {len(slide_images)} slides")
+
+                # Get placeholder regions if outlining is enabled
+                placeholder_regions = None
+                slide_dimensions = None
+                if args.outline_placeholders:
+                    print("Extracting placeholder regions...")
+                    placeholder_regions, slide_dimensions = get_placeholder_regions(
+                        input_path
+                    )
+                    if placeholder_regions:
+                        print(f"Found placeholders on {len(placeholder_regions)} slides")
+
+                # Create grids (max cols×(cols+1) images per grid)
+                grid_files = create_grids(
+                    slide_images,
+                    cols,
+                    THUMBNAIL_WIDTH,
+                    output_path,
+                    placeholder_regions,
+                    slide_dimensions,
+                    cache=not args.no_cache,
+                )
+
+                # Print saved files
+                print(f"Created {len(grid_files)} grid(s):")
+                for grid_file in grid_files:
+                    print(f"  - {grid_file}")
 
     except Exception as e:
         print(f"Error: {e}")
@@ -194,46 +262,120 @@ def get_placeholder_regions(pptx_path):
     return placeholder_regions, (slide_width_inches, slide_height_inches)
 
 
-def convert_to_images(pptx_path, temp_dir, dpi):
-    """Convert PowerPoint to images via PDF, handling hidden slides."""
-    # Detect hidden slides
-    print("Analyzing presentation...")
-    prs = Presentation(str(pptx_path))
-    total_slides = len(prs.slides)
+def slide_render_keys(prs, dpi):
+    """Hash of everything each slide's rendered image depends on.
 
-    # Find hidden slides (1-based indexing for display)
-    hidden_slides = {
-        idx + 1
-        for idx, slide in enumerate(prs.slides)
-        if slide.element.get("show") == "0"
-    }
+    Covers the slide XML and every part it draws from (layout, master,
+    theme, media, charts), the slide size and default text style, the
+    installed fonts, the DPI and THUMBNAIL_CACHE_VERSION. Slides with a
+    slide number field are also keyed by their position.
+    """
+    presentation = prs.element
+    default_style = presentation.find(
+        "{http://schemas.openxmlformats.org/presentationml/2006/main}defaultTextStyle"
+    )
+    deck_digest = hashlib.sha256(
+        f"{THUMBNAIL_CACHE_VERSION}:{dpi}:{prs.slide_width}x{prs.slide_height}:"
+        f"{font_directory_digest()}:".encode("utf-8")
+    )
+    if default_style is not None:
+        deck_digest.update(etree.tostring(default_style))
+    deck_digest = deck_digest.hexdigest()
+
+    part_digests = {}
+    keys = []
+    for slide_num, slide in enumerate(prs.slides, start=1):
+        digest = hashlib.sha256(deck_digest.encode("utf-8"))
+        for name in sorted(_render_part_names(slide.part, part_digests)):
+            digest.update(f":{name}:{part_digests[name]}".encode("utf-8"))
+        if b'type="slidenum"' in slide.part.blob:
+            digest.update(f":slide-{slide_num}".encode("utf-8"))
+        keys.append(digest.hexdigest())
+    return keys
+
+
+def _render_part_names(slide_part, part_digests):
+    """Names of the parts a slide renders from, hashing each one into part_digests once."""
+    names = set()
+    pending = [slide_part]
+    while pending:
+        part = pending.pop()
+        name = str(part.partname)
+        if name in names:
+            continue
+        names.add(name)
+        if name not in part_digests:
+            part_digests[name] = hashlib.sha256(part.blob).hexdigest()
+        for rel in part.rels.values():
+            if rel.is_external or rel.reltype in _RENDER_IGNORED_RELS:
+                continue
+            if rel.reltype == RT.SLIDE_LAYOUT and part.content_type == CT.PML_SLIDE_MASTER:
+                continue
+            pending.append(rel.target_part)
+    return names
+
+
+def render_slides(pptx_path, slide_nums, temp_dir, dpi):
+    """Render the given visible slides (1-based) to JPEGs via PDF.
+
+    Returns a dict of slide number -> image path.
+    """
+    return render_decks([(pptx_path, slide_nums, temp_dir)], dpi)[0]
 
-    print(f"Total slides: {total_slides}")
-    if hidden_slides:
-        print(f"Hidden slides: {sorted(hidden_slides)}")
 
-    pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
+def render_decks(jobs, dpi):
+    """Render slides of several decks, converting all of them in one office batch.
+
+    jobs are (pptx_path, slide_nums, temp_dir) triples, each with its own
+    temp_dir. Other slides are hidden in a copy of the deck so LibreOffice
+    only exports the requested ones, while slide numbering stays the same.
+    Returns a dict of slide number -> image path for each job.
+    """
+    render_paths = [
+        _render_copy(pptx_path, slide_nums, temp_dir, index)
+        for index, (pptx_path, slide_nums, temp_dir) in enumerate(jobs)
+    ]
 
-    # Convert to PDF
+    # Convert to PDF (shared office workers, one batch for every deck)
     print("Converting to PDF...")
-    result = subprocess.run(
-        [
-            "soffice",
-            "--headless",
-            "--convert-to",
-            "pdf",
-            "--outdir",
-            str(temp_dir),
-            str(pptx_path),
-        ],
-        capture_output=True,
-        text=True,
+    pdf_paths = get_office_service().convert_many(
+        [(render_path, temp_dir) for render_path, (_, _, temp_dir) in zip(render_paths, jobs)],
+        "pdf",
     )
-    if result.returncode != 0 or not pdf_path.exists():
-        raise RuntimeError("PDF conversion failed")
+    for (pptx_path, _, _), pdf_path in zip(jobs, pdf_paths):
+        if isinstance(pdf_path, OfficeError):
+            raise RuntimeError(f"PDF conversion of {pptx_path} failed: {pdf_path}") from pdf_path
 
     # Convert PDF to images
     print(f"Converting to images at {dpi} DPI...")
+    return [
+        _rasterize(pdf_path, slide_nums, temp_dir, dpi)
+        for pdf_path, (_, slide_nums, temp_dir) in zip(pdf_paths, jobs)
+    ]
+
+
+def _render_copy(pptx_path, slide_nums, temp_dir, index):
+    """The deck to convert: pptx_path, or a copy with all other slides hidden."""
+    prs = Presentation(str(pptx_path))
+    requested = set(slide_nums)
+    if not any(
+        slide.element.get("show") != "0"
+        for slide_num, slide in enumerate(prs.slides, start=1)
+        if slide_num not in requested
+    ):
+        return pptx_path
+
+    for slide_num, slide in enumerate(prs.slides, start=1):
+        if slide_num not in requested:
+            slide.element.set("show", "0")
+    # Distinct names let the office batch convert every copy in one run
+    render_path = temp_dir / f"render-{index}.pptx"
+    prs.save(str(render_path))
+    return render_path
+
+
+def _rasterize(pdf_path, slide_nums, temp_dir, dpi):
+    """Split a PDF of the given slides into JPEGs; returns slide number -> image path."""
     result = subprocess.run(
         ["pdftoppm", "-jpeg", "-r", str(dpi), str(pdf_path), str(temp_dir / "slide")],
         capture_output=True,
@@ -242,31 +384,136 @@ def convert_to_images(pptx_path, temp_dir, dpi):
     if result.returncode != 0:
         raise RuntimeError("Image conversion failed")
 
-    visible_images = sorted(temp_dir.glob("slide-*.jpg"))
+    images = sorted(temp_dir.glob("slide-*.jpg"))
+    if len(images) != len(slide_nums):
+        raise RuntimeError(
+            f"Image conversion failed: expected {len(slide_nums)} slides, got {len(images)}"
+        )
+    return dict(zip(sorted(slide_nums), images))
 
-    # Create full list with placeholders for hidden slides
-    all_images = []
-    visible_idx = 0
+
+def _store_in_cache(source, cache_path):
+    """Copy a file into the cache (atomic, best effort); returns the path to use."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f, open(source, "rb") as src:
+            shutil.copyfileobj(src, f)
+        os.replace(tmp_name, cache_path)
+        return cache_path
+    except OSError:
+        return source
+
+
+def convert_to_images(pptx_path, temp_dir, dpi, cache=True, cache_dir=None):
+    """Convert PowerPoint to images via PDF, handling hidden slides.
+
+    With cache enabled, slides whose render key is in cache_dir (default:
+    DEFAULT_CACHE_DIR) are reused and only the remaining slides are rendered.
+    """
+    return convert_decks_to_images([pptx_path], temp_dir, dpi, cache, cache_dir)[0]
+
+
+def convert_decks_to_images(pptx_paths, temp_dir, dpi, cache=True, cache_dir=None):
+    """Convert several decks to slide images, as convert_to_images does for one.
+
+    The slides that are not cached are rendered for all decks together (see
+    render_decks). Returns the list of slide images for each deck.
+    """
+    cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+    plans = []
+    for index, pptx_path in enumerate(pptx_paths):
+        deck_dir = Path(temp_dir) / f"deck-{index}"
+        deck_dir.mkdir(parents=True, exist_ok=True)
+        plans.append(_plan_images(pptx_path, deck_dir, dpi, cache, cache_dir))
+
+    stale_plans = [plan for plan in plans if plan["stale_slides"]]
+    if stale_plans:
+        rendered = render_decks(
+            [(plan["path"], plan["stale_slides"], plan["temp_dir"]) for plan in stale_plans], dpi
+        )
+        for plan, images in zip(stale_plans, rendered):
+            for slide_num, image_path in images.items():
+                if cache:
+                    image_path = _store_in_cache(
+                        image_path, cache_dir / f"{plan['keys'][slide_num - 1]}.jpg"
+                    )
+                plan["slide_images"][slide_num] = image_path
+    if cache:
+        prune_cache(cache_dir, "*.jpg", CACHE_MAX_BYTES)
+
+    return [_with_hidden_placeholders(plan) for plan in plans]
+
+
+def _plan_images(pptx_path, temp_dir, dpi, cache, cache_dir):
+    """Find a deck's hidden slides, its cached slide images and the slides to render."""
+    # Detect hidden slides
+    print("Analyzing presentation...")
+    prs = Presentation(str(pptx_path))
+    total_slides = len(prs.slides)
+
+    # Find hidden slides (1-based indexing for display)
+    hidden_slides = {
+        idx + 1
+        for idx, slide in enumerate(prs.slides)
+        if slide.element.get("show") == "0"
+    }
+
+    print(f"Total slides: {total_slides}")
+    if hidden_slides:
+        print(f"Hidden slides: {sorted(hidden_slides)}")
+
+    visible_slides = [n for n in range(1, total_slides + 1) if n not in hidden_slides]
+    slide_images = {}
+    keys = None
+    if cache:
+        keys = slide_render_keys(prs, dpi)
+        for slide_num in visible_slides:
+            cache_path = cache_dir / f"{keys[slide_num - 1]}.jpg"
+            if cache_path.is_file():
+                mark_cache_used(cache_path)
+                slide_images[slide_num] = cache_path
+
+    stale_slides = [n for n in visible_slides if n not in slide_images]
+    if stale_slides and slide_images:
+        print(f"Rendering {len(stale_slides)} changed slide(s), reusing {len(slide_images)}")
+    elif visible_slides and not stale_slides:
+        print("All slides unchanged, using cached images")
+
+    return {
+        "path": pptx_path,
+        "temp_dir": temp_dir,
+        "total_slides": total_slides,
+        "hidden_slides": hidden_slides,
+        "visible_slides": visible_slides,
+        "slide_images": slide_images,
+        "stale_slides": stale_slides,
+        "keys": keys,
+    }
+
+
+def _with_hidden_placeholders(plan):
+    """All slide images of a planned deck, with placeholders for hidden slides."""
+    slide_images = plan["slide_images"]
 
     # Get placeholder dimensions from first visible slide
-    if visible_images:
-        with Image.open(visible_images[0]) as img:
+    if plan["visible_slides"]:
+        with Image.open(slide_images[plan["visible_slides"][0]]) as img:
             placeholder_size = img.size
     else:
         placeholder_size = (1920, 1080)
 
-    for slide_num in range(1, total_slides + 1):
-        if slide_num in hidden_slides:
+    # Create full list with placeholders for hidden slides
+    all_images = []
+    for slide_num in range(1, plan["total_slides"] + 1):
+        if slide_num in plan["hidden_slides"]:
             # Create placeholder image for hidden slide
-            placeholder_path = temp_dir / f"hidden-{slide_num:03d}.jpg"
+            placeholder_path = plan["temp_dir"] / f"hidden-{slide_num:03d}.jpg"
             placeholder_img = create_hidden_slide_placeholder(placeholder_size)
             placeholder_img.save(placeholder_path, "JPEG")
             all_images.append(placeholder_path)
         else:
-            # Use the actual visible slide image
-            if visible_idx < len(visible_images):
-                all_images.append(visible_images[visible_idx])
-                visible_idx += 1
+            all_images.append(slide_images[slide_num])
 
     return all_images
 
@@ -278,11 +525,16 @@ def create_grids(
     output_path,
     placeholder_regions=None,
     slide_dimensions=None,
+    cache=True,
+    cache_dir=None,
 ):
     """Create multiple thumbnail grids from slide images, max cols×(cols+1) images per grid."""
     # Maximum images per grid is cols × (cols + 1) for better proportions
     max_images_per_grid = cols * (cols + 1)
     grid_files = []
+    tile_cache_dir = None
+    if cache:
+        tile_cache_dir = (Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR) / "tiles"
 
     print(
         f"Creating grids with {cols} columns (max {max_images_per_grid} images per grid)"
@@ -297,7 +549,13 @@ def create_grids(
 
         # Create grid for this chunk
         grid = create_grid(
-            chunk_images, cols, width, start_idx, placeholder_regions, slide_dimensions
+            chunk_images,
+            cols,
+            width,
+            start_idx,
+            placeholder_regions,
+            slide_dimensions,
+            tile_cache_dir,
         )
 
         # Generate output filename
@@ -315,6 +573,9 @@ def create_grids(
         grid.save(str(grid_filename), quality=JPEG_QUALITY)
         grid_files.append(str(grid_filename))
 
+    if tile_cache_dir is not None:
+        prune_cache(tile_cache_dir, "*.png", TILE_CACHE_MAX_BYTES)
+
     return grid_files
 
 
@@ -325,8 +586,14 @@ def create_grid(
     start_slide_num=0,
     placeholder_regions=None,
     slide_dimensions=None,
+    tile_cache_dir=None,
 ):
-    """Create thumbnail grid from slide images with optional placeholder outlining."""
+    """Create thumbnail grid from slide images with optional placeholder outlining.
+
+    All tiles are pasted onto one canvas allocated up front. With
+    tile_cache_dir, tiles of unchanged slides are loaded from the cache
+    instead of being outlined and downscaled again.
+    """
     font_size = int(width * FONT_SIZE_RATIO)
     label_padding = int(font_size * LABEL_PADDING_RATIO)
 
@@ -374,76 +641,121 @@ def create_grid(
         # Add thumbnail below label with proportional spacing
         y_thumbnail = y_base + label_padding + font_size + label_padding
 
-        with Image.open(img_path) as img:
-            # Get original dimensions before thumbnail
-            orig_w, orig_h = img.size
-
-            # Apply placeholder outlines if enabled
-            if placeholder_regions and (start_slide_num + i) in placeholder_regions:
-                # Convert to RGBA for transparency support
-                if img.mode != "RGBA":
-                    img = img.convert("RGBA")
-
-                # Get the regions for this slide
-                regions = placeholder_regions[start_slide_num + i]
-
-                # Calculate scale factors using actual slide dimensions
-                if slide_dimensions:
-                    slide_width_inches, slide_height_inches = slide_dimensions
-                else:
-                    # Fallback: estimate from image size at CONVERSION_DPI
-                    slide_width_inches = orig_w / CONVERSION_DPI
-                    slide_height_inches = orig_h / CONVERSION_DPI
-
-                x_scale = orig_w / slide_width_inches
-                y_scale = orig_h / slide_height_inches
-
-                # Create a highlight overlay
-                overlay = Image.new("RGBA", img.size, (255, 255, 255, 0))
-                overlay_draw = ImageDraw.Draw(overlay)
-
-                # Highlight each placeholder region
-                for region in regions:
-                    # Convert from inches to pixels in the original image
-                    px_left = int(region["left"] * x_scale)
-                    px_top = int(region["top"] * y_scale)
-                    px_width = int(region["width"] * x_scale)
-                    px_height = int(region["height"] * y_scale)
-
-                    # Draw highlight outline with red color and thick stroke
-                    # Using a bright red outline instead of fill
-                    stroke_width = max(
-                        5, min(orig_w, orig_h) // 150
-                    )  # Thicker proportional stroke width
-                    overlay_draw.rectangle(
-                        [(px_left, px_top), (px_left + px_width, px_top + px_height)],
-                        outline=(255, 0, 0, 255),  # Bright red, fully opaque
-                        width=stroke_width,
-                    )
+        regions = None
+        if placeholder_regions and (start_slide_num + i) in placeholder_regions:
+            regions = placeholder_regions[start_slide_num + i]
+        tile = load_tile(img_path, width, height, regions, slide_dimensions, tile_cache_dir)
+
+        w, h = tile.size
+        tx = x + (width - w) // 2
+        ty = y_thumbnail + (height - h) // 2
+        grid.paste(tile, (tx, ty))
+
+        # Add border
+        if BORDER_WIDTH > 0:
+            draw.rectangle(
+                [
+                    (tx - BORDER_WIDTH, ty - BORDER_WIDTH),
+                    (tx + w + BORDER_WIDTH - 1, ty + h + BORDER_WIDTH - 1),
+                ],
+                outline="gray",
+                width=BORDER_WIDTH,
+            )
 
-                # Composite the overlay onto the image using alpha blending
-                img = Image.alpha_composite(img, overlay)
-                # Convert back to RGB for JPEG saving
-                img = img.convert("RGB")
-
-            img.thumbnail((width, height), Image.Resampling.LANCZOS)
-            w, h = img.size
-            tx = x + (width - w) // 2
-            ty = y_thumbnail + (height - h) // 2
-            grid.paste(img, (tx, ty))
-
-            # Add border
-            if BORDER_WIDTH > 0:
-                draw.rectangle(
-                    [
-                        (tx - BORDER_WIDTH, ty - BORDER_WIDTH),
-                        (tx + w + BORDER_WIDTH - 1, ty + h + BORDER_WIDTH - 1),
-                    ],
-                    outline="gray",
-                    width=BORDER_WIDTH,
+    return grid
+
+
+def load_tile(img_path, width, height, regions=None, slide_dimensions=None, tile_cache_dir=None):
+    """Thumbnail of one slide image, from tile_cache_dir when it was made before.
+
+    Tiles are keyed by the slide image bytes, the tile size and the
+    outlined regions, and stored losslessly so cached grids match fresh ones.
+    """
+    if tile_cache_dir is None:
+        return make_tile(img_path, width, height, regions, slide_dimensions)
+
+    digest = hashlib.sha256(
+        json.dumps(
+            [THUMBNAIL_CACHE_VERSION, width, height, regions, slide_dimensions]
+        ).encode("utf-8")
+    )
+    with open(img_path, "rb") as f:
+        digest.update(f.read())
+    tile_path = tile_cache_dir / f"{digest.hexdigest()}.png"
+
+    try:
+        with Image.open(tile_path) as cached:
+            tile = cached.copy()
+        mark_cache_used(tile_path)
+        return tile
+    except OSError:
+        pass
+
+    tile = make_tile(img_path, width, height, regions, slide_dimensions)
+    try:
+        tile_cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=tile_cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            tile.save(f, "PNG")
+        os.replace(tmp_name, tile_path)
+    except OSError:
+        pass
+    return tile
+
+
+def make_tile(img_path, width, height, regions=None, slide_dimensions=None):
+    """Downscale a slide image to fit width×height, outlining text regions if given."""
+    with Image.open(img_path) as img:
+        # Get original dimensions before thumbnail
+        orig_w, orig_h = img.size
+
+        # Apply placeholder outlines if enabled
+        if regions:
+            # Convert to RGBA for transparency support
+            if img.mode != "RGBA":
+                img = img.convert("RGBA")
+
+            # Calculate scale factors using actual slide dimensions
+            if slide_dimensions:
+                slide_width_inches, slide_height_inches = slide_dimensions
+            else:
+                # Fallback: estimate from image size at CONVERSION_DPI
+                slide_width_inches = orig_w / CONVERSION_DPI
+                slide_height_inches = orig_h / CONVERSION_DPI
+
+            x_scale = orig_w / slide_width_inches
+            y_scale = orig_h / slide_height_inches
+
+            # Create a highlight overlay
+            overlay = Image.new("RGBA", img.size, (255, 255, 255, 0))
+            overlay_draw = ImageDraw.Draw(overlay)
+
+            # Highlight each placeholder region
+            for region in regions:
+                # Convert from inches to pixels in the original image
+                px_left = int(region["left"] * x_scale)
+                px_top = int(region["top"] * y_scale)
+                px_width = int(region["width"] * x_scale)
+                px_height = int(region["height"] * y_scale)
+
+                # Draw highlight outline with red color and thick stroke
+                # Using a bright red outline instead of fill
+                stroke_width = max(
+                    5, min(orig_w, orig_h) // 150
+                )  # Thicker proportional stroke width
+                overlay_draw.rectangle(
+                    [(px_left, px_top), (px_left + px_width, px_top + px_height)],
+                    outline=(255, 0, 0, 255),  # Bright red, fully opaque
+                    width=stroke_width,
                 )
 
-    return grid
+            # Composite the overlay onto the image using alpha blending
+            img = Image.alpha_composite(img, overlay)
+            # Convert back to RGB for JPEG saving
+            img = img.convert("RGB")
+
+        img.thumbnail((width, height), Image.Resampling.LANCZOS)
+        return img.copy()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,342 @@
+import hashlib
+import io
+import json
+import os
+import random
+import subprocess
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image, ImageDraw
+from pptx import Presentation
+from pptx.util import Inches
+
+import thumbnail
+from ooxml.scripts.office import FakeBackend, OfficeService
+from thumbnail import (
+    CONVERSION_DPI,
+    THUMBNAIL_WIDTH,
+    convert_decks_to_images,
+    convert_to_images,
+    create_grids,
+    prune_cache,
+    slide_render_keys,
+)
+
+
+def slide_fingerprint(slide):
+    """What the fake renderer draws for a slide: its text and layout."""
+    texts = [shape.text_frame.text for shape in slide.shapes if shape.has_text_frame]
+    return hashlib.sha256(
+        json.dumps([slide.slide_layout.name, texts]).encode("utf-8")
+    ).hexdigest()
+
+
+def fake_export(input_path, convert_to, output_path):
+    """Stand-in for the LibreOffice PDF export: the "PDF" lists visible slides."""
+    prs = Presentation(str(input_path))
+    output_path.write_text(
+        json.dumps(
+            [
+                slide_fingerprint(slide)
+                for slide in prs.slides
+                if slide.element.get("show") != "0"
+            ]
+        )
+    )
+
+
+def fake_pdftoppm(args, **kwargs):
+    """Stand-in for pdftoppm: one deterministic JPEG per "PDF" page."""
+    pdf_path, prefix = args[-2], args[-1]
+    with open(pdf_path) as f:
+        pages = json.load(f)
+    fake_pdftoppm.pages_rendered += len(pages)
+    for page, fingerprint in enumerate(pages, start=1):
+        rnd = random.Random(fingerprint)
+        image = Image.new("RGB", (1000, 563), tuple(rnd.randrange(256) for _ in range(3)))
+        draw = ImageDraw.Draw(image)
+        for _ in range(20):
+            x, y = rnd.randrange(1000), rnd.randrange(563)
+            draw.rectangle(
+                [x, y, x + rnd.randrange(200), y + rnd.randrange(100)],
+                fill=tuple(rnd.randrange(256) for _ in range(3)),
+            )
+        image.save(f"{prefix}-{page:0{len(str(len(pages)))}d}.jpg", "JPEG")
+    return subprocess.CompletedProcess(args, 0, "", "")
+
+
+def build_deck(path, titles, hidden=()):
+    prs = Presentation()
+    for slide_num, title in enumerate(titles, start=1):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = title
+        slide.placeholders[1].text = f"Body of slide {slide_num}"
+        if slide_num in hidden:
+            slide.element.set("show", "0")
+    prs.save(str(path))
+
+
+def png_bytes(color):
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestIncrementalThumbnails(unittest.TestCase):
+
+    TITLES = [f"Slide {n}" for n in range(1, 8)]
+    REGIONS = {1: [{"left": 0.5, "top": 0.5, "width": 4.0, "height": 1.0}]}
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.cache_dir = self.root / "cache"
+
+        self.backend = FakeBackend(convert_handler=fake_export, batches=True)
+        service = OfficeService(self.backend, workers=1)
+        self.addCleanup(service.close)
+        fake_pdftoppm.pages_rendered = 0
+        for patcher in (
+            mock.patch.object(thumbnail, "get_office_service", return_value=service),
+            mock.patch.object(thumbnail.subprocess, "run", side_effect=fake_pdftoppm),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def grids(self, pptx_path, name, cache):
+        """Grid file bytes for a deck, plus the number of slides rendered for them."""
+        rendered_before = fake_pdftoppm.pages_rendered
+        work_dir = self.root / f"work-{name}"
+        work_dir.mkdir()
+        images = convert_to_images(
+            pptx_path, work_dir, CONVERSION_DPI, cache=cache, cache_dir=self.cache_dir
+        )
+        grid_files = create_grids(
+            images,
+            2,
+            THUMBNAIL_WIDTH,
+            self.root / name / "grid.jpg",
+            self.REGIONS,
+            (10.0, 7.5),
+            cache=cache,
+            cache_dir=self.cache_dir,
+        )
+        contents = [Path(grid_file).read_bytes() for grid_file in grid_files]
+        return contents, fake_pdftoppm.pages_rendered - rendered_before
+
+    def test_cold_warm_and_edited_runs_match_uncached_output(self):
+        deck = self.root / "deck.pptx"
+        build_deck(deck, self.TITLES, hidden={4})
+        edited = self.root / "deck_edit.pptx"
+        build_deck(edited, self.TITLES[:1] + ["Changed"] + self.TITLES[2:], hidden={4})
+
+        reference, rendered = self.grids(deck, "reference", cache=False)
+        self.assertEqual(len(reference), 2)
+        self.assertEqual(rendered, 6)
+
+        cold, rendered = self.grids(deck, "cold", cache=True)
+        self.assertEqual(cold, reference)
+        self.assertEqual(rendered, 6)
+
+        warm, rendered = self.grids(deck, "warm", cache=True)
+        self.assertEqual(warm, reference)
+        self.assertEqual(rendered, 0)
+
+        edited_reference, _ = self.grids(edited, "edited-reference", cache=False)
+        self.assertNotEqual(edited_reference, reference)
+        edited_cached, rendered = self.grids(edited, "edited", cache=True)
+        self.assertEqual(edited_cached, edited_reference)
+        self.assertEqual(rendered, 1)
+
+    def test_decks_are_converted_in_one_batch(self):
+        decks = []
+        for name, titles in (("a", self.TITLES), ("b", self.TITLES[:3]), ("c", ["Other"])):
+            deck = self.root / name / "deck.pptx"
+            deck.parent.mkdir()
+            build_deck(deck, titles, hidden={2} if name == "b" else ())
+            decks.append(deck)
+        expected = []
+        for index, deck in enumerate(decks):
+            images, _ = self.grids(deck, f"reference-{index}", cache=False)
+            expected.append(images)
+        self.backend.batch_sizes.clear()
+
+        work_dir = self.root / "work-batch"
+        deck_images = convert_decks_to_images(decks, work_dir, CONVERSION_DPI, cache=False)
+
+        # One office request for all three decks
+        self.assertEqual(self.backend.batch_sizes, [3])
+        for index, images in enumerate(deck_images):
+            grid_files = create_grids(
+                images, 2, THUMBNAIL_WIDTH, self.root / f"batch-{index}" / "grid.jpg",
+                self.REGIONS, (10.0, 7.5), cache=False,
+            )
+            self.assertEqual([Path(f).read_bytes() for f in grid_files], expected[index])
+
+    def test_main_thumbnails_several_decks(self):
+        decks = []
+        for name in ("intro", "roadmap"):
+            deck = self.root / f"{name}.pptx"
+            build_deck(deck, self.TITLES if name == "roadmap" else self.TITLES[:2])
+            decks.append(str(deck))
+        prefix = self.root / "library" / "grid"
+        prefix.parent.mkdir()
+
+        argv = ["thumbnail.py", *decks, str(prefix), "--cols", "2", "--no-cache"]
+        with mock.patch("sys.argv", argv), mock.patch("sys.stdout", io.StringIO()):
+            thumbnail.main()
+
+        self.assertEqual(self.backend.batch_sizes, [2])
+        self.assertEqual(
+            sorted(path.name for path in prefix.parent.iterdir()),
+            ["grid-intro.jpg", "grid-roadmap-1.jpg", "grid-roadmap-2.jpg"],
+        )
+
+    def test_cache_stays_bounded(self):
+        deck = self.root / "deck.pptx"
+        build_deck(deck, self.TITLES)
+
+        self.grids(deck, "first", cache=True)
+        slide_images = list(self.cache_dir.glob("*.jpg"))
+        self.assertEqual(len(slide_images), 7)
+        one_image = max(path.stat().st_size for path in slide_images)
+
+        # Age the entries past the grace period; the next run refreshes the ones it uses
+        old = time.time() - 2 * thumbnail.CACHE_PRUNE_GRACE
+        for path in self.cache_dir.rglob("*.*"):
+            os.utime(path, (old, old))
+        stray = self.cache_dir / "tiles" / "interrupted.tmp"
+        stray.write_bytes(b"partial")
+        os.utime(stray, (old, old))
+
+        with mock.patch.object(thumbnail, "CACHE_MAX_BYTES", 3 * one_image), \
+                mock.patch.object(thumbnail, "TILE_CACHE_MAX_BYTES", 0):
+            build_deck(deck, self.TITLES[:6] + ["Changed"])
+            _, rendered = self.grids(deck, "second", cache=True)
+
+        self.assertEqual(rendered, 1)
+        remaining = set(self.cache_dir.glob("*.jpg"))
+        # All images used by the second run survive, the replaced slide's image is gone
+        self.assertEqual(len(remaining), 7)
+        self.assertEqual(sum(path.stat().st_mtime >= old + 1 for path in remaining), 7)
+        self.assertFalse(stray.exists())
+        self.assertEqual(len(list((self.cache_dir / "tiles").glob("*.png"))), 7)
+
+
+class TestPruneCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache_dir = Path(self.temp_dir.name)
+
+    def add_entry(self, name, age):
+        path = self.cache_dir / name
+        path.write_bytes(b"x" * 100)
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_removes_least_recently_used_first(self):
+        oldest = self.add_entry("a.jpg", 3000)
+        older = self.add_entry("b.jpg", 2000)
+        newer = self.add_entry("c.jpg", 1000)
+        other = self.add_entry("d.png", 4000)
+
+        prune_cache(self.cache_dir, "*.jpg", 150, grace=0)
+
+        self.assertFalse(oldest.exists())
+        self.assertFalse(older.exists())
+        self.assertTrue(newer.exists())
+        self.assertTrue(other.exists())
+
+    def test_keeps_recently_used_entries_over_the_limit(self):
+        old = self.add_entry("a.jpg", 3000)
+        recent = self.add_entry("b.jpg", 10)
+
+        prune_cache(self.cache_dir, "*.jpg", 0, grace=60)
+
+        self.assertFalse(old.exists())
+        self.assertTrue(recent.exists())
+
+    def test_missing_directory(self):
+        prune_cache(self.cache_dir / "missing", "*.jpg", 0)
+
+
+class TestSlideRenderKeys(unittest.TestCase):
+    """Editing a part changes the keys of exactly the slides that render it."""
+
+    def setUp(self):
+        self.prs = Presentation()
+        layouts = self.prs.slide_layouts
+        # Slides 1-2 use the title layout, 3-4 the title-and-content layout;
+        # slides 2 and 3 each show their own picture, slide 4 shares slide 3's
+        for slide_num, layout in enumerate([layouts[0], layouts[0], layouts[1], layouts[1]], 1):
+            slide = self.prs.slides.add_slide(layout)
+            slide.shapes.title.text = f"Slide {slide_num}"
+        self.pictures = {
+            2: self.add_picture(2, "red"),
+            3: self.add_picture(3, "blue"),
+        }
+        self.add_picture(4, "blue")
+        self.keys = slide_render_keys(self.prs, CONVERSION_DPI)
+
+    def add_picture(self, slide_num, color):
+        slide = self.prs.slides[slide_num - 1]
+        picture = slide.shapes.add_picture(io.BytesIO(png_bytes(color)), Inches(1), Inches(1))
+        return slide.part.related_part(picture._element.blip_rId)
+
+    def changed_slides(self):
+        keys = slide_render_keys(self.prs, CONVERSION_DPI)
+        return [n for n, (old, new) in enumerate(zip(self.keys, keys), 1) if old != new]
+
+    def test_keys_are_stable(self):
+        self.assertEqual(self.changed_slides(), [])
+        self.assertEqual(len(set(self.keys)), 4)
+
+    def test_slide_edit(self):
+        self.prs.slides[1].shapes.title.text = "Changed"
+        self.assertEqual(self.changed_slides(), [2])
+
+    def test_layout_edit(self):
+        self.prs.slide_layouts[1].element.cSld.set("name", "Renamed layout")
+        self.assertEqual(self.changed_slides(), [3, 4])
+
+    def test_media_edit(self):
+        self.pictures[2]._blob = png_bytes("green")
+        self.assertEqual(self.changed_slides(), [2])
+
+    def test_shared_media_edit(self):
+        self.pictures[3]._blob = png_bytes("green")
+        self.assertEqual(self.changed_slides(), [3, 4])
+
+    def test_theme_edit(self):
+        master = self.prs.slide_masters[0]
+        theme = master.part.part_related_by(thumbnail.RT.THEME)
+        self.assertIn(b"Office Theme", theme.blob)
+        theme._blob = theme.blob.replace(b"Office Theme", b"Edited Theme")
+        self.assertEqual(self.changed_slides(), [1, 2, 3, 4])
+
+    def test_notes_edit(self):
+        self.prs.slides[0].notes_slide.notes_text_frame.text = "Speaker notes"
+        self.assertEqual(self.changed_slides(), [])
+
+    def test_render_part_names(self):
+        part_digests = {}
+        names = thumbnail._render_part_names(self.prs.slides[2].part, part_digests)
+        self.assertIn("/ppt/slides/slide3.xml", names)
+        self.assertIn(str(self.prs.slide_layouts[1].part.partname), names)
+        self.assertIn(str(self.pictures[3].partname), names)
+        self.assertNotIn(str(self.prs.slide_layouts[0].part.partname), names)
+        self.assertNotIn(str(self.pictures[2].partname), names)
+        self.assertEqual(set(part_digests), names)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,124 +2,214 @@
 """
 Excel Formula Recalculation Script
 Recalculates all formulas in an Excel file using LibreOffice
+(shared office workers, see office.py). Several files given to one run are
+recalculated as one batch, so LibreOffice starts once rather than per file.
 """
 
 import json
-import sys
-import subprocess
 import os
-import platform
+import posixpath
+import sys
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from openpyxl import load_workbook
+from openpyxl.utils import coordinate_to_tuple, get_column_letter
+from office import OfficeError, get_office_service
 
 
-def setup_libreoffice_macro():
-    """Setup LibreOffice macro for recalculation if not already configured"""
-    if platform.system() == 'Darwin':
-        macro_dir = os.path.expanduser('~/Library/Application Support/LibreOffice/4/user/basic/Standard')
-    else:
-        macro_dir = os.path.expanduser('~/.config/libreoffice/4/user/basic/Standard')
+EXCEL_ERRORS = ['#VALUE!', '#DIV/0!', '#REF!', '#NAME?', '#NULL!', '#NUM!', '#N/A']
+
+# Workbooks with less sheet XML than this (uncompressed) are scanned in-process
+MIN_PARALLEL_BYTES = 8 * 1024 * 1024
+
+MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def worksheet_parts(zf):
+    """(sheet name, part name) of each worksheet, in workbook order"""
+    workbook_part = 'xl/workbook.xml'
+    root_rels = ET.fromstring(zf.read('_rels/.rels'))
+    for rel in root_rels.iter(f'{PKG_REL_NS}Relationship'):
+        if rel.get('Type', '').endswith('/officeDocument'):
+            workbook_part = rel.get('Target').lstrip('/')
     
-    macro_file = os.path.join(macro_dir, 'Module1.xba')
+    rels_part = posixpath.join(
+        posixpath.dirname(workbook_part), '_rels', posixpath.basename(workbook_part) + '.rels'
+    )
+    targets = {}
+    for rel in ET.fromstring(zf.read(rels_part)).iter(f'{PKG_REL_NS}Relationship'):
+        if rel.get('Type', '').endswith('/worksheet'):
+            target = rel.get('Target')
+            if target.startswith('/'):
+                targets[rel.get('Id')] = target.lstrip('/')
+            else:
+                targets[rel.get('Id')] = posixpath.normpath(
+                    posixpath.join(posixpath.dirname(workbook_part), target)
+                )
     
-    if os.path.exists(macro_file):
-        with open(macro_file, 'r') as f:
-            if 'RecalculateAndSave' in f.read():
-                return True
+    # Chartsheets have no cells
+    workbook = ET.fromstring(zf.read(workbook_part))
+    return [
+        (sheet.get('name'), targets[sheet.get(f'{REL_NS}id')])
+        for sheet in workbook.iter(f'{MAIN_NS}sheet')
+        if sheet.get(f'{REL_NS}id') in targets
+    ]
+
+
+def scan_sheet(filename, sheet_name, part_name):
+    """
+    Stream one worksheet's XML and collect error cells and formula count
     
-    if not os.path.exists(macro_dir):
-        subprocess.run(['soffice', '--headless', '--terminate_after_init'], 
-                      capture_output=True, timeout=10)
-        os.makedirs(macro_dir, exist_ok=True)
+    Only error-typed cells (t="e") are checked, so cell values are never
+    decoded. Rows are dropped as soon as they are scanned.
     
-    macro_content = '''<?xml version="1.0" encoding="UTF-8"?>
-<!DOCTYPE script:module PUBLIC "-//OpenOffice.org//DTD OfficeDocument 1.0//EN" "module.dtd">
-<script:module xmlns:script="http://openoffice.org/2000/script" script:name="Module1" script:language="StarBasic">
-    Sub RecalculateAndSave()
-      ThisComponent.calculateAll()
-      ThisComponent.store()
-      ThisComponent.close(True)
-    End Sub
-</script:module>'''
+    Returns:
+        (list of (error type, location), number of formulas)
+    """
+    errors = []
+    formula_count = 0
+    row_tag, cell_tag = f'{MAIN_NS}row', f'{MAIN_NS}c'
+    value_tag, formula_tag = f'{MAIN_NS}v', f'{MAIN_NS}f'
     
-    try:
-        with open(macro_file, 'w') as f:
-            f.write(macro_content)
-        return True
-    except Exception:
-        return False
+    with zipfile.ZipFile(filename) as zf, zf.open(part_name) as xml:
+        sheet_data = None
+        row_num = 0
+        for event, elem in ET.iterparse(xml, events=('start', 'end')):
+            if event == 'start':
+                if elem.tag == f'{MAIN_NS}sheetData':
+                    sheet_data = elem
+                continue
+            if elem.tag != row_tag:
+                continue
+            
+            # Same position rules as openpyxl when r attributes are missing
+            row_num = int(float(elem.get('r'))) if elem.get('r') else row_num + 1
+            col_num = 0
+            previous = None
+            for cell in elem:
+                if cell.tag != cell_tag:
+                    continue
+                coordinate = cell.get('r')
+                if coordinate:
+                    # Only parsed when a following cell needs it
+                    previous = coordinate
+                else:
+                    if previous:
+                        col_num = coordinate_to_tuple(previous)[1]
+                        previous = None
+                    col_num += 1
+                    coordinate = f'{get_column_letter(col_num)}{row_num}'
+                
+                formula = cell.find(formula_tag)
+                # Array and data table formulas are not counted (as before)
+                if formula is not None and formula.get('t') not in ('array', 'dataTable'):
+                    formula_count += 1
+                
+                if cell.get('t') == 'e':
+                    value = cell.findtext(value_tag) or ''
+                    for err in EXCEL_ERRORS:
+                        if err in value:
+                            errors.append((err, f"{sheet_name}!{coordinate}"))
+                            break
+            
+            if sheet_data is not None:
+                sheet_data.clear()
+            else:
+                elem.clear()
+    
+    return errors, formula_count
+
+
+def _scan_sheet_task(args):
+    return scan_sheet(*args)
+
+
+def scan_workbook(filename, workers=None):
+    """
+    Find error cells and count formulas in all worksheets
+    
+    Sheets are scanned in parallel processes when the workbook is large.
+    
+    Returns:
+        (dict of error type -> locations, total number of formulas)
+    """
+    with zipfile.ZipFile(filename) as zf:
+        sheets = worksheet_parts(zf)
+        sheet_bytes = sum(zf.getinfo(part_name).file_size for _, part_name in sheets)
+    
+    tasks = [(filename, sheet_name, part_name) for sheet_name, part_name in sheets]
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers > 1 and sheet_bytes >= MIN_PARALLEL_BYTES:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_scan_sheet_task, tasks))
+    else:
+        results = [scan_sheet(*task) for task in tasks]
+    
+    error_details = {err: [] for err in EXCEL_ERRORS}
+    formula_count = 0
+    for errors, sheet_formulas in results:
+        for err, location in errors:
+            error_details[err].append(location)
+        formula_count += sheet_formulas
+    return error_details, formula_count
 
 
-def recalc(filename, timeout=30):
+def recalc(filename, timeout=30, workers=None):
     """
     Recalculate formulas in Excel file and report any errors
     
     Args:
         filename: Path to Excel file
         timeout: Maximum time to wait for recalculation (seconds)
+        workers: Processes for scanning sheets (default: CPU count)
     
     Returns:
         dict with error locations and counts
     """
-    if not Path(filename).exists():
-        return {'error': f'File {filename} does not exist'}
-    
-    abs_path = str(Path(filename).absolute())
-    
-    if not setup_libreoffice_macro():
-        return {'error': 'Failed to setup LibreOffice macro'}
-    
-    cmd = [
-        'soffice', '--headless', '--norestore',
-        'vnd.sun.star.script:Standard.Module1.RecalculateAndSave?language=Basic&location=application',
-        abs_path
-    ]
-    
-    # Handle timeout command differences between Linux and macOS
-    if platform.system() != 'Windows':
-        timeout_cmd = 'timeout' if platform.system() == 'Linux' else None
-        if platform.system() == 'Darwin':
-            # Check if gtimeout is available on macOS
-            try:
-                subprocess.run(['gtimeout', '--version'], capture_output=True, timeout=1, check=False)
-                timeout_cmd = 'gtimeout'
-            except (FileNotFoundError, subprocess.TimeoutExpired):
-                pass
-        
-        if timeout_cmd:
-            cmd = [timeout_cmd, str(timeout)] + cmd
-    
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    
-    if result.returncode != 0 and result.returncode != 124:  # 124 is timeout exit code
-        error_msg = result.stderr or 'Unknown error during recalculation'
-        if 'Module1' in error_msg or 'RecalculateAndSave' not in error_msg:
-            return {'error': 'LibreOffice macro not configured properly'}
+    return recalc_many([filename], timeout, workers)[filename]
+
+
+def recalc_many(filenames, timeout=30, workers=None):
+    """
+    Recalculate several Excel files in one batch and report errors for each
+
+    Args:
+        filenames: Paths to Excel files
+        timeout: Maximum time to wait for each file's recalculation (seconds)
+        workers: Processes for scanning sheets (default: CPU count)
+
+    Returns:
+        dict of filename -> result as returned by recalc()
+    """
+    results = {}
+    existing = []
+    for filename in filenames:
+        if Path(filename).exists():
+            existing.append(filename)
         else:
-            return {'error': error_msg}
-    
+            results[filename] = {'error': f'File {filename} does not exist'}
+
+    outcomes = get_office_service().recalculate_many(
+        [str(Path(filename).absolute()) for filename in existing], timeout=timeout
+    )
+    for filename, outcome in zip(existing, outcomes):
+        if isinstance(outcome, OfficeError):
+            results[filename] = {'error': str(outcome)}
+        else:
+            results[filename] = error_report(filename, workers)
+
+    return {filename: results[filename] for filename in filenames}
+
+
+def error_report(filename, workers=None):
+    """Summary of the Excel errors and formulas in a recalculated file"""
     # Check for Excel errors in the recalculated file - scan ALL cells
     try:
-        wb = load_workbook(filename, data_only=True)
-        
-        excel_errors = ['#VALUE!', '#DIV/0!', '#REF!', '#NAME?', '#NULL!', '#NUM!', '#N/A']
-        error_details = {err: [] for err in excel_errors}
-        total_errors = 0
-        
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            # Check ALL rows and columns - no limits
-            for row in ws.iter_rows():
-                for cell in row:
-                    if cell.value is not None and isinstance(cell.value, str):
-                        for err in excel_errors:
-                            if err in cell.value:
-                                location = f"{sheet_name}!{cell.coordinate}"
-                                error_details[err].append(location)
-                                total_errors += 1
-                                break
-        
-        wb.close()
+        error_details, formula_count = scan_workbook(filename, workers)
+        total_errors = sum(len(locations) for locations in error_details.values())
         
         # Build result summary
         result = {
@@ -136,17 +226,7 @@ def recalc(filename, timeout=30):
                     'locations': locations[:20]  # Show up to 20 locations
                 }
         
-        # Add formula count for context - also check ALL cells
-        wb_formulas = load_workbook(filename, data_only=False)
-        formula_count = 0
-        for sheet_name in wb_formulas.sheetnames:
-            ws = wb_formulas[sheet_name]
-            for row in ws.iter_rows():
-                for cell in row:
-                    if cell.value and isinstance(cell.value, str) and cell.value.startswith('='):
-                        formula_count += 1
-        wb_formulas.close()
-        
+        # Add formula count for context
         result['total_formulas'] = formula_count
         
         return result
@@ -157,8 +237,9 @@ def recalc(filename, timeout=30):
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python recalc.py <excel_file> [timeout_seconds]")
+        print("Usage: python recalc.py <excel_file> [more_excel_files ...] [timeout_seconds]")
         print("\nRecalculates all formulas in an Excel file using LibreOffice")
+        print("(several files are recalculated in one batch; output is keyed by filename)")
         print("\nReturns JSON with error details:")
         print("  - status: 'success' or 'errors_found'")
         print("  - total_errors: Total number of Excel errors found")
@@ -167,11 +248,16 @@ def main():
         print("    - #VALUE!, #DIV/0!, #REF!, #NAME?, #NULL!, #NUM!, #N/A")
         sys.exit(1)
     
-    filename = sys.argv[1]
-    timeout = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    filenames = sys.argv[1:]
+    timeout = 30
+    if len(filenames) > 1 and filenames[-1].isdigit():
+        timeout = int(filenames.pop())
     
-    result = recalc(filename, timeout)
-    print(json.dumps(result, indent=2))
+    results = recalc_many(filenames, timeout)
+    if len(filenames) == 1:
+        print(json.dumps(results[filenames[0]], indent=2))
+    else:
+        print(json.dumps(results, indent=2))
 
 
 if __name__ == '__main__':
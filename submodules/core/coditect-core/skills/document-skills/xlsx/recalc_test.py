@@ -0,0 +1,233 @@
+import random
+import shutil
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.chart import BarChart, Reference
+from openpyxl.utils import get_column_letter
+
+import recalc
+from office import FakeBackend, OfficeError, OfficeService
+from recalc import EXCEL_ERRORS, scan_workbook, worksheet_parts
+
+SHEET_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    "<sheetData>{rows}</sheetData></worksheet>"
+)
+
+# Hand-written cells: missing r attributes, shared/array/dataTable formulas
+# and error text in cells that are not error-typed
+EDGE_ROWS = "".join(
+    [
+        '<row r="1">'
+        '<c r="A1" t="e"><f>1/0</f><v>#DIV/0!</v></c>'
+        '<c r="B1" t="str"><f>"#REF! text"</f><v>#REF! text</v></c>'
+        '<c r="C1" t="inlineStr"><is><t>#N/A literal</t></is></c>'
+        "</row>",
+        # No row number: row 2; no cell references: A2, B2, C2
+        "<row>"
+        '<c t="e"><v>#NAME?</v></c><c><v>1</v></c><c t="e"><f>NA()</f><v>#N/A</v></c>'
+        "</row>",
+        # A cell without r continues after the previous explicit reference
+        '<row r="5"><c r="C5"><v>1</v></c><c t="e"><v>#VALUE!</v></c></row>',
+        '<row r="6"><c r="A6"><f t="shared" ref="A6:A8" si="0">B6*2</f><v>0</v></c></row>',
+        '<row r="7"><c r="A7"><f t="shared" si="0"/><v>0</v></c></row>',
+        '<row r="8"><c r="A8"><f t="shared" si="0"/><v>0</v></c></row>',
+        '<row r="9"><c r="A9"><f t="array" ref="A9:A10">SUM(B1:B2*C1:C2)</f><v>0</v></c></row>',
+        '<row r="10"><c r="A10"><v>0</v></c></row>',
+        '<row r="11"><c r="B11"><f t="dataTable" ref="B11:C12" dt2D="0" dtr="0" r1="A1"/>'
+        "<v>0</v></c></row>",
+        '<row r="12.0">'
+        '<c r="B12" t="e"><v>#NULL!</v></c><c r="C12" t="e"><v>#NUM!</v></c>'
+        '<c r="D12" t="e"><v>#GETTING_DATA</v></c>'
+        "</row>",
+    ]
+)
+
+
+def random_rows(rnd, row_count=400):
+    """Random sheet content; row and cell references are dropped at random."""
+    rows = []
+    row_num = 0
+    for _ in range(row_count):
+        # Rows without r follow the previous row; explicit rows may skip ahead
+        explicit_row = rnd.random() < 0.8
+        row_num += rnd.choice([1, 1, 1, 2, 5]) if explicit_row else 1
+        cells = []
+        col_num = 0
+        for _ in range(rnd.randrange(1, 12)):
+            explicit_cell = rnd.random() < 0.7
+            col_num += rnd.choice([1, 1, 3]) if explicit_cell else 1
+            ref = f' r="{get_column_letter(col_num)}{row_num}"' if explicit_cell else ""
+            kind = rnd.randrange(6)
+            error = rnd.choice(EXCEL_ERRORS + ["#SPILL!"])
+            if kind == 0:
+                cells.append(f'<c{ref} t="e"><v>{error}</v></c>')
+            elif kind == 1:
+                cells.append(f'<c{ref} t="e"><f>A1/0</f><v>{error}</v></c>')
+            elif kind == 2:
+                cells.append(f'<c{ref} t="str"><f>"{error}"</f><v>{error}</v></c>')
+            elif kind == 3:
+                cells.append(f'<c{ref} t="inlineStr"><is><t>x {error}</t></is></c>')
+            elif kind == 4:
+                cells.append(f"<c{ref}><f>SUM(A1:A{row_num})</f><v>{rnd.random()}</v></c>")
+            else:
+                cells.append(f"<c{ref}><v>{rnd.randrange(1000)}</v></c>")
+        row_ref = f' r="{row_num}"' if explicit_row else ""
+        rows.append(f"<row{row_ref}>{''.join(cells)}</row>")
+    return "".join(rows)
+
+
+def build_workbook(path, sheets):
+    """Workbook with the given worksheet XML and a chartsheet between them."""
+    wb = Workbook()
+    wb.active.title = "Data"
+    wb.active["A1"] = 1
+    chart = BarChart()
+    chart.add_data(Reference(wb.active, min_col=1, min_row=1, max_row=1))
+    wb.create_chartsheet("Chart").add_chart(chart)
+    for title in list(sheets)[1:]:
+        wb.create_sheet(title)["A1"] = 1
+    wb.save(path)
+
+    # Swap in the hand-written sheet XML
+    with zipfile.ZipFile(path) as zf:
+        parts = {info.filename: zf.read(info) for info in zf.infolist()}
+    for index, rows in enumerate(sheets.values(), start=1):
+        part_name = f"xl/worksheets/sheet{index}.xml"
+        assert part_name in parts
+        parts[part_name] = SHEET_XML.format(rows=rows).encode("utf-8")
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for part_name, data in parts.items():
+            zf.writestr(part_name, data)
+
+
+def openpyxl_scan(filename):
+    """Reference scan with openpyxl: error-typed cells and string formulas."""
+    error_details = {err: [] for err in EXCEL_ERRORS}
+    wb = load_workbook(filename, data_only=True)
+    for ws in wb.worksheets:
+        for row in ws.iter_rows():
+            for cell in row:
+                if cell.data_type == "e" and isinstance(cell.value, str):
+                    for err in EXCEL_ERRORS:
+                        if err in cell.value:
+                            error_details[err].append(f"{ws.title}!{cell.coordinate}")
+                            break
+    wb.close()
+
+    formula_count = 0
+    wb = load_workbook(filename, data_only=False)
+    for ws in wb.worksheets:
+        for row in ws.iter_rows():
+            for cell in row:
+                if isinstance(cell.value, str) and cell.value.startswith("="):
+                    formula_count += 1
+    wb.close()
+    return error_details, formula_count
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestScanWorkbook(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = Path(self.temp_dir.name) / "book.xlsx"
+        rnd = random.Random(1234)
+        build_workbook(
+            self.path,
+            {
+                "Data": EDGE_ROWS,
+                "Random 1": random_rows(rnd),
+                "Random 2": random_rows(rnd),
+            },
+        )
+
+    def test_matches_openpyxl(self):
+        self.assertEqual(scan_workbook(self.path, workers=1), openpyxl_scan(self.path))
+
+    def test_parallel_scan_matches_openpyxl(self):
+        with mock.patch.object(recalc, "MIN_PARALLEL_BYTES", 0):
+            self.assertEqual(scan_workbook(self.path, workers=2), openpyxl_scan(self.path))
+
+    def test_edge_cases(self):
+        error_details, _ = scan_workbook(self.path, workers=1)
+        data_errors = {
+            err: [location for location in locations if location.startswith("Data!")]
+            for err, locations in error_details.items()
+        }
+        self.assertEqual(
+            data_errors,
+            {
+                "#VALUE!": ["Data!D5"],
+                "#DIV/0!": ["Data!A1"],
+                "#REF!": [],  # B1 is a text result, not an error
+                "#NAME?": ["Data!A2"],
+                "#NULL!": ["Data!B12"],
+                "#NUM!": ["Data!C12"],
+                "#N/A": ["Data!C2"],  # C1 only contains the text
+            },
+        )
+
+        with zipfile.ZipFile(self.path) as zf:
+            data_part = dict(worksheet_parts(zf))["Data"]
+        _, formula_count = recalc.scan_sheet(self.path, "Data", data_part)
+        # A1, B1, C2 and the three shared formula cells; array and data table are not counted
+        self.assertEqual(formula_count, 6)
+
+    def test_chartsheets_are_skipped(self):
+        with zipfile.ZipFile(self.path) as zf:
+            names = [name for name, _ in worksheet_parts(zf)]
+        self.assertEqual(names, ["Data", "Random 1", "Random 2"])
+
+    def test_recalc_report(self):
+        service = OfficeService(FakeBackend(), workers=1)
+        self.addCleanup(service.close)
+        with mock.patch.object(recalc, "get_office_service", return_value=service):
+            result = recalc.recalc(str(self.path), workers=1)
+
+        error_details, formula_count = openpyxl_scan(self.path)
+        self.assertEqual(result["status"], "errors_found")
+        self.assertEqual(result["total_formulas"], formula_count)
+        self.assertEqual(
+            result["total_errors"], sum(len(locations) for locations in error_details.values())
+        )
+        for err, summary in result["error_summary"].items():
+            self.assertEqual(summary["count"], len(error_details[err]))
+            self.assertEqual(summary["locations"], error_details[err][:20])
+
+    def test_recalc_many_is_one_batch(self):
+        copy = self.path.with_name("copy.xlsx")
+        shutil.copyfile(self.path, copy)
+        broken = self.path.with_name("broken.xlsx")
+        shutil.copyfile(self.path, broken)
+        missing = self.path.with_name("missing.xlsx")
+
+        def recalculate(path):
+            if path.name == "broken.xlsx":
+                raise OfficeError("could not open")
+
+        backend = FakeBackend(recalculate_handler=recalculate, batches=True)
+        service = OfficeService(backend, workers=1)
+        self.addCleanup(service.close)
+        filenames = [str(self.path), str(missing), str(broken), str(copy)]
+        with mock.patch.object(recalc, "get_office_service", return_value=service):
+            results = recalc.recalc_many(filenames, workers=1)
+            single = recalc.recalc(str(self.path), workers=1)
+
+        self.assertEqual(list(results), filenames)
+        self.assertEqual(backend.batch_sizes, [3, 1])
+        self.assertEqual(results[str(self.path)], single)
+        self.assertEqual(results[str(copy)], single)
+        self.assertEqual(results[str(broken)], {"error": "could not open"})
+        self.assertIn("does not exist", results[str(missing)]["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,72 +5,149 @@ Observability Hooks
 Metrics collection, structured logging, and observability utilities.
 """
 
+from bisect import bisect_left
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import time
 import json
 import logging
+import threading
+
+
+# Histogram bucket upper bounds (seconds) used when none are given
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
 
 
 @dataclass
 class MetricPoint:
-    """Single metric data point"""
+    """Current value of one metric series"""
     name: str
     value: float
     timestamp: datetime
     tags: Dict[str, str] = field(default_factory=dict)
 
 
-class MetricsCollector:
-    """Collect and export metrics"""
+@dataclass
+class _HistogramSeries:
+    """Bucket counts, sum and count for one histogram series"""
+    counts: List[int]
+    sum: float = 0.0
+    count: int = 0
+
 
-    def __init__(self):
-        self.metrics: List[MetricPoint] = []
+SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsCollector:
+    """
+    Aggregate and export metrics.
+
+    Each (name, tags) series keeps a single running value: counters add,
+    gauges overwrite, histograms count observations into fixed buckets.
+    Updates are O(1) and memory grows with the number of series, not the
+    number of calls.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counters: Dict[SeriesKey, float] = {}
+        self.gauges: Dict[SeriesKey, float] = {}
+        self.histograms: Dict[SeriesKey, _HistogramSeries] = {}
+        self.updated: Dict[SeriesKey, datetime] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, tags: Optional[Dict[str, str]]) -> SeriesKey:
+        return name, tuple(sorted((tags or {}).items()))
 
     def increment(self, name: str, value: float = 1.0, tags: Optional[Dict[str, str]] = None):
         """Increment a counter"""
-        self.metrics.append(MetricPoint(
-            name=name,
-            value=value,
-            timestamp=datetime.now(),
-            tags=tags or {}
-        ))
+        key = self._key(name, tags)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0.0) + value
+            self.updated[key] = datetime.now()
 
     def gauge(self, name: str, value: float, tags: Optional[Dict[str, str]] = None):
         """Set a gauge value"""
-        self.metrics.append(MetricPoint(
-            name=name,
-            value=value,
-            timestamp=datetime.now(),
-            tags=tags or {}
-        ))
+        key = self._key(name, tags)
+        with self._lock:
+            self.gauges[key] = value
+            self.updated[key] = datetime.now()
 
     def histogram(self, name: str, value: float, tags: Optional[Dict[str, str]] = None):
         """Record histogram value (for timing, sizes, etc.)"""
-        self.metrics.append(MetricPoint(
-            name=name,
-            value=value,
-            timestamp=datetime.now(),
-            tags=tags or {}
-        ))
+        key = self._key(name, tags)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self.histograms.get(key)
+            if series is None:
+                series = self.histograms[key] = _HistogramSeries(counts=[0] * (len(self.buckets) + 1))
+            series.counts[index] += 1
+            series.sum += value
+            series.count += 1
+            self.updated[key] = datetime.now()
 
     def get_metrics(self) -> List[MetricPoint]:
-        """Get all collected metrics"""
-        return self.metrics
+        """Get the current value of every series (histograms report their count)"""
+        with self._lock:
+            series = [(key, value) for key, value in self.counters.items()]
+            series += [(key, value) for key, value in self.gauges.items()]
+            series += [(key, float(h.count)) for key, h in self.histograms.items()]
+            return [
+                MetricPoint(name=name, value=value, timestamp=self.updated[(name, tags)], tags=dict(tags))
+                for (name, tags), value in series
+            ]
 
     def clear(self):
         """Clear all metrics"""
-        self.metrics = []
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+            self.updated.clear()
+
+    @staticmethod
+    def _labels(tags: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+        pairs = [f'{k}="{_escape(str(v))}"' for k, v in tags]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
 
     def export_prometheus(self) -> str:
-        """Export metrics in Prometheus format"""
-        lines = []
-        for metric in self.metrics:
-            tags_str = ",".join(f'{k}="{v}"' for k, v in metric.tags.items())
-            line = f"{metric.name}{{{tags_str}}} {metric.value} {int(metric.timestamp.timestamp() * 1000)}"
-            lines.append(line)
-        return "\n".join(lines)
+        """Export metrics in Prometheus text format"""
+        with self._lock:
+            families: Dict[str, Tuple[str, List[str]]] = {}
+
+            for (name, tags), value in self.counters.items():
+                families.setdefault(name, ("counter", []))[1].append(f"{name}{self._labels(tags)} {value}")
+
+            for (name, tags), value in self.gauges.items():
+                families.setdefault(name, ("gauge", []))[1].append(f"{name}{self._labels(tags)} {value}")
+
+            for (name, tags), series in self.histograms.items():
+                lines = families.setdefault(name, ("histogram", []))[1]
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), series.counts):
+                    cumulative += count
+                    le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+                    lines.append(f"{name}_bucket{self._labels(tags, le)} {cumulative}")
+                lines.append(f"{name}_sum{self._labels(tags)} {series.sum}")
+                lines.append(f"{name}_count{self._labels(tags)} {series.count}")
+
+        output = []
+        for name in sorted(families):
+            metric_type, lines = families[name]
+            output.append(f"# TYPE {name} {metric_type}")
+            output.extend(lines)
+        return "\n".join(output)
 
 
 class TimingContext:
@@ -168,7 +245,7 @@ def main():
     with TimingContext(metrics, "database_query", tags={"table": "users"}):
         time.sleep(0.1)  # Simulate query
 
-    print(f"Collected {len(metrics.get_metrics())} metrics")
+    print(f"Collected {len(metrics.get_metrics())} metric series")
     print("\nPrometheus Export:")
     print(metrics.export_prometheus())
 
@@ -192,7 +269,7 @@ def main():
     # Show timing metric
     timing_metrics = [m for m in metrics.get_metrics() if "duration" in m.name]
     for metric in timing_metrics:
-        print(f"{metric.name}: {metric.value:.3f}s (tags: {metric.tags})")
+        print(f"{metric.name}: {int(metric.value)} observation(s) (tags: {metric.tags})")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Tests for CODITECT Buffered Audit Writer
+
+Tests batching, flush semantics, segment rotation, crash recovery of
+truncated segments, and the shared writer registry.
+
+Author: AZ1.AI CODITECT Team
+Sprint: Sprint +1 - MEMORY-CONTEXT Implementation
+Date: 2025-11-16
+"""
+
+import unittest
+import io
+import json
+import sys
+import tempfile
+import shutil
+import threading
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+# Add scripts/core to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts" / "core"))
+
+from audit_writer import (
+    AuditWriter, AuditWriterClosedError, AuditWriterError,
+    get_audit_writer, list_segments, main, read_audit_log, segment_prefixes
+)
+
+
+class TestAuditWriter(unittest.TestCase):
+    """Test buffered audit writing and reading."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.audit_dir = self.test_dir / "audit"
+
+    def tearDown(self):
+        """Clean up."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_write_is_buffered_until_flush(self):
+        """Entries are not on disk until a flush trigger fires."""
+        writer = AuditWriter(self.audit_dir, flush_size=1000, flush_interval=60)
+        writer.write({'operation': 'pii_detected', 'n': 1})
+
+        self.assertEqual(list(read_audit_log(self.audit_dir)), [])
+
+        self.assertTrue(writer.flush())
+        self.assertEqual(list(read_audit_log(self.audit_dir)), [{'operation': 'pii_detected', 'n': 1}])
+        writer.close()
+
+    def test_flush_size_triggers_write(self):
+        """Reaching flush_size writes a batch without an explicit flush."""
+        writer = AuditWriter(self.audit_dir, flush_size=5, flush_interval=60)
+        for i in range(5):
+            writer.write({'n': i})
+
+        writer.close()
+        self.assertEqual(writer.batches_written, 1)
+        self.assertEqual([e['n'] for e in read_audit_log(self.audit_dir)], list(range(5)))
+
+    def test_flush_interval_triggers_write(self):
+        """Pending entries are written once flush_interval elapses."""
+        writer = AuditWriter(self.audit_dir, flush_size=1000, flush_interval=0.05)
+        writer.write({'n': 1})
+
+        for _ in range(100):
+            if writer.entries_written:
+                break
+            threading.Event().wait(0.02)
+
+        self.assertEqual(writer.entries_written, 1)
+        writer.close()
+
+    def test_concurrent_writers_preserve_all_entries(self):
+        """Entries from many threads all reach the audit trail."""
+        writer = AuditWriter(self.audit_dir, max_queue=50, flush_size=16)
+
+        def produce(tid):
+            for i in range(200):
+                writer.write({'tid': tid, 'i': i})
+
+        threads = [threading.Thread(target=produce, args=(t,)) for t in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        writer.close()
+
+        entries = list(read_audit_log(self.audit_dir))
+        self.assertEqual(len(entries), 800)
+        for tid in range(4):
+            ordered = [e['i'] for e in entries if e['tid'] == tid]
+            self.assertEqual(ordered, list(range(200)))
+
+    def test_segment_rotation(self):
+        """Segments rotate once they exceed segment_max_bytes."""
+        writer = AuditWriter(self.audit_dir, flush_size=1, segment_max_bytes=1)
+        for i in range(3):
+            writer.write({'n': i})
+            writer.flush()
+        writer.close()
+
+        self.assertEqual(len(list_segments(self.audit_dir)), 3)
+        self.assertEqual([e['n'] for e in read_audit_log(self.audit_dir)], [0, 1, 2])
+
+    def test_new_writer_starts_new_segment(self):
+        """A second writer never appends to an existing segment."""
+        first = AuditWriter(self.audit_dir)
+        first.write({'n': 1})
+        first.close()
+
+        second = AuditWriter(self.audit_dir)
+        second.write({'n': 2})
+        second.close()
+
+        seqs = [seq for seq, _ in list_segments(self.audit_dir)]
+        self.assertEqual(seqs, [1, 2])
+        self.assertEqual([e['n'] for e in read_audit_log(self.audit_dir)], [1, 2])
+
+    def test_truncated_trailing_batch_is_skipped(self):
+        """A crash mid-write loses only the last batch."""
+        writer = AuditWriter(self.audit_dir)
+        writer.write({'n': 1})
+        writer.flush()
+        writer.write({'n': 2})
+        writer.close()
+
+        _, path = list_segments(self.audit_dir)[0]
+        data = path.read_bytes()
+        path.write_bytes(data[:-5])
+
+        self.assertEqual(list(read_audit_log(self.audit_dir)), [{'n': 1}])
+
+    def test_write_after_close_raises(self):
+        """Writing to a closed writer raises AuditWriterClosedError."""
+        writer = AuditWriter(self.audit_dir)
+        writer.close()
+
+        with self.assertRaises(AuditWriterClosedError):
+            writer.write({'n': 1})
+        self.assertFalse(writer.flush())
+
+    def test_no_segment_without_entries(self):
+        """Directory is created lazily on first flushed entry."""
+        writer = AuditWriter(self.audit_dir)
+        writer.flush()
+        writer.close()
+
+        self.assertFalse(self.audit_dir.exists())
+
+    def test_invalid_arguments(self):
+        """Invalid sizes are rejected."""
+        with self.assertRaises(AuditWriterError):
+            AuditWriter(self.audit_dir, flush_size=0)
+        with self.assertRaises(AuditWriterError):
+            AuditWriter(self.audit_dir, flush_interval=0)
+
+    def test_shared_writer_per_destination(self):
+        """get_audit_writer returns one writer per directory and prefix."""
+        a = get_audit_writer(self.audit_dir, prefix="x")
+        b = get_audit_writer(self.audit_dir, prefix="x")
+        c = get_audit_writer(self.audit_dir, prefix="y")
+
+        self.assertIs(a, b)
+        self.assertIsNot(a, c)
+
+        a.close()
+        self.assertIsNot(get_audit_writer(self.audit_dir, prefix="x"), a)
+
+
+
+class TestAuditCli(unittest.TestCase):
+    """Test the audit reader CLI."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.audit_dir = self.test_dir / "audit"
+
+    def tearDown(self):
+        """Clean up."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def write_entries(self, prefix, operations):
+        writer = AuditWriter(self.audit_dir, prefix=prefix)
+        for operation in operations:
+            writer.write({'operation': operation})
+        writer.close()
+
+    def run_main(self, *args):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with mock.patch.object(sys, 'argv', ['audit_writer.py', str(self.audit_dir), *args]), \
+                redirect_stdout(stdout), redirect_stderr(stderr):
+            code = main()
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def test_prefix_detected_from_segments(self):
+        """Segments written under another prefix than the directory name are found."""
+        self.write_entries("privacy-audit", ["a", "b"])
+        self.write_entries("privacy-audit", ["c"])
+        self.assertEqual(segment_prefixes(self.audit_dir), ["privacy-audit"])
+
+        code, out, err = self.run_main()
+        self.assertEqual(code, 0)
+        self.assertEqual([json.loads(line)['operation'] for line in out.splitlines()],
+                         ["a", "b", "c"])
+        self.assertEqual(err, "")
+
+    def test_several_prefixes_need_a_choice(self):
+        """Ambiguous directories are refused until --prefix picks a log."""
+        self.write_entries("privacy-audit", ["a"])
+        self.write_entries("privacy_audit", ["b", "c"])
+
+        code, out, err = self.run_main('--count')
+        self.assertEqual(code, 1)
+        self.assertIn("privacy-audit, privacy_audit", err)
+
+        code, out, err = self.run_main('--count', '--prefix', 'privacy_audit')
+        self.assertEqual((code, out.strip(), err), (0, "2", ""))
+
+    def test_warns_when_no_segments_match(self):
+        """A prefix without segments warns instead of silently printing nothing."""
+        self.write_entries("privacy-audit", ["a"])
+        code, out, err = self.run_main('--count', '--prefix', 'audit')
+        self.assertEqual((code, out.strip()), (0, "0"))
+        self.assertIn("No audit segments named audit-", err)
+        self.assertIn("found: privacy-audit", err)
+
+        shutil.rmtree(self.audit_dir)
+        self.audit_dir.mkdir()
+        code, out, err = self.run_main('--count')
+        self.assertEqual((code, out.strip()), (0, "0"))
+        self.assertIn("No audit segments", err)
+
+if __name__ == '__main__':
+    unittest.main()
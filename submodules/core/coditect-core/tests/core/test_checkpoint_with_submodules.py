@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Submodule Checkpoint Manager
+
+Covers dependency levels for nested submodules, bounded commit concurrency,
+per-remote push limits and a full checkpoint against local bare
+repositories used as remotes.
+
+Usage:
+    python -m pytest tests/core/test_checkpoint_with_submodules.py -v
+"""
+
+import importlib.util
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).parent.parent.parent / "scripts" / "checkpoint-with-submodules.py"
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+@pytest.fixture
+def checkpoint(tmp_path, monkeypatch):
+    """Load the checkpoint script as a module (it logs to the working directory)."""
+    monkeypatch.chdir(tmp_path)
+    spec = importlib.util.spec_from_file_location("checkpoint_with_submodules", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def git(repo: Path, *args: str) -> str:
+    """Run a git command in repo."""
+    return subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com",
+         "-c", "protocol.file.allow=always", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def make_remote(tmp_path: Path, name: str) -> Path:
+    """Create a bare repository with one commit on main."""
+    bare = tmp_path / "remotes" / f"{name}.git"
+    bare.mkdir(parents=True)
+    git(bare, "init", "-q", "--bare", "-b", "main")
+    work = tmp_path / "seed" / name
+    work.mkdir(parents=True)
+    git(work, "init", "-q", "-b", "main")
+    (work / "README.md").write_text(f"{name}\n")
+    git(work, "add", "-A")
+    git(work, "commit", "-q", "-m", "initial")
+    git(work, "push", "-q", str(bare), "main")
+    return bare
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """A parent repository with two submodules, each backed by a bare remote."""
+    for var in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(var, "Test")
+    for var in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(var, "test@example.com")
+
+    parent_remote = make_remote(tmp_path, "parent")
+    parent = tmp_path / "parent"
+    git(tmp_path, "clone", "-q", str(parent_remote), str(parent))
+    for name in ("alpha", "beta"):
+        remote = make_remote(tmp_path, name)
+        git(parent, "submodule", "add", "-q", str(remote), f"submodules/{name}")
+    git(parent, "commit", "-q", "-m", "add submodules")
+    git(parent, "push", "-q", "origin", "main")
+    return parent
+
+
+# ============================================================================
+# Scheduling Tests
+# ============================================================================
+
+def test_submodule_levels_order_nested_first(checkpoint):
+    """Nested submodules come before the submodules containing them."""
+    levels = checkpoint.SubmoduleCheckpointManager.submodule_levels([
+        "submodules/core",
+        "submodules/core/vendor/lib",
+        "submodules/core/vendor",
+        "submodules/docs",
+        "submodules/corelib",
+    ])
+
+    assert levels == [
+        ["submodules/core/vendor/lib", "submodules/corelib", "submodules/docs"],
+        ["submodules/core/vendor"],
+        ["submodules/core"],
+    ]
+
+
+def test_commits_run_concurrently_within_bound(checkpoint, tmp_path, monkeypatch):
+    """At most max_parallel submodules are committed at once."""
+    manager = checkpoint.SubmoduleCheckpointManager(repo_root=str(tmp_path), max_parallel=2)
+    lock = threading.Lock()
+    active = peak = 0
+
+    def fake_commit(path, full_path, description):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return path != "submodules/c"
+
+    monkeypatch.setattr(manager, "commit_submodule_changes", fake_commit)
+    modified = {f"submodules/{name}": {"path": tmp_path / name} for name in "abcde"}
+
+    results = manager.commit_submodules(modified, "Sprint")
+
+    assert peak == 2
+    assert results["submodules/a"] and not results["submodules/c"]
+
+
+def test_pushes_limited_per_remote_host(checkpoint, tmp_path, monkeypatch):
+    """Pushes to one host are bounded by pushes_per_remote."""
+    manager = checkpoint.SubmoduleCheckpointManager(
+        repo_root=str(tmp_path), max_parallel=8, pushes_per_remote=1
+    )
+    urls = {"a": "git@github.com:org/a.git", "b": "https://github.com/org/b", "c": "/srv/c.git"}
+    lock = threading.Lock()
+    active = {"github.com": 0, "local": 0}
+    peak = dict(active)
+
+    def fake_run(cmd, cwd=None):
+        return 0, urls[Path(cwd).name] + "\n", ""
+
+    def fake_push(path, full_path):
+        host = manager._remote_key(urls[full_path.name])
+        with lock:
+            active[host] += 1
+            peak[host] = max(peak[host], active[host])
+        time.sleep(0.05)
+        with lock:
+            active[host] -= 1
+        return True
+
+    monkeypatch.setattr(manager, "run_command", fake_run)
+    monkeypatch.setattr(manager, "push_submodule_changes", fake_push)
+    modified = {name: {"path": tmp_path / name} for name in urls}
+
+    assert manager.push_submodules(modified, list(modified)) == {"a": True, "b": True, "c": True}
+    assert peak == {"github.com": 1, "local": 1}
+
+
+# ============================================================================
+# End-to-End Tests
+# ============================================================================
+
+def test_full_checkpoint_pushes_submodules_and_parent(checkpoint, workspace, tmp_path):
+    """Modified submodules are committed and pushed before the parent."""
+    (workspace / "submodules" / "alpha" / "notes.md").write_text("alpha notes\n")
+    (workspace / "submodules" / "beta" / "README.md").write_text("beta changed\n")
+
+    manager = checkpoint.SubmoduleCheckpointManager(repo_root=str(workspace), max_parallel=2)
+    assert manager.run_full_checkpoint("Sprint 1 wrap-up", auto_push=True)
+
+    for name in ("alpha", "beta"):
+        remote = tmp_path / "remotes" / f"{name}.git"
+        local_head = git(workspace / "submodules" / name, "rev-parse", "HEAD").strip()
+        assert git(remote, "rev-parse", "main").strip() == local_head
+        assert "Sprint 1 wrap-up" in git(remote, "log", "-1", "--format=%B", "main")
+
+    parent_remote = tmp_path / "remotes" / "parent.git"
+    assert git(parent_remote, "rev-parse", "main").strip() == git(workspace, "rev-parse", "HEAD").strip()
+    assert git(workspace, "status", "--porcelain", "submodules") == ""
+
+    statuses = {(op["repo"], op["operation"]): op["status"] for op in manager.operations_log}
+    assert statuses[("submodules/alpha", "push")] == "success"
+    assert statuses[("parent", "push")] == "success"
+    assert list((workspace / "MEMORY-CONTEXT" / "audit-logs").glob("*.json"))
+
+
+def test_commit_only_commits_submodules_without_pushing(checkpoint, workspace, tmp_path):
+    """--no-push commits every modified submodule locally."""
+    remote = tmp_path / "remotes" / "alpha.git"
+    before = git(remote, "rev-parse", "main")
+    (workspace / "submodules" / "alpha" / "notes.md").write_text("alpha notes\n")
+
+    manager = checkpoint.SubmoduleCheckpointManager(repo_root=str(workspace))
+    assert manager.run_full_checkpoint("Local only", auto_push=False)
+
+    assert git(workspace / "submodules" / "alpha", "status", "--porcelain") == ""
+    assert git(remote, "rev-parse", "main") == before
+    assert git(workspace, "status", "--porcelain", "submodules") == ""
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Git Repository Scanner
+
+Covers the pruned directory walk, porcelain v2 status parsing, concurrent
+analysis and the HEAD/index status cache, using real repositories created
+in a temporary directory.
+
+Usage:
+    python -m pytest tests/core/test_git_repository_scanner.py -v
+"""
+
+import logging
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts" / "core"))
+
+from git_repository_scanner import GitRepositoryScanner, parse_porcelain_v2
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+logger = logging.getLogger("test-git-scanner")
+
+
+def git(repo: Path, *args: str) -> str:
+    """Run a git command in repo."""
+    return subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def make_repo(path: Path, files=None) -> Path:
+    """Create a repository with one commit."""
+    path.mkdir(parents=True, exist_ok=True)
+    git(path, "init", "-q", "-b", "main")
+    for name, content in (files or {"README.md": "hello\n"}).items():
+        (path / name).write_text(content)
+    git(path, "add", "-A")
+    git(path, "commit", "-q", "-m", "initial")
+    return path
+
+
+@pytest.fixture
+def projects(tmp_path):
+    """A tree with clean, dirty, nested and excluded repositories."""
+    root = tmp_path / "PROJECTS"
+    make_repo(root / "clean")
+    dirty = make_repo(root / "dirty", {"a.txt": "a\n", "b.txt": "b\n"})
+    (dirty / "a.txt").write_text("changed\n")
+    (dirty / "new file.txt").write_text("new\n")
+    make_repo(root / "dirty" / "nested")
+    make_repo(root / "app" / "node_modules" / "dep")
+    return root
+
+
+# ============================================================================
+# Discovery Tests
+# ============================================================================
+
+def test_finds_repositories_and_prunes_excluded(projects):
+    """Nested repos are found; repos under excluded directories are not."""
+    scanner = GitRepositoryScanner(projects, logger)
+    repos = scanner.find_all_repositories()
+
+    names = [repo.name for repo in repos]
+    assert names == ["clean", "dirty", "nested"]
+
+
+def test_custom_exclude_list(projects):
+    """exclude_dirs replaces the default exclusions."""
+    scanner = GitRepositoryScanner(projects, logger, exclude_dirs={"nested"})
+    names = {repo.name for repo in scanner.find_all_repositories()}
+
+    assert names == {"clean", "dirty", "dep"}
+
+
+def test_status_and_branch(projects):
+    """Branch, modified and untracked files come from one status call."""
+    scanner = GitRepositoryScanner(projects, logger, max_workers=2)
+    repos = {repo.name: repo for repo in scanner.find_all_repositories()}
+
+    assert repos["clean"].branch == "main"
+    assert not repos["clean"].is_dirty
+
+    dirty = repos["dirty"]
+    assert dirty.is_dirty and dirty.has_uncommitted
+    assert dirty.modified_files == ["a.txt"]
+    assert set(dirty.untracked_files) == {"new file.txt", "nested/"}
+    assert scanner.get_repositories_with_changes() == [dirty]
+
+
+def test_detached_head_reports_head(projects):
+    """A detached HEAD is reported as "HEAD"."""
+    repo = projects / "clean"
+    git(repo, "checkout", "-q", "--detach")
+
+    scanner = GitRepositoryScanner(projects, logger)
+    repos = {r.name: r for r in scanner.find_all_repositories()}
+    assert repos["clean"].branch == "HEAD"
+
+
+# ============================================================================
+# Cache Tests
+# ============================================================================
+
+def test_status_cache_invalidated_by_index_change(projects):
+    """Cached statuses are reused until HEAD or the index changes."""
+    scanner = GitRepositoryScanner(projects, logger, cache_ttl=60)
+    repo = projects / "clean"
+    scanner.find_all_repositories()
+
+    # Worktree edits alone do not invalidate (until the TTL expires) ...
+    (repo / "README.md").write_text("edited\n")
+    assert scanner._get_status(repo)[1] == []
+
+    # ... but staging them touches the index
+    git(repo, "add", "README.md")
+    assert scanner._get_status(repo)[1] == ["README.md"]
+
+    scanner.invalidate_cache()
+    assert scanner._status_cache == {}
+
+
+def test_cache_disabled(projects):
+    """cache_ttl=0 always runs git status."""
+    scanner = GitRepositoryScanner(projects, logger, cache_ttl=0)
+    repo = projects / "clean"
+    scanner.find_all_repositories()
+
+    (repo / "README.md").write_text("edited\n")
+    assert scanner._get_status(repo)[1] == ["README.md"]
+
+
+# ============================================================================
+# Parser Tests
+# ============================================================================
+
+def test_parse_porcelain_v2_records():
+    """Ordinary, renamed, unmerged and untracked records are parsed."""
+    output = "\0".join([
+        "# branch.oid 1234",
+        "# branch.head feature/x",
+        "1 .M N... 100644 100644 100644 abc abc src/main.py",
+        "2 R. N... 100644 100644 100644 abc abc R100 new name.py",
+        "old name.py",
+        "u UU N... 100644 100644 100644 100644 a b c conflict.txt",
+        "? notes.md",
+        "",
+    ])
+
+    branch, modified, untracked = parse_porcelain_v2(output)
+
+    assert branch == "feature/x"
+    assert modified == ["src/main.py", "new name.py", "conflict.txt"]
+    assert untracked == ["notes.md"]
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Tests for CODITECT Hook Daemon
+
+Tests running hooks through the daemon, in-memory hook state, re-import of
+edited hooks, and the client's in-process fallback.
+
+Author: AZ1.AI CODITECT Team
+Framework: CODITECT
+"""
+
+import io
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add .coditect/hooks to path
+HOOKS_DIR = Path(__file__).parent.parent.parent / ".coditect" / "hooks"
+sys.path.insert(0, str(HOOKS_DIR))
+
+import hook_state
+from hook_client import main as client_main, run_in_process, send_request
+from hook_daemon import HookDaemon, pidfile_path
+
+COUNTER_HOOK = '''
+import json
+import sys
+from pathlib import Path
+
+from hook_state import get_instance
+
+
+class Counter:
+    def __init__(self, repo_root):
+        self.state_file = Path(repo_root) / "counter.json"
+        self.loads = 1
+        self.count = json.loads(self.state_file.read_text())["count"] if self.state_file.exists() else 0
+
+    def bump(self):
+        self.count += 1
+        self.state_file.write_text(json.dumps({"count": self.count}))
+
+
+def main():
+    hook_input = json.loads(sys.stdin.read())
+    counter = get_instance(Counter, str(Path(__file__).parent))
+    counter.bump()
+    print(json.dumps({"continue": True, "count": counter.count, "tool": hook_input.get("tool_name")}))
+    sys.exit(3 if hook_input.get("fail") else 0)
+
+
+if __name__ == '__main__':
+    main()
+'''
+
+
+class TestHookDaemon(unittest.TestCase):
+    """Test hook daemon request handling."""
+
+    def setUp(self):
+        """Start a daemon serving a temporary hooks directory."""
+        # Short path: Unix socket paths are limited to ~104 bytes
+        self.test_dir = Path(tempfile.mkdtemp(prefix="hk", dir="/tmp"))
+        (self.test_dir / "counter_hook.py").write_text(COUNTER_HOOK)
+        self.socket_path = str(self.test_dir / "d.sock")
+
+        self.daemon = HookDaemon(self.test_dir, self.socket_path, idle_timeout=30)
+        self.assertTrue(self.daemon.bind())
+        self.thread = threading.Thread(target=self.daemon.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        """Stop the daemon and clean up."""
+        send_request(self.socket_path, {'op': 'stop'}, timeout=5)
+        self.thread.join(5)
+        hook_state.PERSISTENT = False
+        hook_state.clear()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def run_hook(self, hook_input, hook='counter_hook'):
+        return send_request(
+            self.socket_path,
+            {'op': 'run', 'hook': hook},
+            json.dumps(hook_input).encode(),
+            timeout=10,
+        )
+
+    def test_run_hook_relays_output_and_exit_code(self):
+        """Test stdout and exit code of main() are returned."""
+        response = self.run_hook({'tool_name': 'Bash'})
+        self.assertEqual(response['exit_code'], 0)
+        self.assertEqual(json.loads(response['stdout'])['tool'], 'Bash')
+
+        response = self.run_hook({'tool_name': 'Bash', 'fail': True})
+        self.assertEqual(response['exit_code'], 3)
+
+    def test_state_kept_in_memory(self):
+        """Test hook state objects are reused across events."""
+        for expected in range(1, 4):
+            response = self.run_hook({'tool_name': 'Read'})
+            self.assertEqual(json.loads(response['stdout'])['count'], expected)
+
+        # State is still persisted for standalone runs
+        state = json.loads((self.test_dir / "counter.json").read_text())
+        self.assertEqual(state['count'], 3)
+        self.assertEqual(len(hook_state._instances), 1)
+
+    def test_edited_hook_reimported(self):
+        """Test a changed hook file is re-imported on next use."""
+        self.run_hook({'tool_name': 'Read'})
+
+        hook_path = self.test_dir / "counter_hook.py"
+        hook_path.write_text(COUNTER_HOOK.replace('"continue": True', '"continue": True, "v": 2'))
+        os.utime(hook_path, (time.time() + 5, time.time() + 5))
+
+        response = self.run_hook({'tool_name': 'Read'})
+        output = json.loads(response['stdout'])
+        self.assertEqual(output['v'], 2)
+        # New class object: state reloaded from the state file
+        self.assertEqual(output['count'], 2)
+
+    def test_script_without_main(self):
+        """Test scripts without main() run as __main__ on every event."""
+        (self.test_dir / "plain_hook.py").write_text(textwrap.dedent('''
+            import json, sys
+            data = json.loads(sys.stdin.read())
+            print(json.dumps({"echo": data["n"]}))
+        '''))
+
+        for n in (1, 2):
+            response = self.run_hook({'n': n}, hook='plain_hook')
+            self.assertEqual(json.loads(response['stdout']), {'echo': n})
+
+    def test_unknown_hook_rejected(self):
+        """Test unknown or non-hook names are rejected."""
+        self.assertEqual(self.run_hook({}, hook='missing_hook')['exit_code'], 1)
+        self.assertEqual(self.run_hook({}, hook='../etc/passwd')['exit_code'], 1)
+
+    def test_stats(self):
+        """Test per-hook statistics."""
+        self.run_hook({'tool_name': 'Read'})
+        stats = send_request(self.socket_path, {'op': 'stats'}, timeout=5)
+        self.assertEqual(stats['hooks']['counter_hook']['count'], 1)
+        self.assertIn('counter_hook', stats['loaded_hooks'])
+
+    def test_second_daemon_refuses_live_socket(self):
+        """Test a second daemon does not steal a live socket."""
+        other = HookDaemon(self.test_dir, self.socket_path)
+        self.assertFalse(other.bind())
+
+        pid = (self.test_dir / "d.pid").read_text().strip()
+        self.assertEqual(pid, str(os.getpid()))
+        self.assertEqual(pidfile_path(self.socket_path), str(self.test_dir / "d.pid"))
+
+    def test_busy_daemon_keeps_its_socket(self):
+        """Test a daemon busy with a slow hook is not replaced."""
+        (self.test_dir / "slow_hook.py").write_text(textwrap.dedent('''
+            import time
+            def main():
+                time.sleep(3)
+                print("done")
+        '''))
+        results = []
+        runner = threading.Thread(
+            target=lambda: results.append(self.run_hook({}, hook='slow_hook')))
+        runner.start()
+        time.sleep(0.2)
+
+        # A ping gets no answer while the hook runs, but the daemon still holds the lock
+        self.assertIsNone(send_request(self.socket_path, {'op': 'ping'}, timeout=0.5))
+        inode = os.stat(self.socket_path).st_ino
+        other = HookDaemon(self.test_dir, self.socket_path)
+        self.assertFalse(other.bind())
+        other.close()
+        self.assertEqual(os.stat(self.socket_path).st_ino, inode)
+
+        runner.join(10)
+        self.assertEqual(results[0]['stdout'], 'done\n')
+        self.assertEqual(self.run_hook({'tool_name': 'Read'})['exit_code'], 0)
+
+    def test_close_leaves_a_replaced_socket(self):
+        """Test close() only removes the socket file this daemon bound."""
+        socket_path = str(self.test_dir / "e.sock")
+        daemon = HookDaemon(self.test_dir, socket_path)
+        self.assertTrue(daemon.bind())
+
+        os.unlink(socket_path)
+        replacement = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(replacement.close)
+        replacement.bind(socket_path)
+        daemon.close()
+        self.assertTrue(os.path.exists(socket_path))
+
+        # The lock is released: a new daemon can take over
+        other = HookDaemon(self.test_dir, socket_path)
+        self.assertTrue(other.bind())
+        other.close()
+        self.assertFalse(os.path.exists(socket_path))
+
+    def test_stale_socket_replaced(self):
+        """Test a socket left by a dead daemon is replaced."""
+        send_request(self.socket_path, {'op': 'stop'}, timeout=5)
+        self.thread.join(5)
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.socket_path)
+        stale.close()
+
+        daemon = HookDaemon(self.test_dir, self.socket_path)
+        self.assertTrue(daemon.bind())
+        self.addCleanup(daemon.close)
+        self.assertNotEqual(daemon.socket_inode, None)
+        self.assertEqual(os.stat(self.socket_path).st_ino, daemon.socket_inode)
+
+
+class TestHookClientFallback(unittest.TestCase):
+    """Test the client without a running daemon."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="hk", dir="/tmp"))
+        (self.test_dir / "counter_hook.py").write_text(COUNTER_HOOK)
+        self.saved = (sys.stdin, sys.stdout)
+
+    def tearDown(self):
+        """Clean up."""
+        sys.stdin, sys.stdout = self.saved
+        os.environ.pop('CODITECT_HOOK_SOCKET', None)
+        os.environ.pop('CODITECT_HOOK_AUTOSTART', None)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_run_in_process(self):
+        """Test hooks run in-process when the daemon is absent."""
+        sys.stdout = io.StringIO()
+        code = run_in_process('counter_hook', b'{"tool_name": "Edit"}', str(self.test_dir))
+        output = sys.stdout.getvalue()
+        sys.stdout = self.saved[1]
+
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(output)['count'], 1)
+
+    def test_client_falls_back_without_daemon(self):
+        """Test the client runs the hook itself when nothing listens."""
+        os.environ['CODITECT_HOOK_SOCKET'] = str(self.test_dir / "none.sock")
+        os.environ['CODITECT_HOOK_AUTOSTART'] = '0'
+
+        stdin = io.TextIOWrapper(io.BytesIO(b'{"tool_name": "Bash"}'))
+        sys.stdin = stdin
+        sys.stdout = io.StringIO()
+        # enhance_prompt passes an empty prompt straight through
+        code = client_main(['enhance_prompt'])
+        output = sys.stdout.getvalue()
+        sys.stdout = self.saved[1]
+
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(output), {'continue': True})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Tests for CODITECT Hook Latency Sketches
+
+Tests sketch accuracy and merging, event log replay and compaction, and the
+profiler/monitoring snapshot + replay cycle.
+
+Author: AZ1.AI CODITECT Team
+Framework: CODITECT
+"""
+
+import json
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add .coditect/hooks to path
+HOOKS_DIR = Path(__file__).parent.parent.parent / ".coditect" / "hooks"
+sys.path.insert(0, str(HOOKS_DIR))
+
+import performance_profiling
+from latency_sketch import EventLog, LatencySketch
+from monitoring_observability import MonitoringObservability
+from performance_profiling import PerformanceProfiler, merge_session_sketches
+
+
+def exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class TestLatencySketch(unittest.TestCase):
+    """Test quantile accuracy, merging and serialization"""
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.values = [rng.lognormvariate(-4, 1.2) for _ in range(20000)]
+
+    def test_quantiles_within_relative_accuracy(self):
+        sketch = LatencySketch(relative_accuracy=0.01)
+        for value in self.values:
+            sketch.add(value)
+
+        for q in (0.5, 0.9, 0.95, 0.99):
+            expected = exact_quantile(self.values, q)
+            self.assertAlmostEqual(sketch.quantile(q) / expected, 1.0, delta=0.011)
+
+        self.assertEqual(sketch.count, len(self.values))
+        self.assertAlmostEqual(sketch.mean, sum(self.values) / len(self.values))
+
+    def test_merge_matches_single_sketch(self):
+        whole = LatencySketch()
+        left, right = LatencySketch(), LatencySketch()
+        for i, value in enumerate(self.values):
+            whole.add(value)
+            (left if i % 2 else right).add(value)
+
+        left.merge(right)
+
+        self.assertEqual(left.buckets, whole.buckets)
+        self.assertEqual(left.quantile(0.99), whole.quantile(0.99))
+        self.assertEqual(left.max, whole.max)
+
+    def test_merge_rejects_different_accuracy(self):
+        with self.assertRaises(ValueError):
+            LatencySketch(0.01).merge(LatencySketch(0.02))
+
+    def test_memory_is_bounded(self):
+        sketch = LatencySketch(max_buckets=64)
+        for exponent in range(-6, 4):
+            for step in range(1, 100):
+                sketch.add(step * 10.0 ** exponent)
+
+        self.assertLessEqual(len(sketch.buckets), 64)
+        # Collapsing folds low buckets upward; the tail stays accurate
+        self.assertAlmostEqual(sketch.quantile(1.0), 99000.0)
+
+    def test_round_trip(self):
+        sketch = LatencySketch()
+        for value in self.values[:100]:
+            sketch.add(value)
+
+        restored = LatencySketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+
+        self.assertEqual(restored.buckets, sketch.buckets)
+        self.assertEqual(restored.quantile(0.95), sketch.quantile(0.95))
+        self.assertEqual(LatencySketch().quantile(0.5), 0.0)
+
+
+class TestEventLog(unittest.TestCase):
+    """Test append, offset-tracked replay and compaction"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = Path(self.temp_dir) / "events.jsonl"
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_reads_only_new_events(self):
+        writer, reader = EventLog(self.path), EventLog(self.path)
+        writer.append({'n': 1})
+        writer.append({'n': 2})
+
+        self.assertEqual([e['n'] for e in reader.read_new()], [1, 2])
+        self.assertEqual(reader.read_new(), [])
+
+        writer.append({'n': 3})
+        self.assertEqual([e['n'] for e in reader.read_new()], [3])
+
+    def test_resume_from_position(self):
+        log = EventLog(self.path)
+        log.append({'n': 1})
+        log.read_new()
+        position = log.position
+        log.append({'n': 2})
+
+        resumed = EventLog(self.path)
+        resumed.seek(*position)
+        self.assertEqual([e['n'] for e in resumed.read_new()], [2])
+
+    def test_partial_line_left_for_next_read(self):
+        log = EventLog(self.path)
+        log.append({'n': 1})
+        with open(self.path, 'ab') as f:
+            f.write(b'{"n": 2')
+
+        self.assertEqual([e['n'] for e in log.read_new()], [1])
+
+        # A torn line is terminated before the next append
+        log.append({'n': 3})
+        self.assertEqual([e['n'] for e in log.read_new()], [3])
+
+    def test_compaction_restarts_readers(self):
+        log, other = EventLog(self.path, max_bytes=5), EventLog(self.path)
+        log.append({'n': 1})
+        other.read_new()
+        log.read_new()
+        self.assertTrue(log.should_compact())
+
+        log.compact()
+        log.append({'n': 2})
+
+        self.assertEqual([e['n'] for e in other.read_new()], [2])
+
+
+class TestPerformanceProfiler(unittest.TestCase):
+    """Test the profiler's event log, snapshots and session reports"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        (Path(self.temp_dir) / '.coditect' / 'hooks').mkdir(parents=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_snapshot_written_periodically(self):
+        profiler = PerformanceProfiler(self.temp_dir)
+        written = [
+            profiler.record_execution('Bash', 'PostToolUse', 0.01)
+            for _ in range(performance_profiling.SNAPSHOT_EVERY)
+        ]
+
+        self.assertEqual(written.count(True), 1)
+        self.assertTrue(written[-1])
+        self.assertTrue(profiler.profile_file.exists())
+
+    def test_replays_events_after_snapshot(self):
+        profiler = PerformanceProfiler(self.temp_dir)
+        for i in range(30):
+            profiler.record_execution('Bash', 'PostToolUse', 0.001 * (i + 1))
+        profiler.save_profiles()
+        for _ in range(5):
+            profiler.record_execution('Bash', 'PostToolUse', 0.5)
+
+        reloaded = PerformanceProfiler(self.temp_dir)
+        profile = reloaded.profiles['PostToolUse_Bash']
+
+        self.assertEqual(profile['count'], 35)
+        self.assertEqual(profile['max_time'], 0.5)
+        self.assertEqual(list(profile['recent'])[-1], 0.5)
+
+    def test_compaction_keeps_totals(self):
+        profiler = PerformanceProfiler(self.temp_dir)
+        profiler.event_log.max_bytes = 200
+        for _ in range(10):
+            profiler.record_execution('Read', 'PreToolUse', 0.002)
+        profiler.save_profiles()
+
+        self.assertEqual(profiler.event_log.path.stat().st_size, 0)
+        profiler.record_execution('Read', 'PreToolUse', 0.002)
+
+        reloaded = PerformanceProfiler(self.temp_dir)
+        self.assertEqual(reloaded.profiles['PreToolUse_Read']['count'], 11)
+
+    def test_converts_legacy_profiles(self):
+        legacy = {
+            'PostToolUse_Bash': {
+                'executions': [{'timestamp': '2025-01-01T00:00:00', 'duration': d, 'details': {}}
+                               for d in (0.1, 0.2, 0.3)],
+                'total_time': 0.6, 'count': 3, 'min_time': 0.1, 'max_time': 0.3,
+                'avg_time': 0.2, 'p95_time': 0.3, 'p99_time': 0.3, 'recent_trend': 'stable'
+            }
+        }
+        profile_file = Path(self.temp_dir) / '.coditect' / 'hooks' / '.performance-profile.json'
+        profile_file.write_text(json.dumps(legacy))
+
+        profile = PerformanceProfiler(self.temp_dir).profiles['PostToolUse_Bash']
+
+        self.assertEqual(profile['count'], 3)
+        self.assertEqual(profile['sketch'].count, 3)
+        self.assertEqual(list(profile['recent']), [0.1, 0.2, 0.3])
+
+    def test_merges_sketches_across_sessions_and_files(self):
+        profiler = PerformanceProfiler(self.temp_dir)
+        for session, duration in (('a', 0.01), ('b', 0.02), ('c', 0.04)):
+            for _ in range(10):
+                profiler.record_execution('Bash', 'PostToolUse', duration, session_id=session)
+        profiler.save_profiles()
+        snapshot = json.loads(profiler.profile_file.read_text())
+
+        other = json.loads(json.dumps(snapshot))
+        other['sessions'] = {'remote': other['sessions']['a']}
+
+        merged = merge_session_sketches([snapshot, other])
+        self.assertEqual(merged['PostToolUse_Bash'].count, 40)
+
+        only_b = merge_session_sketches([snapshot], session_ids=['b'])
+        self.assertAlmostEqual(only_b['PostToolUse_Bash'].quantile(0.5), 0.02, delta=0.0002)
+
+        latest = merge_session_sketches([snapshot], last=1)
+        self.assertAlmostEqual(latest['PostToolUse_Bash'].max, 0.04)
+
+
+class TestMonitoringObservability(unittest.TestCase):
+    """Test trace replay and periodic metrics snapshots"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        (Path(self.temp_dir) / '.coditect' / 'hooks').mkdir(parents=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def record(self, monitor, tool='Bash', status='success'):
+        data = monitor.monitor_execution({'event': 'PostToolUse', 'tool_name': tool})
+        return monitor.record_completion(data, status=status)
+
+    def test_metrics_not_rewritten_per_event(self):
+        monitor = MonitoringObservability(self.temp_dir)
+        self.assertFalse(self.record(monitor))
+
+        self.assertFalse(monitor.metrics_file.exists())
+        self.assertTrue(monitor.trace_file.exists())
+        self.assertEqual(monitor.metrics['total_executions'], 1)
+
+    def test_counters_rebuilt_from_snapshot_and_traces(self):
+        monitor = MonitoringObservability(self.temp_dir)
+        for _ in range(3):
+            self.record(monitor)
+        monitor.save_metrics()
+        self.record(monitor, tool='Read', status='error')
+
+        reloaded = MonitoringObservability(self.temp_dir)
+
+        self.assertEqual(reloaded.metrics['total_executions'], 4)
+        self.assertEqual(reloaded.metrics['errors'], 1)
+        self.assertEqual(reloaded.metrics['by_tool']['Bash']['count'], 3)
+        self.assertEqual(reloaded.metrics['hooks_executed']['PostToolUse_Read']['errors'], 1)
+        self.assertEqual(reloaded.sketches['PostToolUse_Bash'].count, 3)
+        self.assertIn('p95_time_ms', reloaded.get_performance_summary()['slowest_hooks'][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,6 +15,7 @@ Date: 2025-11-22
 import os
 import sys
 import json
+import base64
 import pytest
 import tempfile
 import jwt
@@ -59,7 +60,7 @@ def license_manager(temp_db):
     return LicenseManager(
         db_path=temp_db,
         secret_key="test_secret_key_12345",
-        encryption_key=b'test_encryption_key_1234567890123456789012345678'[:32]
+        encryption_key=base64.urlsafe_b64encode(b'test_encryption_key_1234567890123456789012345678'[:32])
     )
 
 
@@ -71,7 +72,7 @@ class TestLicenseManagerInitialization:
         lm = LicenseManager(
             db_path=temp_db,
             secret_key="test_key",
-            encryption_key=b'a' * 32
+            encryption_key=base64.urlsafe_b64encode(b'a' * 32)
         )
 
         assert lm.db_path == temp_db
@@ -297,13 +298,20 @@ class TestQuotaManagement:
             organization="Projects Org"
         )
 
-        # Set 25 projects
-        license_manager.record_usage(license_key, "project", count=25)
-
-        # Should be at limit
+        # 24 projects: one more still fits
+        license_manager.record_usage(license_key, "project", count=24)
         assert license_manager.check_quota(license_key, "project") is True
 
-        # Adding one more should fail
+        # The 25th project is the last one allowed
+        assert license_manager.check_and_record(license_key, "project") is True
+        assert license_manager.get_license_info(license_key)['current_usage']['projects_count'] == 25
+
+        # At the limit, no further project fits
+        with pytest.raises(QuotaExceededError, match=r"Project quota exceeded \(25/25\)"):
+            license_manager.check_quota(license_key, "project")
+        with pytest.raises(QuotaExceededError, match="Project quota exceeded"):
+            license_manager.check_and_record(license_key, "project")
+
         license_manager.record_usage(license_key, "project", count=26)
         with pytest.raises(QuotaExceededError, match="Project quota exceeded"):
             license_manager.check_quota(license_key, "project")
@@ -316,13 +324,20 @@ class TestQuotaManagement:
             organization="Users Org"
         )
 
-        # Set 10 users
-        license_manager.record_usage(license_key, "user", count=10)
-
-        # Should be at limit
+        # 9 users: one more still fits
+        license_manager.record_usage(license_key, "user", count=9)
         assert license_manager.check_quota(license_key, "user") is True
 
-        # Adding one more should fail
+        # The 10th user is the last one allowed
+        assert license_manager.check_and_record(license_key, "user") is True
+        assert license_manager.get_license_info(license_key)['current_usage']['active_users_count'] == 10
+
+        # At the limit, no further user fits
+        with pytest.raises(QuotaExceededError, match=r"User quota exceeded \(10/10\)"):
+            license_manager.check_quota(license_key, "user")
+        with pytest.raises(QuotaExceededError, match="User quota exceeded"):
+            license_manager.check_and_record(license_key, "user")
+
         license_manager.record_usage(license_key, "user", count=11)
         with pytest.raises(QuotaExceededError, match="User quota exceeded"):
             license_manager.check_quota(license_key, "user")
@@ -627,5 +642,229 @@ class TestErrorHandling:
         assert info['current_usage']['ai_operations_today'] == 10
 
 
+
+class TestHotPathCaching:
+    """Test in-memory caches, write-behind usage and atomic check-and-record."""
+
+    def _usage_row(self, temp_db):
+        import sqlite3
+        conn = sqlite3.connect(str(temp_db))
+        row = conn.execute(
+            "SELECT ai_operations_count, projects_count FROM license_usage"
+        ).fetchone()
+        conn.close()
+        return row
+
+    def test_token_cache_reuses_decoded_payload(self, license_manager):
+        """Test a validated token is not decoded again."""
+        license_key = license_manager.generate_license(
+            tier=LicenseTier.PRO,
+            user_email="cache@example.com",
+            organization="Cache Org"
+        )
+
+        license_manager.validate_license(license_key)
+        with patch('license_manager.jwt.decode') as decode:
+            for _ in range(5):
+                license_manager.check_quota(license_key, "ai_operation")
+            decode.assert_not_called()
+
+    def test_usage_buffered_until_flush(self, license_manager, temp_db):
+        """Test usage is visible immediately but persisted in batches."""
+        license_key = license_manager.generate_license(
+            tier=LicenseTier.PRO,
+            user_email="flush@example.com",
+            organization="Flush Org"
+        )
+
+        license_manager.record_usage(license_key, "ai_operation", count=3)
+        license_manager.record_usage(license_key, "project", count=2)
+
+        info = license_manager.get_license_info(license_key)
+        assert info['current_usage']['ai_operations_today'] == 3
+        assert self._usage_row(temp_db) is None
+
+        assert license_manager.flush_usage() == 1
+        assert tuple(self._usage_row(temp_db)) == (3, 2)
+
+        license_manager.record_usage(license_key, "ai_operation", count=2)
+        license_manager.flush_usage()
+        assert tuple(self._usage_row(temp_db)) == (5, 2)
+
+    def test_flush_triggered_by_batch_size(self, license_manager, temp_db):
+        """Test reaching USAGE_FLUSH_BATCH writes usage automatically."""
+        license_key = license_manager.generate_license(
+            tier=LicenseTier.PRO,
+            user_email="batch@example.com",
+            organization="Batch Org"
+        )
+
+        license_manager.USAGE_FLUSH_BATCH = 5
+        for _ in range(5):
+            license_manager.record_usage(license_key, "ai_operation")
+
+        assert self._usage_row(temp_db)[0] == 5
+
+    def test_usage_survives_new_manager(self, license_manager, temp_db):
+        """Test a second manager sees flushed usage."""
+        license_key = license_manager.generate_license(
+            tier=LicenseTier.PRO,
+            user_email="restart@example.com",
+            organization="Restart Org"
+        )
+        license_manager.record_usage(license_key, "ai_operation", count=7)
+        license_manager.close()
+
+        other = LicenseManager(
+            db_path=temp_db,
+            secret_key="test_secret_key_12345",
+            encryption_key=base64.urlsafe_b64encode(b'test_encryption_key_1234567890123456789012345678'[:32])
+        )
+        info = other.get_license_info(license_key)
+        assert info['current_usage']['ai_operations_today'] == 7
+        other.close()
+
+    def test_check_and_record_enforces_quota(self, license_manager):
+        """Test check_and_record reserves usage up to the limit only."""
+        license_key = license_manager.generate_license(
+            tier=LicenseTier.FREE,
+            user_email="atomic@example.com",
+            organization="Atomic Org"
+        )
+        limit = TIER_CONFIGS[LicenseTier.FREE].max_ai_operations_per_day
+
+        for _ in range(limit):
+            assert license_manager.check_and_record(license_key, "ai_operation")
+
+        with pytest.raises(QuotaExceededError):
+            license_manager.check_and_record(license_key, "ai_operation")
+
+        info = license_manager.get_license_info(license_key)
+        assert info['current_usage']['ai_operations_today'] == limit
+
+    def test_check_and_record_concurrent(self, license_manager):
+        """Test concurrent callers cannot jointly exceed the quota."""
+        import threading
+
+        license_key = license_manager.generate_license(
+            tier=LicenseTier.FREE,
+            user_email="race@example.com",
+            organization="Race Org"
+        )
+        limit = TIER_CONFIGS[LicenseTier.FREE].max_ai_operations_per_day
+        granted = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(limit):
+                try:
+                    license_manager.check_and_record(license_key, "ai_operation")
+                except QuotaExceededError:
+                    continue
+                with lock:
+                    granted.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(granted) == limit
+        license_manager.flush_usage()
+        info = license_manager.get_license_info(license_key)
+        assert info['current_usage']['ai_operations_today'] == limit
+
+    def _expire_usage_counters(self, license_manager):
+        """Make the next quota check reload usage from the database."""
+        for counter in license_manager._usage.values():
+            counter.loaded_at = float('-inf')
+
+    def test_reload_during_flush_counts_inflight_usage(self, license_manager):
+        """Test a reload between flush snapshot and commit cannot exceed quota."""
+        from contextlib import contextmanager
+
+        license_key = license_manager.generate_license(
+            tier=LicenseTier.FREE,
+            user_email="inflight@example.com",
+            organization="Inflight Org"
+        )
+        limit = TIER_CONFIGS[LicenseTier.FREE].max_ai_operations_per_day
+        for _ in range(limit - 1):
+            license_manager.check_and_record(license_key, "ai_operation")
+        license_manager.flush_usage()
+        license_manager.check_and_record(license_key, "ai_operation")
+
+        real_connection = license_manager._connection
+        intercepted = []
+
+        @contextmanager
+        def connection():
+            # The first borrow is the flush write; check quota before it commits
+            if not intercepted:
+                intercepted.append(True)
+                self._expire_usage_counters(license_manager)
+                with pytest.raises(QuotaExceededError):
+                    license_manager.check_and_record(license_key, "ai_operation")
+            with real_connection() as conn:
+                yield conn
+
+        with patch.object(license_manager, '_connection', connection):
+            assert license_manager.flush_usage() == 1
+        assert intercepted
+
+        # The reload above ran before the commit; counts stay exact afterwards
+        with pytest.raises(QuotaExceededError):
+            license_manager.check_and_record(license_key, "ai_operation")
+        info = license_manager.get_license_info(license_key)
+        assert info['current_usage']['ai_operations_today'] == limit
+
+    def test_failed_flush_keeps_usage_counted(self, license_manager, temp_db):
+        """Test usage of a failed flush is retried and never lost from quota."""
+        import sqlite3
+        from contextlib import contextmanager
+
+        license_key = license_manager.generate_license(
+            tier=LicenseTier.FREE,
+            user_email="retry@example.com",
+            organization="Retry Org"
+        )
+        limit = TIER_CONFIGS[LicenseTier.FREE].max_ai_operations_per_day
+        for _ in range(limit):
+            license_manager.check_and_record(license_key, "ai_operation")
+
+        @contextmanager
+        def broken_connection():
+            raise sqlite3.OperationalError("database is locked")
+            yield
+
+        with patch.object(license_manager, '_connection', broken_connection):
+            with pytest.raises(DatabaseError):
+                license_manager.flush_usage()
+
+        self._expire_usage_counters(license_manager)
+        with pytest.raises(QuotaExceededError):
+            license_manager.check_and_record(license_key, "ai_operation")
+
+        assert license_manager.flush_usage() == 1
+        assert self._usage_row(temp_db)[0] == limit
+
+    def test_suspend_invalidates_cached_license(self, license_manager):
+        """Test status changes take effect despite the license cache."""
+        license_key = license_manager.generate_license(
+            tier=LicenseTier.PRO,
+            user_email="invalidate@example.com",
+            organization="Invalidate Org"
+        )
+        license_manager.validate_license(license_key)
+
+        license_manager.suspend_license(license_key)
+        with pytest.raises(LicenseValidationError, match="suspended"):
+            license_manager.validate_license(license_key)
+
+        license_manager.activate_license(license_key)
+        assert license_manager.validate_license(license_key) is True
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v', '--tb=short'])
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Tests for CODITECT Non-Blocking Logging Pipeline
+
+Tests the drop-debug-first queue policy, batched handler delivery, batched
+structured uploads through the local stand-in sink, and UnifiedLogger
+integration.
+
+Author: AZ1.AI CODITECT Team
+Framework: CODITECT
+"""
+
+import unittest
+import sys
+import io
+import json
+import logging
+import tempfile
+import shutil
+from pathlib import Path
+
+# Add scripts/core to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts" / "core"))
+
+from log_pipeline import (
+    DropDebugFirstQueue, LogPipeline, LocalStructuredSink, StructuredBatchHandler
+)
+from rolling_log_handler import read_last_lines
+from unified_logger import UnifiedLogger
+
+
+def make_record(level: int, msg: str) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 0, msg, None, None)
+
+
+class CountingHandler(logging.Handler):
+    """Handler recording the batches it receives."""
+
+    def __init__(self, level=logging.DEBUG):
+        super().__init__(level)
+        self.batches = []
+
+    def emit(self, record):
+        self.batches.append([record.getMessage()])
+
+    def emit_batch(self, records):
+        self.batches.append([r.getMessage() for r in records])
+
+
+class TestDropDebugFirstQueue(unittest.TestCase):
+    """Test the backpressure policy."""
+
+    def test_preserves_submission_order(self):
+        q = DropDebugFirstQueue(capacity=10)
+        for level, msg in [(logging.INFO, 'a'), (logging.DEBUG, 'b'), (logging.INFO, 'c')]:
+            q.put_nowait(make_record(level, msg))
+
+        self.assertEqual([r.msg for r in q.get_batch(10)], ['a', 'b', 'c'])
+
+    def test_incoming_debug_dropped_when_full(self):
+        q = DropDebugFirstQueue(capacity=2)
+        q.put_nowait(make_record(logging.INFO, 'a'))
+        q.put_nowait(make_record(logging.INFO, 'b'))
+        q.put_nowait(make_record(logging.DEBUG, 'c'))
+
+        self.assertEqual(len(q), 2)
+        self.assertEqual(q.dropped['DEBUG'], 1)
+
+    def test_queued_debug_evicted_for_info(self):
+        q = DropDebugFirstQueue(capacity=2)
+        q.put_nowait(make_record(logging.DEBUG, 'a'))
+        q.put_nowait(make_record(logging.INFO, 'b'))
+        q.put_nowait(make_record(logging.INFO, 'c'))
+
+        self.assertEqual([r.msg for r in q.get_batch(10)], ['b', 'c'])
+        self.assertEqual(q.dropped['DEBUG'], 1)
+
+    def test_info_dropped_without_debug_to_evict(self):
+        q = DropDebugFirstQueue(capacity=1)
+        q.put_nowait(make_record(logging.INFO, 'a'))
+        q.put_nowait(make_record(logging.INFO, 'b'))
+
+        self.assertEqual(q.dropped['INFO'], 1)
+
+    def test_error_waits_then_drops_on_timeout(self):
+        q = DropDebugFirstQueue(capacity=1, block_timeout=0.01)
+        q.put_nowait(make_record(logging.INFO, 'a'))
+        q.put_nowait(make_record(logging.ERROR, 'b'))
+
+        self.assertEqual(q.dropped['ERROR'], 1)
+
+    def test_sentinel_bypasses_capacity(self):
+        q = DropDebugFirstQueue(capacity=1)
+        q.put_nowait(make_record(logging.INFO, 'a'))
+        q.put_nowait(None)
+
+        self.assertEqual(len(q), 2)
+
+
+class TestLogPipeline(unittest.TestCase):
+    """Test batched delivery to handlers."""
+
+    def test_batches_and_respects_handler_level(self):
+        debug_handler = CountingHandler(logging.DEBUG)
+        info_handler = CountingHandler(logging.INFO)
+        pipeline = LogPipeline([debug_handler, info_handler])
+
+        logger = logging.getLogger("test-pipeline-levels")
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(pipeline.queue_handler)
+        try:
+            for i in range(50):
+                logger.debug(f"d{i}")
+                logger.info(f"i{i}")
+            self.assertTrue(pipeline.flush())
+        finally:
+            logger.removeHandler(pipeline.queue_handler)
+            pipeline.stop()
+
+        debug_msgs = [m for batch in debug_handler.batches for m in batch]
+        info_msgs = [m for batch in info_handler.batches for m in batch]
+        self.assertEqual(len(debug_msgs), 100)
+        self.assertEqual(info_msgs, [f"i{i}" for i in range(50)])
+
+    def test_stream_handler_gets_all_records(self):
+        stream = io.StringIO()
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        pipeline = LogPipeline([handler])
+
+        for i in range(10):
+            pipeline.queue_handler.handle(make_record(logging.INFO, f"m{i}"))
+        pipeline.stop()
+
+        self.assertEqual(stream.getvalue().splitlines(), [f"m{i}" for i in range(10)])
+
+    def test_structured_batch_upload(self):
+        sink = LocalStructuredSink()
+        pipeline = LogPipeline([StructuredBatchHandler(sink, resource={'type': 'test'})])
+
+        for i in range(5):
+            record = make_record(logging.INFO, f"m{i}")
+            record.structured = {'message': f"m{i}", 'severity': 'INFO'}
+            pipeline.queue_handler.handle(record)
+        pipeline.stop()
+
+        self.assertEqual([e['payload']['message'] for e in sink.entries], [f"m{i}" for i in range(5)])
+        self.assertLessEqual(sink.commits, 5)
+        self.assertEqual(sink.entries[0]['resource'], {'type': 'test'})
+
+
+class TestUnifiedLoggerPipeline(unittest.TestCase):
+    """Test UnifiedLogger on top of the pipeline."""
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_local_file_written_after_flush(self):
+        log_file = self.test_dir / "component.log"
+        ul = UnifiedLogger("component", log_file=log_file, force_environment="local",
+                           console_level=logging.CRITICAL)
+        try:
+            ul.info("hello", operation="op")
+            self.assertTrue(ul.flush())
+
+            last = read_last_lines(log_file, 1)[0]
+            payload = json.loads(last.split(" - ", 3)[3])
+            self.assertEqual(payload['message'], 'hello')
+            self.assertEqual(payload['operation'], 'op')
+        finally:
+            ul.close()
+
+    def test_structured_stand_in_sink(self):
+        sink = LocalStructuredSink()
+        ul = UnifiedLogger("component", structured_logger=sink)
+        try:
+            ul.warning("careful", metadata={'k': 'v'})
+            ul.flush()
+        finally:
+            ul.close()
+
+        messages = [e['payload']['message'] for e in sink.entries]
+        self.assertIn('careful', messages)
+        entry = next(e for e in sink.entries if e['payload']['message'] == 'careful')
+        self.assertEqual(entry['severity'], 'WARNING')
+        self.assertEqual(entry['payload']['metadata'], {'k': 'v'})
+        self.assertEqual(entry['resource']['type'], 'k8s_pod')
+
+
+if __name__ == '__main__':
+    unittest.main()
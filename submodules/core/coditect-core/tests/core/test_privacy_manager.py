@@ -24,6 +24,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts" / "core")
 from privacy_manager import (
     PrivacyManager, PrivacyLevel, PIIType, PIIDetection, PrivacyConfig
 )
+from audit_writer import read_audit_log, list_segments
 
 # Comprehensive test data fixtures
 TEST_CASES = {
@@ -676,23 +677,27 @@ class TestAuditLogging(unittest.TestCase):
         """Set up test fixtures."""
         self.test_dir = tempfile.mkdtemp()
         self.pm = PrivacyManager(repo_root=Path(self.test_dir))
-        self.audit_log_path = self.pm.audit_log_path
+        self.audit_dir = self.pm.audit_dir
 
     def tearDown(self):
         """Clean up."""
         shutil.rmtree(self.test_dir, ignore_errors=True)
 
+    def _read_entries(self):
+        """Flush the buffered writer and read back all audit entries."""
+        self.assertTrue(self.pm.flush_audit(), "Audit flush should complete")
+        return list(read_audit_log(self.audit_dir, prefix="privacy_audit"))
+
     def test_audit_log_pii_detected(self):
         """Test audit log creation for PII detection."""
         text = "Email: test@example.com"
         detections = self.pm.detect_pii(text)
 
-        # Check audit log was created
-        self.assertTrue(self.audit_log_path.exists(), "Audit log should be created")
-
         # Check audit log content
-        with open(self.audit_log_path, 'r') as f:
-            log_entries = [json.loads(line) for line in f]
+        log_entries = self._read_entries()
+
+        # Check audit segment was created
+        self.assertTrue(list_segments(self.audit_dir, "privacy_audit"), "Audit segment should be created")
 
         self.assertGreater(len(log_entries), 0, "Should have audit entries")
         last_entry = log_entries[-1]
@@ -707,8 +712,7 @@ class TestAuditLogging(unittest.TestCase):
         redacted = self.pm.redact(text, level=PrivacyLevel.PUBLIC)
 
         # Check audit log
-        with open(self.audit_log_path, 'r') as f:
-            log_entries = [json.loads(line) for line in f]
+        log_entries = self._read_entries()
 
         # Should have both detection and redaction entries
         operations = [e['operation'] for e in log_entries]
@@ -741,16 +745,16 @@ class TestAuditLogging(unittest.TestCase):
         text = "Email: test@example.com"
         pm.detect_pii(text)
 
-        # Audit log should not be created
-        self.assertFalse(pm.audit_log_path.exists(), "Audit log should not exist when disabled")
+        # No audit writer should be started
+        self.assertIsNone(pm.audit_writer, "Audit writer should not exist when disabled")
+        self.assertTrue(pm.flush_audit())
 
     def test_audit_log_timestamp_format(self):
         """Test audit log timestamp format."""
         text = "Email: test@example.com"
         self.pm.detect_pii(text)
 
-        with open(self.audit_log_path, 'r') as f:
-            log_entry = json.loads(f.readline())
+        log_entry = self._read_entries()[-1]
 
         # Check timestamp is ISO format
         timestamp = log_entry['timestamp']
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for CODITECT Segmented Rolling Log Handler
+
+Tests segment rolling, O(1) oldest-segment removal, resume across handler
+instances, and reading the last N lines across segments.
+
+Author: AZ1.AI CODITECT Team
+Framework: CODITECT
+"""
+
+import os
+import unittest
+import sys
+import logging
+import tempfile
+import shutil
+from pathlib import Path
+
+# Add scripts/core to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts" / "core"))
+
+from rolling_log_handler import (
+    SegmentedRollingFileHandler, list_log_segments, read_last_lines
+)
+
+
+class TestSegmentedRollingFileHandler(unittest.TestCase):
+    """Test segmented rolling file handler."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.log_file = self.test_dir / "test.log"
+        self.logger = logging.getLogger(f"test-segmented-{id(self)}")
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+        self.handlers = []
+
+    def tearDown(self):
+        """Clean up."""
+        for handler in self.handlers:
+            self.logger.removeHandler(handler)
+            handler.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _attach(self, **kwargs) -> SegmentedRollingFileHandler:
+        handler = SegmentedRollingFileHandler(str(self.log_file), **kwargs)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self.logger.addHandler(handler)
+        self.handlers.append(handler)
+        return handler
+
+    def test_rolls_into_numbered_segments(self):
+        """Full segments roll into the next sequence number."""
+        self._attach(max_lines=20, segments=4)
+        for i in range(12):
+            self.logger.info(f"line {i}")
+
+        seqs = [seq for seq, _ in list_log_segments(self.log_file)]
+        self.assertEqual(seqs, [1, 2, 3])
+        self.assertEqual(read_last_lines(self.log_file, 100), [f"line {i}" for i in range(12)])
+
+    def test_drops_oldest_segment(self):
+        """Line count stays bounded by dropping whole segments."""
+        self._attach(max_lines=20, segments=4)
+        for i in range(100):
+            self.logger.info(f"line {i}")
+
+        segments = list_log_segments(self.log_file)
+        self.assertEqual(len(segments), 4)
+
+        lines = read_last_lines(self.log_file, 1000)
+        self.assertGreaterEqual(len(lines), 15)
+        self.assertLessEqual(len(lines), 20)
+        self.assertEqual(lines[-1], "line 99")
+
+    def test_multiline_records_count_every_line(self):
+        """Multi-line messages count toward the segment size."""
+        handler = self._attach(max_lines=10, segments=2)
+        self.logger.info("a\nb\nc")
+
+        self.assertEqual(handler.line_count, 3)
+
+    def test_resumes_newest_segment(self):
+        """A new handler appends to the newest segment instead of starting over."""
+        first = self._attach(max_lines=20, segments=4)
+        for i in range(7):
+            self.logger.info(f"first {i}")
+        self.logger.removeHandler(first)
+        first.close()
+
+        second = self._attach(max_lines=20, segments=4)
+        self.assertEqual(second.current_seq, 2)
+        self.assertEqual(second.line_count, 2)
+
+        self.logger.info("second 0")
+        self.assertEqual(read_last_lines(self.log_file, 2), ["first 6", "second 0"])
+
+    def test_relative_path_survives_chdir(self):
+        """Segments rolled after a chdir stay next to the first one."""
+        cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        try:
+            self.log_file = Path("test.log")
+            handler = self._attach(max_lines=8, segments=4)
+            os.chdir(cwd)
+            for i in range(6):
+                self.logger.info(f"line {i}")
+        finally:
+            os.chdir(cwd)
+
+        self.assertTrue(os.path.isabs(handler.baseFilename))
+        self.assertEqual(Path(handler.baseFilename).parent, self.test_dir)
+        self.assertEqual(
+            read_last_lines(self.test_dir / "test.log", 100),
+            [f"line {i}" for i in range(6)]
+        )
+
+    def test_read_last_lines_spans_segments(self):
+        """read_last_lines returns lines in order across segment boundaries."""
+        self._attach(max_lines=20, segments=4)
+        for i in range(18):
+            self.logger.info(f"line {i}")
+
+        self.assertEqual(read_last_lines(self.log_file, 7), [f"line {i}" for i in range(11, 18)])
+        self.assertEqual(read_last_lines(self.log_file, 0), [])
+
+    def test_read_last_lines_missing_log(self):
+        """Reading a log that was never written returns no lines."""
+        self.assertEqual(read_last_lines(self.test_dir / "missing.log", 10), [])
+
+    def test_invalid_arguments(self):
+        """Non-positive limits are rejected."""
+        with self.assertRaises(ValueError):
+            SegmentedRollingFileHandler(str(self.log_file), max_lines=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
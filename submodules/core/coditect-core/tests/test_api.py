@@ -7,14 +7,16 @@ Tests REST API endpoints for command execution.
 import pytest
 from fastapi.testclient import TestClient
 
-from api.main import create_app
+from api.main import app_state, create_app
+from orchestration.result_store import ResultStore
 
 
 @pytest.fixture
 def client():
-    """Create test client."""
+    """Create test client (entering it runs the lifespan, starting the job queue)."""
     app = create_app()
-    return TestClient(app)
+    with TestClient(app) as client:
+        yield client
 
 
 class TestRootEndpoints:
@@ -41,6 +43,17 @@ class TestRootEndpoints:
         assert "services" in data
         assert "timestamp" in data
 
+    def test_metrics_endpoint(self, client):
+        """Test Prometheus metrics endpoint includes request metrics."""
+        client.get("/health")
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE coditect_http_requests_total counter" in response.text
+        assert 'coditect_http_requests_total{method="GET",route="/health",status="200"}' in response.text
+        assert "coditect_http_request_seconds_bucket" in response.text
+
 
 class TestCommandListEndpoint:
     """Test command listing endpoint."""
@@ -89,6 +102,7 @@ class TestCommandExecutionEndpoint:
             "command": "/analyze",
             "args": {"target": "tests/test_api.py"},
             "stream": False,
+            "wait": True,
         }
 
         response = client.post("/api/v1/commands/execute", json=request_data)
@@ -111,6 +125,7 @@ class TestCommandExecutionEndpoint:
         request_data = {
             "command": "/analyze",
             "args": {"target": "src/main.rs", "focus": "security"},
+            "wait": True,
         }
 
         response = client.post("/api/v1/commands/execute", json=request_data)
@@ -123,7 +138,7 @@ class TestCommandExecutionEndpoint:
 
     def test_execute_unknown_command(self, client):
         """Test executing unknown command returns error."""
-        request_data = {"command": "/unknown-command"}
+        request_data = {"command": "/unknown-command", "wait": True}
 
         response = client.post("/api/v1/commands/execute", json=request_data)
 
@@ -137,7 +152,7 @@ class TestCommandExecutionEndpoint:
 
     def test_execute_command_missing_required_args(self, client):
         """Test executing command with missing required arguments."""
-        request_data = {"command": "/implement"}  # Missing required 'description' arg
+        request_data = {"command": "/implement", "wait": True}  # Missing required 'description' arg
 
         response = client.post("/api/v1/commands/execute", json=request_data)
 
@@ -157,6 +172,25 @@ class TestCommandExecutionEndpoint:
         # Should fail validation
         assert response.status_code == 422
 
+    def test_execute_returns_202_with_command_id(self, client):
+        """Test that commands are queued and accepted without waiting."""
+        response = client.post("/api/v1/commands/execute", json={"command": "/unknown-command"})
+
+        assert response.status_code == 202
+        data = response.json()
+
+        assert data["command_id"].startswith("CMD-unknown-command-")
+        assert data["status"] in ("queued", "running", "completed")
+        assert data["status_url"] == f"/api/v1/commands/{data['command_id']}/status"
+
+    def test_execute_invalid_priority(self, client):
+        """Test that out-of-range priorities are rejected."""
+        response = client.post(
+            "/api/v1/commands/execute", json={"command": "/analyze", "priority": 99}
+        )
+
+        assert response.status_code == 422
+
 
 class TestCommandStatusEndpoint:
     """Test command status endpoint."""
@@ -165,11 +199,12 @@ class TestCommandStatusEndpoint:
     async def test_get_command_status(self, client):
         """Test getting command execution status."""
         # First execute a command
-        request_data = {"command": "/analyze"}
+        request_data = {"command": "/analyze", "wait": True}
         response = client.post("/api/v1/commands/execute", json=request_data)
         assert response.status_code == 200
 
-        command_id = response.json()["command_id"]
+        result = response.json()
+        command_id = result["command_id"]
 
         # Get status
         response = client.get(f"/api/v1/commands/{command_id}/status")
@@ -178,7 +213,9 @@ class TestCommandStatusEndpoint:
         data = response.json()
 
         assert data["command_id"] == command_id
-        assert "status" in data
+        assert data["status"] == "completed"
+        assert data["progress"] == 100.0
+        assert data["result_status"] == result["status"]
 
     def test_get_status_nonexistent_command(self, client):
         """Test getting status for nonexistent command."""
@@ -187,6 +224,27 @@ class TestCommandStatusEndpoint:
         assert response.status_code == 404
 
 
+class TestCommandCancelEndpoint:
+    """Test command cancellation endpoint."""
+
+    def test_cancel_finished_command_conflicts(self, client):
+        """Test cancelling a command that already finished."""
+        response = client.post(
+            "/api/v1/commands/execute", json={"command": "/unknown-command", "wait": True}
+        )
+        command_id = response.json()["command_id"]
+
+        response = client.post(f"/api/v1/commands/{command_id}/cancel")
+
+        assert response.status_code == 409
+
+    def test_cancel_nonexistent_command(self, client):
+        """Test cancelling an unknown command."""
+        response = client.post("/api/v1/commands/nonexistent-id/cancel")
+
+        assert response.status_code == 404
+
+
 class TestCommandResultEndpoint:
     """Test command result endpoint."""
 
@@ -194,7 +252,7 @@ class TestCommandResultEndpoint:
     async def test_get_command_result(self, client):
         """Test getting full command result."""
         # First execute a command
-        request_data = {"command": "/analyze"}
+        request_data = {"command": "/analyze", "wait": True}
         response = client.post("/api/v1/commands/execute", json=request_data)
         assert response.status_code == 200
 
@@ -217,6 +275,57 @@ class TestCommandResultEndpoint:
 
         assert response.status_code == 404
 
+    def test_result_not_retained(self, client, monkeypatch):
+        """Test that a completed command whose result was dropped says so."""
+        # In-memory store that keeps nothing, as with a huge result and no result DB
+        monkeypatch.setattr(app_state, "results", ResultStore(max_entries=0))
+
+        response = client.post(
+            "/api/v1/commands/execute", json={"command": "/unknown-command", "wait": True}
+        )
+        assert response.status_code == 200
+        executed = response.json()
+        command_id = executed["command_id"]
+
+        status_data = client.get(f"/api/v1/commands/{command_id}/status").json()
+        assert status_data["status"] == "completed"
+
+        response = client.get(f"/api/v1/commands/{command_id}")
+        assert response.status_code == 200
+        for data in (executed, response.json()):
+            assert data["status"] == status_data["result_status"]
+            assert data["status"] != "pending"
+            assert data["error_type"] == "ResultNotRetained"
+            assert "CODITECT_API_RESULT_DB" in data["error_message"]
+            assert data["metadata"]["job_status"] == "completed"
+
+
+class TestResultListEndpoint:
+    """Test result listing endpoint."""
+
+    def test_list_results_paginated(self, client):
+        """Test paging through stored results newest first."""
+        ids = [
+            client.post(
+                "/api/v1/commands/execute", json={"command": "/unknown-command", "wait": True}
+            ).json()["command_id"]
+            for _ in range(3)
+        ]
+
+        first = client.get("/api/v1/results?limit=2&status=failed").json()
+        assert first["count"] == 2
+        assert first["results"][0]["command_id"] == ids[-1]
+        assert "output" not in first["results"][0]
+
+        second = client.get(f"/api/v1/results?limit=2&cursor={first['next_cursor']}").json()
+        assert ids[0] in [item["command_id"] for item in second["results"]]
+
+    def test_list_results_invalid_cursor(self, client):
+        """Test that malformed cursors are rejected."""
+        response = client.get("/api/v1/results?cursor=abc")
+
+        assert response.status_code == 400
+
 
 class TestAPIErrorHandling:
     """Test API error handling."""
@@ -0,0 +1,307 @@
+"""
+Tests for Backup Manager and the deduplicating Backup Store
+
+Tests backup creation, catalog-based listing, chunk deduplication,
+rollback reconstruction and legacy backup import.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from orchestration import BackupManager, BackupStore
+from orchestration.backup_store import MAX_CHUNK_SIZE, chunk_boundaries
+
+
+def make_state(num_tasks: int, completed: int = 0, project_id: str = "proj") -> dict:
+    """Build a project state resembling StateManager output."""
+    tasks = {
+        f"TASK-{i:04d}": {
+            "task_id": f"TASK-{i:04d}",
+            "title": f"Task number {i}",
+            "description": f"Implement component {i} with full test coverage " * 3,
+            "status": "completed" if i < completed else "pending",
+        }
+        for i in range(num_tasks)
+    }
+    return {
+        "format_version": 2,
+        "project_id": project_id,
+        "tasks": tasks,
+        "metrics": {
+            "total_tasks": num_tasks,
+            "completed_tasks": completed,
+            "completion_percentage": 100.0 * completed / num_tasks if num_tasks else 0.0,
+        },
+    }
+
+
+def write_state(path, state: dict) -> None:
+    path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+
+
+@pytest.fixture
+def state_file(tmp_path):
+    path = tmp_path / "project_state.json"
+    write_state(path, make_state(200))
+    return path
+
+
+@pytest.fixture
+def manager(state_file):
+    return BackupManager(state_file=state_file)
+
+
+def create_backup_at(manager: BackupManager, timestamp: str):
+    """Create a backup with a fixed timestamp."""
+    with patch("orchestration.backup_manager.datetime") as mock_datetime:
+        mock_datetime.now.return_value.strftime.return_value = timestamp
+        return manager.create_backup()
+
+
+class TestChunking:
+    """Test content-defined chunking."""
+
+    def test_chunks_cover_input(self):
+        """Test chunk boundaries partition the input."""
+        data = json.dumps(make_state(300), indent=2).encode()
+        ends = list(chunk_boundaries(data))
+
+        assert ends[-1] == len(data)
+        assert ends == sorted(ends)
+        sizes = [b - a for a, b in zip([0] + ends, ends)]
+        assert max(sizes) <= MAX_CHUNK_SIZE
+        assert len(ends) > 1
+
+    def test_boundaries_resync_after_insert(self):
+        """Test an insertion only changes nearby chunks."""
+        data = json.dumps(make_state(300), indent=2).encode()
+        edited = data[:5000] + b"INSERTED" + data[5000:]
+
+        def chunks(blob):
+            ends = list(chunk_boundaries(blob))
+            return {blob[a:b] for a, b in zip([0] + ends, ends)}
+
+        original = chunks(data)
+        changed = chunks(edited) - original
+        assert len(changed) <= 2
+
+    def test_empty_input(self):
+        """Test empty input has no chunks."""
+        assert list(chunk_boundaries(b"")) == []
+
+
+class TestBackupManager:
+    """Test backup creation, listing and rollback."""
+
+    def test_create_backup_metadata(self, manager):
+        """Test metadata is computed at backup time."""
+        metadata = create_backup_at(manager, "20251112-010000")
+
+        assert metadata.timestamp == "20251112-010000"
+        assert metadata.total_tasks == 200
+        assert metadata.project_id == "proj"
+        assert metadata.file_size_bytes == manager.state_file.stat().st_size
+        assert metadata.chunk_count >= 1
+        assert metadata.file_path == manager.store.catalog_path
+
+    def test_create_backup_missing_state(self, tmp_path):
+        """Test no backup is created without a state file."""
+        manager = BackupManager(state_file=tmp_path / "missing.json")
+        assert manager.create_backup() is None
+
+    def test_create_backup_invalid_json(self, manager):
+        """Test corrupted state raises IOError."""
+        manager.state_file.write_text("{not json", encoding="utf-8")
+        with pytest.raises(IOError):
+            manager.create_backup()
+
+    def test_list_backups_uses_catalog_only(self, manager):
+        """Test listing never reads backup content."""
+        create_backup_at(manager, "20251112-010000")
+        create_backup_at(manager, "20251112-020000")
+
+        with patch.object(BackupStore, "_read_chunk", side_effect=AssertionError):
+            backups = manager.list_backups()
+
+        assert [b.timestamp for b in backups] == ["20251112-020000", "20251112-010000"]
+        assert len(manager.list_backups(limit=1)) == 1
+
+    def test_storage_grows_with_changes(self, manager):
+        """Test unchanged snapshots add no chunk data."""
+        first = create_backup_at(manager, "20251112-010000")
+        second = create_backup_at(manager, "20251112-020000")
+
+        assert first.stored_size_bytes > 0
+        assert second.stored_size_bytes == 0
+
+        state = make_state(200, completed=1)
+        write_state(manager.state_file, state)
+        third = create_backup_at(manager, "20251112-030000")
+
+        assert 0 < third.stored_size_bytes < first.stored_size_bytes / 2
+        stats = manager.get_storage_stats()
+        assert stats["backups"] == 3
+        assert stats["dedup_ratio"] > 2
+
+    def test_rollback_restores_exact_content(self, manager):
+        """Test rollback reconstructs the original bytes."""
+        original = manager.state_file.read_bytes()
+        create_backup_at(manager, "20251112-010000")
+
+        write_state(manager.state_file, make_state(5))
+        success = manager.rollback_to_backup(
+            "20251112-010000",
+            create_pre_rollback_backup=False,
+            confirm=False,
+        )
+
+        assert success
+        assert manager.state_file.read_bytes() == original
+
+    def test_rollback_same_second_pre_rollback_backup(self, manager):
+        """Test the pre-rollback backup cannot clobber the restore target."""
+        original = manager.state_file.read_bytes()
+        create_backup_at(manager, "20251112-010000")
+        write_state(manager.state_file, make_state(5))
+
+        with patch("orchestration.backup_manager.datetime") as mock_datetime:
+            mock_datetime.now.return_value.strftime.return_value = "20251112-010000"
+            manager.rollback_to_backup("20251112-010000", confirm=False)
+
+        assert manager.state_file.read_bytes() == original
+
+    def test_rollback_missing_backup(self, manager):
+        """Test rollback to unknown timestamp raises."""
+        with pytest.raises(FileNotFoundError):
+            manager.rollback_to_backup("19990101-000000", confirm=False)
+
+    def test_delete_backup_collects_unused_chunks(self, manager):
+        """Test deleting removes only chunks no other backup uses."""
+        create_backup_at(manager, "20251112-010000")
+        write_state(manager.state_file, make_state(200, completed=50))
+        create_backup_at(manager, "20251112-020000")
+        chunks_before = manager.get_storage_stats()["chunks"]
+
+        assert manager.delete_backup("20251112-020000")
+        assert not manager.delete_backup("20251112-020000")
+
+        assert manager.get_storage_stats()["chunks"] < chunks_before
+        assert [b.timestamp for b in manager.list_backups()] == ["20251112-010000"]
+        manager.rollback_to_backup(
+            "20251112-010000", create_pre_rollback_backup=False, confirm=False
+        )
+        assert json.loads(manager.state_file.read_text())["metrics"]["completed_tasks"] == 0
+
+    def test_catalog_shared_between_managers(self, manager, state_file):
+        """Test a second manager sees backups created by the first."""
+        create_backup_at(manager, "20251112-010000")
+
+        other = BackupManager(state_file=state_file)
+        assert [b.timestamp for b in other.list_backups()] == ["20251112-010000"]
+
+    def test_legacy_backups_imported(self, tmp_path):
+        """Test full-copy backups from older versions stay available."""
+        state_file = tmp_path / "project_state.json"
+        backups_dir = tmp_path / "backups"
+        backups_dir.mkdir()
+        legacy = backups_dir / "project_state.backup.20250101-120000.json"
+        write_state(legacy, make_state(10, completed=5))
+        (backups_dir / "project_state.backup.20250101-130000.json").write_text("{broken")
+
+        manager = BackupManager(state_file=state_file)
+        backups = manager.list_backups()
+
+        assert [b.timestamp for b in backups] == ["20250101-120000"]
+        assert backups[0].completed_tasks == 5
+        assert backups[0].file_path == legacy
+        assert BackupManager(state_file=state_file).list_backups()[0].file_path == legacy
+
+        manager.rollback_to_backup(
+            "20250101-120000", create_pre_rollback_backup=False, confirm=False
+        )
+        assert state_file.read_bytes() == legacy.read_bytes()
+
+        assert manager.delete_backup("20250101-120000")
+        assert not legacy.exists()
+
+
+class TestBackupStore:
+    """Test the chunk store directly."""
+
+    def test_round_trip_and_integrity(self, tmp_path):
+        """Test stored content is verified on read."""
+        store = BackupStore(tmp_path / "store")
+        data = json.dumps(make_state(100)).encode()
+        entry = store.put("t1", data, {"total_tasks": 100})
+
+        assert store.get("t1") == data
+
+        chunk_path = next(p for p in store._chunk_paths(entry.chunks[0]) if p.exists())
+        other = BackupStore(tmp_path / "other")
+        other.put("x", b"tampered" * 500)
+        replacement = next(
+            p for d in other.entries()[0].chunks for p in other._chunk_paths(d) if p.exists()
+        )
+        chunk_path.write_bytes(replacement.read_bytes())
+
+        with pytest.raises(IOError):
+            store.get("t1")
+
+    def test_torn_catalog_line_ignored(self, tmp_path):
+        """Test an interrupted catalog append does not break listing."""
+        store = BackupStore(tmp_path / "store")
+        store.put("t1", b"hello world")
+        with open(store.catalog_path, "a", encoding="utf-8") as f:
+            f.write('{"timestamp": "t2", "sha')
+
+        reopened = BackupStore(tmp_path / "store")
+        assert [e.timestamp for e in reopened.entries()] == ["t1"]
+        assert reopened.get("t1") == b"hello world"
+
+        reopened.put("t3", b"after crash")
+        assert [e.timestamp for e in BackupStore(tmp_path / "store").entries()] == ["t1", "t3"]
+
+    def test_gzip_chunks_readable_with_any_codec(self, tmp_path):
+        """Test chunks written with gzip remain readable."""
+        store = BackupStore(tmp_path / "store")
+        store.codec = "gz"
+        store.put("t1", b"gzip payload " * 1000)
+
+        reopened = BackupStore(tmp_path / "store")
+        assert reopened.get("t1") == b"gzip payload " * 1000
+
+    def test_put_survives_delete_of_deduplicated_chunks(self, tmp_path):
+        """Test a delete between dedup and cataloging cannot orphan the new backup."""
+        store = BackupStore(tmp_path / "store")
+        data = json.dumps(make_state(200)).encode()
+        store.put("t1", data)
+        chunk_count = len(list(chunk_boundaries(data)))
+
+        real_write_chunk = store._write_chunk
+        written = []
+
+        def write_chunk(digest, chunk):
+            result = real_write_chunk(digest, chunk)
+            written.append(digest)
+            if len(written) == chunk_count:
+                # Every chunk deduplicated against t1, none cataloged for t2 yet
+                assert store.delete("t1")
+            return result
+
+        with patch.object(store, "_write_chunk", write_chunk):
+            store.put("t2", data)
+
+        assert BackupStore(tmp_path / "store").get("t2") == data
+
+    def test_replacing_backup_removes_its_unused_chunks(self, tmp_path):
+        """Test re-using a timestamp frees chunks only the old backup used."""
+        store = BackupStore(tmp_path / "store")
+        store.put("t1", b"shared " * 500)
+        store.put("t2", b"original " * 5000)
+        store.put("t2", b"shared " * 500)
+
+        assert store.get("t2") == b"shared " * 500
+        assert store.get("t1") == b"shared " * 500
+        assert store.stats()["chunks"] == len(list(chunk_boundaries(b"shared " * 500)))
@@ -4,6 +4,8 @@ Tests for Slash Command Router (Phase 2B)
 Tests command parsing, routing, execution, and structured results.
 """
 
+import asyncio
+
 import pytest
 from datetime import datetime
 from orchestration import (
@@ -256,6 +258,145 @@ class TestSlashCommandRouter:
         assert "security" in description
 
 
+class TestCommandCoalescing:
+    """Test sharing of identical in-flight command executions."""
+
+    @staticmethod
+    def make_router(delay=0.01):
+        """Create a router whose executions are counted and slow."""
+        router = SlashCommandRouter()
+        router.calls = []
+
+        async def fake_execute(command_str, args=None):
+            router.calls.append(command_str)
+            await asyncio.sleep(delay)
+            return CommandResult(
+                command=command_str.split()[0],
+                status=CommandStatus.SUCCESS,
+                output=f"ran {command_str}",
+            )
+
+        router._execute = fake_execute
+        return router
+
+    def test_identical_requests_share_execution(self):
+        """Concurrent identical commands run once and all get the result."""
+        router = self.make_router()
+
+        async def run():
+            return await asyncio.gather(
+                router.execute("/analyze target=a.py focus=security", command_id="CMD-1"),
+                router.execute("/analyze focus=security", args={"target": "a.py"}, command_id="CMD-2"),
+                router.execute("/analyze target=a.py focus=security", command_id="CMD-3"),
+            )
+
+        results = asyncio.run(run())
+
+        assert len(router.calls) == 1
+        assert [r.metadata["command_id"] for r in results] == ["CMD-1", "CMD-2", "CMD-3"]
+        assert "coalesced_with" not in results[0].metadata
+        assert results[1].metadata["coalesced_with"] == "CMD-1"
+        assert results[2].output == results[0].output
+        assert router._inflight == {}
+
+    def test_different_args_run_separately(self):
+        """Requests differing in arguments are not coalesced."""
+        router = self.make_router()
+
+        async def run():
+            await asyncio.gather(
+                router.execute("/analyze target=a.py"),
+                router.execute("/analyze target=b.py"),
+            )
+
+        asyncio.run(run())
+        assert len(router.calls) == 2
+
+    def test_sequential_requests_run_again(self):
+        """Only in-flight executions are shared; results are not cached."""
+        router = self.make_router(delay=0)
+
+        async def run():
+            await router.execute("/analyze")
+            await router.execute("/analyze")
+
+        asyncio.run(run())
+        assert len(router.calls) == 2
+
+    def test_spec_opt_out(self):
+        """Commands with coalesce=False always execute independently."""
+        router = self.make_router()
+        assert COMMAND_REGISTRY["/new-project"].coalesce is False
+
+        async def run():
+            await asyncio.gather(
+                router.execute("/new-project description=x"),
+                router.execute("/new-project description=x"),
+            )
+
+        asyncio.run(run())
+        assert len(router.calls) == 2
+
+    def test_cancelled_caller_does_not_cancel_others(self):
+        """One waiter's cancellation leaves the shared execution running."""
+        router = self.make_router(delay=0.05)
+
+        async def run():
+            first = asyncio.ensure_future(router.execute("/analyze", command_id="CMD-1"))
+            second = asyncio.ensure_future(router.execute("/analyze", command_id="CMD-2"))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+
+        result = asyncio.run(run())
+        assert result.status == CommandStatus.SUCCESS
+        # CMD-1 never got the result, so CMD-2 now leads the execution
+        assert "coalesced_with" not in result.metadata
+        assert len(router.calls) == 1
+
+    def test_cancelled_leader_hands_over_to_oldest_waiter(self):
+        """Followers of a cancelled leader name the oldest remaining waiter."""
+        router = self.make_router(delay=0.05)
+
+        async def run():
+            callers = [
+                asyncio.ensure_future(router.execute("/analyze", command_id=f"CMD-{n}"))
+                for n in range(1, 5)
+            ]
+            await asyncio.sleep(0.01)
+            callers[0].cancel()
+            callers[1].cancel()
+            return await asyncio.gather(*callers[2:])
+
+        third, fourth = asyncio.run(run())
+        assert "coalesced_with" not in third.metadata
+        assert fourth.metadata["coalesced_with"] == "CMD-3"
+        assert fourth.output == third.output
+        assert len(router.calls) == 1
+
+    def test_cancelling_every_caller_cancels_execution(self):
+        """The shared execution stops once nobody is waiting for it."""
+        router = self.make_router(delay=0.05)
+
+        async def run():
+            callers = [
+                asyncio.ensure_future(router.execute("/analyze", command_id=f"CMD-{n}"))
+                for n in range(1, 3)
+            ]
+            await asyncio.sleep(0.01)
+            flight = next(iter(router._inflight.values()))
+            for caller in callers:
+                caller.cancel()
+            await asyncio.gather(*callers, return_exceptions=True)
+            await asyncio.sleep(0)
+            return flight
+
+        flight = asyncio.run(run())
+        assert flight.task.cancelled()
+        assert flight.waiters == []
+        assert router._inflight == {}
+
+
 class TestCommandResult:
     """Test CommandResult data structure."""
 
@@ -0,0 +1,312 @@
+"""
+Unit Tests for the Background Job Queue
+=======================================
+
+Tests priority ordering, bounded concurrency, cancellation, failure
+handling, progress estimates and SQLite persistence across restarts.
+
+Copyright © 2025 AZ1.AI INC. All rights reserved.
+"""
+
+import asyncio
+
+import pytest
+
+from orchestration.job_queue import Job, JobQueue, JobState, JobStore, QueueFullError
+from orchestration.metrics import MetricsRegistry
+
+
+def make_queue(runner, **kwargs):
+    """Create a job queue with an isolated metrics registry."""
+    return JobQueue(runner, metrics=MetricsRegistry(), **kwargs)
+
+
+# ============================================================================
+# Scheduling Tests
+# ============================================================================
+
+def test_priority_order():
+    """Higher priority jobs run first; equal priorities run FIFO."""
+    order = []
+    gate = asyncio.Event()
+
+    async def runner(job):
+        if job.kind == "blocker":
+            await gate.wait()
+        order.append(job.kind)
+        return "success"
+
+    async def run():
+        queue = make_queue(runner, workers=1)
+        await queue.start()
+        blocker = queue.submit("blocker")
+        await asyncio.sleep(0)  # let the worker pick up the blocker
+        jobs = [
+            queue.submit("low-1", priority=-1),
+            queue.submit("normal-1"),
+            queue.submit("high", priority=5),
+            queue.submit("normal-2"),
+        ]
+        assert queue.position(jobs[2].job_id) == 1
+        assert queue.position(jobs[0].job_id) == 4
+        gate.set()
+        await asyncio.gather(blocker.wait(), *(job.wait() for job in jobs))
+        await queue.stop()
+
+    asyncio.run(run())
+    assert order == ["blocker", "high", "normal-1", "normal-2", "low-1"]
+
+
+def test_worker_pool_bounds_concurrency():
+    """No more than `workers` jobs run at once."""
+    active = 0
+    peak = 0
+
+    async def runner(job):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    async def run():
+        queue = make_queue(runner, workers=2)
+        await queue.start()
+        jobs = [queue.submit("work") for _ in range(6)]
+        await asyncio.gather(*(job.wait() for job in jobs))
+        await queue.stop()
+        return jobs
+
+    jobs = asyncio.run(run())
+    assert peak == 2
+    assert all(job.state == JobState.COMPLETED for job in jobs)
+
+
+def test_queue_full():
+    """Submissions beyond max_queued are rejected."""
+
+    async def run():
+        queue = make_queue(lambda job: asyncio.sleep(0), max_queued=2)
+        await queue.start()
+        await queue.stop()  # keep submissions waiting
+        queue.submit("a")
+        queue.submit("b")
+        with pytest.raises(QueueFullError):
+            queue.submit("c")
+
+    asyncio.run(run())
+
+
+def test_submit_requires_start():
+    """Jobs cannot be submitted before start()."""
+    queue = make_queue(lambda job: asyncio.sleep(0))
+    with pytest.raises(RuntimeError):
+        queue.submit("a")
+
+
+# ============================================================================
+# Outcome Tests
+# ============================================================================
+
+def test_runner_outcome_and_failure():
+    """Return values become the outcome; exceptions mark the job failed."""
+
+    async def runner(job):
+        if job.payload.get("fail"):
+            raise ValueError("bad input")
+        job.report(50.0, "Halfway")
+        return "success"
+
+    async def run():
+        queue = make_queue(runner)
+        await queue.start()
+        ok = queue.submit("cmd")
+        bad = queue.submit("cmd", {"fail": True})
+        await asyncio.gather(ok.wait(), bad.wait())
+        await queue.stop()
+        return ok, bad
+
+    ok, bad = asyncio.run(run())
+    assert ok.state == JobState.COMPLETED
+    assert ok.outcome == "success"
+    assert ok.progress == 100.0
+    assert bad.state == JobState.FAILED
+    assert bad.error == "ValueError: bad input"
+
+
+def test_cancel_queued_and_running():
+    """Queued jobs never run; running jobs are interrupted."""
+    ran = []
+
+    async def runner(job):
+        ran.append(job.kind)
+        await asyncio.sleep(60)
+
+    async def run():
+        queue = make_queue(runner, workers=1)
+        await queue.start()
+        running = queue.submit("running")
+        waiting = queue.submit("waiting")
+        await asyncio.sleep(0.01)
+
+        assert running.state == JobState.RUNNING
+        assert queue.cancel(waiting.job_id)
+        assert waiting.state == JobState.CANCELLED
+        assert queue.cancel(running.job_id)
+        await asyncio.wait_for(running.wait(), timeout=1)
+
+        assert not queue.cancel(running.job_id)  # already finished
+        await queue.stop()
+        return running
+
+    running = asyncio.run(run())
+    assert running.state == JobState.CANCELLED
+    assert ran == ["running"]
+
+
+def test_estimates_use_observed_durations():
+    """Completion estimates appear once a job of the kind has finished."""
+
+    async def run():
+        queue = make_queue(lambda job: asyncio.sleep(0.01), workers=1)
+        await queue.start()
+        first = queue.submit("/analyze")
+        assert queue.estimated_completion(first) is None
+        await first.wait()
+
+        assert queue.expected_duration("/analyze") > 0
+        assert queue.expected_duration("/other") == queue.expected_duration("/analyze")
+        assert queue.estimated_progress(first) == 100.0
+        assert queue.estimated_completion(first) == first.completed_at
+
+        second = queue.submit("/analyze")
+        assert queue.estimated_completion(second) > second.submitted_at
+        await second.wait()
+        await queue.stop()
+
+    asyncio.run(run())
+
+
+# ============================================================================
+# Persistence Tests
+# ============================================================================
+
+def test_unfinished_jobs_survive_restart(tmp_path):
+    """Jobs queued or running at shutdown run after the next start()."""
+    db = tmp_path / "jobs.db"
+    ran = []
+
+    async def blocking(job):
+        await asyncio.sleep(60)
+
+    async def recording(job):
+        ran.append(job.payload["n"])
+        return "success"
+
+    async def first_process():
+        store = JobStore(db)
+        queue = make_queue(blocking, workers=1, store=store)
+        await queue.start()
+        ids = [queue.submit("cmd", {"n": n}).job_id for n in range(3)]
+        await asyncio.sleep(0.01)
+        await queue.stop()
+        store.close()
+        return ids
+
+    async def second_process(ids):
+        store = JobStore(db)
+        queue = make_queue(recording, workers=1, store=store)
+        assert await queue.start() == 3
+        await asyncio.gather(*(queue.get(job_id).wait() for job_id in ids))
+        await queue.stop()
+        store.close()
+
+    ids = asyncio.run(first_process())
+    asyncio.run(second_process(ids))
+    assert ran == [0, 1, 2]
+
+    store = JobStore(db)
+    assert store.unfinished() == []
+    assert store.load(ids[0]).state == JobState.COMPLETED
+    store.close()
+
+
+def test_finished_jobs_fall_back_to_store(tmp_path):
+    """Jobs evicted from memory are still found through the store."""
+
+    async def run():
+        store = JobStore(tmp_path / "jobs.db")
+        queue = make_queue(lambda job: asyncio.sleep(0), max_finished=1, store=store)
+        await queue.start()
+        jobs = [queue.submit("cmd") for _ in range(3)]
+        await asyncio.gather(*(job.wait() for job in jobs))
+        await queue.stop()
+
+        found = queue.get(jobs[0].job_id)
+        assert found is not jobs[0]
+        assert found.state == JobState.COMPLETED
+        store.close()
+
+    asyncio.run(run())
+
+
+def test_store_prunes_oldest_finished_jobs(tmp_path):
+    """Only the most recently finished jobs stay in the store."""
+    db = tmp_path / "jobs.db"
+    store = JobStore(db, max_finished=3)
+    queued = Job(job_id="JOB-Q", kind="cmd", payload={}, seq=1)
+    store.save(queued)
+
+    # Finish order differs from submission order
+    jobs = [Job(job_id=f"JOB-{n}", kind="cmd", payload={}, seq=n + 2) for n in range(5)]
+    for job in jobs:
+        job.state = JobState.RUNNING
+        store.save(job)
+    for n in (4, 0, 3, 1, 2):
+        jobs[n].state = JobState.COMPLETED if n % 2 else JobState.FAILED
+        store.save(jobs[n])
+
+    kept = {job.job_id for job in jobs if store.load(job.job_id)}
+    assert kept == {"JOB-3", "JOB-1", "JOB-2"}
+    assert store.unfinished() == [queued]
+    store.close()
+
+    # Reopening with a smaller limit trims the existing rows
+    store = JobStore(db, max_finished=1)
+    assert store.load("JOB-2").state == JobState.FAILED
+    assert store.load("JOB-1") is None
+    assert store.load("JOB-Q") is not None
+    store.close()
+
+
+def test_store_prunes_in_batches(tmp_path):
+    """Pruning runs once per batch of finished jobs, not on every save."""
+    store = JobStore(tmp_path / "jobs.db", max_finished=20)
+
+    def count():
+        return store._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def finish(n):
+        job = Job(job_id=f"JOB-{n}", kind="cmd", payload={}, seq=n + 1)
+        job.state = JobState.COMPLETED
+        store.save(job)
+
+    # Batches of max_finished // 10 = 2 jobs
+    for n in range(21):
+        finish(n)
+    assert count() == 21
+    finish(21)
+    assert count() == 20
+    assert store.load("JOB-1") is None and store.load("JOB-2") is not None
+    store.close()
+
+
+def test_job_round_trip():
+    """to_dict/from_dict preserve job fields."""
+    job = Job(job_id="JOB-1", kind="/analyze", payload={"args": {"a": 1}}, priority=3, seq=7)
+    job.report(40.0, "Working")
+
+    restored = Job.from_dict(job.to_dict())
+
+    assert restored.to_dict() == job.to_dict()
+    assert not restored.done
@@ -0,0 +1,256 @@
+"""
+Unit Tests for LLM Usage Capture
+================================
+
+Tests token/latency extraction from provider responses, cost estimates,
+LlmFactory wrapping of plain-string providers, the usage ledger and the
+executor hand-off into ExecutionResult metadata.
+
+Copyright © 2025 AZ1.AI INC. All rights reserved.
+"""
+
+import asyncio
+import pickle
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from llm_abstractions import BaseLlm, LlmFactory, LlmResponse, LlmUsage
+from llm_abstractions.anthropic_llm import AnthropicLlm
+from llm_abstractions.gemini import Gemini
+from llm_abstractions.openai_llm import OpenAILlm
+from llm_abstractions.usage import estimate_cost
+from orchestration.executor import ExecutionResult, ExecutionStatus, TaskExecutor
+from orchestration.metrics import get_registry
+from orchestration.usage_ledger import UsageLedger
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+
+
+def bare_provider(cls, model, client):
+    """Create a provider without its SDK (constructors import it)."""
+    llm = cls.__new__(cls)
+    llm.model = model
+    llm.max_tokens = 1024
+    llm.temperature = 0.7
+    llm.client = client
+    return llm
+
+
+# ============================================================================
+# Provider Tests
+# ============================================================================
+
+def test_anthropic_usage_includes_cache_reads():
+    """Anthropic input tokens are normalised to include cached tokens."""
+    response = SimpleNamespace(
+        content=[SimpleNamespace(text="Hi there")],
+        usage=SimpleNamespace(
+            input_tokens=100,
+            output_tokens=20,
+            cache_read_input_tokens=900,
+            cache_creation_input_tokens=0,
+        ),
+    )
+    client = Mock()
+    client.messages.create = AsyncMock(return_value=response)
+    llm = bare_provider(AnthropicLlm, "claude-3-5-sonnet-20241022", client)
+
+    result = asyncio.run(llm.generate_content_async(MESSAGES))
+
+    assert result == "Hi there"
+    usage = result.usage
+    assert usage.provider == "anthropic-claude"
+    assert (usage.input_tokens, usage.output_tokens, usage.cached_tokens) == (1000, 20, 900)
+    assert usage.total_tokens == 1020
+    assert usage.latency_seconds >= 0
+    # 100 uncached input at $3/M, 900 cached at $0.30/M, 20 output at $15/M
+    assert usage.estimated_cost == pytest.approx(0.00087)
+
+
+def test_openai_usage_with_cached_prompt():
+    """OpenAI-style usage blocks populate input, output and cached tokens."""
+    response = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="Hello from GPT"))],
+        usage=SimpleNamespace(
+            prompt_tokens=1200,
+            completion_tokens=300,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+        ),
+    )
+    client = Mock()
+    client.chat.completions.create = AsyncMock(return_value=response)
+    llm = bare_provider(OpenAILlm, "gpt-4o", client)
+
+    usage = asyncio.run(llm.generate_content_async(MESSAGES)).usage
+
+    assert (usage.input_tokens, usage.output_tokens, usage.cached_tokens) == (1200, 300, 1024)
+    assert usage.estimated_cost == pytest.approx((176 * 2.5 + 1024 * 1.25 + 300 * 10) / 1e6)
+
+
+def test_gemini_usage_metadata():
+    """Gemini usage_metadata counts are captured."""
+    response = SimpleNamespace(
+        text="Hello from Gemini",
+        usage_metadata=SimpleNamespace(
+            prompt_token_count=50, candidates_token_count=10, cached_content_token_count=0
+        ),
+    )
+    client = Mock()
+    client.generate_content = Mock(return_value=response)
+    llm = bare_provider(Gemini, "gemini-2.0-flash", client)
+
+    usage = asyncio.run(llm.generate_content_async(MESSAGES)).usage
+
+    assert (usage.input_tokens, usage.output_tokens, usage.cached_tokens) == (50, 10, 0)
+
+
+def test_missing_usage_leaves_tokens_unknown():
+    """Responses without usage keep None counts and no cost."""
+    response = Mock()
+    response.choices = [SimpleNamespace(message=SimpleNamespace(content="ok"))]
+    client = Mock()
+    client.chat.completions.create = AsyncMock(return_value=response)
+    llm = bare_provider(OpenAILlm, "gpt-4o", client)
+
+    usage = asyncio.run(llm.generate_content_async(MESSAGES)).usage
+
+    assert usage.input_tokens is None and usage.total_tokens is None
+    assert usage.estimated_cost is None
+    assert usage.latency_seconds is not None
+
+
+def test_estimate_cost_local_and_unknown_models():
+    """Local providers cost nothing; unpriced models have no estimate."""
+    usage = LlmUsage(provider="ollama", input_tokens=10, output_tokens=5)
+    assert estimate_cost("ollama", "llama3.2", usage) == 0.0
+    assert estimate_cost("openai-gpt", "gpt-unknown", usage) is None
+
+
+def test_llm_response_behaves_like_text():
+    """LlmResponse compares, serializes and pickles as its text."""
+    response = LlmResponse("hello", LlmUsage(provider="custom", input_tokens=1, output_tokens=2))
+
+    assert response == "hello" and response.upper() == "HELLO"
+    assert type(response.text) is str
+    restored = pickle.loads(pickle.dumps(response))
+    assert restored == "hello" and restored.usage.total_tokens == 3
+
+
+# ============================================================================
+# Factory Tests
+# ============================================================================
+
+def test_factory_wraps_plain_string_providers():
+    """Custom providers returning str still yield usage with latency."""
+
+    class PlainLlm(BaseLlm):
+        def __init__(self, model=None, api_key=None, **kwargs):
+            self.model = model
+
+        async def generate_content_async(self, messages, **kwargs):
+            return "plain"
+
+    class MeteredLlm(PlainLlm):
+        PROVIDER = "usage-test-metered"
+
+        async def generate_content_async(self, messages, **kwargs):
+            return self._response("metered", 0.0, input_tokens=7, output_tokens=3)
+
+    LlmFactory.list_providers()
+    LlmFactory.register_provider("usage-test-plain", PlainLlm)
+    LlmFactory.register_provider("usage-test-metered", MeteredLlm)
+    try:
+        plain = LlmFactory.get_provider("usage-test-plain", model="plain-1")
+        metered = LlmFactory.get_provider("usage-test-metered", model="metered-1")
+    finally:
+        LlmFactory._providers.pop("usage-test-plain", None)
+        LlmFactory._providers.pop("usage-test-metered", None)
+
+    response = asyncio.run(plain.generate_content_async(MESSAGES))
+    assert response == "plain"
+    assert response.usage.provider == "usage-test-plain"
+    assert response.usage.model == "plain-1"
+    assert response.usage.input_tokens is None
+    assert response.usage.latency_seconds >= 0
+
+    asyncio.run(metered.generate_content_async(MESSAGES))
+    tokens = get_registry().get("coditect_llm_tokens_total")
+    assert tokens.labels("usage-test-metered", "metered-1", "input").get() == 7
+    assert tokens.labels("usage-test-metered", "metered-1", "output").get() == 3
+
+
+# ============================================================================
+# Ledger Tests
+# ============================================================================
+
+def usage(provider="openai-gpt", model="gpt-4o", tokens=(100, 50, 0), latency=1.0, ttft=None, cost=0.01):
+    """Create an LlmUsage."""
+    return LlmUsage(
+        provider=provider,
+        model=model,
+        input_tokens=tokens[0] if tokens else None,
+        output_tokens=tokens[1] if tokens else None,
+        cached_tokens=tokens[2] if tokens else None,
+        latency_seconds=latency,
+        time_to_first_token_seconds=ttft,
+        estimated_cost=cost,
+    )
+
+
+def test_ledger_aggregates_per_agent_and_model():
+    """Usage is totalled per agent/provider/model."""
+    ledger = UsageLedger()
+    ledger.record("code-reviewer", usage(latency=1.0, ttft=0.2))
+    ledger.record("code-reviewer", usage(tokens=(300, 100, 200), latency=3.0))
+    ledger.record("code-reviewer", usage(tokens=None, cost=None))
+    ledger.record("researcher", usage(provider="ollama", model="llama3.2", cost=0.0))
+
+    top = ledger.entries()[0]
+    assert (top.agent_id, top.model) == ("code-reviewer", "gpt-4o")
+    assert top.requests == 3 and top.unmetered_requests == 1
+    assert top.total_tokens == 550
+    assert top.cache_hit_ratio == pytest.approx(0.5)
+    assert top.average_latency_seconds == pytest.approx(5.0 / 3)
+    assert top.average_time_to_first_token_seconds == pytest.approx(0.2)
+    assert top.estimated_cost == pytest.approx(0.02)
+
+
+def test_ledger_rollups():
+    """totals() groups by agent, provider or model."""
+    ledger = UsageLedger()
+    ledger.record("a", usage())
+    ledger.record("b", usage())
+    ledger.record("b", usage(model="gpt-4-turbo"))
+
+    by_model = ledger.totals(by="model")
+    assert by_model["gpt-4o"].requests == 2
+    assert ledger.totals(by="agent")["b"].total_tokens == 300
+    assert ledger.to_dict()["total"]["requests"] == 3
+
+    with pytest.raises(ValueError):
+        ledger.totals(by="day")
+
+    ledger.reset()
+    assert ledger.entries() == []
+
+
+def test_executor_copies_usage_into_metadata():
+    """TaskExecutor exposes tokens_used/estimated_cost and feeds the ledger."""
+    ledger = UsageLedger()
+    executor = TaskExecutor(registry=Mock(), usage_ledger=ledger)
+    result = ExecutionResult(
+        task_id="T-1", agent="gpt-test", status=ExecutionStatus.SUCCESS, started_at=datetime.now()
+    )
+    llm_config = SimpleNamespace(provider="openai-gpt", model="gpt-4o")
+    response = LlmResponse("done", usage(tokens=(10, 5, 0), cost=0.0001))
+
+    executor._record_usage(result, "gpt-test", llm_config, response)
+    executor._record_usage(result, "gpt-test", llm_config, "no usage")
+
+    assert result.metadata["tokens_used"] == 15
+    assert result.metadata["estimated_cost"] == 0.0001
+    assert result.metadata["llm_latency_seconds"] == 1.0
+    assert ledger.entries()[0].requests == 1
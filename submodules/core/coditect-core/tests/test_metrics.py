@@ -0,0 +1,206 @@
+"""
+Unit Tests for the Metrics Registry
+===================================
+
+Tests counters, gauges and histograms, Prometheus rendering, and the
+TaskExecutor / LlmFactory instrumentation points.
+
+Copyright © 2025 AZ1.AI INC. All rights reserved.
+"""
+
+import threading
+
+import pytest
+
+from llm_abstractions import BaseLlm, LlmFactory
+from orchestration.agent_registry import AgentInterface, AgentRegistry, AgentType
+from orchestration.executor import TaskExecutor
+from orchestration.metrics import MetricsRegistry, get_registry
+from orchestration.task import AgentTask, TaskPriority, TaskStatus
+
+
+@pytest.fixture
+def registry():
+    """Create an isolated metrics registry."""
+    return MetricsRegistry()
+
+
+# ============================================================================
+# Registry Tests
+# ============================================================================
+
+def test_counter_aggregates_per_label_set(registry):
+    """Counters keep one value per label combination."""
+    counter = registry.counter("jobs_total", "Jobs run", ["status"])
+    for _ in range(1000):
+        counter.labels("ok").inc()
+    counter.labels(status="error").inc(2)
+
+    assert counter.labels("ok").get() == 1000
+    assert counter.labels("error").get() == 2
+    assert len(counter.samples()) == 2
+
+    with pytest.raises(ValueError):
+        counter.labels("ok").inc(-1)
+
+
+def test_registration_is_idempotent(registry):
+    """Re-declaring a metric returns it; conflicting declarations raise."""
+    first = registry.counter("calls_total", "Calls", ["kind"])
+    assert registry.counter("calls_total", "Calls", ["kind"]) is first
+
+    with pytest.raises(ValueError):
+        registry.gauge("calls_total", "Calls", ["kind"])
+    with pytest.raises(ValueError):
+        registry.counter("calls_total", "Calls", ["other"])
+
+
+def test_label_validation(registry):
+    """Wrong label names or counts are rejected."""
+    counter = registry.counter("labeled_total", "Labeled", ["a", "b"])
+
+    with pytest.raises(ValueError):
+        counter.labels("x")
+    with pytest.raises(ValueError):
+        counter.labels(a="x", c="y")
+    with pytest.raises(ValueError):
+        counter.inc()
+    with pytest.raises(ValueError):
+        registry.counter("bad-name", "Bad")
+
+
+def test_gauge_operations(registry):
+    """Gauges can be set, incremented and tracked."""
+    gauge = registry.gauge("queue_depth", "Queue depth")
+    gauge.set(5)
+    gauge.inc(2)
+    gauge.dec()
+    assert gauge.get() == 6
+
+    with gauge.track_inprogress():
+        assert gauge.get() == 7
+    assert gauge.get() == 6
+
+
+def test_histogram_buckets(registry):
+    """Histograms count observations into cumulative buckets."""
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=[0.1, 1.0])
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    data = histogram.get()
+    assert data["buckets"] == {0.1: 2, 1.0: 3, float("inf"): 4}
+    assert data["count"] == 4
+    assert data["sum"] == pytest.approx(2.65)
+
+
+def test_concurrent_increments(registry):
+    """Updates from many threads are not lost."""
+    counter = registry.counter("threaded_total", "Threaded")
+    histogram = registry.histogram("threaded_seconds", "Threaded")
+
+    def work():
+        for _ in range(5000):
+            counter.inc()
+            histogram.observe(0.01)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.get() == 20000
+    assert histogram.get()["count"] == 20000
+
+
+def test_render_prometheus_format(registry):
+    """render() emits HELP/TYPE lines, escaped labels and histogram series."""
+    registry.counter("requests_total", "Requests", ["path"]).labels('/a"b').inc()
+    histogram = registry.histogram("request_seconds", "Latency", ["path"], buckets=[0.5])
+    histogram.labels("/a").observe(0.25)
+
+    output = registry.render()
+
+    assert "# HELP requests_total Requests" in output
+    assert "# TYPE requests_total counter" in output
+    assert 'requests_total{path="/a\\"b"} 1' in output
+    assert "# TYPE request_seconds histogram" in output
+    assert 'request_seconds_bucket{path="/a",le="0.5"} 1' in output
+    assert 'request_seconds_bucket{path="/a",le="+Inf"} 1' in output
+    assert 'request_seconds_sum{path="/a"} 0.25' in output
+    assert 'request_seconds_count{path="/a"} 1' in output
+
+
+def test_clear_resets_values(registry):
+    """clear() resets values but keeps metric definitions."""
+    counter = registry.counter("reset_total", "Reset")
+    counter.inc(3)
+    registry.clear()
+
+    assert counter.get() == 0
+    assert registry.get("reset_total") is counter
+
+
+# ============================================================================
+# Instrumentation Tests
+# ============================================================================
+
+@pytest.mark.asyncio
+async def test_executor_records_executions(registry):
+    """TaskExecutor counts executions and observes their latency."""
+    agents = AgentRegistry()
+    agents.register_agent(
+        name="claude-metrics",
+        agent_type=AgentType.ANTHROPIC_CLAUDE,
+        interface=AgentInterface.TASK_TOOL,
+    )
+    executor = TaskExecutor(registry=agents, metrics=registry)
+    task = AgentTask(
+        task_id="METRICS-001",
+        title="Metrics Task",
+        description="Task used to test executor metrics",
+        agent="claude-metrics",
+        priority=TaskPriority.MEDIUM,
+        status=TaskStatus.PENDING
+    )
+
+    await executor.execute(task)
+
+    executions = registry.get("coditect_task_executions_total")
+    assert executions.labels("claude-metrics", "task-tool", "pending").get() == 1
+    latency = registry.get("coditect_task_execution_seconds")
+    assert latency.labels("claude-metrics", "task-tool").get()["count"] == 1
+    assert registry.get("coditect_tasks_in_progress").get() == 0
+
+
+@pytest.mark.asyncio
+async def test_llm_factory_instruments_providers():
+    """Providers from LlmFactory record request counts and latency."""
+
+    class FlakyLlm(BaseLlm):
+        def __init__(self, model=None, api_key=None, **kwargs):
+            self.model = model
+
+        async def generate_content_async(self, messages, **kwargs):
+            if not messages:
+                raise RuntimeError("empty conversation")
+            return "ok"
+
+    LlmFactory.list_providers()  # load defaults before adding ours
+    LlmFactory.register_provider("metrics-test-llm", FlakyLlm)
+    try:
+        llm = LlmFactory.get_provider("metrics-test-llm", model="flaky-1")
+    finally:
+        LlmFactory._providers.pop("metrics-test-llm", None)
+
+    assert isinstance(llm, FlakyLlm)
+    assert await llm.generate_content_async([{"role": "user", "content": "hi"}]) == "ok"
+    with pytest.raises(RuntimeError):
+        await llm.generate_content_async([])
+
+    requests = get_registry().get("coditect_llm_requests_total")
+    assert requests.labels("metrics-test-llm", "flaky-1", "success").get() == 1
+    assert requests.labels("metrics-test-llm", "flaky-1", "error").get() == 1
+    latency = get_registry().get("coditect_llm_request_seconds")
+    assert latency.labels("metrics-test-llm", "flaky-1").get()["count"] == 2
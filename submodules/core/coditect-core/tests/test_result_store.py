@@ -0,0 +1,187 @@
+"""
+Unit Tests for the Command Result Store
+=======================================
+
+Tests the memory tier (LRU, byte bound, TTL), the SQLite tier with
+out-of-line compressed outputs, pagination and retention.
+
+Copyright © 2025 AZ1.AI INC. All rights reserved.
+"""
+
+import time
+from datetime import datetime
+
+import pytest
+
+from orchestration.command_result import CommandResult, CommandStatus
+from orchestration.result_store import ResultStore
+
+
+def make_result(output="done", status=CommandStatus.SUCCESS, command="/analyze"):
+    """Create a command result."""
+    return CommandResult(
+        command=command,
+        status=status,
+        output=output,
+        agent_used="code-reviewer",
+        started_at=datetime(2025, 1, 1, 12, 0, 0),
+        completed_at=datetime(2025, 1, 1, 12, 0, 3),
+        execution_time_seconds=3.0,
+        metadata={"task_id": "CMD-analyze-1"},
+    )
+
+
+@pytest.fixture
+def persistent(tmp_path):
+    """Create a SQLite-backed store with a small inline limit."""
+    store = ResultStore(max_entries=2, path=tmp_path / "results.db", inline_limit=100)
+    yield store
+    store.close()
+
+
+# ============================================================================
+# Memory Tier Tests
+# ============================================================================
+
+def test_lru_eviction():
+    """The least recently used result is evicted first."""
+    store = ResultStore(max_entries=2)
+    store.put("a", make_result())
+    store.put("b", make_result())
+    store.get("a")
+    store.put("c", make_result())
+
+    assert "a" in store and "c" in store
+    assert store.get("b") is None
+    assert len(store) == 2
+
+
+def test_byte_bound():
+    """Total cached output bytes stay under max_bytes."""
+    store = ResultStore(max_bytes=100)
+    store.put("a", make_result("x" * 60))
+    store.put("b", make_result("y" * 60))
+    store.put("huge", make_result("z" * 500))
+
+    assert store.get("a") is None
+    assert store.get("b").output == "y" * 60
+    assert store.get("huge") is None
+    assert store.stats()["cached_bytes"] == 60
+
+
+def test_ttl_expiry(monkeypatch):
+    """Results expire from memory after ttl_seconds."""
+    store = ResultStore(ttl_seconds=10)
+    store.put("a", make_result())
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+
+    assert "a" not in store
+    assert store.get("a") is None
+
+
+def test_delete():
+    """delete() removes a result and reports whether it existed."""
+    store = ResultStore()
+    store.put("a", make_result())
+
+    assert store.delete("a")
+    assert not store.delete("a")
+
+
+# ============================================================================
+# SQLite Tier Tests
+# ============================================================================
+
+def test_results_survive_restart(tmp_path):
+    """Persisted results are readable by a new store instance."""
+    path = tmp_path / "results.db"
+    store = ResultStore(path=path)
+    store.put("CMD-1", make_result("analysis output"))
+    store.close()
+
+    reopened = ResultStore(path=path)
+    result = reopened.get("CMD-1")
+    reopened.close()
+
+    assert result.output == "analysis output"
+    assert result.status == CommandStatus.SUCCESS
+    assert result.completed_at == datetime(2025, 1, 1, 12, 0, 3)
+    assert result.metadata == {"task_id": "CMD-analyze-1"}
+
+
+def test_evicted_results_reload_from_sqlite(persistent):
+    """Results evicted from memory are served from SQLite."""
+    for i in range(4):
+        persistent.put(f"CMD-{i}", make_result(f"output {i}"))
+
+    assert persistent.stats()["cached"] == 2
+    assert persistent.get("CMD-0").output == "output 0"
+    assert len(persistent) == 4
+
+
+def test_large_outputs_stored_out_of_line(persistent):
+    """Outputs above inline_limit are compressed into shared blob files."""
+    big = "finding\n" * 1000
+    persistent.put("CMD-1", make_result(big))
+    persistent.put("CMD-2", make_result(big))
+
+    blobs = list(persistent.blob_dir.rglob("*.gz"))
+    assert len(blobs) == 1  # identical outputs share a blob
+    assert blobs[0].stat().st_size < len(big) // 10
+    assert persistent.stats()["out_of_line"] == 2
+
+    persistent._cache.clear()
+    assert persistent.get("CMD-2").output == big
+
+    persistent.delete("CMD-1")
+    assert blobs[0].exists()
+    persistent.delete("CMD-2")
+    assert not blobs[0].exists()
+
+
+def test_retention_prunes_old_results(tmp_path):
+    """prune() applies max_persisted and releases blobs."""
+    store = ResultStore(path=tmp_path / "results.db", inline_limit=10, max_persisted=2)
+    for i in range(4):
+        store.put(f"CMD-{i}", make_result(f"long output number {i}"))
+
+    assert store.prune() == 2
+    assert store.get("CMD-0") is None
+    assert store.get("CMD-3") is not None
+    assert len(list(store.blob_dir.rglob("*.gz"))) == 2
+    store.close()
+
+
+# ============================================================================
+# Pagination Tests
+# ============================================================================
+
+@pytest.mark.parametrize("persisted", [False, True])
+def test_pagination_newest_first(tmp_path, persisted):
+    """list() pages through results newest first with a cursor."""
+    store = ResultStore(path=tmp_path / "results.db" if persisted else None)
+    for i in range(5):
+        status = CommandStatus.FAILED if i % 2 else CommandStatus.SUCCESS
+        store.put(f"CMD-{i}", make_result(f"output {i}", status=status))
+
+    first = store.list(limit=2)
+    second = store.list(limit=2, cursor=first.next_cursor)
+    last = store.list(limit=2, cursor=second.next_cursor)
+
+    assert [item.command_id for item in first.items] == ["CMD-4", "CMD-3"]
+    assert [item.command_id for item in second.items] == ["CMD-2", "CMD-1"]
+    assert [item.command_id for item in last.items] == ["CMD-0"]
+    assert last.next_cursor is None
+    assert first.items[0].output_size == len("output 4")
+
+    failed = store.list(status="failed")
+    assert [item.command_id for item in failed.items] == ["CMD-3", "CMD-1"]
+    store.close()
+
+
+def test_command_result_round_trip():
+    """CommandResult.from_dict inverts to_dict."""
+    result = make_result("text", status=CommandStatus.PARTIAL)
+    assert CommandResult.from_dict(result.to_dict()) == result
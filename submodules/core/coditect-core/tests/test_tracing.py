@@ -0,0 +1,268 @@
+"""
+Unit Tests for Tracing Spans
+============================
+
+Tests span nesting and export, the instrumented router / executor / LLM
+provider / state manager paths, UnifiedLogger trace context, and the
+flame-style trace report.
+
+Copyright © 2025 AZ1.AI INC. All rights reserved.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from llm_abstractions import BaseLlm, LlmFactory
+from orchestration.agent_registry import AgentInterface, AgentRegistry, AgentType
+from orchestration.command_router import SlashCommandRouter
+from orchestration.executor import TaskExecutor
+from orchestration.state_manager import StateManager
+from orchestration.task import AgentTask, TaskPriority, TaskStatus
+from orchestration.trace_report import main as trace_report_main, render_flame
+from orchestration.tracing import (
+    InMemorySpanExporter,
+    JsonlSpanExporter,
+    Span,
+    SpanCollector,
+    StatusCode,
+    configure_tracing,
+    current_span,
+    get_tracer,
+)
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "core"))
+from unified_logger import current_trace_context
+
+
+@pytest.fixture
+def exporter():
+    """Route spans synchronously to an in-memory exporter."""
+    exporter = InMemorySpanExporter()
+    configure_tracing(exporter=exporter, batch=False)
+    yield exporter
+    configure_tracing()
+
+
+def spans_by_name(exporter):
+    return {span.name: span for span in exporter.spans}
+
+
+# ============================================================================
+# Tracer Tests
+# ============================================================================
+
+def test_disabled_tracer_yields_noop_span():
+    """Without an exporter, spans are shared no-op objects."""
+    configure_tracing()
+    with get_tracer().start_as_current_span("ignored") as span:
+        span.set_attribute("key", "value")
+        assert not span.is_recording
+        assert current_span() is None
+
+
+def test_nested_spans_share_trace(exporter):
+    """Child spans link to their parent and inherit the correlation id."""
+    tracer = get_tracer()
+    with tracer.start_as_current_span("root", correlation_id="wf-123") as root:
+        with tracer.start_as_current_span("child", {"n": 1}) as child:
+            assert current_span() is child
+
+    spans = spans_by_name(exporter)
+    assert spans["child"].trace_id == spans["root"].trace_id
+    assert spans["child"].parent_span_id == root.span_id
+    assert spans["root"].parent_span_id is None
+    assert spans["child"].correlation_id == "wf-123"
+    assert spans["child"].end_time_unix_nano >= spans["child"].start_time_unix_nano
+
+
+def test_exception_marks_span_error(exporter):
+    """Exceptions escaping a span are recorded and set ERROR status."""
+    with pytest.raises(RuntimeError):
+        with get_tracer().start_as_current_span("boom"):
+            raise RuntimeError("kaput")
+
+    span = exporter.spans[0]
+    assert span.status_code == StatusCode.ERROR
+    assert span.status_message == "kaput"
+    assert span.events[0].attributes["exception.type"] == "RuntimeError"
+
+
+def test_context_propagates_into_asyncio_tasks(exporter):
+    """Spans opened in gathered tasks are children of the creating span."""
+    tracer = get_tracer()
+
+    async def work(i):
+        with tracer.start_as_current_span(f"work-{i}"):
+            await asyncio.sleep(0)
+
+    async def run():
+        with tracer.start_as_current_span("batch") as batch:
+            await asyncio.gather(work(1), work(2))
+            return batch.span_id
+
+    batch_id = asyncio.run(run())
+    spans = spans_by_name(exporter)
+    assert spans["work-1"].parent_span_id == batch_id
+    assert spans["work-2"].parent_span_id == batch_id
+
+
+def test_jsonl_round_trip(tmp_path):
+    """Batch-exported JSONL spans load back through the collector."""
+    path = tmp_path / "spans.jsonl"
+    tracer = configure_tracing(path)
+    try:
+        with tracer.start_as_current_span("root", {"command_id": "CMD-1"}):
+            with tracer.start_as_current_span("child"):
+                pass
+        assert tracer.force_flush()
+    finally:
+        configure_tracing()
+
+    line = json.loads(path.read_text().splitlines()[0])
+    assert {"traceId", "spanId", "startTimeUnixNano", "status"} <= set(line)
+
+    collector = SpanCollector.from_file(path)
+    assert collector.command_ids() == ["CMD-1"]
+    assert {span.name for span in collector.find_command("CMD-1")} == {"root", "child"}
+
+
+# ============================================================================
+# Instrumentation Tests
+# ============================================================================
+
+def test_router_root_span_carries_command_id(exporter):
+    """SlashCommandRouter.execute opens a command.execute root span."""
+    router = SlashCommandRouter()
+    result = asyncio.run(router.execute("/no-such-command", command_id="CMD-test-1"))
+
+    span = spans_by_name(exporter)["command.execute"]
+    assert result.metadata["command_id"] == "CMD-test-1"
+    assert span.attributes["command_id"] == "CMD-test-1"
+    assert span.status_code == StatusCode.ERROR
+
+
+def test_executor_span_nested_under_caller(exporter):
+    """TaskExecutor.execute records a task.execute span."""
+    agents = AgentRegistry()
+    agents.register_agent(
+        name="claude-trace",
+        agent_type=AgentType.ANTHROPIC_CLAUDE,
+        interface=AgentInterface.TASK_TOOL,
+    )
+    executor = TaskExecutor(registry=agents)
+    task = AgentTask(
+        task_id="TRACE-001",
+        title="Trace Task",
+        description="Task used to test tracing",
+        agent="claude-trace",
+        priority=TaskPriority.MEDIUM,
+        status=TaskStatus.PENDING
+    )
+
+    async def run():
+        with get_tracer().start_as_current_span("command.execute") as root:
+            await executor.execute(task)
+            return root.span_id
+
+    root_id = asyncio.run(run())
+    span = spans_by_name(exporter)["task.execute"]
+    assert span.parent_span_id == root_id
+    assert span.attributes["task_id"] == "TRACE-001"
+    assert span.attributes["status"] == "pending"
+
+
+def test_llm_provider_call_span(exporter):
+    """LlmFactory providers record an llm.generate client span."""
+
+    class EchoLlm(BaseLlm):
+        def __init__(self, model=None, api_key=None, **kwargs):
+            self.model = model
+
+        async def generate_content_async(self, messages, **kwargs):
+            return messages[-1]["content"]
+
+    LlmFactory.list_providers()
+    LlmFactory.register_provider("trace-test-llm", EchoLlm)
+    try:
+        llm = LlmFactory.get_provider("trace-test-llm", model="echo-1")
+    finally:
+        LlmFactory._providers.pop("trace-test-llm", None)
+
+    asyncio.run(llm.generate_content_async([{"role": "user", "content": "hello"}]))
+
+    span = spans_by_name(exporter)["llm.generate"]
+    assert span.attributes["provider"] == "trace-test-llm"
+    assert span.attributes["model"] == "echo-1"
+    assert span.attributes["response_chars"] == 5
+
+
+def test_state_save_span(exporter, tmp_path):
+    """StateManager.save_state records a state.save span."""
+    manager = StateManager(state_file=tmp_path / "state.json", fsync_enabled=False)
+    manager.save_state({"TASK-001": {"status": "pending"}}, project_id="p")
+
+    span = spans_by_name(exporter)["state.save"]
+    assert span.attributes["tasks"] == 1
+
+
+def test_unified_logger_reads_trace_context(exporter):
+    """UnifiedLogger entries pick up the active span's ids."""
+    assert current_trace_context() == {}
+
+    with get_tracer().start_as_current_span("op", correlation_id="wf-9") as span:
+        context = current_trace_context()
+
+    assert context == {"trace_id": span.trace_id, "span_id": span.span_id, "correlation_id": "wf-9"}
+
+
+# ============================================================================
+# Trace Report Tests
+# ============================================================================
+
+def make_span(name, span_id, parent, start_ms, end_ms, **attributes):
+    return Span(
+        name=name,
+        trace_id="t" * 32,
+        span_id=span_id,
+        parent_span_id=parent,
+        start_time_unix_nano=int(start_ms * 1e6),
+        end_time_unix_nano=int(end_ms * 1e6),
+        attributes=attributes,
+    )
+
+
+def test_render_flame_breakdown():
+    """The flame view nests children and computes self time."""
+    spans = [
+        make_span("command.execute", "a", None, 0, 100, command_id="CMD-9"),
+        make_span("prompt.build", "b", "a", 1, 11),
+        make_span("llm.generate", "c", "a", 11, 91),
+    ]
+
+    lines = render_flame(spans).splitlines()
+
+    assert lines[0].startswith("command.execute")
+    assert "100.0%" in lines[0] and "10.0ms self" in lines[0]
+    assert lines[1].startswith("  prompt.build")
+    assert lines[2].startswith("  llm.generate") and "80.0%" in lines[2]
+
+
+def test_trace_report_cli(tmp_path, capsys):
+    """The CLI lists command ids and renders one command's trace."""
+    path = tmp_path / "spans.jsonl"
+    JsonlSpanExporter(path).export([
+        make_span("command.execute", "a", None, 0, 50, command_id="CMD-9"),
+        make_span("llm.generate", "b", "a", 5, 45),
+    ])
+
+    assert trace_report_main(["--list", "--file", str(path)]) == 0
+    assert capsys.readouterr().out.strip() == "CMD-9"
+
+    assert trace_report_main(["CMD-9", "--file", str(path)]) == 0
+    assert "llm.generate" in capsys.readouterr().out
+
+    assert trace_report_main(["CMD-missing", "--file", str(path)]) == 1